@@ -0,0 +1,163 @@
+from config.loader import load_config
+from utils.url_utils import EndpointTemplate
+
+APP_SETTINGS = load_config()
+
+
+class CamaraEndpoints:
+    # API REST
+    LEGISLATURAS = EndpointTemplate(APP_SETTINGS.CAMARA.REST_BASE_URL, "legislaturas")
+    DEPUTADOS = EndpointTemplate(APP_SETTINGS.CAMARA.REST_BASE_URL, "deputados")
+    DETALHES_DEPUTADO = EndpointTemplate(
+        APP_SETTINGS.CAMARA.REST_BASE_URL, "deputados/{id}"
+    )
+    DESPESAS_DEPUTADO = EndpointTemplate(
+        APP_SETTINGS.CAMARA.REST_BASE_URL,
+        "deputados/{id}/despesas",
+        {"ordem": "ASC", "ordenarPor": "dataDocumento", "itens": 100},
+    )
+    DISCURSOS_DEPUTADO = EndpointTemplate(
+        APP_SETTINGS.CAMARA.REST_BASE_URL, "deputados/{id}/discursos", {"itens": 100}
+    )
+    FRENTES = EndpointTemplate(APP_SETTINGS.CAMARA.REST_BASE_URL, "frentes")
+    MEMBROS_FRENTE = EndpointTemplate(
+        APP_SETTINGS.CAMARA.REST_BASE_URL, "frentes/{id}/membros"
+    )
+    PROPOSICOES = EndpointTemplate(
+        APP_SETTINGS.CAMARA.REST_BASE_URL,
+        "proposicoes",
+        {"itens": 100, "ordem": "ASC", "ordenarPor": "id"},
+    )
+    DETALHES_PROPOSICAO = EndpointTemplate(
+        APP_SETTINGS.CAMARA.REST_BASE_URL, "proposicoes/{id}"
+    )
+    AUTORES_PROPOSICAO = EndpointTemplate(
+        APP_SETTINGS.CAMARA.REST_BASE_URL, "proposicoes/{id}/autores"
+    )
+    VOTACOES = EndpointTemplate(
+        APP_SETTINGS.CAMARA.REST_BASE_URL, "votacoes", {"itens": 100}
+    )
+    DETALHES_VOTACAO = EndpointTemplate(
+        APP_SETTINGS.CAMARA.REST_BASE_URL, "votacoes/{id}"
+    )
+    ORIENTACOES_VOTACAO = EndpointTemplate(
+        APP_SETTINGS.CAMARA.REST_BASE_URL, "votacoes/{id}/orientacoes"
+    )
+    VOTOS_VOTACAO = EndpointTemplate(
+        APP_SETTINGS.CAMARA.REST_BASE_URL, "votacoes/{id}/votos"
+    )
+    # Portal (HTML)
+    PRESENCA_PLENARIO = EndpointTemplate(
+        APP_SETTINGS.CAMARA.PORTAL_BASE_URL, "deputados/{id}/presenca-plenario/{ano}"
+    )
+
+
+class CamaraRecordFields:
+    """
+    Campos mantidos em cada registro dos endpoints paginados da Câmara quando a saída é gravada um registro por linha.
+    Campos que não estão na lista são descartados. None mantém o registro inteiro.
+    """
+
+    DESPESAS_DEPUTADO = (
+        "ano",
+        "mes",
+        "tipoDespesa",
+        "codDocumento",
+        "tipoDocumento",
+        "codTipoDocumento",
+        "dataDocumento",
+        "numDocumento",
+        "valorDocumento",
+        "urlDocumento",
+        "nomeFornecedor",
+        "cnpjCpfFornecedor",
+        "valorLiquido",
+        "valorGlosa",
+        "numRessarcimento",
+        "codLote",
+        "parcela",
+    )
+    DISCURSOS_DEPUTADO = (
+        "dataHoraInicio",
+        "dataHoraFim",
+        "uriEvento",
+        "faseEvento",
+        "tipoDiscurso",
+        "urlTexto",
+        "keywords",
+        "sumario",
+        "transcricao",
+    )
+    FRENTES = ("id", "titulo", "idLegislatura")
+    MEMBROS_FRENTE = (
+        "id",
+        "nome",
+        "siglaPartido",
+        "siglaUf",
+        "idLegislatura",
+        "titulo",
+        "codTitulo",
+        "dataInicio",
+        "dataFim",
+    )
+    PROPOSICOES = ("id", "siglaTipo", "codTipo", "numero", "ano", "ementa")
+    VOTACOES = (
+        "id",
+        "data",
+        "dataHoraRegistro",
+        "siglaOrgao",
+        "uriEvento",
+        "proposicaoObjeto",
+        "uriProposicaoObjeto",
+        "descricao",
+        "aprovacao",
+    )
+
+
+class SenadoEndpoints:
+    COLEGIADOS = EndpointTemplate(
+        APP_SETTINGS.SENADO.REST_BASE_URL, "comissao/lista/colegiados"
+    )
+    SENADORES_EXERCICIO = EndpointTemplate(
+        APP_SETTINGS.SENADO.REST_BASE_URL, "senador/lista/atual", {"v": 4}
+    )
+    SENADORES_AFASTADOS = EndpointTemplate(
+        APP_SETTINGS.SENADO.REST_BASE_URL, "senador/afastados"
+    )
+    DETALHES_SENADOR = EndpointTemplate(
+        APP_SETTINGS.SENADO.REST_BASE_URL, "senador/{id}", {"v": 6}
+    )
+    DISCURSOS_SENADOR = EndpointTemplate(
+        APP_SETTINGS.SENADO.REST_BASE_URL, "senador/{id}/discursos", {"v": 5}
+    )
+    PROCESSOS = EndpointTemplate(
+        APP_SETTINGS.SENADO.REST_BASE_URL,
+        "processo",
+        {"tramitouLegislaturaAtual": "S"},
+    )
+    DETALHES_PROCESSO = EndpointTemplate(
+        APP_SETTINGS.SENADO.REST_BASE_URL, "processo/{id}", {"v": 1}
+    )
+    VOTACOES = EndpointTemplate(APP_SETTINGS.SENADO.REST_BASE_URL, "votacao", {"v": 1})
+    # O endpoint de despesas CEAPS não utiliza a URL base do Senado pois é de um domínio diferente.
+    DESPESAS_CEAPS = EndpointTemplate(
+        APP_SETTINGS.SENADO.ADM_BASE_URL, "senadores/despesas_ceaps/{ano}"
+    )
+
+
+class TSEEndpoints:
+    CANDIDATOS = EndpointTemplate(
+        APP_SETTINGS.TSE.BASE_URL, "consulta_cand/consulta_cand_{ano}.zip"
+    )
+    PRESTACAO_CONTAS = EndpointTemplate(
+        APP_SETTINGS.TSE.BASE_URL,
+        "prestacao_contas/prestacao_de_contas_eleitorais_candidatos_{ano}.zip",
+    )
+    REDES_SOCIAIS = EndpointTemplate(
+        APP_SETTINGS.TSE.BASE_URL,
+        "consulta_cand/rede_social_candidato_{ano}_{uf}.zip",
+    )
+    VOTACAO = EndpointTemplate(
+        APP_SETTINGS.TSE.BASE_URL,
+        "votacao_candidato_munzona/votacao_candidato_munzona_{ano}.zip",
+    )
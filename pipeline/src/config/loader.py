@@ -24,16 +24,25 @@ class FlowConfig(BaseModel):
 class AllEndpoints(BaseModel):
     FETCH_MAX_RETRIES: int
     FETCH_RETRY_DELAY: int
+    PROGRESS_INTERVAL: int
+    PROGRESS_SAMPLE: int
+    PROGRESS_ARTIFACTS: bool
 
 
 class TSEConfig(BaseModel):
     BASE_URL: str
     OUTPUT_EXTRACT_DIR: str
+    OUTPUT_TRANSFORM_DIR: str
     TASK_RETRIES: int
     TASK_RETRY_DELAY: int
     TASK_TIMEOUT: int
     CACHE_POLICY: str
-    CACHE_EXPIRATION: int
+    DOWNLOAD_SEGMENT_SIZE: int
+    DOWNLOAD_POOL_SIZE: int
+    DOWNLOAD_MAX_BANDWIDTH: float
+    DISK_SPACE_MARGIN: int
+    STORE_RETENTION: int
+    PARQUET_CHUNK_SIZE: int
 
 
 class CamaraConfig(BaseModel):
@@ -44,10 +53,12 @@ class CamaraConfig(BaseModel):
     TASK_RETRY_DELAY: int
     TASK_TIMEOUT: int
     FETCH_LIMIT: int
+    NDJSON_RECORDS: bool
 
 
 class SenadoConfig(BaseModel):
     REST_BASE_URL: str
+    ADM_BASE_URL: str
     OUTPUT_EXTRACT_DIR: str
     TASK_RETRIES: int
     TASK_RETRY_DELAY: int
@@ -55,12 +66,72 @@ class SenadoConfig(BaseModel):
     FETCH_LIMIT: int
 
 
+class LoadConfig(BaseModel):
+    TASK_RETRIES: int
+    TASK_RETRY_DELAY: int
+    TASK_TIMEOUT: int
+    PARTITION_RETENTION: int
+    DROP_DETACHED_PARTITIONS: bool
+
+
+class InstrumentationConfig(BaseModel):
+    OUTPUT_DIR: str
+    PROFILE_TASKS: list[str]
+    PROFILE_TOP_N: int
+    LOOP_LAG_TASKS: list[str]
+    LOOP_LAG_INTERVAL: float
+    LOOP_LAG_THRESHOLD: float
+    LOOP_LAG_TOP_N: int
+    MEMORY_TASKS: list[str]
+    MEMORY_INTERVAL: float
+    MEMORY_TOP_N: int
+    MEMORY_BUDGET: int
+    MEMORY_BUDGETS: dict[str, int]
+
+
+class StandInConfig(BaseModel):
+    ENABLED: bool
+    URL: str
+    SEED: int
+    SCALE: int
+    LATENCY_DISTRIBUTION: str
+    LATENCY_MEAN: float
+    LATENCY_SIGMA: float
+    ERROR_RATE: float
+    THROTTLE_RATE: float
+    RETRY_AFTER: float
+    MAX_REQUESTS_PER_SECOND: float
+    BANDWIDTH: float
+
+
+class CassetteConfig(BaseModel):
+    MODE: str
+    DIR: str
+    TIME_SCALE: float
+
+
+class BenchmarkConfig(BaseModel):
+    DIR: str
+    REGRESSION_THRESHOLD: float
+
+
+class DeltaIdsConfig(BaseModel):
+    ENABLED: bool
+    REFRESH_DAYS: float
+
+
 class AppConfig(BaseModel):
     FLOW: FlowConfig
     ALLENDPOINTS: AllEndpoints
     TSE: TSEConfig
     CAMARA: CamaraConfig
     SENADO: SenadoConfig
+    LOAD: LoadConfig
+    INSTRUMENTATION: InstrumentationConfig
+    STANDIN: StandInConfig
+    CASSETTE: CassetteConfig
+    BENCHMARK: BenchmarkConfig
+    DELTA_IDS: DeltaIdsConfig
 
 
 CONFIG_PATH = "appsettings.toml"
@@ -75,7 +146,22 @@ def load_config(path: str | Path = CONFIG_PATH) -> AppConfig:
     with path.open("rb") as f:
         raw = tomllib.load(f)
 
-    return AppConfig(**raw)
+    config = AppConfig(**raw)
+    if config.STANDIN.ENABLED:
+        use_standin(config)
+    return config
+
+
+def use_standin(config: AppConfig):
+    """
+    Aponta as URLs base das APIs para o servidor substituto (utils/standin_api.py), com os mesmos prefixos dele.
+    """
+    url = config.STANDIN.URL.rstrip("/")
+    config.CAMARA.REST_BASE_URL = f"{url}/camara/api/v2/"
+    config.CAMARA.PORTAL_BASE_URL = f"{url}/camara/portal/"
+    config.SENADO.REST_BASE_URL = f"{url}/senado/dadosabertos/"
+    config.SENADO.ADM_BASE_URL = f"{url}/senado/adm/api/v1/"
+    config.TSE.BASE_URL = f"{url}/tse/"
 
 
 CACHE_POLICY_MAP = {
@@ -10,10 +10,15 @@ class FlowsNames(str, Enum):
 
 class TasksNames:
     # TSE
+    EXTRACT_TSE_ARCHIVES = "extract_tse_archives"
     EXTRACT_TSE_CANDIDATOS = "extract_tse_candidatos"
     EXTRACT_TSE_PRESTACAO_CONTAS = "extract_tse_prestacao_contas"
     EXTRACT_TSE_REDES_SOCIAIS = "extract_tse_redes_sociais"
     EXTRACT_TSE_VOTACAO = "extract_tse_votacao"
+    TRANSFORM_TSE_PARQUET = "transform_tse_parquet"
+    TRANSFORM_TSE_VOTACAO_AGREGADA = "transform_tse_votacao_agregada"
+    # PARLAMENTARES x TSE
+    TRANSFORM_PARLAMENTARES_TSE = "transform_parlamentares_tse"
     # CAMARA
     EXTRACT_CAMARA_LEGISLATURA = "extract_camara_legislatura"
     EXTRACT_CAMARA_DEPUTADOS = "extract_camara_deputados"
@@ -39,3 +44,12 @@ class TasksNames:
     EXTRACT_SENADO_PROCESSOS = "extract_senado_processos"
     EXTRACT_SENADO_DETALHES_PROCESSOS = "extract_senado_detalhes_processos"
     EXTRACT_SENADO_VOTACOES = "extract_senado_votacoes"
+    # LOAD
+    LOAD_DEPUTADOS = "load_deputados"
+    LOAD_VOTACOES = "load_votacoes"
+    LOAD_VOTOS = "load_votos"
+    LOAD_DESPESAS = "load_despesas"
+    LOAD_DISCURSOS = "load_discursos"
+    LOAD_PROPOSICOES = "load_proposicoes"
+    LOAD_SENADORES = "load_senadores"
+    LOAD_PROCESSOS = "load_processos"
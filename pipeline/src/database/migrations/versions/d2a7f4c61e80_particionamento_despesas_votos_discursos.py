@@ -0,0 +1,204 @@
+"""particionamento das tabelas despesas, votos e discursos
+
+Revision ID: d2a7f4c61e80
+Revises: c5d1e8a94f27
+Create Date: 2026-10-19 19:12:27.904113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7f4c61e80'
+down_revision: Union[str, Sequence[str], None] = 'c5d1e8a94f27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Colunas de dados de cada tabela, copiadas entre a versão antiga e a nova
+COLUMNS = {
+    'despesas': [
+        'chave', 'deputado_id', 'ano', 'mes', 'tipo_despesa', 'cod_documento', 'tipo_documento',
+        'data_documento', 'num_documento', 'valor_documento', 'valor_liquido', 'valor_glosa',
+        'nome_fornecedor', 'cnpj_cpf_fornecedor', 'url_documento', 'lote_id', 'data_hora',
+    ],
+    'votos': [
+        'votacao_id', 'deputado_id', 'tipo_voto', 'data_registro_voto', 'sigla_partido', 'sigla_uf',
+        'lote_id', 'data_hora',
+    ],
+    'discursos': [
+        'chave', 'deputado_id', 'data_hora_inicio', 'data_hora_fim', 'tipo_discurso', 'fase_evento',
+        'sumario', 'transcricao', 'keywords', 'url_texto', 'lote_id', 'data_hora',
+    ],
+}
+
+# Coluna de partição das novas tabelas e a expressão que a calcula a partir das colunas antigas.
+# Linhas em que a expressão é nula não podem ser gravadas em nenhuma partição e não são copiadas.
+PARTITION_KEYS = {
+    'despesas': ('data_competencia', 'make_date(ano, mes, 1)'),
+    'votos': ('data', 'data_registro_voto::date'),
+    'discursos': ('data_hora_inicio', 'data_hora_inicio'),
+}
+
+
+def create_year_partitions(table: str, source: str, expression: str) -> None:
+    """Cria uma partição anual para cada ano presente na tabela de origem."""
+    years = op.get_bind().execute(
+        sa.text(f'SELECT DISTINCT extract(year FROM {expression})::int FROM {source} WHERE {expression} IS NOT NULL')
+    ).scalars()
+    for year in years:
+        op.execute(
+            f"CREATE TABLE {table}_{year} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in COLUMNS:
+        op.rename_table(table, f'{table}_antiga')
+        op.execute(f'ALTER TABLE {table}_antiga RENAME CONSTRAINT {table}_pkey TO {table}_antiga_pkey')
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('despesas',
+    sa.Column('chave', sa.String(length=32), nullable=False),
+    sa.Column('data_competencia', sa.Date(), nullable=False),
+    sa.Column('deputado_id', sa.BigInteger(), nullable=False),
+    sa.Column('ano', sa.Integer(), nullable=False),
+    sa.Column('mes', sa.Integer(), nullable=False),
+    sa.Column('tipo_despesa', sa.Text(), nullable=True),
+    sa.Column('cod_documento', sa.BigInteger(), nullable=True),
+    sa.Column('tipo_documento', sa.String(length=64), nullable=True),
+    sa.Column('data_documento', sa.Date(), nullable=True),
+    sa.Column('num_documento', sa.Text(), nullable=True),
+    sa.Column('valor_documento', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('valor_liquido', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('valor_glosa', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('nome_fornecedor', sa.Text(), nullable=True),
+    sa.Column('cnpj_cpf_fornecedor', sa.String(length=14), nullable=True),
+    sa.Column('url_documento', sa.Text(), nullable=True),
+    sa.Column('lote_id', sa.Integer(), nullable=False),
+    sa.Column('data_hora', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['lote_id'], ['lote.id'], ),
+    sa.PrimaryKeyConstraint('chave', 'data_competencia'),
+    postgresql_partition_by='RANGE (data_competencia)'
+    )
+    op.create_index('ix_despesas_deputado_id_data_competencia', 'despesas', ['deputado_id', 'data_competencia'], unique=False)
+    op.create_table('votos',
+    sa.Column('votacao_id', sa.String(length=32), nullable=False),
+    sa.Column('deputado_id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('data', sa.Date(), nullable=False),
+    sa.Column('tipo_voto', sa.String(length=32), nullable=True),
+    sa.Column('data_registro_voto', sa.DateTime(), nullable=True),
+    sa.Column('sigla_partido', sa.String(length=32), nullable=True),
+    sa.Column('sigla_uf', sa.String(length=2), nullable=True),
+    sa.Column('lote_id', sa.Integer(), nullable=False),
+    sa.Column('data_hora', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['lote_id'], ['lote.id'], ),
+    sa.PrimaryKeyConstraint('votacao_id', 'deputado_id', 'data'),
+    postgresql_partition_by='RANGE (data)'
+    )
+    op.create_index('ix_votos_deputado_id_data', 'votos', ['deputado_id', 'data'], unique=False)
+    op.create_table('discursos',
+    sa.Column('chave', sa.String(length=32), nullable=False),
+    sa.Column('data_hora_inicio', sa.DateTime(), nullable=False),
+    sa.Column('deputado_id', sa.BigInteger(), nullable=False),
+    sa.Column('data_hora_fim', sa.DateTime(), nullable=True),
+    sa.Column('tipo_discurso', sa.String(length=128), nullable=True),
+    sa.Column('fase_evento', sa.Text(), nullable=True),
+    sa.Column('sumario', sa.Text(), nullable=True),
+    sa.Column('transcricao', sa.Text(), nullable=True),
+    sa.Column('keywords', sa.Text(), nullable=True),
+    sa.Column('url_texto', sa.Text(), nullable=True),
+    sa.Column('lote_id', sa.Integer(), nullable=False),
+    sa.Column('data_hora', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['lote_id'], ['lote.id'], ),
+    sa.PrimaryKeyConstraint('chave', 'data_hora_inicio'),
+    postgresql_partition_by='RANGE (data_hora_inicio)'
+    )
+    op.create_index('ix_discursos_deputado_id_data_hora_inicio', 'discursos', ['deputado_id', 'data_hora_inicio'], unique=False)
+    # ### end Alembic commands ###
+
+    # Cópia das linhas já carregadas para as partições
+    for table, columns in COLUMNS.items():
+        partition_column, expression = PARTITION_KEYS[table]
+        create_year_partitions(table, f'{table}_antiga', expression)
+
+        target_columns = list(dict.fromkeys(columns + [partition_column]))
+        source_columns = [expression if c == partition_column else c for c in target_columns]
+        op.execute(
+            f"INSERT INTO {table} ({', '.join(target_columns)}) "
+            f"SELECT {', '.join(source_columns)} FROM {table}_antiga WHERE {expression} IS NOT NULL"
+        )
+        op.drop_table(f'{table}_antiga')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in COLUMNS:
+        op.rename_table(table, f'{table}_particionada')
+        op.execute(f'ALTER TABLE {table}_particionada RENAME CONSTRAINT {table}_pkey TO {table}_particionada_pkey')
+        op.drop_index(f'ix_{table}_deputado_id_{PARTITION_KEYS[table][0]}', table_name=f'{table}_particionada')
+
+    op.create_table('despesas',
+    sa.Column('chave', sa.String(length=32), nullable=False),
+    sa.Column('deputado_id', sa.BigInteger(), nullable=False),
+    sa.Column('ano', sa.Integer(), nullable=False),
+    sa.Column('mes', sa.Integer(), nullable=False),
+    sa.Column('tipo_despesa', sa.Text(), nullable=True),
+    sa.Column('cod_documento', sa.BigInteger(), nullable=True),
+    sa.Column('tipo_documento', sa.String(length=64), nullable=True),
+    sa.Column('data_documento', sa.Date(), nullable=True),
+    sa.Column('num_documento', sa.Text(), nullable=True),
+    sa.Column('valor_documento', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('valor_liquido', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('valor_glosa', sa.Numeric(precision=12, scale=2), nullable=True),
+    sa.Column('nome_fornecedor', sa.Text(), nullable=True),
+    sa.Column('cnpj_cpf_fornecedor', sa.String(length=14), nullable=True),
+    sa.Column('url_documento', sa.Text(), nullable=True),
+    sa.Column('lote_id', sa.Integer(), nullable=False),
+    sa.Column('data_hora', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['lote_id'], ['lote.id'], ),
+    sa.PrimaryKeyConstraint('chave')
+    )
+    op.create_table('votos',
+    sa.Column('votacao_id', sa.String(length=32), nullable=False),
+    sa.Column('deputado_id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('tipo_voto', sa.String(length=32), nullable=True),
+    sa.Column('data_registro_voto', sa.DateTime(), nullable=True),
+    sa.Column('sigla_partido', sa.String(length=32), nullable=True),
+    sa.Column('sigla_uf', sa.String(length=2), nullable=True),
+    sa.Column('lote_id', sa.Integer(), nullable=False),
+    sa.Column('data_hora', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['lote_id'], ['lote.id'], ),
+    sa.PrimaryKeyConstraint('votacao_id', 'deputado_id')
+    )
+    op.create_table('discursos',
+    sa.Column('chave', sa.String(length=32), nullable=False),
+    sa.Column('deputado_id', sa.BigInteger(), nullable=False),
+    sa.Column('data_hora_inicio', sa.DateTime(), nullable=False),
+    sa.Column('data_hora_fim', sa.DateTime(), nullable=True),
+    sa.Column('tipo_discurso', sa.String(length=128), nullable=True),
+    sa.Column('fase_evento', sa.Text(), nullable=True),
+    sa.Column('sumario', sa.Text(), nullable=True),
+    sa.Column('transcricao', sa.Text(), nullable=True),
+    sa.Column('keywords', sa.Text(), nullable=True),
+    sa.Column('url_texto', sa.Text(), nullable=True),
+    sa.Column('lote_id', sa.Integer(), nullable=False),
+    sa.Column('data_hora', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['lote_id'], ['lote.id'], ),
+    sa.PrimaryKeyConstraint('chave')
+    )
+
+    # A mesma chave pode existir em mais de uma partição, por isso apenas a mais recente é mantida
+    for table, columns in COLUMNS.items():
+        keys = {'despesas': 'chave', 'votos': 'votacao_id, deputado_id', 'discursos': 'chave'}[table]
+        op.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"SELECT DISTINCT ON ({keys}) {', '.join(columns)} FROM {table}_particionada "
+            f"ORDER BY {keys}, data_hora DESC"
+        )
+        # Apagar a tabela particionada apaga também as suas partições
+        op.drop_table(f'{table}_particionada')
@@ -1,8 +1,10 @@
 from datetime import datetime
 from typing import TypedDict
+from uuid import UUID
 
 import sqlalchemy as sa
 from pydantic.dataclasses import dataclass
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -34,6 +36,48 @@ class InsertLogDB:
     message: str
 
 
+# Métricas de desempenho de uma Task Run, gravadas pelas funções de download de muitas URLs
+@dataclass
+class TaskMetricsDB:
+    lote_id: int
+    task: str
+    task_run_id: UUID
+    duracao: float
+    urls_planejadas: int
+    urls_baixadas: int
+    urls_falhas: int
+    paginas: int
+    registros: int
+    bytes: int
+    novas_tentativas: int
+    latencia_p50: float | None
+    latencia_p95: float | None
+    latencia_p99: float | None
+    pico_rss: int | None
+
+
+# Metadados de um arquivo do TSE, informados pelo servidor ou gravados no registro de arquivos
+@dataclass
+class TSEArchive:
+    url: str
+    etag: str | None
+    last_modified: str | None
+    content_length: int | None
+    path: str | None = None
+    sha256: str | None = None
+
+
+# Correspondência entre um parlamentar e o seu registro de candidato no TSE em uma eleição
+@dataclass
+class ParlamentarCandidatoTSE:
+    casa: str
+    parlamentar_id: str
+    ano_eleicao: int
+    sq_candidato: int | None
+    criterio: str | None
+    assinatura: str
+
+
 # Utilizado para o retorno das funções de URL nas tasks
 class UrlsResult(TypedDict):
     urls_to_download: list[str]
@@ -92,3 +136,301 @@ class Logs(Base):
     flow_run_name = sa.Column(sa.String(256), nullable=False)
     task_run_name = sa.Column(sa.String(256), nullable=True)
     mensagem = sa.Column(sa.Text, nullable=False)
+
+
+class TaskMetrics(Base):
+    __tablename__ = "task_metrics"
+    __table_args__ = (sa.Index("ix_task_metrics_task_data_hora", "task", "data_hora"),)
+
+    id = sa.Column(sa.Integer, sa.Identity(start=1, cycle=False), primary_key=True)
+    lote_id = sa.Column(sa.Integer, sa.ForeignKey("lote.id"), nullable=False)
+    task = sa.Column(sa.String(256), nullable=False)
+    task_run_id = sa.Column(sa.Uuid, nullable=False, index=True)
+    data_hora = sa.Column(
+        sa.DateTime(timezone=True),
+        nullable=False,
+        server_default=sa.func.now(),
+    )
+    duracao = sa.Column(sa.Float, nullable=False)  # Segundos desde o início da Task Run
+    urls_planejadas = sa.Column(sa.Integer, nullable=False)
+    urls_baixadas = sa.Column(sa.Integer, nullable=False)
+    urls_falhas = sa.Column(sa.Integer, nullable=False)
+    paginas = sa.Column(sa.Integer, nullable=False)
+    registros = sa.Column(sa.Integer, nullable=False)
+    bytes = sa.Column(sa.BigInteger, nullable=False)
+    novas_tentativas = sa.Column(sa.Integer, nullable=False)
+    # Latências das requisições, em segundos
+    latencia_p50 = sa.Column(sa.Float, nullable=True)
+    latencia_p95 = sa.Column(sa.Float, nullable=True)
+    latencia_p99 = sa.Column(sa.Float, nullable=True)
+    pico_rss = sa.Column(sa.BigInteger, nullable=True)  # Bytes
+    tamanho_saida = sa.Column(sa.BigInteger, nullable=True)  # Bytes
+    # Preenchidas pelo monitor de lag do event loop (utils/loop_lag.py), em segundos
+    lag_loop_max = sa.Column(sa.Float, nullable=True)
+    lag_loop_p99 = sa.Column(sa.Float, nullable=True)
+    bloqueio_loop_total = sa.Column(sa.Float, nullable=True)
+    bloqueios_loop = sa.Column(
+        JSONB, nullable=True
+    )  # Trechos que mais bloquearam o loop
+    # Preenchidas pelo monitor de memória (utils/memory.py), em bytes
+    rss_inicio = sa.Column(sa.BigInteger, nullable=True)
+    rss_fim = sa.Column(sa.BigInteger, nullable=True)
+    rss_max = sa.Column(sa.BigInteger, nullable=True)
+    tracemalloc_pico = sa.Column(sa.BigInteger, nullable=True)
+    orcamento_memoria_excedido = sa.Column(sa.Boolean, nullable=True)
+    alocacoes = sa.Column(JSONB, nullable=True)  # Locais que mais alocaram memória
+
+
+class ArquivosTSE(Base):
+    __tablename__ = "arquivos_tse"
+
+    id = sa.Column(sa.Integer, sa.Identity(start=1, cycle=False), primary_key=True)
+    lote_id = sa.Column(sa.Integer, sa.ForeignKey("lote.id"), nullable=False)
+    url = sa.Column(sa.Text, nullable=False, unique=True)
+    etag = sa.Column(sa.Text, nullable=True)
+    last_modified = sa.Column(sa.String(64), nullable=True)
+    content_length = sa.Column(sa.BigInteger, nullable=True)
+    caminho = sa.Column(sa.Text, nullable=False)
+    sha256 = sa.Column(sa.String(64), nullable=True)
+    data_hora_baixado = sa.Column(
+        sa.DateTime(timezone=True),
+        nullable=False,
+        server_default=sa.func.now(),
+    )
+    data_hora_verificado = sa.Column(
+        sa.DateTime(timezone=True),
+        nullable=False,
+        server_default=sa.func.now(),
+    )
+
+
+# IDs de entidades cujos detalhes já foram baixados por uma task, com a data do último download
+class RegistroIds(Base):
+    __tablename__ = "registro_ids"
+    __table_args__ = (sa.UniqueConstraint("task", "entidade_id"),)
+
+    id = sa.Column(sa.Integer, sa.Identity(start=1, cycle=False), primary_key=True)
+    lote_id = sa.Column(sa.Integer, sa.ForeignKey("lote.id"), nullable=False)
+    task = sa.Column(sa.String(256), nullable=False)
+    entidade_id = sa.Column(sa.String(64), nullable=False)
+    data_hora_baixado = sa.Column(
+        sa.DateTime(timezone=True),
+        nullable=False,
+        server_default=sa.func.now(),
+    )
+
+
+class ParlamentaresCandidatosTSE(Base):
+    __tablename__ = "parlamentares_candidatos_tse"
+    __table_args__ = (sa.UniqueConstraint("casa", "parlamentar_id", "ano_eleicao"),)
+
+    id = sa.Column(sa.Integer, sa.Identity(start=1, cycle=False), primary_key=True)
+    lote_id = sa.Column(sa.Integer, sa.ForeignKey("lote.id"), nullable=False)
+    casa = sa.Column(sa.String(16), nullable=False)
+    parlamentar_id = sa.Column(sa.String(32), nullable=False)
+    ano_eleicao = sa.Column(sa.Integer, nullable=False)
+    sq_candidato = sa.Column(sa.BigInteger, nullable=True)
+    criterio = sa.Column(sa.String(32), nullable=True)
+    assinatura = sa.Column(sa.String(40), nullable=False)
+    data_hora = sa.Column(
+        sa.DateTime(timezone=True),
+        nullable=False,
+        server_default=sa.func.now(),
+    )
+
+
+# ============= TABELAS DE DADOS =============
+# Alimentadas pela etapa de load a partir dos arquivos da extração. As colunas lote_id e data_hora
+# registram o último lote que gravou cada linha.
+# As tabelas de fatos (despesas, votos e discursos) são particionadas por intervalo de datas. A coluna de partição
+# faz parte da chave primária e info["partition"] define o tamanho de cada partição ("year" ou "month").
+# As partições são criadas pela etapa de load (database/repository/partitions.py).
+
+
+class Deputados(Base):
+    __tablename__ = "deputados"
+
+    id = sa.Column(sa.BigInteger, primary_key=True, autoincrement=False)
+    nome_civil = sa.Column(sa.Text, nullable=True)
+    nome_parlamentar = sa.Column(sa.Text, nullable=True)
+    sigla_partido = sa.Column(sa.String(32), nullable=True)
+    sigla_uf = sa.Column(sa.String(2), nullable=True)
+    data_nascimento = sa.Column(sa.Date, nullable=True)
+    cpf = sa.Column(sa.String(11), nullable=True)
+    sexo = sa.Column(sa.String(1), nullable=True)
+    situacao = sa.Column(sa.String(64), nullable=True)
+    lote_id = sa.Column(sa.Integer, sa.ForeignKey("lote.id"), nullable=False)
+    data_hora = sa.Column(
+        sa.DateTime(timezone=True),
+        nullable=False,
+        server_default=sa.func.now(),
+    )
+
+
+class Votacoes(Base):
+    __tablename__ = "votacoes"
+
+    id = sa.Column(sa.String(32), primary_key=True)
+    data = sa.Column(sa.Date, nullable=True)
+    data_hora_registro = sa.Column(sa.DateTime, nullable=True)
+    sigla_orgao = sa.Column(sa.String(32), nullable=True)
+    descricao = sa.Column(sa.Text, nullable=True)
+    aprovacao = sa.Column(sa.Integer, nullable=True)
+    proposicao_objeto = sa.Column(sa.Text, nullable=True)
+    uri_proposicao_objeto = sa.Column(sa.Text, nullable=True)
+    lote_id = sa.Column(sa.Integer, sa.ForeignKey("lote.id"), nullable=False)
+    data_hora = sa.Column(
+        sa.DateTime(timezone=True),
+        nullable=False,
+        server_default=sa.func.now(),
+    )
+
+
+class Votos(Base):
+    __tablename__ = "votos"
+    __table_args__ = (
+        sa.Index("ix_votos_deputado_id_data", "deputado_id", "data"),
+        {"postgresql_partition_by": "RANGE (data)", "info": {"partition": "year"}},
+    )
+
+    votacao_id = sa.Column(sa.String(32), primary_key=True)
+    deputado_id = sa.Column(sa.BigInteger, primary_key=True, autoincrement=False)
+    # Data do registro do voto, chave das partições
+    data = sa.Column(sa.Date, primary_key=True)
+    tipo_voto = sa.Column(sa.String(32), nullable=True)
+    data_registro_voto = sa.Column(sa.DateTime, nullable=True)
+    sigla_partido = sa.Column(sa.String(32), nullable=True)
+    sigla_uf = sa.Column(sa.String(2), nullable=True)
+    lote_id = sa.Column(sa.Integer, sa.ForeignKey("lote.id"), nullable=False)
+    data_hora = sa.Column(
+        sa.DateTime(timezone=True),
+        nullable=False,
+        server_default=sa.func.now(),
+    )
+
+
+class Despesas(Base):
+    __tablename__ = "despesas"
+    __table_args__ = (
+        sa.Index(
+            "ix_despesas_deputado_id_data_competencia",
+            "deputado_id",
+            "data_competencia",
+        ),
+        {
+            "postgresql_partition_by": "RANGE (data_competencia)",
+            "info": {"partition": "year"},
+        },
+    )
+
+    # Hash dos campos que identificam a despesa. A API não tem um identificador único para elas.
+    chave = sa.Column(sa.String(32), primary_key=True)
+    # Primeiro dia do mês da despesa, chave das partições
+    data_competencia = sa.Column(sa.Date, primary_key=True)
+    deputado_id = sa.Column(sa.BigInteger, nullable=False)
+    ano = sa.Column(sa.Integer, nullable=False)
+    mes = sa.Column(sa.Integer, nullable=False)
+    tipo_despesa = sa.Column(sa.Text, nullable=True)
+    cod_documento = sa.Column(sa.BigInteger, nullable=True)
+    tipo_documento = sa.Column(sa.String(64), nullable=True)
+    data_documento = sa.Column(sa.Date, nullable=True)
+    num_documento = sa.Column(sa.Text, nullable=True)
+    valor_documento = sa.Column(sa.Numeric(12, 2), nullable=True)
+    valor_liquido = sa.Column(sa.Numeric(12, 2), nullable=True)
+    valor_glosa = sa.Column(sa.Numeric(12, 2), nullable=True)
+    nome_fornecedor = sa.Column(sa.Text, nullable=True)
+    cnpj_cpf_fornecedor = sa.Column(sa.String(14), nullable=True)
+    url_documento = sa.Column(sa.Text, nullable=True)
+    lote_id = sa.Column(sa.Integer, sa.ForeignKey("lote.id"), nullable=False)
+    data_hora = sa.Column(
+        sa.DateTime(timezone=True),
+        nullable=False,
+        server_default=sa.func.now(),
+    )
+
+
+class Discursos(Base):
+    __tablename__ = "discursos"
+    __table_args__ = (
+        sa.Index(
+            "ix_discursos_deputado_id_data_hora_inicio",
+            "deputado_id",
+            "data_hora_inicio",
+        ),
+        {
+            "postgresql_partition_by": "RANGE (data_hora_inicio)",
+            "info": {"partition": "year"},
+        },
+    )
+
+    # Hash dos campos que identificam o discurso. A API não tem um identificador único para eles.
+    chave = sa.Column(sa.String(32), primary_key=True)
+    # Chave das partições
+    data_hora_inicio = sa.Column(sa.DateTime, primary_key=True)
+    deputado_id = sa.Column(sa.BigInteger, nullable=False)
+    data_hora_fim = sa.Column(sa.DateTime, nullable=True)
+    tipo_discurso = sa.Column(sa.String(128), nullable=True)
+    fase_evento = sa.Column(sa.Text, nullable=True)
+    sumario = sa.Column(sa.Text, nullable=True)
+    transcricao = sa.Column(sa.Text, nullable=True)
+    keywords = sa.Column(sa.Text, nullable=True)
+    url_texto = sa.Column(sa.Text, nullable=True)
+    lote_id = sa.Column(sa.Integer, sa.ForeignKey("lote.id"), nullable=False)
+    data_hora = sa.Column(
+        sa.DateTime(timezone=True),
+        nullable=False,
+        server_default=sa.func.now(),
+    )
+
+
+class Proposicoes(Base):
+    __tablename__ = "proposicoes"
+
+    id = sa.Column(sa.BigInteger, primary_key=True, autoincrement=False)
+    sigla_tipo = sa.Column(sa.String(16), nullable=True)
+    cod_tipo = sa.Column(sa.Integer, nullable=True)
+    numero = sa.Column(sa.Integer, nullable=True)
+    ano = sa.Column(sa.Integer, nullable=True)
+    ementa = sa.Column(sa.Text, nullable=True)
+    lote_id = sa.Column(sa.Integer, sa.ForeignKey("lote.id"), nullable=False)
+    data_hora = sa.Column(
+        sa.DateTime(timezone=True),
+        nullable=False,
+        server_default=sa.func.now(),
+    )
+
+
+class Senadores(Base):
+    __tablename__ = "senadores"
+
+    id = sa.Column(sa.BigInteger, primary_key=True, autoincrement=False)
+    nome_parlamentar = sa.Column(sa.Text, nullable=True)
+    nome_civil = sa.Column(sa.Text, nullable=True)
+    sexo = sa.Column(sa.String(16), nullable=True)
+    sigla_partido = sa.Column(sa.String(32), nullable=True)
+    sigla_uf = sa.Column(sa.String(2), nullable=True)
+    data_nascimento = sa.Column(sa.Date, nullable=True)
+    lote_id = sa.Column(sa.Integer, sa.ForeignKey("lote.id"), nullable=False)
+    data_hora = sa.Column(
+        sa.DateTime(timezone=True),
+        nullable=False,
+        server_default=sa.func.now(),
+    )
+
+
+class Processos(Base):
+    __tablename__ = "processos"
+
+    id = sa.Column(sa.BigInteger, primary_key=True, autoincrement=False)
+    codigo_materia = sa.Column(sa.BigInteger, nullable=True)
+    identificacao = sa.Column(sa.String(64), nullable=True)
+    tipo_documento = sa.Column(sa.Text, nullable=True)
+    ementa = sa.Column(sa.Text, nullable=True)
+    data_apresentacao = sa.Column(sa.Date, nullable=True)
+    autoria = sa.Column(sa.Text, nullable=True)
+    lote_id = sa.Column(sa.Integer, sa.ForeignKey("lote.id"), nullable=False)
+    data_hora = sa.Column(
+        sa.DateTime(timezone=True),
+        nullable=False,
+        server_default=sa.func.now(),
+    )
@@ -0,0 +1,81 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from database.engine import get_connection
+from database.models.base import ArquivosTSE, TSEArchive
+
+arquivos_tse = ArquivosTSE.__table__
+
+
+def get_tse_archives_db(urls: list[str]) -> dict[str, TSEArchive]:
+    """
+    Busca no registro de arquivos do TSE, em uma única consulta, os metadados da última versão baixada de cada URL.
+    URLs de arquivos que nunca foram baixados não aparecem no resultado.
+    """
+    if not urls:
+        return {}
+
+    with get_connection() as conn:
+        stmt = select(
+            arquivos_tse.c.url,
+            arquivos_tse.c.etag,
+            arquivos_tse.c.last_modified,
+            arquivos_tse.c.content_length,
+            arquivos_tse.c.caminho,
+            arquivos_tse.c.sha256,
+        ).where(arquivos_tse.c.url.in_(urls))
+
+        return {
+            row.url: TSEArchive(
+                url=row.url,
+                etag=row.etag,
+                last_modified=row.last_modified,
+                content_length=row.content_length,
+                path=row.caminho,
+                sha256=row.sha256,
+            )
+            for row in conn.execute(stmt)
+        }
+
+
+def upsert_tse_archive_db(archive: TSEArchive, lote_id: int):
+    """
+    Grava no registro de arquivos do TSE os metadados da versão que acabou de ser baixada.
+    """
+    now = datetime.now(timezone.utc)
+
+    with get_connection() as conn:
+        values = {
+            "lote_id": lote_id,
+            "etag": archive.etag,
+            "last_modified": archive.last_modified,
+            "content_length": archive.content_length,
+            "caminho": archive.path,
+            "sha256": archive.sha256,
+            "data_hora_baixado": now,
+            "data_hora_verificado": now,
+        }
+        stmt = (
+            insert(arquivos_tse)
+            .values(url=archive.url, **values)
+            .on_conflict_do_update(index_elements=["url"], set_=values)
+        )
+        conn.execute(stmt)
+
+
+def update_tse_archives_verified_db(urls: list[str]):
+    """
+    Atualiza a data da última verificação dos arquivos que não mudaram no servidor do TSE.
+    """
+    if not urls:
+        return
+
+    with get_connection() as conn:
+        stmt = (
+            update(arquivos_tse)
+            .where(arquivos_tse.c.url.in_(urls))
+            .values(data_hora_verificado=datetime.now(timezone.utc))
+        )
+        conn.execute(stmt)
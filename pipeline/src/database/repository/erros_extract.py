@@ -5,6 +5,7 @@ from sqlalchemy.dialects.postgresql import insert
 
 from database.engine import get_connection
 from database.models.base import ErrorExtract, ErrosExtract, Lote
+from utils.url_utils import canonical_url
 
 erros_extract = ErrosExtract.__table__
 lote = Lote.__table__
@@ -16,6 +17,7 @@ def insert_extract_error_db(
     """
     Cria um novo registro na tabela erros_extract de uma URL que não pôde ser baixada.
     Recebe como argumento o nome da task, o código de status de erro, a mensagem de erro e a URL
+    A URL é gravada na forma canônica, para que a restrição de unicidade não aceite duas grafias do mesmo recurso.
     """
     with get_connection() as conn:
         stmt_error = (
@@ -25,7 +27,7 @@ def insert_extract_error_db(
                 task=task,
                 status_code=status_code,
                 mensagem=message,
-                url=url,
+                url=canonical_url(url),
             )
             .on_conflict_do_nothing(index_elements=["url"])
         )
@@ -55,7 +57,8 @@ def verify_not_downloaded_urls_in_task_db(task: str) -> list[ErrorExtract]:
 
         rows = result.fetchall()
 
-        return [ErrorExtract(id=row.id, url=row.url) for row in rows]
+        # Registros antigos podem ter sido gravados antes da forma canônica
+        return [ErrorExtract(id=row.id, url=canonical_url(row.url)) for row in rows]
 
 
 def update_not_downloaded_urls_db(error_id: int, lote_id: int):
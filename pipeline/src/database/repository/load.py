@@ -0,0 +1,144 @@
+import csv
+import io
+import json
+from datetime import date
+from typing import Any, Iterable, Iterator
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert
+
+from database.engine import get_connection
+
+from .partitions import ensure_partitions_db, partition_column
+
+# Coluna da tabela de staging com a ordem de leitura dos registros. Entre registros repetidos, o último lido é gravado.
+LINE_COLUMN = "_linha"
+
+
+def csv_value(value: Any) -> Any:
+    """
+    Converte um valor para o formato aceito pelo COPY em CSV. Listas e dicionários são gravados como JSON.
+    """
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+class CsvRowsReader(io.TextIOBase):
+    """
+    Arquivo somente leitura que gera o CSV do COPY sob demanda, a partir de um iterador de registros.
+    Os registros nunca são carregados todos na memória: cada chamada de read() gera apenas as linhas necessárias.
+    None é gravado como campo vazio sem aspas, que o COPY interpreta como NULL. Textos vazios continuam entre aspas.
+    """
+
+    def __init__(self, rows: Iterable[dict], columns: list[str]):
+        self.columns = columns
+        self.rows = 0
+        self._rows: Iterator[dict] = iter(rows)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(
+            self._buffer, quoting=csv.QUOTE_NOTNULL, lineterminator="\n"
+        )
+        self._exhausted = False
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> str:
+        size = -1 if size is None else size
+        while not self._exhausted and (size < 0 or self._buffer.tell() < size):
+            row = next(self._rows, None)
+            if row is None:
+                self._exhausted = True
+                break
+            self.rows += 1
+            self._writer.writerow(
+                [self.rows]
+                + [csv_value(row.get(column)) for column in self.columns[1:]]
+            )
+
+        data = self._buffer.getvalue()
+        if size >= 0 and len(data) > size:
+            data, rest = data[:size], data[size:]
+        else:
+            rest = ""
+
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._buffer.write(rest)
+        return data
+
+
+def staging_table(table: sa.Table) -> sa.Table:
+    """
+    Tabela temporária com as colunas da tabela de destino (exceto data_hora), descartada no fim da transação.
+    Não tem restrições nem índices, para que o COPY não pague o custo de mantê-los.
+    """
+    return sa.Table(
+        f"staging_{table.name}",
+        sa.MetaData(),
+        sa.Column(LINE_COLUMN, sa.BigInteger),
+        *(sa.Column(c.name, c.type) for c in table.columns if c.name != "data_hora"),
+        prefixes=["TEMPORARY"],
+        postgresql_on_commit="DROP",
+    )
+
+
+def load_rows_db(
+    table: sa.Table,
+    rows: Iterable[dict],
+    lote_id: int,
+    partitions_from: date | None = None,
+) -> int:
+    """
+    Carrega os registros na tabela em uma única transação:
+    - Os registros são enviados por COPY para uma tabela temporária de staging
+    - Em tabelas particionadas, os registros anteriores a partitions_from (início do período de retenção) são
+    descartados, para não criar de novo as partições antigas, e as partições que faltam para as datas da staging
+    são criadas
+    - Um único INSERT ... SELECT ... ON CONFLICT atualiza as linhas existentes e insere as novas na tabela de destino
+    Registros repetidos na mesma carga são reduzidos ao último lido, já que o ON CONFLICT não atualiza a mesma linha duas vezes.
+    Retorna o número de registros lidos.
+    """
+    staging = staging_table(table)
+    columns = [c.name for c in staging.columns]
+    data_columns = columns[1:]
+    keys = [c.name for c in table.primary_key.columns]
+
+    reader = CsvRowsReader(({**row, "lote_id": lote_id} for row in rows), columns)
+
+    with get_connection() as conn:
+        staging.create(conn)
+
+        cursor = conn.connection.cursor()
+        cursor.copy_expert(
+            f"COPY {staging.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            reader,
+        )
+
+        column = partition_column(table)
+        if partitions_from is not None and column is not None:
+            conn.execute(
+                sa.delete(staging).where(staging.c[column.name] < partitions_from)
+            )
+
+        ensure_partitions_db(conn, table, staging)
+
+        latest = (
+            sa.select(*(staging.c[c] for c in data_columns))
+            .distinct(*(staging.c[k] for k in keys))
+            .order_by(*(staging.c[k] for k in keys), staging.c[LINE_COLUMN].desc())
+        )
+        stmt = insert(table).from_select(data_columns, latest)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={
+                **{c: stmt.excluded[c] for c in data_columns if c not in keys},
+                "data_hora": sa.func.now(),
+            },
+        )
+        conn.execute(stmt)
+
+    return reader.rows
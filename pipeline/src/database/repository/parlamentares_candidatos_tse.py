@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from database.engine import get_connection
+from database.models.base import ParlamentarCandidatoTSE, ParlamentaresCandidatosTSE
+
+parlamentares_candidatos_tse = ParlamentaresCandidatosTSE.__table__
+
+
+def get_crosswalk_signatures_db() -> dict[tuple[str, str, int], str]:
+    """
+    Busca as assinaturas das correspondências já gravadas, chaveadas por (casa, parlamentar_id, ano_eleicao).
+    """
+    with get_connection() as conn:
+        stmt = select(
+            parlamentares_candidatos_tse.c.casa,
+            parlamentares_candidatos_tse.c.parlamentar_id,
+            parlamentares_candidatos_tse.c.ano_eleicao,
+            parlamentares_candidatos_tse.c.assinatura,
+        )
+        return {
+            (row.casa, row.parlamentar_id, row.ano_eleicao): row.assinatura
+            for row in conn.execute(stmt)
+        }
+
+
+def upsert_crosswalk_db(rows: list[ParlamentarCandidatoTSE], lote_id: int):
+    """
+    Grava as correspondências refeitas entre parlamentares e candidatos do TSE, inclusive as sem candidato encontrado,
+    para que não sejam refeitas enquanto os dados não mudarem.
+    """
+    if not rows:
+        return
+
+    now = datetime.now(timezone.utc)
+
+    with get_connection() as conn:
+        stmt = insert(parlamentares_candidatos_tse).values(
+            [
+                {
+                    "lote_id": lote_id,
+                    "casa": row.casa,
+                    "parlamentar_id": row.parlamentar_id,
+                    "ano_eleicao": row.ano_eleicao,
+                    "sq_candidato": row.sq_candidato,
+                    "criterio": row.criterio,
+                    "assinatura": row.assinatura,
+                    "data_hora": now,
+                }
+                for row in rows
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["casa", "parlamentar_id", "ano_eleicao"],
+            set_={
+                "lote_id": stmt.excluded.lote_id,
+                "sq_candidato": stmt.excluded.sq_candidato,
+                "criterio": stmt.excluded.criterio,
+                "assinatura": stmt.excluded.assinatura,
+                "data_hora": stmt.excluded.data_hora,
+            },
+        )
+        conn.execute(stmt)
@@ -0,0 +1,192 @@
+from datetime import date, datetime
+
+import sqlalchemy as sa
+from sqlalchemy import Connection
+
+from database.engine import get_connection
+
+# Tamanhos de partição aceitos em info["partition"] das tabelas particionadas
+PARTITION_INTERVALS = ("year", "month")
+
+
+def partition_column(table: sa.Table) -> sa.Column | None:
+    """
+    Coluna de partição da tabela, ou None se a tabela não é particionada.
+    """
+    partition_by = table.dialect_options["postgresql"].get("partition_by")
+    if not partition_by:
+        return None
+    column_name = partition_by.split("(", 1)[1].rstrip(")").strip()
+    return table.c[column_name]
+
+
+def partition_interval(table: sa.Table) -> str:
+    interval = table.info.get("partition", "year")
+    if interval not in PARTITION_INTERVALS:
+        raise ValueError(
+            f"Intervalo de partição '{interval}' da tabela {table.name} inválido. Use um de {PARTITION_INTERVALS}."
+        )
+    return interval
+
+
+def partition_bounds(
+    table_name: str, value: date, interval: str
+) -> tuple[str, date, date]:
+    """
+    Partição que contém a data: nome, limite inferior (inclusivo) e limite superior (exclusivo).
+    Ex.: ('despesas', 2025-03-10, 'year') -> ('despesas_2025', 2025-01-01, 2026-01-01)
+    """
+    if isinstance(value, datetime):
+        value = value.date()
+
+    if interval == "year":
+        lower = date(value.year, 1, 1)
+        upper = date(value.year + 1, 1, 1)
+        return f"{table_name}_{value.year}", lower, upper
+
+    lower = date(value.year, value.month, 1)
+    upper = (
+        date(value.year + 1, 1, 1)
+        if value.month == 12
+        else date(value.year, value.month + 1, 1)
+    )
+    return f"{table_name}_{value.year}_{value.month:02d}", lower, upper
+
+
+def partition_start(table_name: str, partition_name: str) -> date | None:
+    """
+    Limite inferior de uma partição a partir do seu nome, ou None se o nome não segue o padrão de partition_bounds.
+    """
+    suffix = partition_name.removeprefix(f"{table_name}_").split("_")
+    try:
+        year = int(suffix[0])
+        month = int(suffix[1]) if len(suffix) > 1 else 1
+        return date(year, month, 1)
+    except (ValueError, IndexError):
+        return None
+
+
+def retention_start(retention: int, today: date | None = None) -> date | None:
+    """
+    Primeiro dia mantido nas tabelas particionadas com PARTITION_RETENTION = retention anos, contando o ano atual.
+    Retorna None quando não há retenção (retention = 0).
+    """
+    if retention <= 0:
+        return None
+    today = today or date.today()
+    return date(today.year - retention + 1, 1, 1)
+
+
+def list_partitions_db(conn: Connection, table: sa.Table) -> list[str]:
+    stmt = sa.text(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :table_name
+        ORDER BY child.relname
+        """
+    )
+    return list(conn.execute(stmt, {"table_name": table.name}).scalars())
+
+
+def create_partition_db(
+    conn: Connection, table: sa.Table, name: str, lower: date, upper: date
+):
+    # Os limites são datas geradas por partition_bounds, por isso podem ser escritos direto no DDL
+    conn.execute(
+        sa.text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table.name}" '
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+    )
+
+
+def attach_partition_db(
+    conn: Connection, table: sa.Table, name: str, lower: date, upper: date
+):
+    conn.execute(
+        sa.text(
+            f'ALTER TABLE "{table.name}" ATTACH PARTITION "{name}" '
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+    )
+
+
+def table_exists_db(conn: Connection, name: str) -> bool:
+    return bool(
+        conn.execute(
+            sa.text("SELECT to_regclass(:name) IS NOT NULL"), {"name": f'"{name}"'}
+        ).scalar()
+    )
+
+
+def ensure_partitions_db(
+    conn: Connection, table: sa.Table, source: sa.Table | None = None
+) -> list[str]:
+    """
+    Cria as partições que faltam para as datas presentes em source (por padrão, a própria tabela).
+    Uma partição desanexada por detach_partitions_db e mantida como tabela comum é anexada de novo, já que o
+    CREATE TABLE IF NOT EXISTS não faria nada e o INSERT falharia por não encontrar a partição da linha.
+    Chamada pela etapa de load com a tabela de staging, na mesma transação do upsert.
+    Retorna os nomes das partições criadas ou anexadas.
+    """
+    column = partition_column(table)
+    if column is None:
+        return []
+
+    interval = partition_interval(table)
+    source = table if source is None else source
+    source_column = source.c[column.name]
+
+    starts = conn.execute(
+        sa.select(sa.func.date_trunc(interval, source_column))
+        .where(source_column.is_not(None))
+        .distinct()
+    ).scalars()
+
+    existing = set(list_partitions_db(conn, table))
+    created = []
+    for start in starts:
+        name, lower, upper = partition_bounds(table.name, start, interval)
+        if name not in existing:
+            if table_exists_db(conn, name):
+                attach_partition_db(conn, table, name, lower, upper)
+            else:
+                create_partition_db(conn, table, name, lower, upper)
+            existing.add(name)
+            created.append(name)
+
+    return created
+
+
+def detach_partitions_db(
+    table: sa.Table, before: date, drop: bool = False
+) -> list[str]:
+    """
+    Desanexa da tabela as partições que terminam antes da data informada. A operação altera apenas o catálogo,
+    sem percorrer os dados. Com drop=True as partições desanexadas são apagadas, caso contrário continuam
+    disponíveis como tabelas comuns.
+    Retorna os nomes das partições desanexadas.
+    """
+    interval = partition_interval(table)
+    detached = []
+
+    with get_connection() as conn:
+        for name in list_partitions_db(conn, table):
+            start = partition_start(table.name, name)
+            if start is None:
+                continue
+            _, _, upper = partition_bounds(table.name, start, interval)
+            if upper > before:
+                continue
+
+            conn.execute(
+                sa.text(f'ALTER TABLE "{table.name}" DETACH PARTITION "{name}"')
+            )
+            if drop:
+                conn.execute(sa.text(f'DROP TABLE "{name}"'))
+            detached.append(name)
+
+    return detached
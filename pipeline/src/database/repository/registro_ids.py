@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from database.engine import get_connection
+from database.models.base import RegistroIds
+
+registro_ids = RegistroIds.__table__
+
+
+def get_registered_ids_db(task: str) -> dict[str, datetime]:
+    """
+    Busca no registro de IDs os IDs já baixados pela task, com a data do último download de cada um.
+    """
+    with get_connection() as conn:
+        stmt = select(
+            registro_ids.c.entidade_id, registro_ids.c.data_hora_baixado
+        ).where(registro_ids.c.task == task)
+        rows = conn.execute(stmt).fetchall()
+
+    return {row.entidade_id: row.data_hora_baixado for row in rows}
+
+
+def mark_ids_fetched_db(task: str, ids: list[str | int], lote_id: int):
+    """
+    Grava no registro de IDs a data de download dos IDs baixados pela task. IDs novos são incluídos no registro.
+    """
+    if not ids:
+        return
+
+    now = datetime.now(timezone.utc)
+
+    with get_connection() as conn:
+        stmt = insert(registro_ids).values(
+            [
+                {
+                    "lote_id": lote_id,
+                    "task": task,
+                    "entidade_id": str(id),
+                    "data_hora_baixado": now,
+                }
+                for id in ids
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["task", "entidade_id"],
+            set_={
+                "lote_id": stmt.excluded.lote_id,
+                "data_hora_baixado": stmt.excluded.data_hora_baixado,
+            },
+        )
+        conn.execute(stmt)
@@ -0,0 +1,76 @@
+from typing import Any
+
+from sqlalchemy import func, insert, update
+
+from database.engine import get_connection
+from database.models.base import TaskMetrics, TaskMetricsDB
+
+task_metrics = TaskMetrics.__table__
+
+
+def insert_task_metrics_db(metrics: TaskMetricsDB) -> int:
+    """
+    Insere as métricas de desempenho de uma Task Run na tabela task_metrics.
+    Retorna o Id do registro criado.
+    """
+    with get_connection() as conn:
+        stmt = (
+            insert(task_metrics)
+            .values(
+                lote_id=metrics.lote_id,
+                task=metrics.task,
+                task_run_id=metrics.task_run_id,
+                duracao=metrics.duracao,
+                urls_planejadas=metrics.urls_planejadas,
+                urls_baixadas=metrics.urls_baixadas,
+                urls_falhas=metrics.urls_falhas,
+                paginas=metrics.paginas,
+                registros=metrics.registros,
+                bytes=metrics.bytes,
+                novas_tentativas=metrics.novas_tentativas,
+                latencia_p50=metrics.latencia_p50,
+                latencia_p95=metrics.latencia_p95,
+                latencia_p99=metrics.latencia_p99,
+                pico_rss=metrics.pico_rss,
+            )
+            .returning(task_metrics.c.id)
+        )
+        metrics_id = conn.execute(stmt).scalar()
+
+        if not isinstance(metrics_id, int):
+            raise ValueError(
+                "Não foi retornado um Id válido da tabela task_metrics na inserção."
+            )
+
+    return metrics_id
+
+
+def add_task_output_db(
+    metrics_id: int, size: int, duration: float | None, peak_rss: int | None
+):
+    """
+    Soma o tamanho de um arquivo gravado pela Task Run ao registro de métricas da tentativa e atualiza a duração e o
+    pico de memória, que passam a incluir a gravação.
+    """
+    with get_connection() as conn:
+        stmt = (
+            update(task_metrics)
+            .where(task_metrics.c.id == metrics_id)
+            .values(
+                tamanho_saida=func.coalesce(task_metrics.c.tamanho_saida, 0) + size,
+                duracao=func.coalesce(duration, task_metrics.c.duracao),
+                pico_rss=func.coalesce(peak_rss, task_metrics.c.pico_rss),
+            )
+        )
+        conn.execute(stmt)
+
+
+def update_task_metrics_db(metrics_id: int, values: dict[str, Any]):
+    """
+    Atualiza colunas do registro de métricas da tentativa, como as preenchidas pelos instrumentos de diagnóstico.
+    """
+    with get_connection() as conn:
+        stmt = (
+            update(task_metrics).where(task_metrics.c.id == metrics_id).values(**values)
+        )
+        conn.execute(stmt)
@@ -1,9 +1,8 @@
 from datetime import date
 
 from prefect import flow, get_run_logger, task
-from prefect.runtime import flow_run
 
-from config.parameters import FlowsNames, TasksNames
+from config.parameters import TasksNames
 from tasks.extract.camara import (
     extract_assiduidade_camara,
     extract_autores_proposicoes_camara,
@@ -21,7 +20,6 @@ from tasks.extract.camara import (
     extract_votacoes_camara,
     extract_votos_votacoes_camara,
 )
-from utils.logs import save_logs
 
 
 @flow(
@@ -220,12 +218,6 @@ def camara_flow(
     for future in futures:
         future.result()
 
-    save_logs(
-        flow_run_name=FlowsNames.CAMARA.value,
-        flow_run_id=flow_run.id,
-        lote_id=lote_id,
-    )
-
     return
 
 
@@ -2,13 +2,14 @@ from datetime import date, datetime, timedelta
 
 from prefect import flow, get_run_logger
 from prefect.futures import resolve_futures_to_states
-from prefect.runtime import flow_run
 
 from config.loader import load_config
-from config.parameters import FlowsNames
+from config.parameters import FlowsNames, TasksNames
 from database.models.base import PipelineParams
 from database.repository.lote import end_lote_in_db, start_lote_in_db
-from utils.logs import save_logs
+from tasks.load import LOAD_DATASETS, load_dataset
+from tasks.transform.parlamentares import transform_parlamentares_tse
+from utils.logs import database_logging
 
 from .camara import run_camara_flow
 from .senado import run_senado_flow
@@ -69,37 +70,54 @@ def pipeline(
             message=message,
         ),
     )
-    logger.info(f"Lote {lote_id} iniciou.")
-
-    futures = []
-
-    if FlowsNames.TSE.value not in ignore_flows:
-        futures.append(
-            run_tse_flow.submit(start_date, refresh_cache, ignore_tasks, lote_id)
-        )
-
-    if FlowsNames.CAMARA.value not in ignore_flows:
-        futures.append(
-            run_camara_flow.submit(start_date, end_date, ignore_tasks, lote_id)
-        )
-
-    if FlowsNames.SENADO.value not in ignore_flows:
-        futures.append(
-            run_senado_flow.submit(start_date, end_date, ignore_tasks, lote_id)
+    # Os logs de todas as Flow Runs e Task Runs do lote são gravados no banco de dados enquanto executam
+    with database_logging(lote_id):
+        logger.info(f"Lote {lote_id} iniciou.")
+
+        futures = []
+
+        if FlowsNames.TSE.value not in ignore_flows:
+            futures.append(
+                run_tse_flow.submit(start_date, refresh_cache, ignore_tasks, lote_id)
+            )
+
+        if FlowsNames.CAMARA.value not in ignore_flows:
+            futures.append(
+                run_camara_flow.submit(start_date, end_date, ignore_tasks, lote_id)
+            )
+
+        if FlowsNames.SENADO.value not in ignore_flows:
+            futures.append(
+                run_senado_flow.submit(start_date, end_date, ignore_tasks, lote_id)
+            )
+
+        ## Bloquea a execução do código até que todos os flows sejam finalizados
+        states = resolve_futures_to_states(futures)
+
+        all_flows_ok = all(s.is_completed() for s in states)  # type:ignore
+
+        # Depende dos detalhes de deputados e senadores e dos candidatos do TSE, por isso roda após os flows
+        if TasksNames.TRANSFORM_PARLAMENTARES_TSE not in ignore_tasks:
+            transform_parlamentares_tse_f = transform_parlamentares_tse.submit(
+                start_date=start_date, lote_id=lote_id
+            )
+            transform_state = resolve_futures_to_states(
+                [transform_parlamentares_tse_f]
+            )[0]
+            all_flows_ok = transform_state.is_completed() and all_flows_ok  # type:ignore
+
+        # Carrega os arquivos da extração no banco de dados, um dataset por task
+        load_futures = [
+            load_dataset.submit(dataset=dataset, lote_id=lote_id)
+            for dataset, config in LOAD_DATASETS.items()
+            if config.task not in ignore_tasks
+        ]
+        all_flows_ok = (
+            all(s.is_completed() for s in resolve_futures_to_states(load_futures))  # type:ignore
+            and all_flows_ok
         )
 
-    ## Bloquea a execução do código até que todos os flows sejam finalizados
-    states = resolve_futures_to_states(futures)
-
-    all_flows_ok = all(s.is_completed() for s in states)  # type:ignore
-
-    lote_id_end = end_lote_in_db(lote_id, all_flows_ok)
-    logger.info(f"Lote {lote_id_end} finalizou com sucesso")
-
-    save_logs(
-        flow_run_name=FlowsNames.PIPELINE.value,
-        flow_run_id=flow_run.id,
-        lote_id=lote_id,
-    )
+        lote_id_end = end_lote_in_db(lote_id, all_flows_ok)
+        logger.info(f"Lote {lote_id_end} finalizou com sucesso")
 
     return
@@ -1,9 +1,8 @@
 from datetime import date
 
 from prefect import flow, get_run_logger, task
-from prefect.runtime import flow_run
 
-from config.parameters import FlowsNames, TasksNames
+from config.parameters import TasksNames
 from tasks.extract.senado import (
     extract_colegiados,
     extract_despesas_senado,
@@ -14,7 +13,6 @@ from tasks.extract.senado import (
     extract_senadores_senado,
     extract_votacoes_senado,
 )
-from utils.logs import save_logs
 
 
 @flow(
@@ -107,12 +105,6 @@ def senado_flow(start_date: date, end_date: date, ignore_tasks: list[str], lote_
     for future in futures:
         future.result()
 
-    save_logs(
-        flow_run_name=FlowsNames.SENADO.value,
-        flow_run_id=flow_run.id,
-        lote_id=lote_id,
-    )
-
     return
 
 
@@ -1,17 +1,17 @@
 from datetime import date
 
 from prefect import flow, get_run_logger, task
-from prefect.runtime import flow_run
 
-from config.parameters import FlowsNames, TasksNames
+from config.parameters import TasksNames
 from tasks.extract.tse import (
-    extract_candidatos,
-    extract_prestacao_contas,
-    extract_redes_sociais,
-    extract_votacao,
+    candidatos_archive,
+    extract_tse_archives,
+    prestacao_contas_archive,
+    redes_sociais_archive,
+    votacao_archive,
 )
+from tasks.transform.tse import transform_tse_parquet, transform_tse_votacao_agregada
 from utils.br_data import BR_UFS, get_election_years
-from utils.logs import save_logs
 
 
 @flow(
@@ -30,62 +30,75 @@ def tse_flow(
 
     futures = []
 
-    # EXTRACT CANDIDATOS
-    extract_candidatos_f = None
+    # Cada arquivo é identificado pelo dataset, ano e UF ("BRASIL" nos arquivos nacionais)
+    archives = []
+
+    # CANDIDATOS
     if TasksNames.EXTRACT_TSE_CANDIDATOS not in ignore_tasks:
-        extract_candidatos_f = [
-            extract_candidatos.with_options(refresh_cache=refresh_cache).submit(
-                year=year, lote_id=lote_id
-            )
+        archives.extend(
+            ("candidatos", year, "BRASIL", candidatos_archive(year))
             for year in elections_years
-        ]  # Retorna lista de futures, que quando resolvidos retorna lista de strings
-        futures.extend(extract_candidatos_f)
+        )
 
-    # EXTRACT PRESTAÇÃO DE CONTAS
-    extract_prestacao_contas_f = None
+    # PRESTAÇÃO DE CONTAS
     if TasksNames.EXTRACT_TSE_PRESTACAO_CONTAS not in ignore_tasks:
-        extract_prestacao_contas_f = [
-            extract_prestacao_contas.with_options(refresh_cache=refresh_cache).submit(
-                year=year, lote_id=lote_id
-            )
+        archives.extend(
+            ("prestacao_contas", year, "BRASIL", prestacao_contas_archive(year))
             for year in elections_years
-        ]
-        futures.extend(extract_prestacao_contas_f)
+        )
 
-    # EXTRACT REDES SOCIAIS
-    extract_redes_sociais_f = None
+    # REDES SOCIAIS
     if TasksNames.EXTRACT_TSE_REDES_SOCIAIS not in ignore_tasks:
-        extract_redes_sociais_f = [
-            extract_redes_sociais.with_options(refresh_cache=refresh_cache).submit(
-                year=year, uf=uf, lote_id=lote_id
-            )
+        archives.extend(
+            ("redes_sociais", year, uf, redes_sociais_archive(year, uf))
             for year in elections_years
             for uf in BR_UFS
             if not (uf == "DF" and year == 2018)
-        ]
-        futures.extend(extract_redes_sociais_f)
+        )
 
-    # EXTRACT VOTACAO
-    extract_votacao_f = None
+    # VOTACAO
     if TasksNames.EXTRACT_TSE_VOTACAO not in ignore_tasks:
-        extract_votacao_f = [
-            extract_votacao.with_options(refresh_cache=refresh_cache).submit(
-                year, lote_id
-            )
+        archives.extend(
+            ("votacao", year, "BRASIL", votacao_archive(year))
             for year in elections_years
-        ]
-        futures.extend(extract_votacao_f)
+        )
+
+    # EXTRACT
+    # Todos os arquivos são baixados em um único pool, com os maiores agendados primeiro
+    zip_paths = {}
+    if archives:
+        zip_paths = extract_tse_archives.submit(
+            archives=[job for *_, job in archives],
+            lote_id=lote_id,
+            force_download=refresh_cache,
+        ).result()
+
+    # TRANSFORM PARQUET
+    transform_votacao_f = {}
+    if TasksNames.TRANSFORM_TSE_PARQUET not in ignore_tasks:
+        for dataset, year, uf, job in archives:
+            transform_f = transform_tse_parquet.submit(
+                zip_path=zip_paths.get(job.url),
+                dataset=dataset,
+                year=year,
+                uf=uf,
+                force=refresh_cache,
+            )
+            futures.append(transform_f)
+            if dataset == "votacao":
+                transform_votacao_f[year] = transform_f
+
+    # TRANSFORM VOTAÇÃO AGREGADA
+    if TasksNames.TRANSFORM_TSE_VOTACAO_AGREGADA not in ignore_tasks:
+        for year, transform_f in transform_votacao_f.items():
+            futures.append(
+                transform_tse_votacao_agregada.submit(year=year, wait_for=[transform_f])
+            )
 
     # Results só é necessário para os úlitmos resultados das últimas tasks, que não são chamadas por nenhuma outra task, para finalizar o processo corretamente.
     for future in futures:
         future.result()
 
-    save_logs(
-        flow_run_name=FlowsNames.TSE.value,
-        flow_run_id=flow_run.id,
-        lote_id=lote_id,
-    )
-
     return
 
 
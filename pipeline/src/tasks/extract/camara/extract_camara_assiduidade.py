@@ -7,10 +7,12 @@ from prefect import get_run_logger, task
 from prefect.artifacts import acreate_table_artifact
 from selectolax.parser import HTMLParser
 
+from config.endpoints import CamaraEndpoints
 from config.loader import load_config
 from config.parameters import TasksNames
 from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
+from utils.instrumentation import instrumented
 from utils.io import fetch_html_many_async, save_ndjson
 
 APP_SETTINGS = load_config()
@@ -29,9 +31,7 @@ def assiduidade_urls(
 
     for id in deputados_ids:
         for year in range(start_date.year, end_date.year + 1):
-            urls.add(
-                f"{APP_SETTINGS.CAMARA.PORTAL_BASE_URL}deputados/{id}/presenca-plenario/{year}"
-            )
+            urls.add(CamaraEndpoints.PRESENCA_PLENARIO.url(id=id, ano=year))
 
     return UrlsResult(
         urls_to_download=list(urls), not_downloaded_urls=not_downloaded_urls
@@ -44,6 +44,7 @@ def assiduidade_urls(
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.CAMARA.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_CAMARA_ASSIDUIDADE)
 async def extract_assiduidade_camara(
     deputados_ids: list[int],
     start_date: date,
@@ -4,11 +4,13 @@ from typing import cast
 from prefect import get_run_logger, task
 from prefect.artifacts import acreate_table_artifact
 
+from config.endpoints import CamaraEndpoints
 from config.loader import load_config
 from config.parameters import TasksNames
 from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
 from utils.fetch_many_jsons import fetch_many_jsons
+from utils.instrumentation import instrumented
 from utils.io import save_ndjson
 
 APP_SETTINGS = load_config()
@@ -24,7 +26,7 @@ def autores_proposicoes_urls(proposicoes_ids: list[int]) -> UrlsResult:
         urls.update([error.url for error in not_downloaded_urls])
 
     for id in proposicoes_ids:
-        urls.add(f"https://dadosabertos.camara.leg.br/api/v2/proposicoes/{id}/autores")
+        urls.add(CamaraEndpoints.AUTORES_PROPOSICAO.url(id=id))
 
     return UrlsResult(
         urls_to_download=list(urls), not_downloaded_urls=not_downloaded_urls
@@ -37,6 +39,7 @@ def autores_proposicoes_urls(proposicoes_ids: list[int]) -> UrlsResult:
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.CAMARA.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_CAMARA_AUTORES_PROPOSICOES)
 async def extract_autores_proposicoes_camara(
     proposicoes_ids: list[int],
     lote_id: int,
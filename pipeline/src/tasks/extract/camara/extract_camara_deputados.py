@@ -4,8 +4,11 @@ from typing import cast
 from prefect import get_run_logger, task
 from prefect.artifacts import create_table_artifact
 
+from config.endpoints import CamaraEndpoints
 from config.loader import load_config
 from config.parameters import TasksNames
+from utils.artifact_aggregates import ArtifactAggregates, Collect, Each
+from utils.instrumentation import instrumented
 from utils.io import fetch_json, save_json
 
 APP_SETTINGS = load_config()
@@ -13,9 +16,7 @@ APP_SETTINGS = load_config()
 
 def deputados_url(legislatura: dict) -> str:
     id_legislatura = legislatura.get("dados", [])[0].get("id")
-    return (
-        f"{APP_SETTINGS.CAMARA.REST_BASE_URL}deputados?idLegislatura={id_legislatura}"
-    )
+    return CamaraEndpoints.DEPUTADOS.url(idLegislatura=id_legislatura)
 
 
 @task(
@@ -24,6 +25,7 @@ def deputados_url(legislatura: dict) -> str:
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.CAMARA.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_CAMARA_DEPUTADOS)
 def extract_deputados_camara(
     legislatura: dict,
     lote_id: int,
@@ -33,12 +35,17 @@ def extract_deputados_camara(
     url = deputados_url(legislatura)
     dest = Path(out_dir) / "deputados.json"
     logger.info(f"Câmara: buscando Deputados de {url} -> {dest}")
-    json = fetch_json(url=url, max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES)
+    json = fetch_json(
+        url=url,
+        lote_id=lote_id,
+        task=TasksNames.EXTRACT_CAMARA_DEPUTADOS,
+        max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
+    )
     json = cast(dict, json)
 
     create_table_artifact(
         key="deputados",
-        table=generate_artifact(json),
+        table=artifact_aggregates().feed_many([json]).table(),
         description="Deputados em uma Legislatura",
     )
 
@@ -51,16 +58,20 @@ def extract_deputados_camara(
     return list(ids_deputados)
 
 
-def generate_artifact(json: dict):
-    artifact_data = []
-    for i, deputado in enumerate(json.get("dados", [])):
-        artifact_data.append(
-            {
-                "index": i,
-                "id": deputado.get("id"),
-                "nome": deputado.get("nome"),
-                "partido": deputado.get("siglaPartido"),
-                "uf": deputado.get("siglaUf"),
-            }
-        )
-    return artifact_data
+def artifact_aggregates() -> ArtifactAggregates:
+    return ArtifactAggregates(
+        table=lambda a: [
+            {"index": i, **row} for i, row in enumerate(a["deputados"].value)
+        ],
+        deputados=Each(
+            lambda json: json.get("dados", []),
+            Collect(
+                lambda deputado: {
+                    "id": deputado.get("id"),
+                    "nome": deputado.get("nome"),
+                    "partido": deputado.get("siglaPartido"),
+                    "uf": deputado.get("siglaUf"),
+                }
+            ),
+        ),
+    )
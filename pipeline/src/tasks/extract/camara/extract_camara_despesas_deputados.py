@@ -5,12 +5,14 @@ from typing import cast
 from prefect import get_run_logger, task
 from prefect.artifacts import acreate_table_artifact
 
+from config.endpoints import CamaraEndpoints, CamaraRecordFields
 from config.loader import load_config
 from config.parameters import TasksNames
 from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
+from utils.camara import save_camara_pages
 from utils.fetch_many_jsons import fetch_many_jsons
-from utils.io import save_ndjson
+from utils.instrumentation import instrumented
 
 APP_SETTINGS = load_config()
 
@@ -48,8 +50,7 @@ def urls_despesas(
             # Full year range
             for year in range(adjusted_start.year, end_date.year + 1):
                 urls.add(
-                    f"{APP_SETTINGS.CAMARA.REST_BASE_URL}/deputados/{id_deputado}/despesas?"
-                    f"ano={year}&ordem=ASC&ordenarPor=dataDocumento&itens=100"
+                    CamaraEndpoints.DESPESAS_DEPUTADO.url(id=id_deputado, ano=year)
                 )
             continue
         # If start and end are in different years
@@ -58,8 +59,9 @@ def urls_despesas(
             current = adjusted_start
             while current.year == adjusted_start.year:
                 urls.add(
-                    f"{APP_SETTINGS.CAMARA.REST_BASE_URL}/deputados/{id_deputado}/despesas?"
-                    f"ano={current.year}&mes={current.month}&ordem=ASC&ordenarPor=dataDocumento&itens=100"
+                    CamaraEndpoints.DESPESAS_DEPUTADO.url(
+                        id=id_deputado, ano=current.year, mes=current.month
+                    )
                 )
                 if current.month == 12:
                     break
@@ -67,15 +69,15 @@ def urls_despesas(
             # Add full years in between (if any)
             for year in range(adjusted_start.year + 1, end_date.year):
                 urls.add(
-                    f"{APP_SETTINGS.CAMARA.REST_BASE_URL}/deputados/{id_deputado}/despesas?"
-                    f"ano={year}&ordem=ASC&ordenarPor=dataDocumento&itens=100"
+                    CamaraEndpoints.DESPESAS_DEPUTADO.url(id=id_deputado, ano=year)
                 )
             # Add months from start of end_date's year to end_date
             current = date(end_date.year, 1, 1)
             while current <= end_date:
                 urls.add(
-                    f"{APP_SETTINGS.CAMARA.REST_BASE_URL}/deputados/{id_deputado}/despesas?"
-                    f"ano={current.year}&mes={current.month}&ordem=ASC&ordenarPor=dataDocumento&itens=100"
+                    CamaraEndpoints.DESPESAS_DEPUTADO.url(
+                        id=id_deputado, ano=current.year, mes=current.month
+                    )
                 )
                 if current.month == 12:
                     break
@@ -85,8 +87,9 @@ def urls_despesas(
             current = adjusted_start
             while current <= end_date:
                 urls.add(
-                    f"{APP_SETTINGS.CAMARA.REST_BASE_URL}/deputados/{id_deputado}/despesas?"
-                    f"ano={current.year}&mes={current.month}&ordem=ASC&ordenarPor=dataDocumento&itens=100"
+                    CamaraEndpoints.DESPESAS_DEPUTADO.url(
+                        id=id_deputado, ano=current.year, mes=current.month
+                    )
                 )
                 if current.month == 12:
                     break
@@ -103,6 +106,7 @@ def urls_despesas(
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.CAMARA.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_CAMARA_DESPESAS_DEPUTADOS)
 async def extract_despesas_camara(
     deputados_ids: list[int],
     start_date: date,
@@ -137,4 +141,6 @@ async def extract_despesas_camara(
     )
 
     dest = Path(out_dir) / "despesas.ndjson"
-    return save_ndjson(cast(list[dict], jsons), dest)
+    return save_camara_pages(
+        cast(list[dict], jsons), dest, lote_id, CamaraRecordFields.DESPESAS_DEPUTADO
+    )
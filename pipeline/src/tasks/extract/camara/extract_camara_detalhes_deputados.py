@@ -1,14 +1,19 @@
 from pathlib import Path
-from typing import Any, cast
+from typing import cast
 
 from prefect import get_run_logger, task
 from prefect.artifacts import acreate_table_artifact
 
+from config.endpoints import CamaraEndpoints
 from config.loader import load_config
 from config.parameters import TasksNames
 from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
+from database.repository.registro_ids import mark_ids_fetched_db
+from utils.artifact_aggregates import ArtifactAggregates, Collect
+from utils.delta_ids import delta_ids
 from utils.fetch_many_jsons import fetch_many_jsons
+from utils.instrumentation import instrumented
 from utils.io import save_ndjson
 
 APP_SETTINGS = load_config()
@@ -24,7 +29,7 @@ def detalhes_deputados_urls(deputados_ids: list[int]) -> UrlsResult:
         urls.update([error.url for error in not_downloaded_urls])
 
     for id in deputados_ids:
-        urls.add(f"{APP_SETTINGS.CAMARA.REST_BASE_URL}deputados/{id}")
+        urls.add(CamaraEndpoints.DETALHES_DEPUTADO.url(id=id))
 
     return UrlsResult(
         urls_to_download=list(urls), not_downloaded_urls=not_downloaded_urls
@@ -37,6 +42,7 @@ def detalhes_deputados_urls(deputados_ids: list[int]) -> UrlsResult:
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.CAMARA.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_CAMARA_DETALHES_DEPUTADOS)
 async def extract_detalhes_deputados_camara(
     deputados_ids: list[int],
     lote_id: int,
@@ -44,9 +50,13 @@ async def extract_detalhes_deputados_camara(
 ) -> str:
     logger = get_run_logger()
 
-    urls = detalhes_deputados_urls(deputados_ids)
+    delta = delta_ids(TasksNames.EXTRACT_CAMARA_DETALHES_DEPUTADOS, deputados_ids)
+    logger.info(f"Câmara: detalhes de deputados, {delta.describe()}")
+
+    urls = detalhes_deputados_urls(delta.ids)
     logger.info(f"Câmara: baixando dados de {len(urls)} Deputado")
 
+    aggregates = artifact_aggregates()
     jsons = await fetch_many_jsons(
         urls=urls["urls_to_download"],
         not_downloaded_urls=urls["not_downloaded_urls"],
@@ -56,11 +66,17 @@ async def extract_detalhes_deputados_camara(
         validate_results=True,
         task=TasksNames.EXTRACT_CAMARA_DETALHES_DEPUTADOS,
         lote_id=lote_id,
+        aggregates=aggregates,
+    )
+
+    # As URLs que falharem ficam em erros_extract e são baixadas de novo no próximo lote
+    mark_ids_fetched_db(
+        TasksNames.EXTRACT_CAMARA_DETALHES_DEPUTADOS, delta.ids, lote_id
     )
 
     await acreate_table_artifact(
         key="detalhes-deputados",
-        table=generate_artifact(jsons),
+        table=aggregates.table(),
         description="Detalhes de deputados",
     )
 
@@ -68,20 +84,21 @@ async def extract_detalhes_deputados_camara(
     return save_ndjson(cast(list[dict], jsons), dest)
 
 
-def generate_artifact(jsons: Any):
-    artifact_data = []
-    for i, json in enumerate(jsons):
-        json = cast(dict, json)
-        deputado = json.get("dados", [])  # type: ignore
-        artifact_data.append(
-            {
-                "index": i,
-                "id": deputado.get("id", None),
-                "nome": deputado.get("ultimoStatus", {}).get("nome", None),
-                "situacao": deputado.get("ultimoStatus", {}).get("situacao", None),
-                "condicao_eleitoral": deputado.get("ultimoStatus", {}).get(
-                    "condicaoEleitoral", None
-                ),
-            }
-        )
-    return artifact_data
+def artifact_aggregates() -> ArtifactAggregates:
+    return ArtifactAggregates(
+        table=lambda a: [
+            {"index": i, **row} for i, row in enumerate(a["deputados"].value)
+        ],
+        deputados=Collect(detalhes_deputado),
+    )
+
+
+def detalhes_deputado(json: dict) -> dict:
+    deputado = json.get("dados", {})
+    ultimo_status = deputado.get("ultimoStatus", {})
+    return {
+        "id": deputado.get("id", None),
+        "nome": ultimo_status.get("nome", None),
+        "situacao": ultimo_status.get("situacao", None),
+        "condicao_eleitoral": ultimo_status.get("condicaoEleitoral", None),
+    }
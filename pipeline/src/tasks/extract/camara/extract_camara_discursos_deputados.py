@@ -1,16 +1,19 @@
 from datetime import date, timedelta
 from pathlib import Path
-from typing import Any, cast
+from typing import cast
 
 from prefect import get_run_logger, task
 from prefect.artifacts import acreate_table_artifact
 
+from config.endpoints import CamaraEndpoints, CamaraRecordFields
 from config.loader import load_config
 from config.parameters import TasksNames
 from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
+from utils.artifact_aggregates import ArtifactAggregates, GroupCount
+from utils.camara import save_camara_pages
 from utils.fetch_many_jsons import fetch_many_jsons
-from utils.io import save_ndjson
+from utils.instrumentation import instrumented
 from utils.url_utils import get_path_parameter_value
 
 APP_SETTINGS = load_config()
@@ -32,7 +35,9 @@ def urls_discursos(
 
     for id in deputados_ids:
         urls.add(
-            f"{APP_SETTINGS.CAMARA.REST_BASE_URL}deputados/{id}/discursos?dataInicio={one_month_back}&dataFim={end_date}&itens=100"
+            CamaraEndpoints.DISCURSOS_DEPUTADO.url(
+                id=id, dataInicio=one_month_back, dataFim=end_date
+            )
         )
 
     return UrlsResult(
@@ -46,6 +51,7 @@ def urls_discursos(
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.CAMARA.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_CAMARA_DISCURSOS_DEPUTADOS)
 async def extract_discursos_deputados_camara(
     deputados_ids: list[int],
     start_date: date,
@@ -58,6 +64,7 @@ async def extract_discursos_deputados_camara(
     urls = urls_discursos(deputados_ids, start_date, end_date)
     logger.info(f"Câmara: buscando discursos de {len(urls)} deputados")
 
+    aggregates = artifact_aggregates()
     jsons = await fetch_many_jsons(
         urls=urls["urls_to_download"],
         not_downloaded_urls=urls["not_downloaded_urls"],
@@ -67,37 +74,36 @@ async def extract_discursos_deputados_camara(
         validate_results=True,
         task=TasksNames.EXTRACT_CAMARA_DISCURSOS_DEPUTADOS,
         lote_id=lote_id,
+        aggregates=aggregates,
     )
 
     await acreate_table_artifact(
         key="discursos-deputados",
-        table=generate_artifact(jsons),
+        table=aggregates.table(),
         description="Discursos de deputados",
     )
 
     dest = Path(out_dir) / "discursos.ndjson"
-    return save_ndjson(cast(list[dict], jsons), dest)
-
+    return save_camara_pages(
+        cast(list[dict], jsons), dest, lote_id, CamaraRecordFields.DISCURSOS_DEPUTADO
+    )
 
-def generate_artifact(jsons: Any):
-    artifact_data = []
-    for i, json in enumerate(jsons):
-        json = cast(dict, json)
-        discursos = json.get("dados", [])  # type: ignore
-        links = {link["rel"]: link["href"] for link in json["links"]}
 
-        # Pegando o id do deputado
-        deputado_id = get_path_parameter_value(
-            url=links.get("self", ""), param_name="deputados"
-        )
+def artifact_aggregates() -> ArtifactAggregates:
+    """
+    Número de discursos de cada deputado. Os discursos de um deputado podem vir em várias páginas.
+    """
+    return ArtifactAggregates(
+        table=lambda a: [
+            {"index": i, "id": id, "num_discursos": n}
+            for i, (id, n) in enumerate(a["discursos"].value.items())
+        ],
+        discursos=GroupCount(
+            key=deputado_id, weight=lambda page: len(page.get("dados", []))
+        ),
+    )
 
-        # Aqui next é usado pois não precisa varrer a lista inteira, ele para no primeiro que encontrar
-        row = next((row for row in artifact_data if row["id"] == deputado_id), None)
 
-        if row:  # Se já tiver um registro, atualiza o número de discursos
-            row["num_discursos"] += len(discursos)
-        else:  # Se não, cria novo registro
-            artifact_data.append(
-                {"index": i, "id": deputado_id, "num_discursos": len(discursos)}
-            )
-    return artifact_data
+def deputado_id(page: dict) -> str | None:
+    links = {link["rel"]: link["href"] for link in page["links"]}
+    return get_path_parameter_value(url=links.get("self", ""), param_name="deputados")
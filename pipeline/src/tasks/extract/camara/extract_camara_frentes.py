@@ -4,16 +4,18 @@ from typing import cast
 from prefect import get_run_logger, task
 from prefect.artifacts import acreate_table_artifact
 
+from config.endpoints import CamaraEndpoints, CamaraRecordFields
 from config.loader import load_config
 from config.parameters import TasksNames
+from utils.camara import save_camara_pages
 from utils.fetch_many_jsons import fetch_many_jsons
-from utils.io import save_ndjson
+from utils.instrumentation import instrumented
 
 APP_SETTINGS = load_config()
 
 
 def frentes_url(id_legislatura: int) -> str:
-    return f"{APP_SETTINGS.CAMARA.REST_BASE_URL}/frentes?idLegislatura={id_legislatura}"
+    return CamaraEndpoints.FRENTES.url(idLegislatura=id_legislatura)
 
 
 @task(
@@ -22,6 +24,7 @@ def frentes_url(id_legislatura: int) -> str:
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.CAMARA.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_CAMARA_FRENTES)
 async def extract_frentes_camara(
     legislatura: dict,
     lote_id: int,
@@ -47,7 +50,7 @@ async def extract_frentes_camara(
     )
     jsons = cast(list[dict], jsons)
 
-    save_ndjson(jsons, dest)
+    save_camara_pages(jsons, dest, lote_id, CamaraRecordFields.FRENTES)
 
     # Retornando ids das frentes
     frentes_ids = []
@@ -1,15 +1,20 @@
 from pathlib import Path
-from typing import Any, cast
+from typing import cast
 
 from prefect import get_run_logger, task
 from prefect.artifacts import acreate_table_artifact
 
+from config.endpoints import CamaraEndpoints, CamaraRecordFields
 from config.loader import load_config
 from config.parameters import TasksNames
 from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
+from database.repository.registro_ids import mark_ids_fetched_db
+from utils.artifact_aggregates import ArtifactAggregates, GroupCount
+from utils.camara import save_camara_pages
+from utils.delta_ids import delta_ids
 from utils.fetch_many_jsons import fetch_many_jsons
-from utils.io import save_ndjson
+from utils.instrumentation import instrumented
 
 APP_SETTINGS = load_config()
 
@@ -24,7 +29,7 @@ def frentes_membros_urls(frentes_ids: list[str]) -> UrlsResult:
         urls.update([error.url for error in not_downloaded_urls])
 
     for id in frentes_ids:
-        urls.add(f"{APP_SETTINGS.CAMARA.REST_BASE_URL}frentes/{id}/membros")
+        urls.add(CamaraEndpoints.MEMBROS_FRENTE.url(id=id))
 
     return UrlsResult(
         urls_to_download=list(urls), not_downloaded_urls=not_downloaded_urls
@@ -37,6 +42,7 @@ def frentes_membros_urls(frentes_ids: list[str]) -> UrlsResult:
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.CAMARA.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_CAMARA_FRENTES_MEMBROS)
 async def extract_frentes_membros_camara(
     frentes_ids: list[str],
     lote_id: int,
@@ -44,9 +50,13 @@ async def extract_frentes_membros_camara(
 ) -> str:
     logger = get_run_logger()
 
-    urls = frentes_membros_urls(frentes_ids)
+    delta = delta_ids(TasksNames.EXTRACT_CAMARA_FRENTES_MEMBROS, frentes_ids)
+    logger.info(f"Câmara: membros de frentes, {delta.describe()}")
+
+    urls = frentes_membros_urls(delta.ids)
     logger.info(f"Câmara: buscando Membros de {len(urls)} Frentes")
 
+    aggregates = artifact_aggregates()
     jsons = await fetch_many_jsons(
         urls=urls["urls_to_download"],
         not_downloaded_urls=urls["not_downloaded_urls"],
@@ -56,28 +66,41 @@ async def extract_frentes_membros_camara(
         validate_results=True,
         task=TasksNames.EXTRACT_CAMARA_FRENTES_MEMBROS,
         lote_id=lote_id,
+        aggregates=aggregates,
     )
 
+    # As URLs que falharem ficam em erros_extract e são baixadas de novo no próximo lote
+    mark_ids_fetched_db(TasksNames.EXTRACT_CAMARA_FRENTES_MEMBROS, delta.ids, lote_id)
+
     await acreate_table_artifact(
         key="frentes-membros",
-        table=generate_artifact(jsons),
+        table=aggregates.table(),
         description="Total de membros encontrados nas frentes.",
     )
 
     dest = Path(out_dir) / "frentes_membros.ndjson"
-    return save_ndjson(cast(list[dict], jsons), dest)
-
-
-def generate_artifact(jsons: Any):
-    artifact_data = []
-    for i, json in enumerate(jsons):
-        json = cast(dict, json)
-        link_self = next(
-            link["href"] for link in json.get("links", []) if link.get("rel") == "self"
-        )
-        id_frente = link_self.split("/")[-2]
-        membros = json.get("dados", [])  # type: ignore
-        artifact_data.append(
-            {"index": i, "id_frente": id_frente, "numero_membros": len(membros)}
-        )
-    return artifact_data
+    return save_camara_pages(
+        cast(list[dict], jsons), dest, lote_id, CamaraRecordFields.MEMBROS_FRENTE
+    )
+
+
+def artifact_aggregates() -> ArtifactAggregates:
+    """
+    Número de membros de cada frente. Os membros de uma frente podem vir em várias páginas.
+    """
+    return ArtifactAggregates(
+        table=lambda a: [
+            {"index": i, "id_frente": id, "numero_membros": n}
+            for i, (id, n) in enumerate(a["membros"].value.items())
+        ],
+        membros=GroupCount(
+            key=frente_id, weight=lambda page: len(page.get("dados", []))
+        ),
+    )
+
+
+def frente_id(page: dict) -> str:
+    link_self = next(
+        link["href"] for link in page.get("links", []) if link.get("rel") == "self"
+    )
+    return link_self.split("/")[-2]
@@ -5,8 +5,10 @@ from typing import cast
 from prefect import get_run_logger, task
 from prefect.artifacts import create_table_artifact
 
+from config.endpoints import CamaraEndpoints
 from config.loader import load_config
 from config.parameters import TasksNames
+from utils.instrumentation import instrumented
 from utils.io import fetch_json, save_json
 
 APP_SETTINGS = load_config()
@@ -18,6 +20,7 @@ APP_SETTINGS = load_config()
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.CAMARA.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_CAMARA_LEGISLATURA)
 def extract_legislatura(
     start_date: date,
     lote_id: int,
@@ -25,16 +28,17 @@ def extract_legislatura(
 ) -> dict:
     logger = get_run_logger()
 
-    LEGISLATURA_URL = (
-        f"{APP_SETTINGS.CAMARA.REST_BASE_URL}legislaturas?data={start_date}"
-    )
+    LEGISLATURA_URL = CamaraEndpoints.LEGISLATURAS.url(data=start_date)
 
     logger.info(f"CÂMARA: Baixando Legislatura atual de {LEGISLATURA_URL} -> {out_dir}")
 
     dest = Path(out_dir) / "legislatura.json"
 
     json = fetch_json(
-        url=LEGISLATURA_URL, max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES
+        url=LEGISLATURA_URL,
+        lote_id=lote_id,
+        task=TasksNames.EXTRACT_CAMARA_LEGISLATURA,
+        max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
     )
     json = cast(dict, json)
 
@@ -1,14 +1,17 @@
 from datetime import date
 from pathlib import Path
-from typing import Any, cast
+from typing import cast
 
 from prefect import get_run_logger, task
 from prefect.artifacts import acreate_table_artifact
 
+from config.endpoints import CamaraEndpoints, CamaraRecordFields
 from config.loader import load_config
 from config.parameters import TasksNames
+from utils.artifact_aggregates import ArtifactAggregates, Distinct, Each, Sum
+from utils.camara import save_camara_pages
 from utils.fetch_many_jsons import fetch_many_jsons
-from utils.io import save_ndjson
+from utils.instrumentation import instrumented
 
 APP_SETTINGS = load_config()
 
@@ -19,6 +22,7 @@ APP_SETTINGS = load_config()
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.CAMARA.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_CAMARA_PROPOSICOES)
 async def extract_proposicoes_camara(
     start_date: date,
     end_date: date,
@@ -27,10 +31,11 @@ async def extract_proposicoes_camara(
 ) -> list[int]:
     logger = get_run_logger()
 
-    url = f"{APP_SETTINGS.CAMARA.REST_BASE_URL}proposicoes?dataInicio={start_date}&dataFim={end_date}&itens=100&ordem=ASC&ordenarPor=id"
+    url = CamaraEndpoints.PROPOSICOES.url(dataInicio=start_date, dataFim=end_date)
 
     logger.info("Buscando proposições da Câmara.")
 
+    aggregates = artifact_aggregates()
     jsons = await fetch_many_jsons(
         urls=[url],
         not_downloaded_urls=[],
@@ -40,26 +45,32 @@ async def extract_proposicoes_camara(
         validate_results=True,
         task=TasksNames.EXTRACT_CAMARA_PROPOSICOES,
         lote_id=lote_id,
+        aggregates=aggregates,
     )
 
     dest = Path(out_dir) / "proposicoes.ndjson"
-    save_ndjson(cast(list[dict], jsons), dest)
+    save_camara_pages(
+        cast(list[dict], jsons), dest, lote_id, CamaraRecordFields.PROPOSICOES
+    )
 
     await acreate_table_artifact(
         key="proposicoes-camara",
-        table=[generate_artifact(jsons)],
+        table=aggregates.table(),
         description="Proposições da Câmara",
     )
 
     # OBS: ao atualizar os dados no final do dia, é possível que no meio do caminho novos dados sejam inseridos na API, o que tornará a comparação errônea pois terão mais dados sendo baixados que os contabilizados inicialmente.
-    ids_proposicoes = {int(p.get("id")) for j in jsons for p in j.get("dados", [])}  # type: ignore
+    ids_proposicoes = aggregates["ids"].aggregator.keys
 
     return list(ids_proposicoes)
 
 
-def generate_artifact(jsons: Any) -> dict:
-    total_proposicoes = 0
-    for j in jsons:
-        downloaded_proposicoes = len(j.get("dados", []))
-        total_proposicoes += downloaded_proposicoes
-    return {"total_proposicoes": total_proposicoes}
+def artifact_aggregates() -> ArtifactAggregates:
+    """
+    Total de proposições baixadas e os seus ids distintos, usados pelas tasks seguintes.
+    """
+    return ArtifactAggregates(
+        table=lambda a: [{"total_proposicoes": a["total"].value}],
+        total=Sum(lambda j: len(j.get("dados", []))),
+        ids=Each(lambda j: j.get("dados", []), Distinct(lambda p: int(p.get("id")))),
+    )
@@ -1,14 +1,17 @@
 from datetime import date, timedelta
 from pathlib import Path
-from typing import Any, cast
+from typing import cast
 
 from prefect import get_run_logger, task
 from prefect.artifacts import acreate_table_artifact
 
+from config.endpoints import CamaraEndpoints, CamaraRecordFields
 from config.loader import load_config
 from config.parameters import TasksNames
+from utils.artifact_aggregates import ArtifactAggregates, Distinct, Each, Sum
+from utils.camara import save_camara_pages
 from utils.fetch_many_jsons import fetch_many_jsons
-from utils.io import save_ndjson
+from utils.instrumentation import instrumented
 
 APP_SETTINGS = load_config()
 
@@ -29,7 +32,7 @@ def generate_urls(start_date: date, end_date: date) -> list[str]:
             current_end = date(current_start.year, 12, 31)
 
         urls.append(
-            f"{APP_SETTINGS.CAMARA.REST_BASE_URL}/votacoes?dataInicio={current_start}&dataFim={current_end}&itens=100"
+            CamaraEndpoints.VOTACOES.url(dataInicio=current_start, dataFim=current_end)
         )
 
         current_start = current_end + timedelta(days=1)
@@ -43,6 +46,7 @@ def generate_urls(start_date: date, end_date: date) -> list[str]:
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.CAMARA.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_CAMARA_VOTACOES)
 async def extract_votacoes_camara(
     start_date: date,
     end_date: date,
@@ -55,6 +59,7 @@ async def extract_votacoes_camara(
 
     logger.info(f"Baixando dados de {len(urls)} URLs")
 
+    aggregates = artifact_aggregates()
     jsons = await fetch_many_jsons(
         urls=urls,
         not_downloaded_urls=[],
@@ -64,25 +69,31 @@ async def extract_votacoes_camara(
         validate_results=True,
         task=TasksNames.EXTRACT_CAMARA_VOTACOES,
         lote_id=lote_id,
+        aggregates=aggregates,
     )
 
     dest = Path(out_dir) / "votacoes.ndjson"
-    save_ndjson(cast(list[dict], jsons), dest)
+    save_camara_pages(
+        cast(list[dict], jsons), dest, lote_id, CamaraRecordFields.VOTACOES
+    )
 
     await acreate_table_artifact(
         key="votacoes-camara",
-        table=[generate_artifact(jsons)],
+        table=aggregates.table(),
         description="Votações da Câmara",
     )
 
-    ids_votacoes = {str(p.get("id")) for j in jsons for p in j.get("dados", [])}  # type: ignore
+    ids_votacoes = aggregates["ids"].aggregator.keys
 
     return list(ids_votacoes)
 
 
-def generate_artifact(jsons: Any) -> dict:
-    total_votacoes = 0
-    for j in jsons:
-        downloaded_votacoes = len(j.get("dados", []))
-        total_votacoes += downloaded_votacoes
-    return {"total_proposicoes": total_votacoes}
+def artifact_aggregates() -> ArtifactAggregates:
+    """
+    Total de votações baixadas e os seus ids distintos, usados pelas tasks seguintes.
+    """
+    return ArtifactAggregates(
+        table=lambda a: [{"total_proposicoes": a["total"].value}],
+        total=Sum(lambda j: len(j.get("dados", []))),
+        ids=Each(lambda j: j.get("dados", []), Distinct(lambda p: str(p.get("id")))),
+    )
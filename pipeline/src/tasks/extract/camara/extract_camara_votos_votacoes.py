@@ -1,14 +1,17 @@
 from pathlib import Path
-from typing import Any, cast
+from typing import cast
 
 from prefect import get_run_logger, task
 from prefect.artifacts import acreate_table_artifact
 
+from config.endpoints import CamaraEndpoints
 from config.loader import load_config
 from config.parameters import TasksNames
 from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
+from utils.artifact_aggregates import ArtifactAggregates, Count
 from utils.fetch_many_jsons import fetch_many_jsons
+from utils.instrumentation import instrumented
 from utils.io import save_ndjson
 
 APP_SETTINGS = load_config()
@@ -24,7 +27,7 @@ def votos_votacoes_urls(votacoes_ids: list[str]) -> UrlsResult:
         urls.update([error.url for error in not_downloaded_urls])
 
     for id in votacoes_ids:
-        urls.add(f"{APP_SETTINGS.CAMARA.REST_BASE_URL}votacoes/{id}/votos")
+        urls.add(CamaraEndpoints.VOTOS_VOTACAO.url(id=id))
 
     return UrlsResult(
         urls_to_download=list(urls), not_downloaded_urls=not_downloaded_urls
@@ -37,6 +40,7 @@ def votos_votacoes_urls(votacoes_ids: list[str]) -> UrlsResult:
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.CAMARA.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_CAMARA_VOTOS_VOTACOES)
 async def extract_votos_votacoes_camara(
     votacoes_ids: list[str],
     lote_id: int,
@@ -48,6 +52,7 @@ async def extract_votos_votacoes_camara(
 
     logger.info(f"Baixando votos de votações da Câmara de {len(urls)} URLs")
 
+    aggregates = artifact_aggregates()
     jsons = await fetch_many_jsons(
         urls=urls["urls_to_download"],
         not_downloaded_urls=urls["not_downloaded_urls"],
@@ -56,11 +61,12 @@ async def extract_votos_votacoes_camara(
         validate_results=True,
         task=TasksNames.EXTRACT_CAMARA_VOTOS_VOTACOES,
         lote_id=lote_id,
+        aggregates=aggregates,
     )
 
     await acreate_table_artifact(
         key="votos-votacoes-camara",
-        table=generate_artifact(jsons),
+        table=aggregates.table(),
         description="Votos Votações da Câmara",
     )
 
@@ -69,9 +75,13 @@ async def extract_votos_votacoes_camara(
     return save_ndjson(cast(list[dict], jsons), dest)
 
 
-def generate_artifact(jsons: Any):
-    num_votacoes_votos = 0
-    for j in jsons:
-        if j.get("dados", []):
-            num_votacoes_votos += 1
-    return [{"total_votacoes_com_votos": f"{num_votacoes_votos}/{len(jsons)}"}]
+def artifact_aggregates() -> ArtifactAggregates:
+    return ArtifactAggregates(
+        table=lambda a: [
+            {
+                "total_votacoes_com_votos": f"{a['com_votos'].value}/{a['votacoes'].value}"
+            }
+        ],
+        votacoes=Count(),
+        com_votos=Count(where=lambda j: j.get("dados", [])),
+    )
@@ -4,8 +4,10 @@ from typing import cast
 from prefect import get_run_logger, task
 from prefect.artifacts import create_table_artifact
 
+from config.endpoints import SenadoEndpoints
 from config.loader import load_config
 from config.parameters import TasksNames
+from utils.instrumentation import instrumented
 from utils.io import fetch_json, save_json
 
 APP_SETTINGS = load_config()
@@ -17,19 +19,25 @@ APP_SETTINGS = load_config()
     retry_delay_seconds=APP_SETTINGS.SENADO.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.SENADO.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_SENADO_COLEGIADOS)
 def extract_colegiados(
     lote_id: int,
     out_dir: str = APP_SETTINGS.SENADO.OUTPUT_EXTRACT_DIR,
 ) -> str:
     logger = get_run_logger()
 
-    url = f"{APP_SETTINGS.SENADO.REST_BASE_URL}comissao/lista/colegiados"
+    url = SenadoEndpoints.COLEGIADOS.url()
 
     logger.info(f"Baixando Colegiados do Senado: {url}")
 
     dest = Path(out_dir) / "colegiados.json"
 
-    json = fetch_json(url=url, max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES)
+    json = fetch_json(
+        url=url,
+        lote_id=lote_id,
+        task=TasksNames.EXTRACT_SENADO_COLEGIADOS,
+        max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
+    )
 
     json = cast(dict, json)
 
@@ -1,15 +1,18 @@
 from datetime import date, timedelta
 from pathlib import Path
-from typing import Any, cast
+from typing import Callable, cast
 
 from prefect import get_run_logger, task
 from prefect.artifacts import acreate_table_artifact
 
+from config.endpoints import SenadoEndpoints
 from config.loader import load_config
 from config.parameters import TasksNames
 from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
+from utils.artifact_aggregates import ArtifactAggregates, Count, Each
 from utils.fetch_many_jsons import fetch_many_jsons
+from utils.instrumentation import instrumented
 from utils.io import save_ndjson
 
 APP_SETTINGS = load_config()
@@ -28,10 +31,7 @@ def despesas_senadores_urls(start_date: date, end_date: date) -> UrlsResult:
     start_date = start_date - timedelta(days=90)
 
     for year in range(start_date.year, end_date.year + 1):
-        # O endpoint não utiliza a URL base do Senado pois é de um domínio diferente.
-        urls.add(
-            f"https://adm.senado.gov.br/adm-dadosabertos/api/v1/senadores/despesas_ceaps/{year}"
-        )
+        urls.add(SenadoEndpoints.DESPESAS_CEAPS.url(ano=year))
 
     return UrlsResult(
         urls_to_download=list(urls), not_downloaded_urls=not_downloaded_urls
@@ -44,6 +44,7 @@ def despesas_senadores_urls(start_date: date, end_date: date) -> UrlsResult:
     retry_delay_seconds=APP_SETTINGS.SENADO.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.SENADO.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_SENADO_DESPESAS_SENADORES)
 async def extract_despesas_senado(
     start_date: date,
     end_date: date,
@@ -56,6 +57,7 @@ async def extract_despesas_senado(
 
     logger.info(f"Baixando despesas de senadores de {len(urls)} urls")
 
+    aggregates = artifact_aggregates(start_date)
     jsons = await fetch_many_jsons(
         urls=urls["urls_to_download"],
         not_downloaded_urls=urls["not_downloaded_urls"],
@@ -65,11 +67,12 @@ async def extract_despesas_senado(
         validate_results=False,
         task=TasksNames.EXTRACT_SENADO_DESPESAS_SENADORES,
         lote_id=lote_id,
+        aggregates=aggregates,
     )
 
     await acreate_table_artifact(
         key="despesas-senadores",
-        table=generate_artifact(jsons, start_date),
+        table=aggregates.table(),
         description="Despesas de senadores",
     )
 
@@ -78,21 +81,34 @@ async def extract_despesas_senado(
     return save_ndjson(cast(list[dict], jsons), dest)
 
 
-def generate_artifact(jsons: Any, start_date: date):
-    counter = 0
+def artifact_aggregates(start_date: date) -> ArtifactAggregates:
+    """
+    Total de despesas a partir de 90 dias antes de start_date.
+    """
+    return ArtifactAggregates(
+        table=lambda a: [{"total_despesas": a["despesas"].value}],
+        despesas=Each(lambda j: j, Count(where=despesa_no_periodo(start_date))),
+    )
+
 
+def despesa_no_periodo(start_date: date) -> Callable[[dict], bool]:
+    """
+    Filtro das despesas do período. Os meses e o ano aceitos são calculados uma única vez, nas formas em que a API
+    pode enviá-los (número ou texto, com ou sem zero à esquerda), então cada despesa custa apenas buscas em conjuntos.
+    """
     start_date_lookback = start_date - timedelta(days=90)
 
-    for j in jsons:
-        for despesa in j:
-            if start_date.year == start_date_lookback.year:
-                if int(despesa.get("mes")) >= start_date_lookback.month:
-                    counter += 1
-            else:
-                if int(despesa.get("ano")) == start_date.year:
-                    counter += 1
-                else:
-                    if int(despesa.get("mes")) >= start_date_lookback.month:
-                        counter += 1
-
-    return [{"total_despesas": counter}]
+    months = range(start_date_lookback.month, 13)
+    accepted_months = {
+        *months,
+        *(str(m) for m in months),
+        *(f"{m:02d}" for m in months),
+    }
+    current_year = {start_date.year, str(start_date.year)}
+
+    if start_date.year == start_date_lookback.year:
+        return lambda despesa: despesa.get("mes") in accepted_months
+
+    return lambda despesa: (
+        despesa.get("ano") in current_year or despesa.get("mes") in accepted_months
+    )
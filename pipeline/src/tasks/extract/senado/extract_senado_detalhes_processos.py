@@ -4,11 +4,15 @@ from typing import cast
 from prefect import get_run_logger, task
 from prefect.artifacts import acreate_table_artifact
 
+from config.endpoints import SenadoEndpoints
 from config.loader import load_config
 from config.parameters import TasksNames
 from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
+from database.repository.registro_ids import mark_ids_fetched_db
+from utils.delta_ids import delta_ids
 from utils.fetch_many_jsons import fetch_many_jsons
+from utils.instrumentation import instrumented
 from utils.io import save_ndjson
 
 APP_SETTINGS = load_config()
@@ -24,7 +28,7 @@ def get_detalhes_processos_url(processos_ids: list[str]) -> UrlsResult:
         urls.update([error.url for error in not_downloaded_urls])
 
     for id in processos_ids:
-        urls.add(f"{APP_SETTINGS.SENADO.REST_BASE_URL}processo/{id}?v=1")
+        urls.add(SenadoEndpoints.DETALHES_PROCESSO.url(id=id))
 
     return UrlsResult(
         urls_to_download=list(urls), not_downloaded_urls=not_downloaded_urls
@@ -37,6 +41,7 @@ def get_detalhes_processos_url(processos_ids: list[str]) -> UrlsResult:
     retry_delay_seconds=APP_SETTINGS.SENADO.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.SENADO.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_SENADO_DETALHES_PROCESSOS)
 async def extract_detalhes_processos_senado(
     ids_processos: list[str],
     lote_id: int,
@@ -44,7 +49,10 @@ async def extract_detalhes_processos_senado(
 ):
     logger = get_run_logger()
 
-    urls = get_detalhes_processos_url(ids_processos)
+    delta = delta_ids(TasksNames.EXTRACT_SENADO_DETALHES_PROCESSOS, ids_processos)
+    logger.info(f"Detalhes de processos: {delta.describe()}")
+
+    urls = get_detalhes_processos_url(delta.ids)
 
     logger.info(f"Baixando detalhes de {len(urls)} URLs de Detalhes de Processos")
 
@@ -59,6 +67,11 @@ async def extract_detalhes_processos_senado(
         lote_id=lote_id,
     )
 
+    # As URLs que falharem ficam em erros_extract e são baixadas de novo no próximo lote
+    mark_ids_fetched_db(
+        TasksNames.EXTRACT_SENADO_DETALHES_PROCESSOS, delta.ids, lote_id
+    )
+
     await acreate_table_artifact(
         key="detalhes-processos",
         table=[{"num_processos": len(jsons)}],
@@ -1,17 +1,20 @@
 from datetime import date, timedelta
 from pathlib import Path
-from typing import Any, cast
+from typing import cast
 
 from prefect import get_run_logger, task
 from prefect.artifacts import acreate_table_artifact
 
+from config.endpoints import SenadoEndpoints
 from config.loader import load_config
 from config.parameters import TasksNames
 from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
+from utils.artifact_aggregates import ArtifactAggregates, GroupCount
 from utils.fetch_many_jsons import fetch_many_jsons
+from utils.instrumentation import instrumented
 from utils.io import save_ndjson
-from utils.url_utils import generate_date_urls_senado
+from utils.url_utils import split_dates_by_year
 
 APP_SETTINGS = load_config()
 
@@ -30,16 +33,13 @@ def discursos_senadores_urls(
     # Baixar discursos até 1 mês atrás (podem demorar a entrarem no sistema)
     start_date = start_date - timedelta(days=30)
 
-    base_url = f"{APP_SETTINGS.SENADO.REST_BASE_URL}senador/%ID%/discursos?dataInicio=%STARTDATE%&dataFim=%ENDDATE%&v=5"
-
-    base_urls_replaced = generate_date_urls_senado(base_url, start_date, end_date)
-
-    if base_urls_replaced is None:
-        raise
-
-    for url in base_urls_replaced:
+    for range_start, range_end in split_dates_by_year(start_date, end_date):
         for id in senadores_ids:
-            urls.add(url.replace("%ID%", id))
+            urls.add(
+                SenadoEndpoints.DISCURSOS_SENADOR.url(
+                    id=id, dataInicio=range_start, dataFim=range_end
+                )
+            )
 
     return UrlsResult(
         urls_to_download=list(urls), not_downloaded_urls=not_downloaded_urls
@@ -52,6 +52,7 @@ def discursos_senadores_urls(
     retry_delay_seconds=APP_SETTINGS.SENADO.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.SENADO.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_SENADO_DISCURSOS_SENADORES)
 async def extract_discursos_senado(
     ids_senadores: list[str],
     start_date: date,
@@ -65,6 +66,7 @@ async def extract_discursos_senado(
 
     logger.info(f"Baixando discursos de {len(urls)} urls")
 
+    aggregates = artifact_aggregates()
     jsons = await fetch_many_jsons(
         urls=urls["urls_to_download"],
         not_downloaded_urls=urls["not_downloaded_urls"],
@@ -74,11 +76,12 @@ async def extract_discursos_senado(
         validate_results=False,
         task=TasksNames.EXTRACT_SENADO_DISCURSOS_SENADORES,
         lote_id=lote_id,
+        aggregates=aggregates,
     )
 
     await acreate_table_artifact(
         key="discursos-senadores",
-        table=generate_artifact(jsons),
+        table=aggregates.table(),
         description="Discursos Senadores",
     )
 
@@ -87,42 +90,42 @@ async def extract_discursos_senado(
     return save_ndjson(cast(list[dict], jsons), dest)
 
 
-def generate_artifact(jsons: Any):
-    artifact_data = []
-
-    for i, json in enumerate(jsons):
-        senador = (
-            json.get("DiscursosParlamentar", {})
-            .get("Parlamentar", {})
-            .get("IdentificacaoParlamentar")
-        )
-
-        senador_id = senador.get("CodigoParlamentar", None)
-
-        discursos = (
-            json.get("DiscursosParlamentar", {})
-            .get("Parlamentar", {})
-            .get("Pronunciamentos", [])
-        )
-
-        if discursos is not None:
-            discursos = discursos.get("Pronunciamento", [])
-        else:
-            discursos = []
-
-        if not any(item["id"] == senador_id for item in artifact_data):
-            artifact_data.append(
-                {
-                    "index": i,
-                    "id": senador_id,
-                    "nome": senador.get("NomeParlamentar", None),
-                    "num_discursos": len(discursos),
-                }
-            )
-        else:
-            for item in artifact_data:
-                if item.get("id") == senador_id:
-                    item["num_discursos"] += len(discursos)
-                    break
+def artifact_aggregates() -> ArtifactAggregates:
+    """
+    Número de discursos de cada senador. Um senador tem uma resposta para cada ano do período.
+    """
+    return ArtifactAggregates(
+        table=lambda a: [
+            {
+                "index": i,
+                "id": id,
+                "nome": a["discursos"].labels[id],
+                "num_discursos": n,
+            }
+            for i, (id, n) in enumerate(a["discursos"].value.items())
+        ],
+        discursos=GroupCount(
+            key=lambda j: identificacao_senador(j).get("CodigoParlamentar", None),
+            weight=lambda j: len(pronunciamentos(j)),
+            label=lambda j: identificacao_senador(j).get("NomeParlamentar", None),
+        ),
+    )
+
+
+def identificacao_senador(json: dict) -> dict:
+    return (
+        json.get("DiscursosParlamentar", {})
+        .get("Parlamentar", {})
+        .get("IdentificacaoParlamentar")
+    ) or {}
 
-    return artifact_data
+
+def pronunciamentos(json: dict) -> list:
+    discursos = (
+        json.get("DiscursosParlamentar", {})
+        .get("Parlamentar", {})
+        .get("Pronunciamentos", [])
+    )
+    if discursos is None:
+        return []
+    return discursos.get("Pronunciamento", [])
@@ -5,9 +5,11 @@ from typing import Any
 from prefect import get_run_logger, task
 from prefect.artifacts import acreate_table_artifact
 
+from config.endpoints import SenadoEndpoints
 from config.loader import load_config
 from config.parameters import TasksNames
 from utils.fetch_many_jsons import fetch_many_jsons
+from utils.instrumentation import instrumented
 from utils.io import save_json
 
 APP_SETTINGS = load_config()
@@ -23,13 +25,9 @@ def get_processos_url(start_date: date, end_date: date, logger: Any) -> list[str
             "Para download de Processos do Senado as datas têm mais de 30 dias de diferença, serão baixadas todas as proposições que entraram em tramitação na atual legislatura"
         )
         # Se for maior que 30 dias, baixa todos os Processos que tramitaram na Legislatura
-        return [
-            f"{APP_SETTINGS.SENADO.REST_BASE_URL}processo?tramitouLegislaturaAtual=S"
-        ]
+        return [SenadoEndpoints.PROCESSOS.url()]
     else:
-        return [
-            f"{APP_SETTINGS.SENADO.REST_BASE_URL}processo?tramitouLegislaturaAtual=S&numdias={dif_days}&v=1"
-        ]
+        return [SenadoEndpoints.PROCESSOS.url(numdias=dif_days, v=1)]
 
 
 @task(
@@ -38,6 +36,7 @@ def get_processos_url(start_date: date, end_date: date, logger: Any) -> list[str
     retry_delay_seconds=APP_SETTINGS.SENADO.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.SENADO.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_SENADO_PROCESSOS)
 async def extract_processos_senado(
     start_date: date,
     end_date: date,
@@ -4,9 +4,14 @@ from typing import cast
 from prefect import get_run_logger, task
 from prefect.artifacts import create_table_artifact
 
+from config.endpoints import SenadoEndpoints
 from config.loader import load_config
 from config.parameters import TasksNames
+from utils.artifact_aggregates import ArtifactAggregates, Collect, Each
+from utils.fetch_progress import FetchProgress
+from utils.instrumentation import instrumented
 from utils.io import fetch_json, save_json
+from utils.task_metrics import record_fetch_metrics
 
 APP_SETTINGS = load_config()
 
@@ -17,14 +22,15 @@ APP_SETTINGS = load_config()
     retry_delay_seconds=APP_SETTINGS.SENADO.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.SENADO.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_SENADO_SENADORES)
 def extract_senadores_senado(
     lote_id: int,
     out_dir: str | Path = APP_SETTINGS.SENADO.OUTPUT_EXTRACT_DIR,
 ) -> list[str]:
     logger = get_run_logger()
 
-    url_exerc = f"{APP_SETTINGS.SENADO.REST_BASE_URL}senador/lista/atual?v=4"
-    url_afast = f"{APP_SETTINGS.SENADO.REST_BASE_URL}senador/afastados"
+    url_exerc = SenadoEndpoints.SENADORES_EXERCICIO.url()
+    url_afast = SenadoEndpoints.SENADORES_AFASTADOS.url()
 
     logger.info(f"Baixando Senadores em exercício: {url_exerc}")
     logger.info(f"Baixando Senadores afastados: {url_afast}")
@@ -32,12 +38,25 @@ def extract_senadores_senado(
     dest_exerc = Path(out_dir) / "senadores_exercicio.json"
     dest_afast = Path(out_dir) / "senadores_afastados.json"
 
-    json_exerc = fetch_json(
-        url=url_exerc, max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES
-    )
-    json_afast = fetch_json(
-        url=url_afast, max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES
-    )
+    # Os dois JSONs são gravados como um único download na tabela task_metrics
+    progress = FetchProgress(task=TasksNames.EXTRACT_SENADO_SENADORES, planned=2)
+    try:
+        json_exerc = fetch_json(
+            url=url_exerc,
+            lote_id=lote_id,
+            task=TasksNames.EXTRACT_SENADO_SENADORES,
+            max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
+            progress=progress,
+        )
+        json_afast = fetch_json(
+            url=url_afast,
+            lote_id=lote_id,
+            task=TasksNames.EXTRACT_SENADO_SENADORES,
+            max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
+            progress=progress,
+        )
+    finally:
+        record_fetch_metrics(progress, lote_id)
 
     json_exerc = cast(dict, json_exerc)
     json_afast = cast(dict, json_afast)
@@ -63,50 +82,51 @@ def extract_senadores_senado(
 
     create_table_artifact(
         key="senadores",
-        table=generate_artifact(json_exerc, json_afast),
+        table=artifact_aggregates().feed_many([json_exerc, json_afast]).table(),
         description="Senadores que atuaram na Legislatura",
     )
 
     return ids_senadores
 
 
-def generate_artifact(json_exerc: dict, json_afast: dict):
-    artifact_data = []
-
-    sens_exerc = (
-        json_exerc.get("ListaParlamentarEmExercicio", {})
-        .get("Parlamentares", {})
-        .get("Parlamentar", [])
-    )
-    sens_afast = (
-        json_afast.get("AfastamentoAtual", {})
-        .get("Parlamentares", {})
-        .get("Parlamentar", [])
+def artifact_aggregates() -> ArtifactAggregates:
+    """
+    Um senador por linha: os em exercício e os afastados, cada grupo vindo de um dos dois JSONs.
+    """
+    return ArtifactAggregates(
+        table=lambda a: [
+            {"index": i, **row}
+            for rows in (a["exercicio"].value, a["afastados"].value)
+            for i, row in enumerate(rows)
+        ],
+        exercicio=Each(
+            lambda json: (
+                json.get("ListaParlamentarEmExercicio", {})
+                .get("Parlamentares", {})
+                .get("Parlamentar", [])
+            ),
+            Collect(lambda senador: senador_row(senador, exercicio=True)),
+        ),
+        afastados=Each(
+            lambda json: (
+                json.get("AfastamentoAtual", {})
+                .get("Parlamentares", {})
+                .get("Parlamentar", [])
+            ),
+            Collect(lambda senador: senador_row(senador, exercicio=False)),
+        ),
     )
 
-    for i, senador in enumerate(sens_exerc):
-        ident = senador.get("IdentificacaoParlamentar", {})
-        artifact_data.append(
-            {
-                "index": i,
-                "id": ident.get("CodigoParlamentar", ""),
-                "nome": ident.get("NomeParlamentar", ""),
-                "partido": ident.get("SiglaPartidoParlamentar", ""),
-                "uf": ident.get("UfParlamentar", ""),
-                "exercicio": "Sim",
-            }
-        )
 
-    for i, senador in enumerate(sens_afast):
-        ident = senador.get("IdentificacaoParlamentar", {})
-        artifact_data.append(
-            {
-                "index": i,
-                "id": ident.get("CodigoParlamentar", ""),
-                "nome": ident.get("NomeParlamentar", ""),
-                "partido": ident.get("SiglaPartidoParlamentar", ""),
-                "exercicio": "Não",
-            }
-        )
-
-    return artifact_data
+def senador_row(senador: dict, exercicio: bool) -> dict:
+    ident = senador.get("IdentificacaoParlamentar", {})
+    row = {
+        "id": ident.get("CodigoParlamentar", ""),
+        "nome": ident.get("NomeParlamentar", ""),
+        "partido": ident.get("SiglaPartidoParlamentar", ""),
+    }
+    # Os afastados não têm a UF na resposta da API
+    if exercicio:
+        row["uf"] = ident.get("UfParlamentar", "")
+    row["exercicio"] = "Sim" if exercicio else "Não"
+    return row
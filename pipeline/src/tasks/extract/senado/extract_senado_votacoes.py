@@ -1,28 +1,27 @@
 from datetime import date
 from pathlib import Path
-from typing import Any, cast
+from typing import cast
 
 from prefect import get_run_logger, task
 from prefect.artifacts import acreate_table_artifact
 
+from config.endpoints import SenadoEndpoints
 from config.loader import load_config
 from config.parameters import TasksNames
+from utils.artifact_aggregates import ArtifactAggregates, Sum
 from utils.fetch_many_jsons import fetch_many_jsons
+from utils.instrumentation import instrumented
 from utils.io import save_ndjson
-from utils.url_utils import generate_date_urls_senado
+from utils.url_utils import split_dates_by_year
 
 APP_SETTINGS = load_config()
 
 
-def get_votacoes_urls(start_date: date, end_date: date) -> list[str] | None:
-    base_url = f"{APP_SETTINGS.SENADO.REST_BASE_URL}votacao?dataInicio=%STARTDATE%&dataFim=%ENDDATE%&v=1"
-
-    base_urls_replaced = generate_date_urls_senado(base_url, start_date, end_date)
-
-    if base_urls_replaced is None:
-        raise
-
-    return base_urls_replaced
+def get_votacoes_urls(start_date: date, end_date: date) -> list[str]:
+    return [
+        SenadoEndpoints.VOTACOES.url(dataInicio=range_start, dataFim=range_end)
+        for range_start, range_end in split_dates_by_year(start_date, end_date)
+    ]
 
 
 @task(
@@ -31,6 +30,7 @@ def get_votacoes_urls(start_date: date, end_date: date) -> list[str] | None:
     retry_delay_seconds=APP_SETTINGS.SENADO.TASK_RETRY_DELAY,
     timeout_seconds=APP_SETTINGS.SENADO.TASK_TIMEOUT,
 )
+@instrumented(TasksNames.EXTRACT_SENADO_VOTACOES)
 async def extract_votacoes_senado(
     start_date: date,
     end_date: date,
@@ -46,6 +46,7 @@ async def extract_votacoes_senado(
 
     logger.info(f"Baixando votações do Senado: {urls}")
 
+    aggregates = artifact_aggregates()
     jsons = await fetch_many_jsons(
         urls=urls,
         not_downloaded_urls=[],
@@ -55,11 +56,12 @@ async def extract_votacoes_senado(
         validate_results=False,
         task=TasksNames.EXTRACT_SENADO_VOTACOES,
         lote_id=lote_id,
+        aggregates=aggregates,
     )
 
     await acreate_table_artifact(
         key="votacoes-senado",
-        table=generate_artifact(jsons),
+        table=aggregates.table(),
         description="Votações Senado",
     )
 
@@ -68,11 +70,8 @@ async def extract_votacoes_senado(
     return save_ndjson(cast(list[dict], jsons), dest)
 
 
-def generate_artifact(jsons: Any):
-    count = 0
-
-    for j in jsons:
-        if len(j):
-            count += len(j)
-
-    return [{"num_votacoes": count}]
+def artifact_aggregates() -> ArtifactAggregates:
+    return ArtifactAggregates(
+        table=lambda a: [{"num_votacoes": a["votacoes"].value}],
+        votacoes=Sum(len),
+    )
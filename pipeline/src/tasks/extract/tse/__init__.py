@@ -1,11 +1,13 @@
-from .extract_tse_candidatos import extract_candidatos
-from .extract_tse_prestacao_contas import extract_prestacao_contas
-from .extract_tse_redes_sociais import extract_redes_sociais
-from .extract_tse_votacao import extract_votacao
+from .extract_tse_archives import extract_tse_archives
+from .extract_tse_candidatos import candidatos_archive
+from .extract_tse_prestacao_contas import prestacao_contas_archive
+from .extract_tse_redes_sociais import redes_sociais_archive
+from .extract_tse_votacao import votacao_archive
 
 __all__ = [
-    "extract_candidatos",
-    "extract_prestacao_contas",
-    "extract_redes_sociais",
-    "extract_votacao",
+    "extract_tse_archives",
+    "candidatos_archive",
+    "prestacao_contas_archive",
+    "redes_sociais_archive",
+    "votacao_archive",
 ]
@@ -0,0 +1,35 @@
+from prefect import get_run_logger, task
+
+from config.loader import load_config
+from config.parameters import TasksNames
+from utils.instrumentation import instrumented
+from utils.tse_download_pool import TSEArchiveJob, download_tse_archives
+
+APP_SETTINGS = load_config()
+
+
+@task(
+    name="Extract TSE Archives",
+    task_run_name=TasksNames.EXTRACT_TSE_ARCHIVES,
+    description="Faz o download de todos os arquivos do TSE em um pool de downloads com conexões e banda limitadas.",
+    retries=APP_SETTINGS.TSE.TASK_RETRIES,
+    retry_delay_seconds=APP_SETTINGS.TSE.TASK_RETRY_DELAY,
+    timeout_seconds=APP_SETTINGS.TSE.TASK_TIMEOUT,
+    log_prints=True,
+)
+@instrumented(TasksNames.EXTRACT_TSE_ARCHIVES)
+async def extract_tse_archives(
+    archives: list[TSEArchiveJob], lote_id: int, force_download: bool = False
+) -> dict[str, str | None]:
+    logger = get_run_logger()
+
+    logger.info(f"Verificando {len(archives)} arquivos do TSE")
+
+    # Os arquivos só são baixados novamente se tiverem mudado no servidor do TSE.
+    # Os membros dos ZIPs são lidos sob demanda, sem extração para o disco
+    return await download_tse_archives(
+        jobs=archives,
+        lote_id=lote_id,
+        force=force_download,
+        task=TasksNames.EXTRACT_TSE_ARCHIVES,
+    )
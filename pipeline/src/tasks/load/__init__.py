@@ -0,0 +1,6 @@
+from .load_dataset import LOAD_DATASETS, load_dataset
+
+__all__ = [
+    "LOAD_DATASETS",
+    "load_dataset",
+]
@@ -0,0 +1,150 @@
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+
+import sqlalchemy as sa
+from prefect import get_run_logger, task
+
+from config.loader import load_config
+from config.parameters import TasksNames
+from database.models.base import (
+    Deputados,
+    Despesas,
+    Discursos,
+    Processos,
+    Proposicoes,
+    Senadores,
+    Votacoes,
+    Votos,
+)
+from database.repository.load import load_rows_db
+from database.repository.partitions import (
+    detach_partitions_db,
+    partition_column,
+    retention_start,
+)
+from utils.load_records import (
+    deputados_rows,
+    despesas_rows,
+    discursos_rows,
+    processos_rows,
+    proposicoes_rows,
+    senadores_rows,
+    votacoes_rows,
+    votos_rows,
+)
+
+APP_SETTINGS = load_config()
+
+
+@dataclass(frozen=True)
+class LoadDataset:
+    """
+    Dataset carregado no banco de dados: arquivo da extração, função que gera as linhas e tabela de destino.
+    """
+
+    task: str
+    source: Path
+    rows: Callable[[Path], Iterator[dict]]
+    table: sa.Table
+
+
+CAMARA_DIR = Path(APP_SETTINGS.CAMARA.OUTPUT_EXTRACT_DIR)
+SENADO_DIR = Path(APP_SETTINGS.SENADO.OUTPUT_EXTRACT_DIR)
+
+LOAD_DATASETS = {
+    "deputados": LoadDataset(
+        TasksNames.LOAD_DEPUTADOS,
+        CAMARA_DIR / "detalhes_deputados.ndjson",
+        deputados_rows,
+        Deputados.__table__,  # type: ignore
+    ),
+    "votacoes": LoadDataset(
+        TasksNames.LOAD_VOTACOES,
+        CAMARA_DIR / "votacoes.ndjson",
+        votacoes_rows,
+        Votacoes.__table__,  # type: ignore
+    ),
+    "votos": LoadDataset(
+        TasksNames.LOAD_VOTOS,
+        CAMARA_DIR / "votos_votacoes_camara.ndjson",
+        votos_rows,
+        Votos.__table__,  # type: ignore
+    ),
+    "despesas": LoadDataset(
+        TasksNames.LOAD_DESPESAS,
+        CAMARA_DIR / "despesas.ndjson",
+        despesas_rows,
+        Despesas.__table__,  # type: ignore
+    ),
+    "discursos": LoadDataset(
+        TasksNames.LOAD_DISCURSOS,
+        CAMARA_DIR / "discursos.ndjson",
+        discursos_rows,
+        Discursos.__table__,  # type: ignore
+    ),
+    "proposicoes": LoadDataset(
+        TasksNames.LOAD_PROPOSICOES,
+        CAMARA_DIR / "proposicoes.ndjson",
+        proposicoes_rows,
+        Proposicoes.__table__,  # type: ignore
+    ),
+    "senadores": LoadDataset(
+        TasksNames.LOAD_SENADORES,
+        SENADO_DIR / "detalhes_senadores.ndjson",
+        senadores_rows,
+        Senadores.__table__,  # type: ignore
+    ),
+    "processos": LoadDataset(
+        TasksNames.LOAD_PROCESSOS,
+        SENADO_DIR / "processos.json",
+        processos_rows,
+        Processos.__table__,  # type: ignore
+    ),
+}
+
+
+@task(
+    name="Load Dataset",
+    task_run_name="load_{dataset}",
+    description="Carrega um dataset da extração no banco de dados com COPY e upsert.",
+    retries=APP_SETTINGS.LOAD.TASK_RETRIES,
+    retry_delay_seconds=APP_SETTINGS.LOAD.TASK_RETRY_DELAY,
+    timeout_seconds=APP_SETTINGS.LOAD.TASK_TIMEOUT,
+    log_prints=True,
+)
+def load_dataset(dataset: str, lote_id: int) -> int:
+    logger = get_run_logger()
+
+    config = LOAD_DATASETS[dataset]
+    if not config.source.exists():
+        logger.warning(
+            f"O arquivo {config.source} não existe, o dataset '{dataset}' não será carregado."
+        )
+        return 0
+
+    before = retention_start(APP_SETTINGS.LOAD.PARTITION_RETENTION)
+
+    started = time.perf_counter()
+    rows = load_rows_db(
+        config.table, config.rows(config.source), lote_id, partitions_from=before
+    )
+    elapsed = time.perf_counter() - started
+
+    logger.info(
+        f"Dataset '{dataset}' carregado na tabela {config.table.name}: {rows} linhas em {elapsed:.1f}s "
+        f"({rows / max(elapsed, 1e-6):.0f} linhas/s)"
+    )
+
+    # Partições anteriores ao período de retenção saem da tabela sem percorrer os dados
+    if before is not None and partition_column(config.table) is not None:
+        detached = detach_partitions_db(
+            config.table, before, drop=APP_SETTINGS.LOAD.DROP_DETACHED_PARTITIONS
+        )
+        if detached:
+            logger.info(
+                f"Partições anteriores a {before} desanexadas de {config.table.name}: {detached}"
+            )
+
+    return rows
@@ -0,0 +1,5 @@
+from .transform_parlamentares_tse import transform_parlamentares_tse
+
+__all__ = [
+    "transform_parlamentares_tse",
+]
@@ -0,0 +1,68 @@
+from datetime import date
+from pathlib import Path
+
+from prefect import get_run_logger, task
+
+from config.loader import load_config
+from config.parameters import TasksNames
+from database.repository.parlamentares_candidatos_tse import (
+    get_crosswalk_signatures_db,
+    upsert_crosswalk_db,
+)
+from utils.br_data import get_election_years
+from utils.entity_resolution import (
+    parlamentares_camara,
+    parlamentares_senado,
+    resolve_parlamentares,
+)
+from utils.instrumentation import instrumented
+
+APP_SETTINGS = load_config()
+
+
+@task(
+    name="Transform Parlamentares TSE",
+    task_run_name=TasksNames.TRANSFORM_PARLAMENTARES_TSE,
+    description="Relaciona deputados e senadores aos seus registros de candidato no TSE.",
+    retries=APP_SETTINGS.TSE.TASK_RETRIES,
+    retry_delay_seconds=APP_SETTINGS.TSE.TASK_RETRY_DELAY,
+    timeout_seconds=APP_SETTINGS.TSE.TASK_TIMEOUT,
+    log_prints=True,
+)
+@instrumented(TasksNames.TRANSFORM_PARLAMENTARES_TSE)
+def transform_parlamentares_tse(
+    start_date: date,
+    lote_id: int,
+    camara_dir: Path | str = APP_SETTINGS.CAMARA.OUTPUT_EXTRACT_DIR,
+    senado_dir: Path | str = APP_SETTINGS.SENADO.OUTPUT_EXTRACT_DIR,
+    transform_dir: Path | str = APP_SETTINGS.TSE.OUTPUT_TRANSFORM_DIR,
+) -> int:
+    logger = get_run_logger()
+
+    parlamentares = []
+    detalhes_deputados = Path(camara_dir) / "detalhes_deputados.ndjson"
+    if detalhes_deputados.exists():
+        parlamentares.extend(parlamentares_camara(detalhes_deputados))
+    detalhes_senadores = Path(senado_dir) / "detalhes_senadores.ndjson"
+    if detalhes_senadores.exists():
+        parlamentares.extend(parlamentares_senado(detalhes_senadores))
+
+    if not parlamentares:
+        logger.warning("Não há detalhes de deputados ou senadores para relacionar.")
+        return 0
+
+    rows = resolve_parlamentares(
+        parlamentares=parlamentares,
+        years=get_election_years(start_date.year),
+        existing_signatures=get_crosswalk_signatures_db(),
+        transform_dir=transform_dir,
+    )
+    upsert_crosswalk_db(rows, lote_id)
+
+    matched = sum(1 for row in rows if row.sq_candidato is not None)
+    logger.info(
+        f"{len(rows)} correspondências entre {len(parlamentares)} parlamentares e candidatos do TSE refeitas, "
+        f"{matched} com candidato encontrado."
+    )
+
+    return len(rows)
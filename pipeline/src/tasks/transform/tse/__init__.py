@@ -0,0 +1,7 @@
+from .transform_tse_parquet import transform_tse_parquet
+from .transform_tse_votacao_agregada import transform_tse_votacao_agregada
+
+__all__ = [
+    "transform_tse_parquet",
+    "transform_tse_votacao_agregada",
+]
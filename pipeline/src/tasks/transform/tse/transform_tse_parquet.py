@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from prefect import get_run_logger, task
+
+from config.loader import load_config
+from config.parameters import TasksNames
+from utils.instrumentation import instrumented
+from utils.tse_parquet import convert_tse_archive, parquet_up_to_date
+
+APP_SETTINGS = load_config()
+
+
+@task(
+    name="Transform TSE Parquet",
+    task_run_name=TasksNames.TRANSFORM_TSE_PARQUET + "_{dataset}_{year}_{uf}",
+    description="Converte os CSVs de um ZIP do TSE em arquivos Parquet particionados por ano e UF.",
+    retries=APP_SETTINGS.TSE.TASK_RETRIES,
+    retry_delay_seconds=APP_SETTINGS.TSE.TASK_RETRY_DELAY,
+    timeout_seconds=APP_SETTINGS.TSE.TASK_TIMEOUT,
+    log_prints=True,
+)
+@instrumented(TasksNames.TRANSFORM_TSE_PARQUET)
+def transform_tse_parquet(
+    zip_path: str | None,
+    dataset: str,
+    year: int,
+    uf: str = "BRASIL",
+    force: bool = False,
+    out_dir: Path | str = APP_SETTINGS.TSE.OUTPUT_TRANSFORM_DIR,
+) -> list[str]:
+    logger = get_run_logger()
+
+    if zip_path is None or not Path(zip_path).exists():
+        logger.warning(
+            f"O arquivo do TSE de {dataset} ({year}, {uf}) não está disponível para conversão."
+        )
+        return []
+
+    # A conversão só é refeita se o ZIP foi baixado novamente desde a última conversão
+    if not force and parquet_up_to_date(zip_path, out_dir, dataset, year, uf):
+        logger.info(f"Os arquivos Parquet de {zip_path} já estão atualizados.")
+        return []
+
+    return convert_tse_archive(
+        zip_path=zip_path, dataset=dataset, year=year, out_dir=out_dir, uf=uf
+    )
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from prefect import get_run_logger, task
+
+from config.loader import load_config
+from config.parameters import TasksNames
+from utils.instrumentation import instrumented
+from utils.tse_parquet import success_marker_path
+from utils.tse_votacao import (
+    build_votacao_agregada,
+    votacao_agregada_dir,
+    votacao_parquet_dir,
+)
+
+APP_SETTINGS = load_config()
+
+
+@task(
+    name="Transform TSE Votação Agregada",
+    task_run_name=TasksNames.TRANSFORM_TSE_VOTACAO_AGREGADA + "_{year}",
+    description="Pré-calcula os votos de cada candidato por município, por UF e no total a partir dos arquivos Parquet de votação.",
+    retries=APP_SETTINGS.TSE.TASK_RETRIES,
+    retry_delay_seconds=APP_SETTINGS.TSE.TASK_RETRY_DELAY,
+    timeout_seconds=APP_SETTINGS.TSE.TASK_TIMEOUT,
+    log_prints=True,
+)
+@instrumented(TasksNames.TRANSFORM_TSE_VOTACAO_AGREGADA)
+def transform_tse_votacao_agregada(
+    year: int,
+    force: bool = False,
+    out_dir: Path | str = APP_SETTINGS.TSE.OUTPUT_TRANSFORM_DIR,
+) -> str | None:
+    logger = get_run_logger()
+
+    if not votacao_parquet_dir(year, out_dir).exists():
+        logger.warning(
+            f"Os arquivos Parquet de votação de {year} não estão disponíveis para agregação."
+        )
+        return None
+
+    # A agregação só é refeita se os arquivos Parquet foram gerados novamente
+    agregada_dir = votacao_agregada_dir(year, out_dir)
+    marker = success_marker_path(out_dir, "votacao", year, "BRASIL")
+    if (
+        not force
+        and agregada_dir.exists()
+        and marker.exists()
+        and agregada_dir.stat().st_mtime >= marker.stat().st_mtime
+    ):
+        logger.info(f"A votação agregada de {year} já está atualizada.")
+        return str(agregada_dir)
+
+    return build_votacao_agregada(year, out_dir)
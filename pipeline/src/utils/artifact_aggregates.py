@@ -0,0 +1,169 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Iterable
+
+
+class Aggregator(ABC):
+    """
+    Agregação feita em uma única passada: add recebe um item por vez e value é o resultado até o momento.
+    Nenhum item é guardado, apenas o estado da agregação.
+    """
+
+    @abstractmethod
+    def add(self, item: Any): ...
+
+    @property
+    @abstractmethod
+    def value(self) -> Any: ...
+
+
+class Count(Aggregator):
+    """
+    Número de itens, ou apenas dos que satisfazem where.
+    """
+
+    def __init__(self, where: Callable[[Any], Any] | None = None):
+        self.where = where
+        self.count = 0
+
+    def add(self, item: Any):
+        if self.where is None or self.where(item):
+            self.count += 1
+
+    @property
+    def value(self) -> int:
+        return self.count
+
+
+class Sum(Aggregator):
+    """
+    Soma de um valor extraído de cada item.
+    """
+
+    def __init__(self, value: Callable[[Any], int | float]):
+        self.extract = value
+        self.total = 0
+
+    def add(self, item: Any):
+        self.total += self.extract(item)
+
+    @property
+    def value(self) -> int | float:
+        return self.total
+
+
+class Distinct(Aggregator):
+    """
+    Número de chaves distintas. As chaves ficam em keys.
+    """
+
+    def __init__(self, key: Callable[[Any], Any]):
+        self.key = key
+        self.keys: set = set()
+
+    def add(self, item: Any):
+        self.keys.add(self.key(item))
+
+    @property
+    def value(self) -> int:
+        return len(self.keys)
+
+
+class GroupCount(Aggregator):
+    """
+    Contagem por chave, na ordem em que cada chave apareceu pela primeira vez.
+    - weight: quanto cada item soma ao grupo (ex.: o número de registros de uma página). Padrão: 1
+    - label: dados do grupo guardados no primeiro item da chave (ex.: o nome do parlamentar), em labels
+    """
+
+    def __init__(
+        self,
+        key: Callable[[Any], Any],
+        weight: Callable[[Any], int] | None = None,
+        label: Callable[[Any], Any] | None = None,
+    ):
+        self.key = key
+        self.weight = weight
+        self.label = label
+        self.counts: dict[Any, int] = {}
+        self.labels: dict[Any, Any] = {}
+
+    def add(self, item: Any):
+        key = self.key(item)
+        if key not in self.counts:
+            self.counts[key] = 0
+            if self.label is not None:
+                self.labels[key] = self.label(item)
+        self.counts[key] += self.weight(item) if self.weight is not None else 1
+
+    @property
+    def value(self) -> dict[Any, int]:
+        return self.counts
+
+
+class Collect(Aggregator):
+    """
+    Uma linha por item, com os campos de project. Para artefatos que listam as entidades (ex.: um deputado por linha).
+    """
+
+    def __init__(self, project: Callable[[Any], dict]):
+        self.project = project
+        self.rows: list[dict] = []
+
+    def add(self, item: Any):
+        self.rows.append(self.project(item))
+
+    @property
+    def value(self) -> list[dict]:
+        return self.rows
+
+
+class Each(Aggregator):
+    """
+    Aplica o agregador a cada registro de um documento (ex.: os itens de 'dados' de uma página da Câmara).
+    """
+
+    def __init__(
+        self, records: Callable[[Any], Iterable | None], aggregator: Aggregator
+    ):
+        self.records = records
+        self.aggregator = aggregator
+
+    def add(self, item: Any):
+        for record in self.records(item) or ():
+            self.aggregator.add(record)
+
+    @property
+    def value(self) -> Any:
+        return self.aggregator.value
+
+
+class ArtifactAggregates:
+    """
+    Agregações do artefato de uma task, declaradas antes do download e alimentadas com cada documento assim que ele
+    chega (fetch_many_jsons(aggregates=...)). O artefato sai do estado das agregações, sem uma segunda passada sobre
+    os resultados.
+    - table: monta a tabela do artefato a partir das agregações, acessadas pelo nome
+    """
+
+    def __init__(
+        self,
+        table: Callable[["ArtifactAggregates"], list[dict] | dict],
+        **aggregators: Aggregator,
+    ):
+        self._table = table
+        self.aggregators = aggregators
+
+    def feed(self, document: Any):
+        for aggregator in self.aggregators.values():
+            aggregator.add(document)
+
+    def feed_many(self, documents: Iterable[Any]) -> "ArtifactAggregates":
+        for document in documents:
+            self.feed(document)
+        return self
+
+    def __getitem__(self, name: str) -> Aggregator:
+        return self.aggregators[name]
+
+    def table(self) -> list[dict] | dict:
+        return self._table(self)
@@ -1,5 +1,16 @@
 from datetime import date, datetime
-from typing import Literal
+from pathlib import Path
+from typing import Iterator, Literal
+
+from config.loader import load_config
+
+from .io import save_ndjson
+from .url_utils import canonical_url, get_page_number
+
+APP_SETTINGS = load_config()
+
+# Colunas de proveniência adicionadas a cada registro gravado um por linha
+PROVENANCE_COLUMNS = ("_url", "_pagina", "_lote_id")
 
 LegislaturaProps = Literal["id", "dataInicio", "dataFim"]
 
@@ -38,3 +49,51 @@ def get_legislatura_data(
             raise ValueError(
                 f"O valor de '{property}' ('{prop_data}') não é conversível para um objeto de data."
             )
+
+
+def page_self_url(page: dict) -> str | None:
+    """
+    URL da página, informada pela própria API da Câmara no link 'self' do envelope.
+    """
+    for link in page.get("links") or []:
+        if link.get("rel") == "self" and link.get("href"):
+            return canonical_url(link["href"])
+    return None
+
+
+def iter_page_records(
+    pages: list[dict], lote_id: int, fields: tuple[str, ...] | None = None
+) -> Iterator[dict]:
+    """
+    Desmonta os envelopes {"dados": [...], "links": [...]} das páginas da Câmara em registros individuais.
+    - Cada registro recebe a URL e o número da página de onde veio e o lote que o baixou
+    - Com fields, apenas os campos listados são mantidos
+    """
+    for page in pages:
+        url = page_self_url(page)
+        page_number = get_page_number(url) if url else None
+        for record in page.get("dados") or []:
+            if fields is not None:
+                record = {k: record[k] for k in fields if k in record}
+            yield {
+                **record,
+                "_url": url,
+                "_pagina": page_number,
+                "_lote_id": lote_id,
+            }
+
+
+def save_camara_pages(
+    pages: list[dict],
+    dest_path: str | Path,
+    lote_id: int,
+    fields: tuple[str, ...] | None = None,
+    records: bool = APP_SETTINGS.CAMARA.NDJSON_RECORDS,
+) -> str:
+    """
+    Grava as páginas de um endpoint paginado da Câmara. Com records=True cada linha do NDJson é um registro,
+    sem o envelope da página. Caso contrário, cada linha é uma página inteira, como retornada pela API.
+    """
+    if records:
+        return save_ndjson(iter_page_records(pages, lote_id, fields), dest_path)
+    return save_ndjson(pages, dest_path)
@@ -0,0 +1,352 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+from typing import IO, cast
+from uuid import uuid4
+
+import httpx
+from prefect.logging import get_logger
+
+from .url_utils import canonical_url
+
+logger = get_logger()
+
+INDEX_FILE = "index.ndjson"
+BODIES_DIR = "corpos"
+CHUNK_SIZE = 64 * 1024
+
+# Headers da conexão, que não valem para a reprodução. O corpo é gravado como veio da rede (ex.: ainda comprimido),
+# então Content-Encoding e Content-Length são mantidos e o httpx decodifica o corpo reproduzido como o original
+HOP_HEADERS = frozenset({"transfer-encoding", "connection"})
+
+
+class Cassette:
+    """
+    Gravação em disco das respostas HTTP de um lote, para reproduzir exatamente a mesma carga em execuções futuras.
+    O cassete é um diretório com:
+    - index.ndjson: uma linha por resposta, com método, URL canônica, intervalo (Range), status, headers e latência
+    - corpos/<sha256>.gz: o corpo de cada resposta, comprimido e gravado uma única vez mesmo que se repita
+    Respostas da mesma requisição (ex.: um erro 503 seguido do sucesso na nova tentativa) são reproduzidas na ordem em que
+    foram gravadas, e a última se repete depois disso.
+    Os corpos são gravados e reproduzidos em stream, sem ficarem inteiros na memória (ex.: os ZIPs do TSE).
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: dict[str, list[dict]] | None = None
+        self._played: Counter[str] = Counter()
+
+    @staticmethod
+    def key(method: str, url: str, byte_range: str | None = None) -> str:
+        return f"{method.upper()} {canonical_url(url)} {byte_range or ''}".rstrip()
+
+    @property
+    def bodies_dir(self) -> Path:
+        return self.path / BODIES_DIR
+
+    # ============= GRAVAÇÃO =============
+
+    def recorder(
+        self,
+        request: httpx.Request,
+        status: int,
+        headers: list[tuple[str, str]],
+        latency: float,
+    ) -> "BodyRecorder":
+        """
+        Inicia a gravação de uma resposta. O corpo é gravado pelo BodyRecorder à medida que é lido.
+        """
+        entry = {
+            "metodo": request.method,
+            "url": canonical_url(str(request.url)),
+            "intervalo": request.headers.get("range"),
+            "status": status,
+            "headers": [[k, v] for k, v in headers if k.lower() not in HOP_HEADERS],
+            "latencia": round(latency, 4),
+        }
+        self.bodies_dir.mkdir(parents=True, exist_ok=True)
+        return BodyRecorder(self, entry, self.bodies_dir / f"{uuid4().hex}.tmp")
+
+    def store(self, entry: dict, tmp_path: Path):
+        """
+        Guarda o corpo gravado em corpos/<sha256>.gz e acrescenta a resposta ao índice.
+        """
+        with self._lock:
+            body_path = self.body_path(entry)
+            if body_path.exists():
+                tmp_path.unlink()
+            else:
+                tmp_path.replace(body_path)
+            # Uma linha por resposta, gravada na hora: uma gravação interrompida mantém tudo o que já foi baixado
+            with open(self.path / INDEX_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    # ============= REPRODUÇÃO =============
+
+    def entries(self) -> dict[str, list[dict]]:
+        with self._lock:
+            if self._entries is None:
+                index = self.path / INDEX_FILE
+                if not index.exists():
+                    raise FileNotFoundError(f"O cassete {self.path} não existe")
+                entries: dict[str, list[dict]] = {}
+                with open(index, encoding="utf-8") as f:
+                    for line in f:
+                        entry = json.loads(line)
+                        key = self.key(
+                            entry["metodo"], entry["url"], entry["intervalo"]
+                        )
+                        entries.setdefault(key, []).append(entry)
+                self._entries = entries
+            return self._entries
+
+    def next_entry(self, request: httpx.Request) -> dict | None:
+        key = self.key(request.method, str(request.url), request.headers.get("range"))
+        recorded = self.entries().get(key)
+        if not recorded:
+            return None
+        with self._lock:
+            played = self._played[key]
+            self._played[key] += 1
+        return recorded[min(played, len(recorded) - 1)]
+
+    def body_path(self, entry: dict) -> Path:
+        return self.bodies_dir / f"{entry['corpo']}.gz"
+
+    def summary(self) -> dict:
+        entries = [e for recorded in self.entries().values() for e in recorded]
+        return {
+            "respostas": len(entries),
+            "urls": len(self.entries()),
+            "bytes": sum(e["tamanho"] for e in entries),
+            "latencia_total": sum(e["latencia"] for e in entries),
+        }
+
+
+class BodyRecorder:
+    """
+    Grava o corpo de uma resposta no cassete à medida que ele é lido, comprimindo e calculando o sha256 por partes.
+    O corpo nunca fica inteiro na memória. A resposta entra no índice quando o stream é fechado, com o que foi lido até
+    ali: um corpo abandonado no meio é gravado como incompleto e reproduzido da mesma forma.
+    """
+
+    def __init__(self, cassette: Cassette, entry: dict, tmp_path: Path):
+        self.cassette = cassette
+        self.entry = entry
+        self.tmp_path = tmp_path
+        self.complete = False
+        self._file: IO[bytes] = gzip.open(tmp_path, "wb", compresslevel=6)
+        self._hash = hashlib.sha256()
+        self._size = 0
+        self._finished = False
+
+    def write(self, chunk: bytes):
+        self._hash.update(chunk)
+        self._size += len(chunk)
+        self._file.write(chunk)
+
+    def finish(self):
+        if self._finished:
+            return
+        self._finished = True
+        self._file.close()
+        self.entry.update(
+            corpo=self._hash.hexdigest(), tamanho=self._size, completo=self.complete
+        )
+        self.cassette.store(self.entry, self.tmp_path)
+
+
+class RecordingStream(httpx.SyncByteStream):
+    """
+    Stream síncrono que entrega o corpo da resposta original e grava cada pedaço no cassete enquanto ele é lido.
+    """
+
+    def __init__(self, stream: httpx.SyncByteStream, recorder: BodyRecorder):
+        self.stream = stream
+        self.recorder = recorder
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self.stream:
+            self.recorder.write(chunk)
+            yield chunk
+        self.recorder.complete = True
+
+    def close(self):
+        try:
+            self.stream.close()
+        finally:
+            self.recorder.finish()
+
+
+class AsyncRecordingStream(httpx.AsyncByteStream):
+    """
+    Stream assíncrono que entrega o corpo da resposta original e grava cada pedaço no cassete enquanto ele é lido.
+    A compressão e a escrita em disco saem do event loop para não atrasar as outras requisições.
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, recorder: BodyRecorder):
+        self.stream = stream
+        self.recorder = recorder
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            await asyncio.to_thread(self.recorder.write, chunk)
+            yield chunk
+        self.recorder.complete = True
+
+    async def aclose(self):
+        try:
+            await self.stream.aclose()
+        finally:
+            await asyncio.to_thread(self.recorder.finish)
+
+
+class CassetteBodyStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """
+    Stream do corpo gravado, descomprimido em pedaços de CHUNK_SIZE à medida que é lido.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __iter__(self) -> Iterator[bytes]:
+        with gzip.open(self.path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                yield chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        f = await asyncio.to_thread(gzip.open, self.path, "rb")
+        try:
+            while chunk := await asyncio.to_thread(f.read, CHUNK_SIZE):
+                yield chunk
+        finally:
+            f.close()
+
+
+def _filtered_headers(response: httpx.Response) -> list[tuple[str, str]]:
+    return [
+        (k, v)
+        for k, v in response.headers.multi_items()
+        if k.lower() not in HOP_HEADERS
+    ]
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """
+    Transporte síncrono que executa as requisições normalmente e grava as respostas no cassete.
+    A latência gravada é o tempo até os headers; o corpo é gravado enquanto o chamador o lê.
+    """
+
+    def __init__(
+        self, cassette: Cassette, transport: httpx.BaseTransport | None = None
+    ):
+        self.cassette = cassette
+        self.transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = self.transport.handle_request(request)
+        latency = time.perf_counter() - started
+
+        recorder = self.cassette.recorder(
+            request, response.status_code, _filtered_headers(response), latency
+        )
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=RecordingStream(
+                cast(httpx.SyncByteStream, response.stream), recorder
+            ),
+            extensions=response.extensions,
+            request=request,
+        )
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Transporte assíncrono que executa as requisições normalmente e grava as respostas no cassete.
+    A latência gravada é o tempo até os headers; o corpo é gravado enquanto o chamador o lê.
+    """
+
+    def __init__(
+        self, cassette: Cassette, transport: httpx.AsyncBaseTransport | None = None
+    ):
+        self.cassette = cassette
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        latency = time.perf_counter() - started
+
+        recorder = await asyncio.to_thread(
+            self.cassette.recorder,
+            request,
+            response.status_code,
+            _filtered_headers(response),
+            latency,
+        )
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=AsyncRecordingStream(
+                cast(httpx.AsyncByteStream, response.stream), recorder
+            ),
+            extensions=response.extensions,
+            request=request,
+        )
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    Transporte que responde com as respostas gravadas no cassete, sem acessar a rede.
+    A latência gravada é multiplicada por time_scale: 1 reproduz o tempo original, 0.1 é 10 vezes mais rápido e 0 não espera.
+    Requisições que não estão no cassete recebem 404 e um aviso é logado.
+    """
+
+    def __init__(self, cassette: Cassette, time_scale: float = 1.0):
+        self.cassette = cassette
+        self.time_scale = time_scale
+        self.misses: Counter[str] = Counter()
+
+    def replay(self, request: httpx.Request) -> tuple[httpx.Response, float]:
+        entry = self.cassette.next_entry(request)
+        if entry is None:
+            url = str(request.url)
+            if not self.misses[url]:
+                logger.warning(
+                    f"A requisição {request.method} {url} não está no cassete"
+                )
+            self.misses[url] += 1
+            return httpx.Response(404, request=request), 0.0
+
+        response = httpx.Response(
+            entry["status"],
+            headers=[tuple(h) for h in entry["headers"]],
+            stream=CassetteBodyStream(self.cassette.body_path(entry)),
+            request=request,
+        )
+        return response, entry["latencia"] * self.time_scale
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response, delay = self.replay(request)
+        time.sleep(delay)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response, delay = await asyncio.to_thread(self.replay, request)
+        await asyncio.sleep(delay)
+        return response
@@ -0,0 +1,84 @@
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from config.loader import load_config
+from database.repository.registro_ids import get_registered_ids_db
+
+APP_SETTINGS = load_config()
+
+
+@dataclass(frozen=True)
+class DeltaIds:
+    """
+    IDs que uma task baixa no lote: os novos, nunca baixados, e a fatia dos já conhecidos que será atualizada.
+    - total: número de IDs recebidos pela task
+    """
+
+    novos: list
+    atualizar: list
+    total: int
+
+    @property
+    def ids(self) -> list:
+        return self.novos + self.atualizar
+
+    def describe(self) -> str:
+        return (
+            f"{len(self.novos)} IDs novos e {len(self.atualizar)} a atualizar, "
+            f"de {self.total} IDs ({self.total - len(self.ids)} não serão baixados neste lote)"
+        )
+
+
+def select_delta_ids(
+    ids: list[Any],
+    registered: dict[str, datetime],
+    refresh_days: float,
+    now: datetime | None = None,
+) -> DeltaIds:
+    """
+    Escolhe os IDs baixados no lote a partir do registro de IDs (ID -> data do último download).
+    - Os IDs que não estão no registro são sempre baixados
+    - Dos conhecidos, são atualizados os baixados há mais tempo, em uma fatia proporcional ao tempo desde o último
+    lote: com um lote por dia e refresh_days = 10, um décimo dos IDs por lote. Assim cada ID é baixado de novo a cada
+    refresh_days, independente da frequência dos lotes
+    - IDs baixados há mais de refresh_days entram na fatia mesmo que ela fique maior (ex.: depois de dias sem lotes)
+    refresh_days = 0 baixa todos os IDs em todos os lotes.
+    """
+    ids = list(dict.fromkeys(ids))
+
+    if refresh_days <= 0:
+        return DeltaIds(novos=[], atualizar=ids, total=len(ids))
+
+    now = now or datetime.now(timezone.utc)
+    period = timedelta(days=refresh_days)
+
+    novos = [id for id in ids if str(id) not in registered]
+    known = sorted(
+        (id for id in ids if str(id) in registered),
+        key=lambda id: registered[str(id)],
+    )
+
+    if not known:
+        return DeltaIds(novos=novos, atualizar=[], total=len(ids))
+
+    last_lote = max(registered[str(id)] for id in known)
+    elapsed = min(max(now - last_lote, timedelta(0)), period)
+    size = math.ceil(len(known) * (elapsed / period))
+    overdue = sum(1 for id in known if registered[str(id)] <= now - period)
+
+    return DeltaIds(novos=novos, atualizar=known[: max(size, overdue)], total=len(ids))
+
+
+def delta_ids(task: str, ids: list[Any]) -> DeltaIds:
+    """
+    IDs que a task baixa no lote, segundo o registro de IDs da task no banco de dados.
+    Com o registro desativado na configuração, todos os IDs são baixados.
+    """
+    if not APP_SETTINGS.DELTA_IDS.ENABLED:
+        return select_delta_ids(ids, {}, refresh_days=0)
+
+    return select_delta_ids(
+        ids, get_registered_ids_db(task), APP_SETTINGS.DELTA_IDS.REFRESH_DAYS
+    )
@@ -0,0 +1,298 @@
+import hashlib
+import json
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+
+from config.loader import load_config
+from database.models.base import ParlamentarCandidatoTSE
+
+from .tse_parquet import PARTITION_COLUMN, success_marker_path
+
+APP_SETTINGS = load_config()
+
+# Similaridade mínima entre os nomes no último critério, que compara apenas candidatos da mesma UF e data de nascimento
+MIN_NAME_SIMILARITY = 0.6
+
+TSE_CANDIDATOS_COLUMNS = [
+    "SQ_CANDIDATO",
+    "NM_CANDIDATO",
+    "NM_URNA_CANDIDATO",
+    "NR_CPF_CANDIDATO",
+    "DT_NASCIMENTO",
+    PARTITION_COLUMN,
+]
+
+_NOT_LETTERS = re.compile(r"[^A-Z ]+")
+_SPACES = re.compile(r"\s+")
+_NOT_DIGITS = re.compile(r"\D+")
+
+
+def normalize_name(name: str | None) -> str | None:
+    """
+    Nome em maiúsculas, sem acentos, pontuação ou espaços repetidos. Ex.: 'José D'Ávila' -> 'JOSE D AVILA'
+    """
+    if not isinstance(name, str) or not name:
+        return None
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    name = _NOT_LETTERS.sub(" ", name.upper())
+    return _SPACES.sub(" ", name).strip() or None
+
+
+def normalize_cpf(cpf: str | None) -> str | None:
+    if not isinstance(cpf, str) or not cpf:
+        return None
+    digits = _NOT_DIGITS.sub("", cpf)
+    return digits.zfill(11) if digits else None
+
+
+def parse_date(value) -> date | None:
+    """
+    Datas no formato ISO (APIs da Câmara e do Senado) ou já convertidas (arquivos Parquet do TSE).
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def name_similarity(a: str, b: str) -> float:
+    """
+    Similaridade de Jaccard entre as palavras de dois nomes normalizados.
+    """
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+
+@dataclass(frozen=True)
+class Parlamentar:
+    casa: str
+    id: str
+    nome_civil: str | None
+    nome_parlamentar: str | None
+    data_nascimento: date | None
+    uf: str | None
+    cpf: str | None
+
+    def signature(self, source_version: str) -> str:
+        """
+        Assinatura dos dados usados na correspondência. Se nem o parlamentar nem o arquivo de candidatos do TSE mudarem,
+        a correspondência não precisa ser refeita.
+        """
+        payload = json.dumps(
+            [
+                normalize_name(self.nome_civil),
+                normalize_name(self.nome_parlamentar),
+                str(self.data_nascimento),
+                self.uf,
+                normalize_cpf(self.cpf),
+                source_version,
+            ]
+        )
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def parlamentares_camara(ndjson_path: str | Path) -> list[Parlamentar]:
+    """
+    Lê os deputados do arquivo de detalhes de deputados da Câmara.
+    """
+    parlamentares = []
+    with open(ndjson_path, encoding="utf-8") as f:
+        for line in f:
+            dados = json.loads(line).get("dados") or {}
+            if not dados.get("id"):
+                continue
+            status = dados.get("ultimoStatus") or {}
+            parlamentares.append(
+                Parlamentar(
+                    casa="camara",
+                    id=str(dados["id"]),
+                    nome_civil=dados.get("nomeCivil"),
+                    nome_parlamentar=status.get("nomeEleitoral") or status.get("nome"),
+                    data_nascimento=parse_date(dados.get("dataNascimento")),
+                    uf=status.get("siglaUf"),
+                    cpf=normalize_cpf(dados.get("cpf")),
+                )
+            )
+    return parlamentares
+
+
+def parlamentares_senado(ndjson_path: str | Path) -> list[Parlamentar]:
+    """
+    Lê os senadores do arquivo de detalhes de senadores do Senado. A API do Senado não informa o CPF.
+    """
+    parlamentares = []
+    with open(ndjson_path, encoding="utf-8") as f:
+        for line in f:
+            parlamentar = (
+                json.loads(line).get("DetalheParlamentar", {}).get("Parlamentar") or {}
+            )
+            identificacao = parlamentar.get("IdentificacaoParlamentar") or {}
+            dados_basicos = parlamentar.get("DadosBasicosParlamentar") or {}
+            if not identificacao.get("CodigoParlamentar"):
+                continue
+            parlamentares.append(
+                Parlamentar(
+                    casa="senado",
+                    id=str(identificacao["CodigoParlamentar"]),
+                    nome_civil=identificacao.get("NomeCompletoParlamentar"),
+                    nome_parlamentar=identificacao.get("NomeParlamentar"),
+                    data_nascimento=parse_date(dados_basicos.get("DataNascimento")),
+                    uf=identificacao.get("UfParlamentar"),
+                    cpf=None,
+                )
+            )
+    return parlamentares
+
+
+def candidatos_source_version(
+    year: int, transform_dir: str | Path = APP_SETTINGS.TSE.OUTPUT_TRANSFORM_DIR
+) -> str | None:
+    """
+    Versão dos arquivos Parquet de candidatos de um ano, dada pela data da última conversão.
+    """
+    marker = success_marker_path(transform_dir, "candidatos", year, "BRASIL")
+    return str(marker.stat().st_mtime_ns) if marker.exists() else None
+
+
+def load_candidatos(
+    year: int, transform_dir: str | Path = APP_SETTINGS.TSE.OUTPUT_TRANSFORM_DIR
+) -> pd.DataFrame:
+    path = Path(transform_dir) / "candidatos" / "consulta_cand" / f"ano={year}"
+    return pd.read_parquet(path, columns=TSE_CANDIDATOS_COLUMNS)
+
+
+class CandidatosIndex:
+    """
+    Índices de blocagem dos candidatos de uma eleição. Cada parlamentar é comparado apenas com os candidatos
+    que compartilham uma chave (CPF, nome + nascimento, nome + UF ou nascimento + UF), em vez de com todos os candidatos.
+    Os índices guardam os números sequenciais (SQ_CANDIDATO) de cada chave.
+    """
+
+    def __init__(self, candidatos: pd.DataFrame):
+        self.by_cpf: dict[str, set[int]] = defaultdict(set)
+        self.by_nome_nascimento: dict[tuple[str, date], set[int]] = defaultdict(set)
+        self.by_nome_uf: dict[tuple[str, str], set[int]] = defaultdict(set)
+        self.by_nascimento_uf: dict[tuple[date, str], set[int]] = defaultdict(set)
+        self.names: dict[int, str] = {}
+        self.birth_dates: dict[int, date | None] = {}
+
+        for row in candidatos.drop_duplicates("SQ_CANDIDATO").itertuples(index=False):
+            sq = int(row.SQ_CANDIDATO)
+            nome = normalize_name(row.NM_CANDIDATO)
+            nome_urna = normalize_name(row.NM_URNA_CANDIDATO)
+            nascimento = parse_date(row.DT_NASCIMENTO)
+            uf = str(getattr(row, PARTITION_COLUMN))
+            cpf = normalize_cpf(row.NR_CPF_CANDIDATO)
+
+            self.names[sq] = nome or ""
+            self.birth_dates[sq] = nascimento
+
+            if cpf:
+                self.by_cpf[cpf].add(sq)
+            if nome and nascimento:
+                self.by_nome_nascimento[(nome, nascimento)].add(sq)
+            for n in {nome, nome_urna} - {None}:
+                self.by_nome_uf[(n, uf)].add(sq)  # type: ignore
+            if nascimento:
+                self.by_nascimento_uf[(nascimento, uf)].add(sq)
+
+    def match(self, parlamentar: Parlamentar) -> tuple[int, str] | None:
+        """
+        Procura o candidato do parlamentar, do critério mais forte para o mais fraco.
+        Um critério só é aceito se apontar para um único candidato.
+        Retorna o SQ_CANDIDATO e o critério utilizado, ou None.
+        """
+        nome_civil = normalize_name(parlamentar.nome_civil)
+        nome_parlamentar = normalize_name(parlamentar.nome_parlamentar)
+        nascimento = parlamentar.data_nascimento
+        uf = parlamentar.uf
+
+        if parlamentar.cpf and len(self.by_cpf.get(parlamentar.cpf, ())) == 1:
+            return next(iter(self.by_cpf[parlamentar.cpf])), "cpf"
+
+        if nome_civil and nascimento:
+            block = self.by_nome_nascimento.get((nome_civil, nascimento), set())
+            if len(block) == 1:
+                return next(iter(block)), "nome_nascimento"
+
+        if uf:
+            for nome in (nome_civil, nome_parlamentar):
+                block = {
+                    sq
+                    for sq in self.by_nome_uf.get((nome, uf), set())  # type: ignore
+                    if nascimento is None or self.birth_dates[sq] in (None, nascimento)
+                }
+                if nome and len(block) == 1:
+                    return next(iter(block)), "nome_uf"
+
+        if nome_civil and nascimento and uf:
+            scored = sorted(
+                (
+                    (name_similarity(nome_civil, self.names[sq]), sq)
+                    for sq in self.by_nascimento_uf.get((nascimento, uf), set())
+                ),
+                reverse=True,
+            )
+            if scored and scored[0][0] >= MIN_NAME_SIMILARITY:
+                # Dois candidatos com a mesma similaridade não permitem decidir
+                if len(scored) == 1 or scored[1][0] < scored[0][0]:
+                    return scored[0][1], "nascimento_uf_similaridade"
+
+        return None
+
+
+def resolve_parlamentares(
+    parlamentares: list[Parlamentar],
+    years: list[int],
+    existing_signatures: dict[tuple[str, str, int], str],
+    transform_dir: str | Path = APP_SETTINGS.TSE.OUTPUT_TRANSFORM_DIR,
+) -> list[ParlamentarCandidatoTSE]:
+    """
+    Refaz a correspondência apenas dos pares (parlamentar, eleição) cuja assinatura mudou desde a última execução,
+    seja porque os dados do parlamentar mudaram ou porque os candidatos do TSE daquele ano foram convertidos novamente.
+    O índice de candidatos de um ano só é montado se algum parlamentar precisar dele.
+    """
+    rows = []
+    for year in years:
+        source_version = candidatos_source_version(year, transform_dir)
+        if source_version is None:
+            continue
+
+        pending = []
+        for parlamentar in parlamentares:
+            signature = parlamentar.signature(source_version)
+            key = (parlamentar.casa, parlamentar.id, year)
+            if existing_signatures.get(key) != signature:
+                pending.append((parlamentar, signature))
+
+        if not pending:
+            continue
+
+        index = CandidatosIndex(load_candidatos(year, transform_dir))
+        for parlamentar, signature in pending:
+            match = index.match(parlamentar)
+            rows.append(
+                ParlamentarCandidatoTSE(
+                    casa=parlamentar.casa,
+                    parlamentar_id=parlamentar.id,
+                    ano_eleicao=year,
+                    sq_candidato=match[0] if match else None,
+                    criterio=match[1] if match else None,
+                    assinatura=signature,
+                )
+            )
+    return rows
@@ -0,0 +1,493 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from prefect.logging import get_logger
+
+from config.loader import load_config
+
+from . import fetch_many_jsons as fetch_many_jsons_module
+from . import io as io_module
+from .fetch_many_jsons import fetch_many_jsons
+from .fetch_progress import MB, collect_progress, percentile
+from .io import fetch_html_many_async, save_json
+from .memory import current_rss, start_tracemalloc, stop_tracemalloc
+from .standin_api import (
+    LATENCY_DISTRIBUTIONS,
+    FaultProfile,
+    LatencyProfile,
+    StandInAPI,
+    serve_in_process,
+)
+from .standin_data import CAMARA_PORTAL_PREFIX, CAMARA_REST_PREFIX, StandInDataset
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+ENGINES = ("json", "html")
+
+# Primeiro ano das páginas de presença baixadas pelo motor html
+FIRST_YEAR = 2019
+
+# Intervalo entre as medições do RSS durante um cenário, em segundos
+RSS_INTERVAL = 0.05
+
+# Métricas comparadas entre duas execuções: True quando um valor maior é melhor
+COMPARED_METRICS = {
+    "requisicoes_por_s": True,
+    "latencia_p95": False,
+    "latencia_p99": False,
+    "cpu_por_requisicao_ms": False,
+    "rss_max": False,
+}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    Um ponto da matriz do benchmark:
+    - motor: json (fetch_many_jsons seguindo a paginação) ou html (fetch_html_many_async)
+    - limite: número de requisições simultâneas
+    - recursos: número de deputados baixados
+    - paginas: páginas de cada recurso. No motor html, cada página é um ano de presença em plenário
+    - itens: itens por página, que definem o tamanho das respostas do motor json. 0 no motor html
+    - latencia, latencia_media: distribuição e média (s) da latência do servidor substituto
+    - taxa_erro: fração das requisições respondidas com erro 5xx
+    """
+
+    motor: str
+    limite: int
+    recursos: int
+    paginas: int
+    itens: int
+    latencia: str
+    latencia_media: float
+    taxa_erro: float
+
+    @property
+    def id(self) -> str:
+        return (
+            f"{self.motor} limite={self.limite} recursos={self.recursos} paginas={self.paginas} "
+            f"itens={self.itens} latencia={self.latencia}:{self.latencia_media} erro={self.taxa_erro}"
+        )
+
+    @property
+    def server_key(self) -> tuple:
+        """Cenários com a mesma chave usam o mesmo servidor substituto."""
+        return (
+            self.recursos,
+            self.paginas,
+            self.itens,
+            self.latencia,
+            self.latencia_media,
+            self.taxa_erro,
+        )
+
+    def server(self) -> StandInAPI:
+        return StandInAPI(
+            dataset=StandInDataset(
+                deputados=self.recursos,
+                discursos_por_deputado=self.paginas * self.itens,
+            ),
+            latency=LatencyProfile(
+                distribution=self.latencia, mean=self.latencia_media
+            ),
+            faults=FaultProfile(error_rate=self.taxa_erro),
+        )
+
+    def urls(self, base_url: str) -> list[str]:
+        ids = StandInDataset(deputados=self.recursos).deputado_ids()
+        if self.motor == "json":
+            return [
+                f"{base_url}{CAMARA_REST_PREFIX}deputados/{id}/discursos?itens={self.itens}"
+                for id in ids
+            ]
+        return [
+            f"{base_url}{CAMARA_PORTAL_PREFIX}deputados/{id}/presenca-plenario/{ano}"
+            for id in ids
+            for ano in range(FIRST_YEAR, FIRST_YEAR + self.paginas)
+        ]
+
+
+@dataclass(frozen=True)
+class BenchmarkMatrix:
+    """
+    Valores de cada dimensão do benchmark. Os cenários são todas as combinações entre eles.
+    """
+
+    motores: tuple[str, ...] = ENGINES
+    limites: tuple[int, ...] = (5, 10, 25, 50)
+    recursos: int = 50
+    paginas: tuple[int, ...] = (1, 4)
+    itens: tuple[int, ...] = (15, 100)
+    latencias: tuple[str, ...] = ("constante", "lognormal")
+    latencia_media: float = 0.05
+    taxas_erro: tuple[float, ...] = (0.0, 0.02)
+
+    def scenarios(self) -> list[Scenario]:
+        for motor in self.motores:
+            if motor not in ENGINES:
+                raise ValueError(
+                    f"Motor {motor} inválido. Opções: {', '.join(ENGINES)}"
+                )
+        for latencia in self.latencias:
+            if latencia not in LATENCY_DISTRIBUTIONS:
+                raise ValueError(
+                    f"Distribuição de latência {latencia} inválida. Opções: {', '.join(LATENCY_DISTRIBUTIONS)}"
+                )
+
+        scenarios = []
+        for motor in self.motores:
+            # O tamanho das páginas html não varia com os itens
+            itens = self.itens if motor == "json" else (0,)
+            for latencia, taxa_erro, paginas, n, limite in itertools.product(
+                self.latencias, self.taxas_erro, self.paginas, itens, self.limites
+            ):
+                scenarios.append(
+                    Scenario(
+                        motor=motor,
+                        limite=limite,
+                        recursos=self.recursos,
+                        paginas=paginas,
+                        itens=n,
+                        latencia=latencia,
+                        latencia_media=self.latencia_media,
+                        taxa_erro=taxa_erro,
+                    )
+                )
+        return scenarios
+
+
+# Matriz reduzida, para uma verificação rápida
+QUICK_MATRIX = BenchmarkMatrix(
+    limites=(5, 25),
+    recursos=20,
+    paginas=(2,),
+    itens=(15,),
+    latencias=("lognormal",),
+    taxas_erro=(0.0,),
+)
+
+
+class RssSampler:
+    """
+    Mede o RSS do processo em segundo plano enquanto o bloco executa, para obter o pico de cada cenário.
+    """
+
+    def __init__(self, interval: float = RSS_INTERVAL):
+        self.interval = interval
+        self.start: int | None = None
+        self.max: int | None = None
+        self._stop = threading.Event()
+
+    def sample(self):
+        rss = current_rss()
+        if rss is not None:
+            self.max = max(self.max or 0, rss)
+
+    def run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self) -> "RssSampler":
+        self.start = current_rss()
+        self.sample()
+        self._thread = threading.Thread(
+            target=self.run, name="rss-benchmark", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+# Módulos de download que gravam as URLs com falha permanente na tabela erros_extract
+ERROR_WRITERS = (fetch_many_jsons_module, io_module)
+
+
+@contextmanager
+def without_error_persistence() -> Iterator[list[dict]]:
+    """
+    Substitui, durante o bloco, a gravação das falhas permanentes na tabela erros_extract por uma lista em memória.
+    """
+    errors: list[dict] = []
+    originals = [(module, module.insert_extract_error_db) for module in ERROR_WRITERS]
+    for module, _ in originals:
+        module.insert_extract_error_db = lambda **kwargs: errors.append(kwargs)
+    try:
+        yield errors
+    finally:
+        for module, original in originals:
+            module.insert_extract_error_db = original
+
+
+async def run_engine(scenario: Scenario, urls: list[str]):
+    task = f"benchmark {scenario.motor}"
+    if scenario.motor == "json":
+        return await fetch_many_jsons(
+            urls=urls,
+            not_downloaded_urls=[],
+            task=task,
+            lote_id=0,
+            limit=scenario.limite,
+            follow_pagination=True,
+        )
+    return await fetch_html_many_async(
+        urls=urls,
+        not_downloaded_urls=[],
+        lote_id=0,
+        task=task,
+        limit=scenario.limite,
+    )
+
+
+def run_scenario(scenario: Scenario, base_url: str, trace_memory: bool = False) -> dict:
+    """
+    Executa um cenário contra o servidor substituto em base_url e retorna as suas métricas.
+    A CPU é a do processo do benchmark, sem o servidor, que executa em outro processo.
+    As falhas permanentes (com a taxa de erro injetada) não são gravadas na tabela erros_extract: o cenário não depende
+    do banco de dados, que receberia um lote falso e somaria o tempo de conexão à duração medida.
+    Com trace_memory, o pico de memória rastreada pelo tracemalloc também é medido, ao custo de mais CPU.
+    """
+    urls = scenario.urls(base_url)
+    error = None
+
+    if trace_memory:
+        start_tracemalloc()
+        tracemalloc.reset_peak()
+    try:
+        with (
+            without_error_persistence(),
+            collect_progress() as progresses,
+            RssSampler() as rss,
+        ):
+            cpu_started = time.process_time()
+            started = time.perf_counter()
+            try:
+                asyncio.run(run_engine(scenario, urls))
+            except Exception as e:
+                error = str(e)
+                logger.error(f"O cenário {scenario.id} falhou: {e}")
+            duration = time.perf_counter() - started
+            cpu = time.process_time() - cpu_started
+        traced_peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            stop_tracemalloc()
+
+    latencies = sorted(lat for p in progresses for lat in p.latencies)
+    requests = len(latencies)
+    pages = sum(p.pages for p in progresses)
+    nbytes = sum(p.bytes for p in progresses)
+    return {
+        "cenario": scenario.id,
+        **asdict(scenario),
+        "duracao": duration,
+        "requisicoes": requests,
+        "urls_baixadas": sum(p.succeeded for p in progresses),
+        "falhas": sum(p.failed for p in progresses),
+        "novas_tentativas": sum(p.retries for p in progresses),
+        "bytes": nbytes,
+        "bytes_por_resposta": nbytes / pages if pages else None,
+        "requisicoes_por_s": requests / duration if duration > 0 else None,
+        "mb_por_s": nbytes / MB / duration if duration > 0 else None,
+        "cpu": cpu,
+        "cpu_por_requisicao_ms": 1000 * cpu / requests if requests else None,
+        **{f"latencia_p{q}": percentile(latencies, q) for q in (50, 95, 99)},
+        "latencia_max": latencies[-1] if latencies else None,
+        "rss_inicio": rss.start,
+        "rss_max": rss.max,
+        "tracemalloc_pico": traced_peak,
+        "erro": error,
+    }
+
+
+def run_benchmark(scenarios: list[Scenario], trace_memory: bool = False) -> dict:
+    """
+    Executa os cenários, reaproveitando o servidor substituto entre os cenários que diferem apenas no motor e no limite.
+    """
+    groups: dict[tuple, list[Scenario]] = {}
+    for scenario in scenarios:
+        groups.setdefault(scenario.server_key, []).append(scenario)
+
+    results = []
+    for group in groups.values():
+        with serve_in_process(group[0].server()) as base_url:
+            for scenario in group:
+                logger.info(
+                    f"Benchmark {len(results) + 1}/{len(scenarios)}: {scenario.id}"
+                )
+                results.append(run_scenario(scenario, base_url, trace_memory))
+
+    return {
+        "criado_em": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "cenarios": results,
+    }
+
+
+def save_results(results: dict, path: str | Path | None = None) -> str:
+    if path is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = Path(APP_SETTINGS.BENCHMARK.DIR) / f"fetch_{stamp}.json"
+    return save_json(results, path)
+
+
+def load_results(path: str | Path) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(
+    base: dict,
+    current: dict,
+    threshold: float = APP_SETTINGS.BENCHMARK.REGRESSION_THRESHOLD,
+) -> list[dict]:
+    """
+    Compara as métricas dos cenários presentes nas duas execuções.
+    Cada linha traz a variação relativa de cada métrica e as regressões: as métricas que pioraram mais que threshold.
+    """
+    base_scenarios = {s["cenario"]: s for s in base["cenarios"]}
+    rows = []
+    for scenario in current["cenarios"]:
+        previous = base_scenarios.get(scenario["cenario"])
+        if previous is None:
+            continue
+
+        changes = {}
+        regressions = []
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            before, after = previous.get(metric), scenario.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            changes[metric] = change
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append(metric)
+
+        rows.append(
+            {
+                "cenario": scenario["cenario"],
+                "variacoes": changes,
+                "regressoes": regressions,
+            }
+        )
+    return rows
+
+
+def format_results(results: dict) -> str:
+    def value(v, fmt: str) -> str:
+        return format(v, fmt) if v is not None else "?"
+
+    lines = [
+        f"{'Cenário':<95} {'req/s':>8} {'CPU/req ms':>10} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'RSS MB':>7}"
+    ]
+    for s in results["cenarios"]:
+        rss = s["rss_max"] / MB if s["rss_max"] is not None else None
+        lines.append(
+            f"{s['cenario']:<95} {value(s['requisicoes_por_s'], '8.1f')} "
+            f"{value(s['cpu_por_requisicao_ms'], '10.3f')} {value(s['latencia_p50'], '7.3f')} "
+            f"{value(s['latencia_p95'], '7.3f')} {value(s['latencia_p99'], '7.3f')} {value(rss, '7.1f')}"
+            + (f"  ERRO: {s['erro']}" if s["erro"] else "")
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(rows: list[dict]) -> str:
+    lines = []
+    for row in rows:
+        changes = ", ".join(
+            f"{metric} {change:+.1%}" for metric, change in row["variacoes"].items()
+        )
+        flag = (
+            f"  REGRESSÃO: {', '.join(row['regressoes'])}" if row["regressoes"] else ""
+        )
+        lines.append(f"{row['cenario']}: {changes}{flag}")
+    return "\n".join(lines)
+
+
+def parse_list(value: str, cast=str) -> tuple:
+    return tuple(cast(v.strip()) for v in value.split(",") if v.strip())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark de fetch_many_jsons e fetch_html_many_async contra o servidor substituto das APIs",
+    )
+    default = BenchmarkMatrix()
+    parser.add_argument("--rapido", action="store_true", help="Usa a matriz reduzida")
+    parser.add_argument("--motores", type=parse_list, default=default.motores)
+    parser.add_argument(
+        "--limites", type=lambda v: parse_list(v, int), default=default.limites
+    )
+    parser.add_argument("--recursos", type=int, default=default.recursos)
+    parser.add_argument(
+        "--paginas", type=lambda v: parse_list(v, int), default=default.paginas
+    )
+    parser.add_argument(
+        "--itens", type=lambda v: parse_list(v, int), default=default.itens
+    )
+    parser.add_argument("--latencias", type=parse_list, default=default.latencias)
+    parser.add_argument("--latencia-media", type=float, default=default.latencia_media)
+    parser.add_argument(
+        "--taxas-erro", type=lambda v: parse_list(v, float), default=default.taxas_erro
+    )
+    parser.add_argument(
+        "--memoria",
+        action="store_true",
+        help="Mede também o pico do tracemalloc (aumenta a CPU medida)",
+    )
+    parser.add_argument("--saida", help="Arquivo JSON dos resultados")
+    parser.add_argument(
+        "--comparar", help="Resultados anteriores, para comparar com esta execução"
+    )
+    args = parser.parse_args(argv)
+
+    matrix = (
+        QUICK_MATRIX
+        if args.rapido
+        else BenchmarkMatrix(
+            motores=args.motores,
+            limites=args.limites,
+            recursos=args.recursos,
+            paginas=args.paginas,
+            itens=args.itens,
+            latencias=args.latencias,
+            latencia_media=args.latencia_media,
+            taxas_erro=args.taxas_erro,
+        )
+    )
+
+    results = run_benchmark(matrix.scenarios(), trace_memory=args.memoria)
+    path = save_results(results, args.saida)
+    print(format_results(results))
+    print(f"\nResultados salvos em {path}")
+
+    if args.comparar:
+        rows = compare(load_results(args.comparar), results)
+        print(f"\nComparação com {args.comparar}:")
+        print(format_comparison(rows))
+        if any(row["regressoes"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,8 +11,12 @@ from database.repository.erros_extract import (
     update_not_downloaded_urls_db,
 )
 
+from .artifact_aggregates import ArtifactAggregates
+from .fetch_progress import FetchProgress, count_records
+from .http_client import async_http_client
 from .io import ensure_dir
-from .url_utils import alter_query_param_value, get_query_param_value, is_first_page
+from .task_metrics import record_fetch_metrics
+from .url_utils import canonical_url, get_page_number, page_url, split_page_url
 
 logger = get_logger()
 
@@ -29,15 +33,20 @@ async def fetch_many_jsons(
     max_retries: int = 10,
     follow_pagination: bool = False,
     validate_results: bool = False,
+    aggregates: ArtifactAggregates | None = None,
 ) -> list[str] | list[dict]:
     """
     - Se out_dir for fornecido, salva cada JSON em um arquivo e retorna a lista de caminhos
     - Caso contrário, retorna a lista de dicionários em memória
+    - aggregates, se fornecido, é alimentado com cada JSON assim que ele é baixado
     """
 
     db_errors = []
     out_dir = ensure_dir(out_dir) if out_dir else None
 
+    # Chaveado pela URL canônica, a mesma gravada na tabela erros_extract
+    failed_urls = {canonical_url(error.url): error for error in not_downloaded_urls}
+
     async def worker(
         queue: asyncio.Queue,
         results: list[dict],
@@ -45,11 +54,15 @@ async def fetch_many_jsons(
         semaphore: asyncio.Semaphore,
         client: httpx.AsyncClient,
         stats: dict,
+        progress: FetchProgress,
         task: str,
         lote_id: int,
     ):
         while True:  # Mantém o consumidor da fila vivo para processar outras urls
-            url = await queue.get()
+            # A fila guarda a URL canônica da primeira página e o número da página,
+            # assim a paginação não depende de interpretar as URLs
+            base_url, page = await queue.get()
+            url = page_url(base_url, page)
 
             if url in processed_urls:
                 queue.task_done()
@@ -59,14 +72,13 @@ async def fetch_many_jsons(
             processed_urls.add(url)
 
             async with semaphore:
-                print(f"Baixando URL: {url=}")
-
-                # status_code = None
-                # request_message = None
-
                 for attempt in range(max_retries):
                     try:
-                        response = await client.get(url, timeout=timeout)
+                        started = progress.request_started(url)
+                        try:
+                            response = await client.get(url, timeout=timeout)
+                        finally:
+                            progress.request_finished(url, started)
 
                         status_code = response.status_code
 
@@ -74,7 +86,7 @@ async def fetch_many_jsons(
 
                         data = response.json()
 
-                        if is_first_page(url):
+                        if page == 1:
                             total_items = response.headers.get("x-total-count", None)
 
                             if total_items:
@@ -89,12 +101,7 @@ async def fetch_many_jsons(
                             # await asyncio.to_thread(save_json, path, data)
                             # results.append(str(path))
                         else:
-                            results.append(data)
-
                             # Verificar e atualizar no banco de dados as urls com falhas
-                            failed_urls = {
-                                error.url: error for error in not_downloaded_urls
-                            }
                             if failed_urls:
                                 try:
                                     update_url_not_downloaded(
@@ -109,17 +116,23 @@ async def fetch_many_jsons(
                                     db_errors.append(url)
 
                         # Se tiver paginação, adiciona novas URLs à fila
-                        if follow_pagination and "links" in data:
-                            links = {
-                                link["rel"]: link["href"] for link in data["links"]
-                            }
-                            if "self" in links and "last" in links:
-                                for new_url in generate_pages_urls(
-                                    links["self"], links["last"]
-                                ):
-                                    if new_url not in processed_urls:
-                                        await queue.put(new_url)
-
+                        # Apenas a primeira página gera as URLs das páginas seguintes
+                        if follow_pagination and page == 1 and "links" in data:
+                            for new_page in range(2, get_last_page(data) + 1):
+                                if page_url(base_url, new_page) not in processed_urls:
+                                    progress.add_planned(1)
+                                    await queue.put((base_url, new_page))
+
+                        progress.success(
+                            url, len(response.content), records=count_records(data)
+                        )
+
+                        # Apenas depois de tudo o que pode falhar na tentativa, para que uma nova tentativa
+                        # não conte a mesma página duas vezes
+                        if not out_dir:
+                            results.append(data)
+                            if aggregates is not None:
+                                aggregates.feed(data)
                         queue.task_done()
                         break
                     except Exception as e:
@@ -127,8 +140,13 @@ async def fetch_many_jsons(
                             logger.warning(
                                 f"Um erro ocorreu no fetch de dados: {e}. TENTANDO NOVAMENTE. Tentativa: {attempt}"
                             )
-                            await asyncio.sleep(2**attempt)
+                            progress.retry_started()
+                            try:
+                                await asyncio.sleep(2**attempt)
+                            finally:
+                                progress.retry_finished()
                         else:
+                            progress.failure()
                             queue.task_done()
                             message = f"Falha permanente ao baixar {url} após {max_retries} tentativas: {e}"
                             logger.error(message)
@@ -156,16 +174,19 @@ async def fetch_many_jsons(
 
     queue = asyncio.Queue()
 
+    # URLs de páginas seguintes (ex.: que falharam em lotes anteriores) entram com o seu número de página,
+    # assim não geram novamente a paginação do recurso
     for u in urls:
-        await queue.put(u)
+        await queue.put(split_page_url(canonical_url(u)))
 
     processed_urls = set()
     results = []
     stats = {"total_items": 0}
 
     semaphore = asyncio.Semaphore(limit)
+    progress = FetchProgress(task=task, planned=queue.qsize(), limit=limit)
 
-    async with httpx.AsyncClient(headers=headers) as client:
+    async with async_http_client(headers=headers) as client, progress.report():
         workers = [
             asyncio.create_task(
                 worker(
@@ -175,6 +196,7 @@ async def fetch_many_jsons(
                     semaphore,
                     client,
                     stats,
+                    progress,
                     task,
                     lote_id,
                 )
@@ -189,6 +211,8 @@ async def fetch_many_jsons(
     for w in workers:
         w.cancel()
 
+    record_fetch_metrics(progress, lote_id)
+
     if validate_results:
         validate(
             results=results,
@@ -206,31 +230,14 @@ async def fetch_many_jsons(
     return results
 
 
-def generate_pages_urls(url_self: str, url_last: str):
+def get_last_page(data: dict) -> int:
     """
-    Caso a url baixada tenha mais páginas, retorna uma lista com as páginas adicionais a serem baixadas
+    Retorna o número da última página de um recurso paginado a partir do link 'last' da primeira página
     """
-    # Pega o número da primeira página
-    self_page = int(get_query_param_value(url_self, "pagina", "1"))
-
-    # Se não for a primeira página, retorna pois todas as URLs já foram geradas
-    if self_page > 1:
-        return []
-
-    # Pega o número da última página
-    last_page = int(
-        get_query_param_value(url=url_last, param_name="pagina", default_value="1")
-    )
-
-    # Gera as urls das páginas seguintes
-    urls = []
-    for page in range(2, (last_page + 1)):
-        new_url = alter_query_param_value(
-            base_url=url_self, param_name="pagina", new_value=page
-        )
-        urls.append(new_url)
-
-    return urls
+    for link in data.get("links", []):
+        if link.get("rel") == "last":
+            return get_page_number(link.get("href", ""))
+    return 1
 
 
 def validate(
@@ -271,9 +278,10 @@ def update_url_not_downloaded(
     lote_id: int, url: str, failed_urls: dict[str, ErrorExtract]
 ):
     """
-    Atualiza no banco de dados o registro da URL que não havia sido baixada
+    Atualiza no banco de dados o registro da URL que não havia sido baixada.
+    A URL e as chaves de failed_urls devem estar na forma canônica.
     """
 
-    if url in failed_urls:
-        error = failed_urls[url]
+    error = failed_urls.get(url)
+    if error is not None:
         update_not_downloaded_urls_db(lote_id=lote_id, error_id=error.id)
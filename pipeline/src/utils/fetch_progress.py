@@ -0,0 +1,306 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Iterator
+from urllib.parse import urlsplit
+from uuid import UUID
+
+from prefect.artifacts import (
+    acreate_markdown_artifact,
+    acreate_progress_artifact,
+    aupdate_progress_artifact,
+)
+from prefect.context import TaskRunContext
+from prefect.exceptions import MissingContextError
+from prefect.logging import get_logger, get_run_logger
+
+from config.loader import load_config
+
+APP_SETTINGS = load_config()
+
+MB = 1024 * 1024
+
+# Lista que recebe os FetchProgress criados no contexto atual, usada por collect_progress
+_collected: ContextVar[list["FetchProgress"] | None] = ContextVar(
+    "fetch_progress_collected", default=None
+)
+
+
+def progress_logger() -> logging.Logger | logging.LoggerAdapter:
+    """
+    Logger da Task Run atual, para que o progresso apareça nos logs da task. Fora de uma execução usa o logger do Prefect.
+    """
+    try:
+        return get_run_logger()
+    except MissingContextError:
+        return get_logger()
+
+
+def percentile(sorted_values: list[float], q: float) -> float | None:
+    """
+    Percentil q (0 a 100) de uma lista já ordenada, pelo método do posto mais próximo.
+    """
+    if not sorted_values:
+        return None
+    rank = max(int(-(-q * len(sorted_values) // 100)), 1)  # Teto de q% de n
+    return sorted_values[rank - 1]
+
+
+def artifact_key(task: str, prefix: str = "progresso") -> str:
+    """
+    Chave dos artefatos da task. O Prefect aceita apenas letras minúsculas, números e hífens.
+    """
+    key = "".join(c if c.isalnum() else "-" for c in task.lower())
+    return f"{prefix}-{key.strip('-')}"
+
+
+def format_duration(seconds: float | None) -> str:
+    if seconds is None:
+        return "?"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return (
+        f"{hours}h{minutes:02d}m{seconds:02d}s"
+        if hours
+        else f"{minutes}m{seconds:02d}s"
+    )
+
+
+def progress_markdown(snapshot: dict) -> str:
+    """
+    Tabela em markdown com o estado atual do download, publicada como artefato durante a execução da task.
+    """
+    s = snapshot
+    percent = 100 * s["done"] / s["planned"] if s["planned"] else 0.0
+    lines = [
+        f"### {s['task']}",
+        "",
+        "| Métrica | Valor |",
+        "| --- | --- |",
+        f"| URLs concluídas | {s['done']}/{s['planned']} ({percent:.1f}%) |",
+        f"| Falhas | {s['failed']} |",
+        f"| Páginas/s | {s['pages_per_s']:.2f} |",
+        f"| MB/s | {s['mb_per_s']:.2f} |",
+        f"| MB baixados | {s['bytes'] / MB:.1f} |",
+        f"| Fila de novas tentativas | {s['retrying']} (total: {s['retries']}) |",
+        f"| Janela de concorrência | {s['in_flight']}/{s['limit']} |",
+        f"| Tempo decorrido | {format_duration(s['elapsed'])} |",
+        f"| ETA | {format_duration(s['eta'])} |",
+    ]
+    if s["hosts"]:
+        lines += ["", "| Host | Requisições em andamento |", "| --- | --- |"]
+        lines += [f"| {host} | {n} |" for host, n in sorted(s["hosts"].items())]
+    return "\n".join(lines)
+
+
+def count_records(data: Any) -> int:
+    """
+    Número de registros de uma resposta: os itens de 'dados' nas páginas da Câmara, os itens de uma lista ou 1.
+    """
+    if isinstance(data, dict) and isinstance(data.get("dados"), list):
+        return len(data["dados"])
+    if isinstance(data, list):
+        return len(data)
+    return 1
+
+
+@contextmanager
+def collect_progress() -> Iterator[list["FetchProgress"]]:
+    """
+    Entrega a lista dos FetchProgress criados dentro do bloco, para medir os downloads de fora (ex.: o benchmark)
+    sem alterar a assinatura das funções de download.
+    """
+    collected: list[FetchProgress] = []
+    token = _collected.set(collected)
+    try:
+        yield collected
+    finally:
+        _collected.reset(token)
+
+
+class FetchProgress:
+    """
+    Progresso agregado dos downloads de uma task com muitas URLs.
+    - O loop de download apenas atualiza contadores, sem logar nada por URL
+    - report() loga um resumo (contagens, taxas, bytes e ETA) a cada interval segundos e ao final
+    - Uma a cada sample_every URLs concluídas é logada em DEBUG. Falhas continuam sendo logadas por quem faz o download
+    - Dentro de uma Task Run, report() também publica um artefato de progresso e uma tabela em markdown,
+      atualizados a cada interval segundos, para acompanhar travamentos e limitações das APIs durante a execução
+    """
+
+    def __init__(
+        self,
+        task: str,
+        planned: int,
+        limit: int | None = None,
+        interval: float = APP_SETTINGS.ALLENDPOINTS.PROGRESS_INTERVAL,
+        sample_every: int = APP_SETTINGS.ALLENDPOINTS.PROGRESS_SAMPLE,
+        logger: logging.Logger | logging.LoggerAdapter | None = None,
+        artifacts: bool = APP_SETTINGS.ALLENDPOINTS.PROGRESS_ARTIFACTS,
+    ):
+        self.task = task
+        self.planned = planned
+        self.limit = limit
+        self.artifacts = artifacts
+        self.interval = interval
+        self.sample_every = sample_every
+        self.logger = logger or progress_logger()
+
+        self.succeeded = 0
+        self.failed = 0
+        self.pages = 0
+        self.records = 0
+        self.bytes = 0
+        self.retries = 0
+        self.in_flight = 0
+        self.hosts: Counter[str] = Counter()
+        self.retrying = 0
+        self.latencies: list[float] = []
+        self.started = time.monotonic()
+
+        collected = _collected.get()
+        if collected is not None:
+            collected.append(self)
+
+    def add_planned(self, n: int):
+        """URLs descobertas durante o download, como as páginas seguintes de um recurso paginado."""
+        self.planned += n
+
+    def request_started(self, url: str) -> float:
+        """Retorna o instante de início da requisição, usado por request_finished para medir a latência."""
+        self.in_flight += 1
+        self.hosts[urlsplit(url).netloc] += 1
+        return time.monotonic()
+
+    def request_finished(self, url: str, started: float):
+        self.latencies.append(time.monotonic() - started)
+        self.in_flight -= 1
+        host = urlsplit(url).netloc
+        self.hosts[host] -= 1
+        if not self.hosts[host]:
+            del self.hosts[host]
+
+    def retry_started(self):
+        self.retries += 1
+        self.retrying += 1
+
+    def retry_finished(self):
+        self.retrying -= 1
+
+    def success(self, url: str, nbytes: int, records: int = 1, pages: int = 1):
+        self.succeeded += 1
+        self.pages += pages
+        self.records += records
+        self.bytes += nbytes
+        if self.sample_every and self.succeeded % self.sample_every == 0:
+            self.logger.debug(f"{self.task}: URL {self.succeeded} baixada: {url}")
+
+    def failure(self):
+        self.failed += 1
+
+    @property
+    def done(self) -> int:
+        return self.succeeded + self.failed
+
+    def latency_percentiles(self) -> dict[str, float | None]:
+        latencies = sorted(self.latencies)
+        return {f"p{q}": percentile(latencies, q) for q in (50, 95, 99)}
+
+    def snapshot(self) -> dict:
+        elapsed = time.monotonic() - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.planned - self.done, 0)
+        return {
+            "task": self.task,
+            "planned": self.planned,
+            "done": self.done,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "pages": self.pages,
+            "records": self.records,
+            "bytes": self.bytes,
+            "retries": self.retries,
+            "in_flight": self.in_flight,
+            "hosts": dict(self.hosts),
+            "limit": self.limit if self.limit is not None else "-",
+            "retrying": self.retrying,
+            "elapsed": elapsed,
+            "urls_per_s": rate,
+            "pages_per_s": self.pages / elapsed if elapsed > 0 else 0.0,
+            "mb_per_s": self.bytes / MB / elapsed if elapsed > 0 else 0.0,
+            "eta": remaining / rate if rate > 0 else None,
+        }
+
+    def message(self, snapshot: dict | None = None) -> str:
+        s = snapshot or self.snapshot()
+        eta = f"{s['eta']:.0f}s" if s["eta"] is not None else "?"
+        return (
+            f"{s['task']}: {s['done']}/{s['planned']} URLs ({s['failed']} falhas, {s['retries']} novas tentativas) | "
+            f"{s['urls_per_s']:.1f} URLs/s | {s['bytes'] / MB:.1f} MB a {s['mb_per_s']:.2f} MB/s | "
+            f"em andamento: {s['in_flight']} | ETA: {eta}"
+        )
+
+    def log(self):
+        snapshot = self.snapshot()
+        self.logger.info(self.message(snapshot), extra={"progress": snapshot})
+        return snapshot
+
+    async def publish(self, snapshot: dict, artifact_id: UUID | None) -> UUID | None:
+        """
+        Publica o progresso nos artefatos da Task Run. Retorna o id do artefato de progresso, criado na primeira chamada.
+        Falhas ao publicar são apenas logadas, para não interromper o download.
+        """
+        percent = (
+            100 * snapshot["done"] / snapshot["planned"] if snapshot["planned"] else 0.0
+        )
+        key = artifact_key(self.task)
+        try:
+            if artifact_id is None:
+                artifact_id = await acreate_progress_artifact(
+                    progress=percent, key=key, description=f"Progresso de {self.task}"
+                )
+            else:
+                await aupdate_progress_artifact(artifact_id, progress=percent)
+            await acreate_markdown_artifact(
+                markdown=progress_markdown(snapshot),
+                key=f"{key}-tabela",
+                description=f"Estado do download de {self.task}",
+            )
+        except Exception as e:
+            self.logger.warning(
+                f"Não foi possível publicar o progresso de {self.task}: {e}"
+            )
+        return artifact_id
+
+    @asynccontextmanager
+    async def report(self) -> AsyncIterator["FetchProgress"]:
+        """
+        Loga (e publica nos artefatos, dentro de uma Task Run) o progresso em segundo plano enquanto o bloco executa,
+        e o resumo final ao sair.
+        """
+        publish = self.artifacts and TaskRunContext.get() is not None
+        artifact_id = None
+
+        async def reporter():
+            nonlocal artifact_id
+            # Os artefatos são criados logo no início, para que a task apareça na UI antes do primeiro intervalo
+            if publish:
+                artifact_id = await self.publish(self.snapshot(), artifact_id)
+            while True:
+                await asyncio.sleep(self.interval)
+                snapshot = self.log()
+                if publish:
+                    artifact_id = await self.publish(snapshot, artifact_id)
+
+        self.started = time.monotonic()
+        reporter_task = asyncio.create_task(reporter())
+        try:
+            yield self
+        finally:
+            reporter_task.cancel()
+            snapshot = self.log()
+            if publish:
+                await self.publish(snapshot, artifact_id)
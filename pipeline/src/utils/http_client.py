@@ -0,0 +1,61 @@
+from functools import cache
+from typing import Any
+
+import httpx
+
+from config.loader import load_config
+
+from .cassette import (
+    AsyncRecordingTransport,
+    Cassette,
+    RecordingTransport,
+    ReplayTransport,
+)
+
+APP_SETTINGS = load_config()
+
+CASSETTE_MODES = ("off", "record", "replay")
+
+
+@cache
+def current_cassette() -> Cassette | None:
+    """
+    Cassete do processo, conforme [CASSETTE]. None quando as requisições vão direto para a rede.
+    """
+    settings = APP_SETTINGS.CASSETTE
+    if settings.MODE not in CASSETTE_MODES:
+        raise ValueError(
+            f"Modo de cassete inválido: '{settings.MODE}'. Use um de {CASSETTE_MODES}"
+        )
+    if settings.MODE == "off":
+        return None
+    return Cassette(settings.DIR)
+
+
+def http_client(**kwargs: Any) -> httpx.Client:
+    """
+    Cliente HTTP síncrono do pipeline. Todas as requisições passam por aqui para que o modo cassete possa gravá-las ou
+    reproduzi-las. Os argumentos são os mesmos de httpx.Client.
+    """
+    cassette = current_cassette()
+    if cassette is None:
+        return httpx.Client(**kwargs)
+    if APP_SETTINGS.CASSETTE.MODE == "record":
+        return httpx.Client(transport=RecordingTransport(cassette), **kwargs)
+    return httpx.Client(
+        transport=ReplayTransport(cassette, APP_SETTINGS.CASSETTE.TIME_SCALE), **kwargs
+    )
+
+
+def async_http_client(**kwargs: Any) -> httpx.AsyncClient:
+    """
+    Cliente HTTP assíncrono do pipeline, com o mesmo comportamento de http_client no modo cassete.
+    """
+    cassette = current_cassette()
+    if cassette is None:
+        return httpx.AsyncClient(**kwargs)
+    if APP_SETTINGS.CASSETTE.MODE == "record":
+        return httpx.AsyncClient(transport=AsyncRecordingTransport(cassette), **kwargs)
+    return httpx.AsyncClient(
+        transport=ReplayTransport(cassette, APP_SETTINGS.CASSETTE.TIME_SCALE), **kwargs
+    )
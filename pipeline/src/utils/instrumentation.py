@@ -0,0 +1,170 @@
+import inspect
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable
+
+from prefect.artifacts import acreate_markdown_artifact, create_markdown_artifact
+from prefect.context import TaskRunContext
+from prefect.logging import get_logger
+
+from config.loader import load_config
+
+from .fetch_progress import artifact_key
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+
+class Instrument:
+    """
+    Base dos instrumentos de diagnóstico das tasks. O decorador instrumented chama start() antes da task e stop()
+    depois dela, mesmo em caso de erro, e publica o markdown() de todos os instrumentos em um único artefato.
+    """
+
+    title = ""
+
+    def __init__(self, task_name: str, lote_id: int | None):
+        self.task_name = task_name
+        self.lote_id = lote_id
+
+    @property
+    def run_name(self) -> str:
+        """Nome da Task Run, que diferencia os arquivos de tasks executadas várias vezes no mesmo lote."""
+        context = TaskRunContext.get()
+        return context.task_run.name if context is not None else self.task_name
+
+    @property
+    def output_dir(self) -> Path:
+        """Diretório dos relatórios do lote, criado apenas quando algum instrumento grava arquivos."""
+        lote = f"lote_{self.lote_id}" if self.lote_id is not None else "sem_lote"
+        path = Path(APP_SETTINGS.INSTRUMENTATION.OUTPUT_DIR) / lote
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def markdown(self) -> str:
+        return ""
+
+
+def task_enabled(task_name: str, tasks: list[str]) -> bool:
+    return "*" in tasks or task_name in tasks
+
+
+def task_instruments(task_name: str) -> list[type[Instrument]]:
+    """
+    Instrumentos ativados na configuração para a task.
+    """
+    # Importados aqui pois os instrumentos dependem de Instrument, definido neste módulo
+    from .loop_lag import LoopLagMonitor
+    from .memory import MemoryMonitor
+    from .profiling import TaskProfiler
+
+    settings = APP_SETTINGS.INSTRUMENTATION
+    candidates = [
+        (TaskProfiler, settings.PROFILE_TASKS),
+        (LoopLagMonitor, settings.LOOP_LAG_TASKS),
+        (MemoryMonitor, settings.MEMORY_TASKS),
+    ]
+    return [cls for cls, tasks in candidates if task_enabled(task_name, tasks)]
+
+
+def instrumentation_report(task_name: str, instruments: list[Instrument]) -> str:
+    sections = [f"## Instrumentação de {task_name}"]
+    for instrument in instruments:
+        body = instrument.markdown()
+        if body:
+            sections.append(f"### {instrument.title}\n\n{body}")
+    return "\n\n".join(sections)
+
+
+def instrumented(task_name: str) -> Callable:
+    """
+    Executa a task com os instrumentos de diagnóstico ativados para ela em [INSTRUMENTATION].
+    Deve ficar abaixo do @task, para que a instrumentação aconteça dentro da Task Run.
+    A configuração é lida na importação: se nenhum instrumento está ativo, a própria função é retornada, sem custo
+    nenhum na execução.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        instrument_classes = task_instruments(task_name)
+        if not instrument_classes:
+            return fn
+
+        signature = inspect.signature(fn)
+
+        def create_instruments(args: tuple, kwargs: dict) -> list[Instrument]:
+            lote_id = signature.bind_partial(*args, **kwargs).arguments.get("lote_id")
+            return [cls(task_name, lote_id) for cls in instrument_classes]
+
+        def start(instruments: list[Instrument]):
+            for instrument in instruments:
+                instrument.start()
+
+        def stop(instruments: list[Instrument]) -> str | None:
+            """Encerra os instrumentos e retorna o relatório a ser publicado, ou None fora de uma Task Run."""
+            for instrument in reversed(instruments):
+                try:
+                    instrument.stop()
+                except Exception as e:
+                    logger.warning(
+                        f"Erro ao encerrar o instrumento '{instrument.title}' da task {task_name}: {e}"
+                    )
+            if TaskRunContext.get() is None:
+                return None
+            return instrumentation_report(task_name, instruments)
+
+        key = artifact_key(task_name, prefix="instrumentacao")
+        description = f"Instrumentação de {task_name}"
+
+        if inspect.iscoroutinefunction(fn):
+
+            @wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                instruments = create_instruments(args, kwargs)
+                start(instruments)
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    report = stop(instruments)
+                    if report is not None:
+                        try:
+                            await acreate_markdown_artifact(
+                                markdown=report, key=key, description=description
+                            )
+                        except Exception as e:
+                            logger.warning(
+                                f"Não foi possível publicar a instrumentação de {task_name}: {e}"
+                            )
+
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            instruments = create_instruments(args, kwargs)
+            start(instruments)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                report = stop(instruments)
+                if report is not None:
+                    try:
+                        create_markdown_artifact(
+                            markdown=report,
+                            key=key,
+                            description=description,
+                            _sync=True,
+                        )
+                    except Exception as e:
+                        logger.warning(
+                            f"Não foi possível publicar a instrumentação de {task_name}: {e}"
+                        )
+
+        return wrapper
+
+    return decorator
@@ -4,9 +4,8 @@ import json
 import os
 import shutil
 import time
-import zipfile
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 import httpx
 from prefect.logging import get_logger
@@ -19,6 +18,11 @@ from database.repository.erros_extract import (
     update_not_downloaded_urls_db,
 )
 
+from .fetch_progress import FetchProgress, count_records
+from .http_client import async_http_client, http_client
+from .task_metrics import record_fetch_metrics, record_output_size
+from .url_utils import canonical_url
+
 APP_SETTINGS = load_config()
 
 logger = get_logger()
@@ -31,116 +35,62 @@ def ensure_dir(path: str | Path) -> Path:
     return p
 
 
-# Download de arquivos zip em streaming por conta dos arquivos pesados
-def download_stream(
-    url: str,
-    lote_id: int,
-    task: str,
-    dest_path: str | Path,
-    unzip: bool = False,
-    timeout: float = 60.0,
-    max_retries: int = APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
-) -> str | None:
-    """
-    Faça o download de um arquivo em stream e opcionalmente extrai os arquivos, caso seja um ZIP.
-    Retorna o caminho do arquivo.
-    """
-    dest_path = Path(dest_path)
-    ensure_dir(dest_path.parent)
-
-    for attempt in range(max_retries):
-        try:
-            with httpx.stream("GET", url, timeout=timeout) as r:
-                r.raise_for_status()
-
-                _total_size = int(r.headers.get("content-length", 0))
-                downloaded_size = 0
-
-                with open(dest_path, "wb") as f:
-                    for chunk in r.iter_bytes():
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-
-                if unzip:
-                    _extracted_files = unzip_file(dest_path)
-                    dest_path.unlink()  # Apaga os zips após a extração
-                    return str(dest_path)
-                else:
-                    return str(dest_path)
-        except Exception as e:
-            status_code = (
-                e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
-            )
-
-            print(
-                f"Erro ao tentar baixar arquivos por stream, tentativa {attempt}: {e}"
-            )
-            if attempt < max_retries - 1:
-                time.sleep(2**attempt)
-            else:
-                # Não damos raise na exceção pois daremos um tratamento próprio para as URLs que não foram baixadas
-                message = f"Falha ao baixar o recurso {url} após {max_retries} tentativas: {e}"
-                logger.error(message)
-
-                try:
-                    insert_extract_error_db(
-                        lote_id=lote_id,
-                        task=task,
-                        status_code=status_code,
-                        message=str(e),
-                        url=url,
-                    )
-                except Exception as e:
-                    logger.critical(
-                        f"Erro ao tentar inserir o erro da URL {url} no banco de dados: {e}"
-                    )
-
-
-def unzip_file(zip_path: str | Path) -> list[str]:
-    zip_path = Path(zip_path)
-    extract_dir = zip_path.parent
-
-    extract_dir.mkdir(parents=True, exist_ok=True)
-
-    with zipfile.ZipFile(zip_path, "r") as zf:
-        zf.extractall(extract_dir)
-        extracted_files = [str(extract_dir / name) for name in zf.namelist()]
-
-    return extracted_files
-
-
 # Busca um json
 def fetch_json(
     url: str,
+    lote_id: int,
+    task: str,
     timeout: float = 30.0,
     max_retries: int = 10,
+    progress: FetchProgress | None = None,
 ) -> dict | list | None:
     """
-    Busca um JSON a partir da URL e retorna o objeto em memória
+    Busca um JSON a partir da URL e retorna o objeto em memória.
+    As métricas do download são gravadas na tabela task_metrics ao final, mesmo em caso de falha. Uma task que baixa
+    vários JSONs passa o mesmo progress em todas as chamadas e grava as métricas uma única vez, com record_fetch_metrics.
     """
 
     logger.info(f"Baixando URL: {url}")
 
-    with httpx.Client(
-        timeout=timeout, follow_redirects=True, headers=headers
-    ) as client:
-        for attempt in range(max_retries):
-            try:
-                r = client.get(url)
-                r.raise_for_status()
-                return r.json()
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    logger.warning(
-                        f"Um erro ocorreu no fetch de dados: {e}. TENTANDO NOVAMENTE. Tentativa: {attempt}"
-                    )
-                    time.sleep(2**attempt)
-                else:
-                    message = f"Erro ao baixar recurso da url {url} após {max_retries} tentativas: {e}"
-                    logger.error(message)
+    record_metrics = progress is None
+    if progress is None:
+        progress = FetchProgress(task=task, planned=1)
 
-                    # Aqui jogamos o erro pois normalmente as tasks necessitam dos dados de dados que são baixados de um único JSON.
-                    raise Exception(message)
+    try:
+        with http_client(
+            timeout=timeout, follow_redirects=True, headers=headers
+        ) as client:
+            for attempt in range(max_retries):
+                try:
+                    started = progress.request_started(url)
+                    try:
+                        r = client.get(url)
+                    finally:
+                        progress.request_finished(url, started)
+                    r.raise_for_status()
+                    data = r.json()
+                    progress.success(url, len(r.content), records=count_records(data))
+                    return data
+                except Exception as e:
+                    if attempt < max_retries - 1:
+                        logger.warning(
+                            f"Um erro ocorreu no fetch de dados: {e}. TENTANDO NOVAMENTE. Tentativa: {attempt}"
+                        )
+                        progress.retry_started()
+                        try:
+                            time.sleep(2**attempt)
+                        finally:
+                            progress.retry_finished()
+                    else:
+                        progress.failure()
+                        message = f"Erro ao baixar recurso da url {url} após {max_retries} tentativas: {e}"
+                        logger.error(message)
+
+                        # Aqui jogamos o erro pois normalmente as tasks necessitam dos dados de dados que são baixados de um único JSON.
+                        raise Exception(message)
+    finally:
+        if record_metrics:
+            record_fetch_metrics(progress, lote_id)
 
 
 def save_json(data: Any, dest_path: str | Path) -> str:
@@ -151,11 +101,12 @@ def save_json(data: Any, dest_path: str | Path) -> str:
     ensure_dir(dest_path.parent)
     with open(dest_path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False)
+    record_output_size(dest_path)
     return str(dest_path)
 
 
 # Salva uma lista de JSONs em um único NDJson
-def save_ndjson(records: list[dict], dest_path: str | Path) -> str:
+def save_ndjson(records: Iterable[dict], dest_path: str | Path) -> str:
     """
     Salva arquivos no formato NDJson, que agrupa vários JSONS.
     Só grava em disco depois dos dados estiverem consolidados
@@ -170,6 +121,7 @@ def save_ndjson(records: list[dict], dest_path: str | Path) -> str:
                 f.write(json.dumps(rec, ensure_ascii=False) + "\n")
 
         os.replace(tmp_path, dest_path)
+        record_output_size(dest_path)
     finally:
         if tmp_path.exists():
             try:
@@ -220,7 +172,11 @@ async def fetch_html_many_async(
 
     processed_urls = set()  # Evita processar a mesma URL duas vezes
 
+    # Chaveado pela URL canônica, a mesma gravada na tabela erros_extract
+    failed_urls = {canonical_url(error.url): error for error in not_downloaded_urls}
+
     async def fetch(u: str, client: httpx.AsyncClient):
+        u = canonical_url(u)
         if u in processed_urls:
             return None
         processed_urls.add(u)
@@ -228,8 +184,11 @@ async def fetch_html_many_async(
         async with sem:
             for attempt in range(max_retries):
                 try:
-                    logger.info(f"Fazendo download da URL: {u}")
-                    r = await client.get(u)
+                    started = progress.request_started(u)
+                    try:
+                        r = await client.get(u)
+                    finally:
+                        progress.request_finished(u, started)
                     r.raise_for_status()
 
                     html_content = r.text
@@ -241,11 +200,10 @@ async def fetch_html_many_async(
                         path = Path(out_dir) / name
                         with open(path, "w", encoding="utf-8") as f:
                             f.write(html_content)
+                        progress.success(u, len(r.content))
                         return str(path)  # Se salvar, retorna o caminho
 
                     # Verificar e atualizar no banco de dados as urls com falhas
-                    failed_urls = {error.url: error for error in not_downloaded_urls}
-
                     if failed_urls:
                         try:
                             update_url_not_downloaded(
@@ -257,6 +215,7 @@ async def fetch_html_many_async(
                             )
                             raise
 
+                    progress.success(u, len(r.content))
                     return html_content
 
                 except Exception as e:
@@ -270,8 +229,13 @@ async def fetch_html_many_async(
                         logger.warning(
                             f"Um erro ocorreu ao baixar uma página HTML: {e}. TENTANDO NOVAMENTE. Tentativa: {attempt}"
                         )
-                        await asyncio.sleep(2**attempt)
+                        progress.retry_started()
+                        try:
+                            await asyncio.sleep(2**attempt)
+                        finally:
+                            progress.retry_finished()
                     else:
+                        progress.failure()
                         logger.error(
                             f"Falha permanente ao baixar {u} após {max_retries} tentativas: {e}"
                         )
@@ -290,7 +254,14 @@ async def fetch_html_many_async(
                             )
                             raise
 
-    async with httpx.AsyncClient(timeout=timeout_cfg, follow_redirects=True) as client:
+    progress = FetchProgress(
+        task=task, planned=len(set(map(canonical_url, urls))), limit=limit
+    )
+
+    async with (
+        async_http_client(timeout=timeout_cfg, follow_redirects=True) as client,
+        progress.report(),
+    ):
         tasks = [fetch(u, client) for u in urls]
         results = await asyncio.gather(*tasks, return_exceptions=True)
         # Elimina os resultados inválidos (erro)
@@ -298,6 +269,8 @@ async def fetch_html_many_async(
             result for result in results if not isinstance(result, BaseException)
         ]
 
+    record_fetch_metrics(progress, lote_id)
+
     return valid_results
 
 
@@ -305,9 +278,10 @@ def update_url_not_downloaded(
     lote_id: int, url: str, failed_urls: dict[str, ErrorExtract]
 ):
     """
-    Atualiza no banco de dados o registro da URL que não havia sido baixada
+    Atualiza no banco de dados o registro da URL que não havia sido baixada.
+    A URL e as chaves de failed_urls devem estar na forma canônica.
     """
 
-    if url in failed_urls:
-        error = failed_urls[url]
+    error = failed_urls.get(url)
+    if error is not None:
         update_not_downloaded_urls_db(lote_id=lote_id, error_id=error.id)
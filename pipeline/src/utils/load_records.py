@@ -0,0 +1,291 @@
+import hashlib
+import json
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any, Iterator
+
+from prefect.logging import get_logger
+
+from .camara import page_self_url
+from .url_utils import get_path_parameter_value
+
+# Funções que leem os arquivos da extração e geram as linhas das tabelas de dados, já com os tipos das colunas.
+# Valores que não podem ser convertidos viram None, para que um registro malformado não faça o COPY da carga inteira falhar.
+
+logger = get_logger()
+
+
+def to_int(value: Any) -> int | None:
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def to_decimal(value: Any) -> Decimal | None:
+    try:
+        return Decimal(str(value)) if value not in (None, "") else None
+    except InvalidOperation:
+        return None
+
+
+def to_date(value: Any) -> date | None:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def to_datetime(value: Any) -> datetime | None:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def record_key(*values: Any) -> str:
+    """
+    Chave de registros sem identificador na API, calculada a partir dos campos que os identificam.
+    """
+    return hashlib.md5(json.dumps(values, default=str).encode()).hexdigest()
+
+
+def iter_camara_records(ndjson_path: str | Path) -> Iterator[tuple[dict, str | None]]:
+    """
+    Lê os registros de um NDJson da Câmara, gravado com um registro por linha ou com uma página por linha.
+    Gera (registro, URL da página de origem).
+    """
+    with open(ndjson_path, encoding="utf-8") as f:
+        for line in f:
+            data = json.loads(line)
+            if "dados" in data:
+                url = page_self_url(data)
+                dados = data["dados"]
+                for record in dados if isinstance(dados, list) else [dados]:
+                    yield record, url
+            else:
+                yield data, data.get("_url")
+
+
+def url_id(url: str | None, resource: str) -> str | None:
+    """
+    Identificador de um recurso no caminho da URL. Ex.: 'deputados' em .../deputados/204554/despesas -> '204554'
+    """
+    if not url:
+        return None
+    try:
+        return get_path_parameter_value(url.split("?", 1)[0], resource)
+    except (ValueError, IndexError):
+        return None
+
+
+def deputados_rows(ndjson_path: str | Path) -> Iterator[dict]:
+    for dados, _ in iter_camara_records(ndjson_path):
+        status = dados.get("ultimoStatus") or {}
+        if not dados.get("id"):
+            continue
+        yield {
+            "id": to_int(dados["id"]),
+            "nome_civil": dados.get("nomeCivil"),
+            "nome_parlamentar": status.get("nomeEleitoral") or status.get("nome"),
+            "sigla_partido": status.get("siglaPartido"),
+            "sigla_uf": status.get("siglaUf"),
+            "data_nascimento": to_date(dados.get("dataNascimento")),
+            "cpf": dados.get("cpf") or None,
+            "sexo": dados.get("sexo") or None,
+            "situacao": status.get("situacao"),
+        }
+
+
+def votacoes_rows(ndjson_path: str | Path) -> Iterator[dict]:
+    for votacao, _ in iter_camara_records(ndjson_path):
+        if not votacao.get("id"):
+            continue
+        yield {
+            "id": str(votacao["id"]),
+            "data": to_date(votacao.get("data")),
+            "data_hora_registro": to_datetime(votacao.get("dataHoraRegistro")),
+            "sigla_orgao": votacao.get("siglaOrgao"),
+            "descricao": votacao.get("descricao"),
+            "aprovacao": to_int(votacao.get("aprovacao")),
+            "proposicao_objeto": votacao.get("proposicaoObjeto"),
+            "uri_proposicao_objeto": votacao.get("uriProposicaoObjeto"),
+        }
+
+
+def votacao_dates(ndjson_path: str | Path) -> dict[str, date]:
+    """
+    Data de cada votação do arquivo de votações, por id.
+    """
+    if not Path(ndjson_path).exists():
+        return {}
+    return {row["id"]: row["data"] for row in votacoes_rows(ndjson_path) if row["data"]}
+
+
+def votos_rows(
+    ndjson_path: str | Path, votacoes_path: str | Path | None = None
+) -> Iterator[dict]:
+    """
+    A data do registro do voto é a chave da partição da tabela de votos. Votos sem data de registro válida usam a data
+    da votação, lida do arquivo de votações (por padrão, votacoes.ndjson no mesmo diretório) apenas quando necessário.
+    Votos sem nenhuma das duas datas não podem ser particionados: são descartados e contados em um aviso.
+    """
+    if votacoes_path is None:
+        votacoes_path = Path(ndjson_path).with_name("votacoes.ndjson")
+    dates: dict[str, date] | None = None
+    skipped = 0
+
+    for voto, url in iter_camara_records(ndjson_path):
+        deputado = voto.get("deputado_") or {}
+        votacao_id = url_id(url, "votacoes")
+        if votacao_id is None or not deputado.get("id"):
+            continue
+
+        registro = to_datetime(voto.get("dataRegistroVoto"))
+        if registro is not None:
+            data = registro.date()
+        else:
+            if dates is None:
+                dates = votacao_dates(votacoes_path)
+            data = dates.get(votacao_id)
+        if data is None:
+            skipped += 1
+            continue
+
+        yield {
+            "votacao_id": votacao_id,
+            "deputado_id": to_int(deputado["id"]),
+            "data": data,
+            "tipo_voto": voto.get("tipoVoto"),
+            "data_registro_voto": registro,
+            "sigla_partido": deputado.get("siglaPartido"),
+            "sigla_uf": deputado.get("siglaUf"),
+        }
+
+    if skipped:
+        logger.warning(
+            f"{skipped} votos de {ndjson_path} sem data de registro e sem a data da votação não foram carregados"
+        )
+
+
+def despesas_rows(ndjson_path: str | Path) -> Iterator[dict]:
+    for despesa, url in iter_camara_records(ndjson_path):
+        deputado_id = to_int(url_id(url, "deputados"))
+        ano, mes = to_int(despesa.get("ano")), to_int(despesa.get("mes"))
+        if deputado_id is None or ano is None or mes not in range(1, 13):
+            continue
+        yield {
+            "chave": record_key(
+                deputado_id,
+                ano,
+                mes,
+                despesa.get("codDocumento"),
+                despesa.get("numDocumento"),
+                despesa.get("parcela"),
+                despesa.get("cnpjCpfFornecedor"),
+                despesa.get("valorDocumento"),
+            ),
+            "data_competencia": date(ano, mes, 1),
+            "deputado_id": deputado_id,
+            "ano": ano,
+            "mes": mes,
+            "tipo_despesa": despesa.get("tipoDespesa"),
+            "cod_documento": to_int(despesa.get("codDocumento")),
+            "tipo_documento": despesa.get("tipoDocumento"),
+            "data_documento": to_date(despesa.get("dataDocumento")),
+            "num_documento": despesa.get("numDocumento"),
+            "valor_documento": to_decimal(despesa.get("valorDocumento")),
+            "valor_liquido": to_decimal(despesa.get("valorLiquido")),
+            "valor_glosa": to_decimal(despesa.get("valorGlosa")),
+            "nome_fornecedor": despesa.get("nomeFornecedor"),
+            "cnpj_cpf_fornecedor": despesa.get("cnpjCpfFornecedor") or None,
+            "url_documento": despesa.get("urlDocumento"),
+        }
+
+
+def discursos_rows(ndjson_path: str | Path) -> Iterator[dict]:
+    for discurso, url in iter_camara_records(ndjson_path):
+        deputado_id = to_int(url_id(url, "deputados"))
+        inicio = to_datetime(discurso.get("dataHoraInicio"))
+        if deputado_id is None or inicio is None:
+            continue
+        fase = discurso.get("faseEvento") or {}
+        yield {
+            "chave": record_key(
+                deputado_id,
+                discurso.get("dataHoraInicio"),
+                discurso.get("uriEvento"),
+                discurso.get("tipoDiscurso"),
+            ),
+            "deputado_id": deputado_id,
+            "data_hora_inicio": inicio,
+            "data_hora_fim": to_datetime(discurso.get("dataHoraFim")),
+            "tipo_discurso": discurso.get("tipoDiscurso"),
+            "fase_evento": fase.get("titulo") if isinstance(fase, dict) else None,
+            "sumario": discurso.get("sumario"),
+            "transcricao": discurso.get("transcricao"),
+            "keywords": discurso.get("keywords"),
+            "url_texto": discurso.get("urlTexto"),
+        }
+
+
+def proposicoes_rows(ndjson_path: str | Path) -> Iterator[dict]:
+    for proposicao, _ in iter_camara_records(ndjson_path):
+        if not proposicao.get("id"):
+            continue
+        yield {
+            "id": to_int(proposicao["id"]),
+            "sigla_tipo": proposicao.get("siglaTipo"),
+            "cod_tipo": to_int(proposicao.get("codTipo")),
+            "numero": to_int(proposicao.get("numero")),
+            "ano": to_int(proposicao.get("ano")),
+            "ementa": proposicao.get("ementa"),
+        }
+
+
+def senadores_rows(ndjson_path: str | Path) -> Iterator[dict]:
+    with open(ndjson_path, encoding="utf-8") as f:
+        for line in f:
+            parlamentar = (
+                json.loads(line).get("DetalheParlamentar", {}).get("Parlamentar") or {}
+            )
+            identificacao = parlamentar.get("IdentificacaoParlamentar") or {}
+            dados_basicos = parlamentar.get("DadosBasicosParlamentar") or {}
+            if not identificacao.get("CodigoParlamentar"):
+                continue
+            yield {
+                "id": to_int(identificacao["CodigoParlamentar"]),
+                "nome_parlamentar": identificacao.get("NomeParlamentar"),
+                "nome_civil": identificacao.get("NomeCompletoParlamentar"),
+                "sexo": identificacao.get("SexoParlamentar"),
+                "sigla_partido": identificacao.get("SiglaPartidoParlamentar"),
+                "sigla_uf": identificacao.get("UfParlamentar"),
+                "data_nascimento": to_date(dados_basicos.get("DataNascimento")),
+            }
+
+
+def processos_rows(json_path: str | Path) -> Iterator[dict]:
+    """
+    O arquivo de processos do Senado é uma lista de respostas, cada uma com a lista de processos.
+    """
+    with open(json_path, encoding="utf-8") as f:
+        responses = json.load(f)
+
+    for response in responses:
+        for processo in response if isinstance(response, list) else []:
+            if not processo.get("id"):
+                continue
+            yield {
+                "id": to_int(processo["id"]),
+                "codigo_materia": to_int(processo.get("codigoMateria")),
+                "identificacao": processo.get("identificacao"),
+                "tipo_documento": processo.get("tipoDocumento"),
+                "ementa": processo.get("ementa"),
+                "data_apresentacao": to_date(processo.get("dataApresentacao")),
+                "autoria": processo.get("autoria"),
+            }
@@ -1,9 +1,13 @@
-import asyncio
 import logging
-from uuid import UUID
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator
 
-from prefect.client.orchestration import get_client
-from prefect.client.schemas.filters import LogFilter, LogFilterFlowRunId, LogFilterLevel
+from prefect.context import FlowRunContext, TaskRunContext
 
 from config.loader import load_config
 from database.models.base import InsertLogDB
@@ -11,89 +15,130 @@ from database.repository.logs import insert_log_db
 
 APP_SETTINGS = load_config()
 
+# Loggers das Flow Runs e Task Runs do Prefect. Os prints das tasks com log_prints=True também passam por eles.
+RUN_LOGGERS = ("prefect.flow_runs", "prefect.task_runs")
 
-def save_logs(flow_run_name: str, flow_run_id: UUID, lote_id: int):
+
+def run_names(record: logging.LogRecord) -> tuple[str | None, str | None]:
     """
-    Resgata os logs das flows e as grava no banco de dados.
+    Nomes da Flow Run e da Task Run do log. Os loggers de execução do Prefect já os incluem no registro,
+    os demais são resolvidos pelo contexto da execução atual.
     """
-    asyncio.run(
-        async_save_logs(
-            flow_run_name=flow_run_name, flow_run_id=flow_run_id, lote_id=lote_id
-        )
-    )
+    flow_run_name = getattr(record, "flow_run_name", None)
+    task_run_name = getattr(record, "task_run_name", None)
+
+    if flow_run_name is None:
+        flow_context = FlowRunContext.get()
+        if flow_context is not None and flow_context.flow_run is not None:
+            flow_run_name = flow_context.flow_run.name
+    if task_run_name is None:
+        task_context = TaskRunContext.get()
+        if task_context is not None:
+            task_run_name = task_context.task_run.name
 
+    return flow_run_name, task_run_name
 
-async def async_save_logs(
-    flow_run_name: str,
-    flow_run_id: UUID,
-    lote_id: int,
-    quiet_required=5,
-    sleep_required=1,
-    timeout=90,
-):
+
+class DatabaseLogHandler(logging.Handler):
     """
-    Os logs da Flow Run só ficam disponíveis depois de um tempo, é necessário esperar.
+    Grava os logs das execuções na tabela logs sem bloquear quem loga:
+    - emit() apenas coloca o log em uma fila, com os nomes da Flow Run e da Task Run já resolvidos
+    - Uma thread em segundo plano grava os logs em lotes de até batch_size linhas, ou a cada flush_interval segundos
+    - close() grava o que ainda está na fila e encerra a thread
     """
-    async with get_client() as client:
-        # 1. Esperar logs chegarem
-        num_logs_available = 0
-        quiet = 0
-        waited = 0
-        while True:
-            logs = await client.read_logs(
-                log_filter=LogFilter(
-                    flow_run_id=LogFilterFlowRunId(any_=[flow_run_id]),
-                ),
-                limit=1,  # só precisa saber a quantidade, não os logs em si
-                offset=0,
-            )
-            num_logs_now = len(logs)
-            if num_logs_now == num_logs_available and num_logs_now > 0:
-                quiet += 1
-            elif num_logs_now > num_logs_available:
-                quiet = 0
-            num_logs_available = num_logs_now
-            if quiet >= quiet_required:
-                break
-            if waited >= timeout:
-                break
-            waited += sleep_required
-            await asyncio.sleep(sleep_required)
-
-        # 2. Paginar e buscar todos os logs
-        all_logs = []
-        limit = 200
-        offset = 0
-        while True:
-            batch = await client.read_logs(
-                log_filter=LogFilter(
-                    flow_run_id=LogFilterFlowRunId(any_=[flow_run_id]),
-                    level=LogFilterLevel(ge_=APP_SETTINGS.FLOW.LOG_DB_LEVEL),
-                ),
-                limit=limit,
-                offset=offset,
-            )
-            all_logs.extend(batch)
-            if len(batch) < limit:
-                break
-            offset += limit
-
-        final_logs: list[InsertLogDB] = []
-        for log in all_logs:
-            task_run_name = None
-            if log.task_run_id:
-                task_run = await client.read_task_run(log.task_run_id)
-                task_run_name = task_run.name
-
-            final_logs.append(
+
+    def __init__(
+        self,
+        lote_id: int,
+        level: int = APP_SETTINGS.FLOW.LOG_DB_LEVEL,
+        batch_size: int = 500,
+        flush_interval: float = 2.0,
+    ):
+        super().__init__(level)
+        self.lote_id = lote_id
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.SimpleQueue[InsertLogDB | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="database-log-handler", daemon=True
+        )
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            flow_run_name, task_run_name = run_names(record)
+            if flow_run_name is None:
+                # Logs fora de uma Flow Run não pertencem a nenhum lote
+                return
+
+            self._queue.put(
                 InsertLogDB(
-                    lote_id=lote_id,
-                    timestamp=log.timestamp,
+                    lote_id=self.lote_id,
+                    timestamp=datetime.fromtimestamp(record.created, tz=timezone.utc),
                     flow_run_name=flow_run_name,
                     task_run_name=task_run_name,
-                    level=logging.getLevelName(log.level),
-                    message=log.message,
+                    level=record.levelname,
+                    message=record.getMessage(),
                 )
             )
+        except Exception:
+            self.handleError(record)
 
-        insert_log_db(final_logs)
+    def _run(self):
+        batch: list[InsertLogDB] = []
+        deadline = time.monotonic() + self.flush_interval
+        stopping = False
+
+        while not stopping:
+            try:
+                log = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                if log is None:
+                    stopping = True
+                else:
+                    batch.append(log)
+            except queue.Empty:
+                pass
+
+            if batch and (
+                stopping
+                or len(batch) >= self.batch_size
+                or time.monotonic() >= deadline
+            ):
+                self._write(batch)
+                batch = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+
+    def _write(self, batch: list[InsertLogDB]):
+        try:
+            insert_log_db(batch)
+        except Exception as e:
+            # Não usa logging para não gerar novos logs para este mesmo handler
+            print(
+                f"Erro ao gravar {len(batch)} logs no banco de dados: {e}",
+                file=sys.stderr,
+            )
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        super().close()
+
+
+@contextmanager
+def database_logging(lote_id: int) -> Iterator[DatabaseLogHandler]:
+    """
+    Grava no banco de dados, durante o bloco, os logs de todas as Flow Runs e Task Runs do processo.
+    Ao sair do bloco, os logs que ainda estão na fila são gravados.
+    """
+    handler = DatabaseLogHandler(lote_id)
+    loggers = [logging.getLogger(name) for name in RUN_LOGGERS]
+    for logger in loggers:
+        logger.addHandler(handler)
+    try:
+        yield handler
+    finally:
+        for logger in loggers:
+            logger.removeHandler(handler)
+        handler.close()
@@ -0,0 +1,191 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+from prefect.logging import get_logger
+
+from config.loader import load_config
+
+from .fetch_progress import percentile
+from .instrumentation import Instrument
+from .task_metrics import update_task_metrics
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+# Código do projeto, usado para atribuir um bloqueio ao trecho do pipeline que o causou e não à biblioteca chamada
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+# Frames exibidos na pilha de cada bloqueio
+STACK_DEPTH = 8
+
+
+def blocking_site(stack: traceback.StackSummary) -> traceback.FrameSummary:
+    """
+    Frame mais interno da pilha que pertence ao código do projeto, ou o mais interno de todos se nenhum pertencer.
+    """
+    for frame in reversed(stack):
+        path = Path(frame.filename)
+        if path.is_relative_to(PROJECT_DIR) and path.name != Path(__file__).name:
+            return frame
+    return stack[-1]
+
+
+class LoopLagMonitor(Instrument):
+    """
+    Mede o atraso (lag) do event loop de uma task assíncrona e identifica o código síncrono que o bloqueia:
+    - Uma corrotina de heartbeat dorme LOOP_LAG_INTERVAL segundos e mede quanto acordou atrasada
+    - Uma thread de vigia captura a pilha da thread do loop quando ela passa LOOP_LAG_THRESHOLD segundos sem heartbeat
+    - Cada bloqueio é atribuído ao frame do projeto mais interno da pilha, e o relatório lista os que mais bloquearam
+    Em tasks síncronas não há event loop e o monitor não faz nada.
+    """
+
+    title = "Lag do event loop"
+
+    def __init__(self, task_name: str, lote_id: int | None):
+        super().__init__(task_name, lote_id)
+        settings = APP_SETTINGS.INSTRUMENTATION
+        self.interval = settings.LOOP_LAG_INTERVAL
+        self.threshold = settings.LOOP_LAG_THRESHOLD
+        self.top_n = settings.LOOP_LAG_TOP_N
+
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.lags: list[float] = []
+        # Bloqueios agrupados pelo local do código: ocorrências, tempo total, tempo máximo e uma pilha de exemplo
+        self.offenders: dict[str, dict] = {}
+        self._last_beat = time.monotonic()
+        self._blocking: tuple[float, traceback.StackSummary] | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def start(self):
+        try:
+            self.loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._heartbeat = self.loop.create_task(self.heartbeat())
+        self._watchdog = threading.Thread(
+            target=self.watch, name=f"loop-lag-{self.task_name}", daemon=True
+        )
+        self._watchdog.start()
+
+    async def heartbeat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.lags.append(max(now - expected, 0.0))
+            self.beat(now)
+
+    def beat(self, now: float):
+        """Registra um heartbeat e encerra o bloqueio em andamento, se houver."""
+        with self._lock:
+            self._last_beat = now
+            blocking, self._blocking = self._blocking, None
+        if blocking is not None:
+            # O último heartbeat ainda dormiu um intervalo antes do bloqueio começar
+            last_beat, stack = blocking
+            self.record(stack, max(now - last_beat - self.interval, 0.0))
+
+    def watch(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                last_beat = self._last_beat
+                if (
+                    self._blocking is not None
+                    or time.monotonic() - last_beat < self.threshold
+                ):
+                    continue
+                frame = sys._current_frames().get(self._loop_thread)
+                if frame is None:
+                    continue
+                self._blocking = (last_beat, traceback.extract_stack(frame))
+
+    def record(self, stack: traceback.StackSummary, blocked: float):
+        site = blocking_site(stack)
+        key = f"{Path(site.filename).name}:{site.lineno} ({site.name})"
+        offender = self.offenders.setdefault(
+            key,
+            {
+                "local": key,
+                "ocorrencias": 0,
+                "total": 0.0,
+                "maximo": 0.0,
+                "pilha": "".join(traceback.format_list(stack[-STACK_DEPTH:])),
+            },
+        )
+        offender["ocorrencias"] += 1
+        offender["total"] += blocked
+        offender["maximo"] = max(offender["maximo"], blocked)
+
+    def worst_offenders(self) -> list[dict]:
+        return sorted(self.offenders.values(), key=lambda o: o["total"], reverse=True)[
+            : self.top_n
+        ]
+
+    def summary(self) -> dict:
+        lags = sorted(self.lags)
+        return {
+            "lag_loop_max": lags[-1] if lags else None,
+            "lag_loop_p99": percentile(lags, 99),
+            "bloqueio_loop_total": sum(o["total"] for o in self.offenders.values()),
+        }
+
+    def stop(self):
+        if self.loop is None:
+            return
+
+        self._stop.set()
+        self._watchdog.join()
+        self._heartbeat.cancel()
+        # Um bloqueio ainda aberto terminou quando o loop voltou a executar este código
+        self.beat(time.monotonic())
+
+        summary = self.summary()
+        if summary["bloqueio_loop_total"]:
+            logger.warning(
+                f"O event loop da task {self.task_name} ficou bloqueado por {summary['bloqueio_loop_total']:.2f}s. "
+                f"Maior bloqueio em {self.worst_offenders()[0]['local']}"
+            )
+        update_task_metrics(
+            {
+                **summary,
+                "bloqueios_loop": [
+                    {k: v for k, v in o.items() if k != "pilha"}
+                    for o in self.worst_offenders()
+                ],
+            }
+        )
+
+    def markdown(self) -> str:
+        if self.loop is None:
+            return "Task síncrona: não há event loop para monitorar."
+
+        summary = self.summary()
+        lag_max = summary["lag_loop_max"] or 0.0
+        lag_p99 = summary["lag_loop_p99"] or 0.0
+        lines = [
+            f"Heartbeats: {len(self.lags)} | Lag máximo: {lag_max:.3f}s | Lag p99: {lag_p99:.3f}s | "
+            f"Tempo bloqueado acima de {self.threshold}s: {summary['bloqueio_loop_total']:.2f}s",
+        ]
+        offenders = self.worst_offenders()
+        if offenders:
+            lines += [
+                "",
+                "| Local | Ocorrências | Total (s) | Máximo (s) |",
+                "| --- | --- | --- | --- |",
+            ]
+            lines += [
+                f"| `{o['local']}` | {o['ocorrencias']} | {o['total']:.2f} | {o['maximo']:.2f} |"
+                for o in offenders
+            ]
+            for o in offenders:
+                lines += ["", f"`{o['local']}`", "```", o["pilha"].rstrip(), "```"]
+        return "\n".join(lines)
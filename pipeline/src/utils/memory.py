@@ -0,0 +1,207 @@
+import os
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+from prefect.logging import get_logger
+
+from config.loader import load_config
+
+from .fetch_progress import MB
+from .instrumentation import Instrument
+from .task_metrics import peak_rss, update_task_metrics
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+# Frames guardados por alocação. Um frame basta para agrupar por linha e mantém o custo do tracemalloc baixo.
+TRACEMALLOC_FRAMES = 1
+
+# O tracemalloc é global no processo: ele fica ativo enquanto houver alguma task monitorada
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+
+def current_rss() -> int | None:
+    """
+    Memória residente atual do processo, em bytes. None em sistemas sem /proc (apenas o pico fica disponível).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def task_memory_budget(task_name: str) -> int | None:
+    """
+    Limite de memória da task em bytes, ou None se não houver limite.
+    """
+    settings = APP_SETTINGS.INSTRUMENTATION
+    budget = settings.MEMORY_BUDGETS.get(task_name, settings.MEMORY_BUDGET)
+    return budget * MB if budget else None
+
+
+def start_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        _tracemalloc_users += 1
+
+
+def stop_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0:
+            tracemalloc.stop()
+
+
+def top_allocations(
+    start: tracemalloc.Snapshot, end: tracemalloc.Snapshot, n: int
+) -> list[dict]:
+    """
+    Linhas de código cuja memória alocada mais cresceu entre os dois snapshots.
+    """
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    stats = end.filter_traces(filters).compare_to(
+        start.filter_traces(filters), "lineno"
+    )
+    rows = []
+    for stat in stats[:n]:
+        frame = stat.traceback[0]
+        rows.append(
+            {
+                "local": f"{Path(frame.filename).name}:{frame.lineno}",
+                "arquivo": frame.filename,
+                "diferenca": stat.size_diff,
+                "tamanho": stat.size,
+                "blocos": stat.count,
+            }
+        )
+    return rows
+
+
+class MemoryMonitor(Instrument):
+    """
+    Acompanha a memória de uma task:
+    - Mede o RSS do processo e a memória rastreada pelo tracemalloc no início, no fim e a cada MEMORY_INTERVAL segundos
+    - Compara os snapshots do tracemalloc do início e do fim para listar os locais que mais alocaram memória
+    - Loga um aviso, com os maiores locais de alocação até o momento, quando o RSS passa do limite da task
+      (MEMORY_BUDGETS ou MEMORY_BUDGET)
+    O RSS e o tracemalloc são do processo inteiro, por isso incluem as tasks que executam em paralelo.
+    """
+
+    title = "Memória"
+
+    def __init__(self, task_name: str, lote_id: int | None):
+        super().__init__(task_name, lote_id)
+        settings = APP_SETTINGS.INSTRUMENTATION
+        self.interval = settings.MEMORY_INTERVAL
+        self.top_n = settings.MEMORY_TOP_N
+        self.budget = task_memory_budget(task_name)
+
+        # (segundos desde o início, RSS, memória rastreada pelo tracemalloc)
+        self.samples: list[tuple[float, int | None, int]] = []
+        self.allocations: list[dict] = []
+        self.traced_peak = 0
+        self.budget_exceeded = False
+        self._stop = threading.Event()
+
+    def start(self):
+        start_tracemalloc()
+        self.started = time.monotonic()
+        self._snapshot = tracemalloc.take_snapshot()
+        self.sample()
+        self._sampler = threading.Thread(
+            target=self.run_sampler, name=f"memory-{self.task_name}", daemon=True
+        )
+        self._sampler.start()
+
+    def run_sampler(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        rss = current_rss()
+        traced, _ = tracemalloc.get_traced_memory()
+        self.samples.append((time.monotonic() - self.started, rss, traced))
+
+        if (
+            self.budget is not None
+            and rss is not None
+            and rss > self.budget
+            and not self.budget_exceeded
+        ):
+            self.budget_exceeded = True
+            top = top_allocations(self._snapshot, tracemalloc.take_snapshot(), 5)
+            sites = ", ".join(
+                f"{a['local']} (+{a['diferenca'] / MB:.1f} MB)" for a in top
+            )
+            logger.warning(
+                f"A task {self.task_name} passou do limite de memória: {rss / MB:.0f} MB de RSS "
+                f"(limite: {self.budget / MB:.0f} MB). Maiores alocações: {sites}"
+            )
+
+    @property
+    def max_rss(self) -> int | None:
+        values = [rss for _, rss, _ in self.samples if rss is not None]
+        return max(values) if values else peak_rss()
+
+    def stop(self):
+        self._stop.set()
+        self._sampler.join()
+        try:
+            self.sample()
+            self.traced_peak = tracemalloc.get_traced_memory()[1]
+            self.allocations = top_allocations(
+                self._snapshot, tracemalloc.take_snapshot(), self.top_n
+            )
+        finally:
+            self._snapshot = None
+            stop_tracemalloc()
+
+        update_task_metrics(
+            {
+                "rss_inicio": self.samples[0][1],
+                "rss_fim": self.samples[-1][1],
+                "rss_max": self.max_rss,
+                "tracemalloc_pico": self.traced_peak,
+                "orcamento_memoria_excedido": self.budget_exceeded,
+                "alocacoes": [
+                    {k: v for k, v in a.items() if k != "arquivo"}
+                    for a in self.allocations
+                ],
+            }
+        )
+
+    def markdown(self) -> str:
+        def mb(value: int | None) -> str:
+            return f"{value / MB:.1f}" if value is not None else "?"
+
+        budget = f"{self.budget / MB:.0f} MB" if self.budget else "sem limite"
+        lines = [
+            f"RSS máximo: {mb(self.max_rss)} MB | Pico do tracemalloc: {mb(self.traced_peak)} MB | "
+            f"Limite: {budget}{' (EXCEDIDO)' if self.budget_exceeded else ''}",
+            "",
+            "| Tempo (s) | RSS (MB) | Rastreada (MB) |",
+            "| --- | --- | --- |",
+        ]
+        lines += [
+            f"| {elapsed:.0f} | {mb(rss)} | {mb(traced)} |"
+            for elapsed, rss, traced in self.samples
+        ]
+        if self.allocations:
+            lines += [
+                "",
+                "| Local | Diferença (MB) | Total (MB) | Blocos |",
+                "| --- | --- | --- | --- |",
+            ]
+            lines += [
+                f"| `{a['local']}` | {a['diferenca'] / MB:+.2f} | {a['tamanho'] / MB:.2f} | {a['blocos']} |"
+                for a in self.allocations
+            ]
+        return "\n".join(lines)
@@ -0,0 +1,100 @@
+import cProfile
+import pstats
+from pathlib import Path
+
+from prefect.logging import get_logger
+
+from config.loader import load_config
+
+from .instrumentation import Instrument
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+
+def top_functions(stats: pstats.Stats, n: int) -> list[dict]:
+    """
+    As n funções com maior tempo acumulado (incluindo as funções chamadas por elas).
+    """
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    rows = []
+    for func in stats.fcn_list[:n]:  # type: ignore[attr-defined]
+        _, ncalls, tottime, cumtime, _ = stats.stats[func]  # type: ignore[attr-defined]
+        filename, line, name = func
+        rows.append(
+            {
+                "funcao": name,
+                "local": f"{Path(filename).name}:{line}" if line else filename,
+                "chamadas": ncalls,
+                "tempo_proprio": tottime,
+                "tempo_acumulado": cumtime,
+            }
+        )
+    return rows
+
+
+def functions_markdown(rows: list[dict]) -> str:
+    lines = [
+        "| Função | Local | Chamadas | Tempo próprio (s) | Tempo acumulado (s) |",
+        "| --- | --- | --- | --- | --- |",
+    ]
+    lines += [
+        f"| `{r['funcao']}` | {r['local']} | {r['chamadas']} | {r['tempo_proprio']:.3f} | {r['tempo_acumulado']:.3f} |"
+        for r in rows
+    ]
+    return "\n".join(lines)
+
+
+class TaskProfiler(Instrument):
+    """
+    Executa a task com o cProfile (determinístico) e grava em OUTPUT_DIR/lote_<id>:
+    - <task run>.prof: o profile completo, que pode ser aberto como flame graph no snakeviz
+    - <task run>_top.txt: as PROFILE_TOP_N funções com maior tempo acumulado
+    A partir do Python 3.12 o cProfile registra todas as threads do processo e apenas um profiler pode estar ativo.
+    O profile inclui portanto as tasks que executam em paralelo, e se outra task já estiver sendo perfilada,
+    esta executa sem profile e um aviso é logado.
+    """
+
+    title = "Profile"
+
+    def __init__(self, task_name: str, lote_id: int | None):
+        super().__init__(task_name, lote_id)
+        self.profiler: cProfile.Profile | None = None
+        self.rows: list[dict] = []
+        self.path: Path | None = None
+
+    def start(self):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            logger.warning(f"A task {self.task_name} será executada sem profile: {e}")
+            return
+        self.profiler = profiler
+
+    def stop(self):
+        if self.profiler is None:
+            return
+        self.profiler.disable()
+
+        self.path = self.output_dir / f"{self.run_name}.prof"
+        self.profiler.dump_stats(self.path)
+
+        top_path = self.output_dir / f"{self.run_name}_top.txt"
+        with open(top_path, "w", encoding="utf-8") as f:
+            stats = pstats.Stats(self.profiler, stream=f)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+                APP_SETTINGS.INSTRUMENTATION.PROFILE_TOP_N
+            )
+        self.rows = top_functions(stats, APP_SETTINGS.INSTRUMENTATION.PROFILE_TOP_N)
+        logger.info(f"Profile da task {self.task_name} gravado em {self.path}")
+
+    def markdown(self) -> str:
+        if self.path is None:
+            return "Profile não coletado: outro profiler estava ativo no processo."
+        uri = self.path.resolve().as_uri()
+        return (
+            f"Profile completo: [{self.path.name}]({uri}) (flame graph: `snakeviz {self.path}`)\n\n"
+            + functions_markdown(self.rows)
+        )
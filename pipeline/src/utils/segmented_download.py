@@ -0,0 +1,104 @@
+import shutil
+from pathlib import Path
+
+import httpx
+
+from .io import ensure_dir
+
+MB = 1024 * 1024
+
+
+class RemoteFileChangedError(Exception):
+    """O arquivo mudou no servidor durante o download em segmentos."""
+
+
+def split_segments(total_size: int, segment_size: int) -> list[tuple[int, int]]:
+    """
+    Divide o arquivo em intervalos de bytes [início, fim], com o fim inclusivo como no header Range.
+    """
+    return [
+        (start, min(start + segment_size, total_size) - 1)
+        for start in range(0, total_size, segment_size)
+    ]
+
+
+def parts_dir(dest_path: Path) -> Path:
+    """
+    Diretório das partes de um download em segmentos, ao lado do arquivo final.
+    """
+    return dest_path.with_name(dest_path.name + ".parts")
+
+
+def part_path(parts: Path, index: int) -> Path:
+    return parts / f"{index:05d}.part"
+
+
+def prepare_parts_dir(parts: Path, validator: str | None):
+    """
+    Cria o diretório das partes. Partes de uma versão anterior do arquivo (validador diferente do gravado junto
+    com elas) não podem ser reaproveitadas e são apagadas.
+    """
+    validator_path = parts / "validator"
+    if parts.exists() and (
+        not validator_path.exists()
+        or validator_path.read_text(encoding="utf-8") != (validator or "")
+    ):
+        shutil.rmtree(parts)
+    ensure_dir(parts)
+    validator_path.write_text(validator or "", encoding="utf-8")
+
+
+def resume_headers(
+    path: Path, start: int, end: int, validator: str | None
+) -> dict[str, str] | None:
+    """
+    Headers da requisição que continua o segmento [início, fim] de onde a parte em disco parou.
+    Retorna None se a parte já está completa. Uma parte maior que o segmento está corrompida e é recomeçada.
+    """
+    expected_size = end - start + 1
+    done = path.stat().st_size if path.exists() else 0
+
+    if done == expected_size:
+        return None
+    if done > expected_size:
+        path.unlink()
+        done = 0
+
+    request_headers = {"Range": f"bytes={start + done}-{end}"}
+    # Se o arquivo mudar no servidor, If-Range faz com que ele responda 200 com o arquivo inteiro em vez de 206
+    if validator:
+        request_headers["If-Range"] = validator
+    return request_headers
+
+
+def check_partial_response(response: httpx.Response, url: str):
+    """
+    Garante que o servidor respondeu ao intervalo de bytes pedido. Um 200 significa que o If-Range não foi aceito
+    (o arquivo mudou) ou que o servidor ignorou o Range, e o corpo não pode ser anexado à parte.
+    """
+    response.raise_for_status()
+    if response.status_code != 206:
+        raise RemoteFileChangedError(
+            f"O servidor não respondeu ao intervalo de bytes de {url} (status {response.status_code}). O arquivo pode ter mudado."
+        )
+
+
+def join_parts(parts: Path, count: int, out_path: Path):
+    """
+    Junta as partes, na ordem dos segmentos, no arquivo de saída.
+    """
+    with open(out_path, "wb") as out:
+        for i in range(count):
+            with open(part_path(parts, i), "rb") as part:
+                shutil.copyfileobj(part, out, length=MB)
+
+
+def check_size(path: Path, expected_size: int | None):
+    """
+    Confere o tamanho do arquivo baixado com o Content-Length informado pelo servidor.
+    """
+    final_size = path.stat().st_size
+    if expected_size and final_size != expected_size:
+        raise Exception(
+            f"O tamanho do arquivo baixado ({final_size} bytes) é diferente do informado pelo servidor ({expected_size} bytes)"
+        )
@@ -0,0 +1,605 @@
+import asyncio
+import hashlib
+import json
+import math
+import multiprocessing
+import queue
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Sequence
+from urllib.parse import parse_qsl, urlsplit
+
+from prefect.logging import get_logger
+
+from config.loader import AppConfig, load_config
+
+from .standin_data import (
+    CAMARA_PORTAL_PREFIX,
+    CAMARA_REST_PREFIX,
+    SENADO_ADM_PREFIX,
+    SENADO_REST_PREFIX,
+    TSE_PREFIX,
+    StandInDataset,
+)
+from .url_utils import PAGE_PARAM
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+# Tamanho dos pedaços em que as respostas são enviadas quando a banda é limitada
+CHUNK_SIZE = 64 * 1024
+
+# Data fixa dos arquivos do TSE, para que os downloads condicionais vejam sempre o mesmo arquivo
+TSE_LAST_MODIFIED = "Mon, 07 Oct 2024 12:00:00 GMT"
+
+LATENCY_DISTRIBUTIONS = ("constante", "uniforme", "exponencial", "lognormal")
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """
+    Distribuição do tempo até o início da resposta, em segundos:
+    - constante: sempre mean
+    - uniforme: entre 0 e 2 * mean
+    - exponencial: média mean, com muitos valores baixos e alguns altos
+    - lognormal: mediana mean e cauda controlada por sigma, a mais próxima das APIs reais
+    """
+
+    distribution: str = "constante"
+    mean: float = 0.0
+    sigma: float = 0.5
+
+    def __post_init__(self):
+        if self.distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Distribuição de latência inválida: '{self.distribution}'. Use uma de {LATENCY_DISTRIBUTIONS}"
+            )
+
+    def sample(self, rng: random.Random) -> float:
+        if self.mean <= 0:
+            return 0.0
+        if self.distribution == "uniforme":
+            return rng.uniform(0, 2 * self.mean)
+        if self.distribution == "exponencial":
+            return rng.expovariate(1 / self.mean)
+        if self.distribution == "lognormal":
+            return rng.lognormvariate(math.log(self.mean), self.sigma)
+        return self.mean
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    """
+    Falhas injetadas nas respostas do servidor substituto.
+    - error_rate: fração das requisições respondidas com um dos error_statuses
+    - throttle_rate: fração das requisições respondidas com 429 e o header Retry-After
+    - max_requests_per_second: acima dessa taxa as requisições recebem 429, como um rate limit real. 0 = sem limite
+    - fail_first: número de falhas (503) de cada URL antes da primeira resposta com sucesso, para testar as novas tentativas
+    - bandwidth: MB/s de cada resposta. 0 = sem limite
+    """
+
+    error_rate: float = 0.0
+    error_statuses: tuple[int, ...] = (500, 502, 503, 504)
+    throttle_rate: float = 0.0
+    retry_after: float = 1.0
+    max_requests_per_second: float = 0.0
+    fail_first: int = 0
+    bandwidth: float = 0.0
+
+
+@dataclass
+class Response:
+    status: int = 200
+    body: bytes = b""
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+def json_response(data: Any, headers: dict[str, str] | None = None) -> Response:
+    return Response(
+        body=json.dumps(data, ensure_ascii=False).encode(),
+        headers={"content-type": "application/json; charset=utf-8", **(headers or {})},
+    )
+
+
+def error_response(status: int, message: str) -> Response:
+    response = json_response({"status": status, "title": message})
+    response.status = status
+    return response
+
+
+class LazyRecords(Sequence):
+    """
+    Registros de uma listagem gerados apenas quando acessados, para que cada página gere somente os seus itens
+    e não a listagem inteira.
+    """
+
+    def __init__(self, ids: list, make: Callable[[Any], Any]):
+        self.ids = ids
+        self.make = make
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.make(id) for id in self.ids[index]]
+        return self.make(self.ids[index])
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: dict[str, str]
+    url: str
+    headers: dict[str, str]
+
+
+class StandInAPI:
+    """
+    Aplicação ASGI que substitui as APIs da Câmara, do Senado e do TSE, para testes de carga sem rede.
+    Reproduz o formato real das respostas: a paginação da Câmara (dados, links e x-total-count), os envelopes
+    aninhados do Senado e os ZIPs do TSE com suporte a HEAD, Range e If-Range.
+    Cada API fica sob o seu prefixo (ex.: /camara/api/v2/), para o qual a configuração aponta com [STANDIN] ENABLED.
+    """
+
+    def __init__(
+        self,
+        dataset: StandInDataset | None = None,
+        latency: LatencyProfile | None = None,
+        faults: FaultProfile | None = None,
+        seed: int = 0,
+    ):
+        self.dataset = dataset or StandInDataset(seed=seed)
+        self.latency = latency or LatencyProfile()
+        self.faults = faults or FaultProfile()
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        self.requests = 0
+        self.statuses: Counter[int] = Counter()
+        self.bytes_sent = 0
+        self._attempts: Counter[str] = Counter()
+        self._tokens = self.faults.max_requests_per_second
+        self._tokens_updated = time.monotonic()
+
+        self.routes: list[tuple[str, re.Pattern, Callable[..., Any]]] = []
+        self._register_routes()
+
+    def __reduce__(self):
+        # As rotas são closures e não podem ser serializadas: outro processo (serve_in_process) recria o app
+        # a partir da configuração, com as estatísticas zeradas
+        return (StandInAPI, (self.dataset, self.latency, self.faults, self.seed))
+
+    # ============= ROTAS =============
+
+    def route(self, prefix: str, pattern: str, handler: Callable[..., Any]):
+        self.routes.append((prefix, re.compile(f"^{pattern}$"), handler))
+
+    def _register_routes(self):
+        d = self.dataset
+        c, p, s, a = (
+            CAMARA_REST_PREFIX,
+            CAMARA_PORTAL_PREFIX,
+            SENADO_REST_PREFIX,
+            SENADO_ADM_PREFIX,
+        )
+
+        self.route(c, "legislaturas", self.legislaturas)
+        self.route(
+            c,
+            "deputados",
+            lambda r: self.camara_page(r, LazyRecords(d.deputado_ids(), d.deputado)),
+        )
+        self.route(
+            c,
+            r"deputados/(\d+)",
+            lambda r, id: self.camara_item(r, d.detalhes_deputado(int(id))),
+        )
+        self.route(
+            c,
+            r"deputados/(\d+)/despesas",
+            lambda r, id: self.camara_page(
+                r,
+                d.despesas_deputado(
+                    int(id),
+                    int(r.query.get("ano", 2024)),
+                    int(r.query["mes"]) if r.query.get("mes") else None,
+                ),
+            ),
+        )
+        self.route(
+            c,
+            r"deputados/(\d+)/discursos",
+            lambda r, id: self.camara_page(r, d.discursos_deputado(int(id))),
+        )
+        self.route(
+            c,
+            "frentes",
+            lambda r: self.camara_page(r, LazyRecords(d.frente_ids(), d.frente)),
+        )
+        self.route(
+            c,
+            r"frentes/(\d+)/membros",
+            lambda r, id: self.camara_page(r, d.membros_frente(int(id))),
+        )
+        self.route(
+            c,
+            "proposicoes",
+            lambda r: self.camara_page(
+                r,
+                LazyRecords(d.proposicoes_ids(r.query.get("dataInicio")), d.proposicao),
+            ),
+        )
+        self.route(
+            c,
+            r"proposicoes/(\d+)",
+            lambda r, id: self.camara_item(r, d.detalhes_proposicao(int(id))),
+        )
+        self.route(
+            c,
+            r"proposicoes/(\d+)/autores",
+            lambda r, id: self.camara_page(r, d.autores_proposicao(int(id))),
+        )
+        self.route(
+            c,
+            "votacoes",
+            lambda r: self.camara_page(
+                r, LazyRecords(d.votacao_ids(r.query.get("dataInicio")), d.votacao)
+            ),
+        )
+        self.route(
+            c, r"votacoes/([\w-]+)", lambda r, id: self.camara_item(r, d.votacao(id))
+        )
+        self.route(
+            c,
+            r"votacoes/([\w-]+)/orientacoes",
+            lambda r, id: self.camara_page(r, d.orientacoes_votacao(id)),
+        )
+        self.route(
+            c,
+            r"votacoes/([\w-]+)/votos",
+            lambda r, id: self.camara_page(r, d.votos_votacao(id)),
+        )
+        self.route(
+            p,
+            r"deputados/(\d+)/presenca-plenario/(\d+)",
+            lambda r, id, ano: Response(
+                body=d.presenca_html(int(id), int(ano)).encode(),
+                headers={"content-type": "text/html; charset=utf-8"},
+            ),
+        )
+
+        self.route(s, "comissao/lista/colegiados", lambda r: d.colegiados_json())
+        self.route(s, "senador/lista/atual", lambda r: d.senadores_em_exercicio())
+        self.route(s, "senador/afastados", lambda r: d.senadores_afastados_json())
+        self.route(s, r"senador/(\d+)", lambda r, id: d.detalhes_senador(int(id)))
+        self.route(
+            s,
+            r"senador/(\d+)/discursos",
+            lambda r, id: d.discursos_senador(int(id), r.query.get("dataInicio")),
+        )
+        self.route(s, "processo", lambda r: d.processos_json(r.query.get("numdias")))
+        self.route(s, r"processo/(\d+)", lambda r, id: d.detalhes_processo(int(id)))
+        self.route(
+            s, "votacao", lambda r: d.votacoes_senado_json(r.query.get("dataInicio"))
+        )
+        self.route(
+            a,
+            r"senadores/despesas_ceaps/(\d+)",
+            lambda r, ano: d.despesas_senado(int(ano)),
+        )
+
+        self.route(TSE_PREFIX, r"(.+\.zip)", self.tse_archive)
+
+    def legislaturas(self, request: Request) -> Response:
+        legislatura = self.dataset.legislatura
+        return self.camara_page(
+            request,
+            [
+                {
+                    "id": legislatura,
+                    "uri": f"https://dadosabertos.camara.leg.br/api/v2/legislaturas/{legislatura}",
+                    "dataInicio": "2023-02-01",
+                    "dataFim": "2027-01-31",
+                }
+            ],
+        )
+
+    def camara_item(self, request: Request, dados: dict) -> Response:
+        return json_response(
+            {"dados": dados, "links": [{"rel": "self", "href": request.url}]}
+        )
+
+    def camara_page(self, request: Request, records: Sequence) -> Response:
+        """
+        Página de um recurso da Câmara. Como na API real, só há paginação quando o parâmetro 'itens' é enviado,
+        e o link 'last' aponta para a última página.
+        """
+        total = len(records)
+        itens = int(request.query.get("itens", 0))
+        if not itens:
+            return json_response(
+                {
+                    "dados": list(records),
+                    "links": [{"rel": "self", "href": request.url}],
+                },
+                {"x-total-count": str(total)},
+            )
+
+        page = int(request.query.get(PAGE_PARAM, 1))
+        last = max(math.ceil(total / itens), 1)
+        base = re.sub(rf"[?&]{PAGE_PARAM}=\d+", "", request.url)
+        separator = "&" if "?" in base else "?"
+
+        def href(n: int) -> str:
+            return f"{base}{separator}{PAGE_PARAM}={n}"
+
+        links = [{"rel": "self", "href": href(page)}]
+        if page < last:
+            links.append({"rel": "next", "href": href(page + 1)})
+        links += [
+            {"rel": "first", "href": href(1)},
+            {"rel": "last", "href": href(last)},
+        ]
+        return json_response(
+            {"dados": records[(page - 1) * itens : page * itens], "links": links},
+            {"x-total-count": str(total)},
+        )
+
+    def tse_archive(self, request: Request, path: str) -> Response | None:
+        body = self.dataset.tse_zip(path)
+        if body is None:
+            return None
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        headers = {
+            "content-type": "application/zip",
+            "accept-ranges": "bytes",
+            "etag": etag,
+            "last-modified": TSE_LAST_MODIFIED,
+        }
+
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", range_header or "")
+        if match and if_range in (None, etag, TSE_LAST_MODIFIED):
+            start = int(match.group(1))
+            end = min(int(match.group(2) or len(body) - 1), len(body) - 1)
+            if start >= len(body):
+                return Response(
+                    status=416, headers={"content-range": f"bytes */{len(body)}"}
+                )
+            headers["content-range"] = f"bytes {start}-{end}/{len(body)}"
+            return Response(status=206, body=body[start : end + 1], headers=headers)
+        return Response(body=body, headers=headers)
+
+    def resolve(self, request: Request) -> Response:
+        for prefix, pattern, handler in self.routes:
+            if not request.path.startswith(prefix):
+                continue
+            match = pattern.match(request.path[len(prefix) :].strip("/"))
+            if match is None:
+                continue
+            result = handler(request, *match.groups())
+            if result is None:
+                break
+            return result if isinstance(result, Response) else json_response(result)
+        return error_response(404, f"Recurso não encontrado: {request.path}")
+
+    def get_json(self, url: str) -> Any:
+        """
+        Resposta JSON de uma URL resolvida diretamente pelas rotas, sem servidor nem rede e sem latência ou falhas.
+        Usado para alimentar as funções das tasks com o mesmo conteúdo que o servidor entregaria.
+        """
+        parts = urlsplit(url)
+        request = Request(
+            method="GET",
+            path=parts.path,
+            query=dict(parse_qsl(parts.query)),
+            url=url,
+            headers={},
+        )
+        response = self.resolve(request)
+        if response.status != 200:
+            raise ValueError(
+                f"O servidor substituto respondeu {response.status} para {url}"
+            )
+        return json.loads(response.body)
+
+    # ============= FALHAS =============
+
+    def take_token(self) -> float:
+        """
+        Consome uma requisição do limite por segundo. Retorna 0 se a requisição pode seguir, ou os segundos até a próxima vaga.
+        """
+        rate = self.faults.max_requests_per_second
+        if rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(rate, self._tokens + (now - self._tokens_updated) * rate)
+        self._tokens_updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / rate
+
+    def injected_fault(self, request: Request) -> Response | None:
+        faults = self.faults
+        wait = self.take_token()
+        if wait:
+            return self.throttled(max(wait, faults.retry_after))
+        if faults.fail_first:
+            self._attempts[request.url] += 1
+            if self._attempts[request.url] <= faults.fail_first:
+                return error_response(503, "Serviço indisponível")
+        if faults.throttle_rate and self.rng.random() < faults.throttle_rate:
+            return self.throttled(faults.retry_after)
+        if faults.error_rate and self.rng.random() < faults.error_rate:
+            status = self.rng.choice(faults.error_statuses)
+            return error_response(status, "Erro interno injetado")
+        return None
+
+    def throttled(self, retry_after: float) -> Response:
+        response = error_response(429, "Muitas requisições")
+        response.headers["retry-after"] = str(math.ceil(retry_after))
+        return response
+
+    # ============= ASGI =============
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable):
+        if scope["type"] != "http":
+            return
+
+        headers = {k.decode().lower(): v.decode() for k, v in scope["headers"]}
+        query_string = scope.get("query_string", b"").decode()
+        url = f"{scope.get('scheme', 'http')}://{headers.get('host', 'localhost')}{scope['path']}"
+        if query_string:
+            url += "?" + query_string
+        request = Request(
+            method=scope["method"],
+            path=scope["path"],
+            query=dict(parse_qsl(query_string)),
+            url=url,
+            headers=headers,
+        )
+
+        self.requests += 1
+        await asyncio.sleep(self.latency.sample(self.rng))
+
+        response = self.injected_fault(request) or self.resolve(request)
+        self.statuses[response.status] += 1
+        await self.send_response(request, response, send)
+
+    async def send_response(self, request: Request, response: Response, send: Callable):
+        headers = {**response.headers, "content-length": str(len(response.body))}
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status,
+                "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+            }
+        )
+
+        body = b"" if request.method == "HEAD" else response.body
+        bandwidth = self.faults.bandwidth * 1024 * 1024
+        if not bandwidth or len(body) <= CHUNK_SIZE:
+            if bandwidth:
+                await asyncio.sleep(len(body) / bandwidth)
+            await send({"type": "http.response.body", "body": body})
+            self.bytes_sent += len(body)
+            return
+
+        for start in range(0, len(body), CHUNK_SIZE):
+            chunk = body[start : start + CHUNK_SIZE]
+            await asyncio.sleep(len(chunk) / bandwidth)
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": start + CHUNK_SIZE < len(body),
+                }
+            )
+            self.bytes_sent += len(chunk)
+
+
+def standin_from_config(config: AppConfig = APP_SETTINGS) -> StandInAPI:
+    settings = config.STANDIN
+    return StandInAPI(
+        dataset=StandInDataset(seed=settings.SEED).scaled(settings.SCALE),
+        latency=LatencyProfile(
+            distribution=settings.LATENCY_DISTRIBUTION,
+            mean=settings.LATENCY_MEAN,
+            sigma=settings.LATENCY_SIGMA,
+        ),
+        faults=FaultProfile(
+            error_rate=settings.ERROR_RATE,
+            throttle_rate=settings.THROTTLE_RATE,
+            retry_after=settings.RETRY_AFTER,
+            max_requests_per_second=settings.MAX_REQUESTS_PER_SECOND,
+            bandwidth=settings.BANDWIDTH,
+        ),
+        seed=settings.SEED,
+    )
+
+
+@contextmanager
+def serve_in_thread(
+    app: StandInAPI, host: str = "127.0.0.1", port: int = 0
+) -> Iterator[str]:
+    """
+    Executa o servidor substituto em uma thread e entrega a sua URL. Com port=0 o sistema escolhe uma porta livre.
+    """
+    import uvicorn  # Dependência do servidor do Prefect, necessária apenas para servir a aplicação
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="off")
+    )
+    thread = threading.Thread(target=server.run, name="standin-api", daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError(f"O servidor substituto não iniciou em {host}:{port}")
+        time.sleep(0.01)
+
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://{host}:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def _serve_until_stopped(app: StandInAPI, urls, stop):
+    with serve_in_thread(app) as url:
+        urls.put(url)
+        stop.wait()
+
+
+@contextmanager
+def serve_in_process(app: StandInAPI, timeout: float = 30.0) -> Iterator[str]:
+    """
+    Executa o servidor substituto em outro processo e entrega a sua URL.
+    Usado para medições de desempenho: o servidor não divide a CPU e o GIL com o código medido.
+    As estatísticas do app (requests, statuses) ficam no outro processo e não são atualizadas aqui.
+    """
+    # spawn, pois o fork de um processo com threads (as do Prefect) pode travar o processo filho
+    context = multiprocessing.get_context("spawn")
+    urls = context.Queue()
+    stop = context.Event()
+    process = context.Process(
+        target=_serve_until_stopped,
+        args=(app, urls, stop),
+        name="standin-api",
+        daemon=True,
+    )
+    process.start()
+    try:
+        try:
+            url = urls.get(timeout=timeout)
+        except queue.Empty as e:
+            raise RuntimeError(
+                "O servidor substituto não iniciou no outro processo"
+            ) from e
+        yield url
+    finally:
+        stop.set()
+        process.join(timeout)
+        if process.is_alive():
+            process.kill()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    settings = APP_SETTINGS.STANDIN
+    host, _, port = settings.URL.removeprefix("http://").partition(":")
+    logger.info(f"Servidor substituto das APIs em {settings.URL}")
+    uvicorn.run(
+        standin_from_config(), host=host, port=int(port or 80), log_level="warning"
+    )
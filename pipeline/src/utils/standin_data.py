@@ -0,0 +1,670 @@
+import csv
+import io
+import random
+import zipfile
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+from functools import lru_cache
+
+# Prefixos de cada API no servidor substituto. As URLs base da configuração apontam para eles no modo STANDIN
+CAMARA_REST_PREFIX = "/camara/api/v2/"
+CAMARA_PORTAL_PREFIX = "/camara/portal/"
+SENADO_REST_PREFIX = "/senado/dadosabertos/"
+SENADO_ADM_PREFIX = "/senado/adm/api/v1/"
+TSE_PREFIX = "/tse/"
+
+UFS = (
+    "AC AL AM AP BA CE DF ES GO MA MG MS MT PA PB PE PI PR RJ RN RO RR RS SC SE SP TO"
+).split()
+PARTIDOS = (
+    "PL PT UNIÃO PP PSD REPUBLICANOS MDB PDT PSB PSDB PODE PSOL AVANTE PCdoB NOVO"
+).split()
+NOMES = (
+    "Ana Antônio Carlos Maria José Fernanda João Luiza Paulo Beatriz Rafael Juliana Marcos Helena Pedro Sônia"
+).split()
+SOBRENOMES = (
+    "Silva Souza Oliveira Santos Pereira Lima Ferreira Costa Rodrigues Almeida Nascimento Araújo Barbosa Ribeiro"
+).split()
+TIPOS_DESPESA = (
+    "COMBUSTÍVEIS E LUBRIFICANTES.",
+    "PASSAGEM AÉREA - SIGEPA",
+    "DIVULGAÇÃO DA ATIVIDADE PARLAMENTAR.",
+    "MANUTENÇÃO DE ESCRITÓRIO DE APOIO À ATIVIDADE PARLAMENTAR",
+    "TELEFONIA",
+)
+TIPOS_VOTO = ("Sim", "Não", "Abstenção", "Obstrução", "Artigo 17")
+SIGLAS_TIPO = ("PL", "PEC", "PLP", "REQ", "MPV", "PDL")
+
+# Arquivos de cada ZIP do TSE, pelo início do caminho do recurso: (prefixo dos membros, colunas)
+_ELEICAO_COLUMNS = [
+    "DT_GERACAO",
+    "ANO_ELEICAO",
+    "CD_TIPO_ELEICAO",
+    "NR_TURNO",
+    "CD_ELEICAO",
+    "DS_ELEICAO",
+    "SG_UF",
+    "CD_CARGO",
+    "DS_CARGO",
+    "SQ_CANDIDATO",
+    "NR_CANDIDATO",
+    "SG_PARTIDO",
+]
+TSE_ARCHIVES = {
+    "consulta_cand/consulta_cand": [
+        (
+            "consulta_cand",
+            _ELEICAO_COLUMNS
+            + [
+                "NM_CANDIDATO",
+                "NM_URNA_CANDIDATO",
+                "NR_CPF_CANDIDATO",
+                "DT_NASCIMENTO",
+                "CD_GENERO",
+                "DS_SIT_TOT_TURNO",
+            ],
+        )
+    ],
+    "consulta_cand/rede_social_candidato": [
+        ("rede_social_candidato", ["SG_UF", "SQ_CANDIDATO", "NR_ORDEM", "DS_URL"])
+    ],
+    "votacao_candidato_munzona/votacao_candidato_munzona": [
+        (
+            "votacao_candidato_munzona",
+            _ELEICAO_COLUMNS + ["CD_MUNICIPIO", "NR_ZONA", "QT_VOTOS_NOMINAIS"],
+        )
+    ],
+    "prestacao_contas/prestacao_de_contas_eleitorais_candidatos": [
+        (
+            "receitas_candidatos",
+            _ELEICAO_COLUMNS + ["DS_ORIGEM_RECEITA", "VR_RECEITA"],
+        ),
+        (
+            "despesas_contratadas_candidatos",
+            _ELEICAO_COLUMNS + ["DS_ORIGEM_DESPESA", "VR_DESPESA_CONTRATADA"],
+        ),
+    ],
+}
+
+# Quantidades de entidades multiplicadas por StandInDataset.scaled. As quantidades por entidade (ex.: discursos de
+# um deputado) não mudam, então o volume total cresce na mesma proporção que o número de entidades
+SCALED_FIELDS = (
+    "deputados",
+    "frentes",
+    "proposicoes",
+    "votacoes",
+    "senadores",
+    "senadores_afastados",
+    "colegiados",
+    "processos",
+    "votacoes_senado",
+    "despesas_senado_por_ano",
+    "tse_linhas",
+)
+
+
+def _seed(*parts) -> str:
+    return ":".join(str(p) for p in parts)
+
+
+@dataclass(frozen=True)
+class StandInDataset:
+    """
+    Dados servidos pelo servidor substituto das APIs. Cada entidade é gerada de forma determinística a partir
+    da semente e do seu identificador, então o mesmo recurso tem sempre o mesmo conteúdo, sem nada guardado em memória.
+    As quantidades são por requisição nos endpoints filtrados por data ou por entidade (ex.: discursos de um deputado).
+    """
+
+    seed: int = 0
+    legislatura: int = 57
+    deputados: int = 513
+    despesas_por_deputado: int = 240  # Por ano
+    discursos_por_deputado: int = 25
+    frentes: int = 300
+    membros_por_frente: int = 40
+    proposicoes: int = 2000
+    autores_por_proposicao: int = 3
+    votacoes: int = 400
+    votos_por_votacao: int = 400
+    orientacoes_por_votacao: int = 12
+    senadores: int = 81
+    senadores_afastados: int = 6
+    discursos_por_senador: int = 10
+    colegiados: int = 120
+    processos: int = 1500
+    votacoes_senado: int = 150
+    despesas_senado_por_ano: int = 20000
+    tse_linhas: int = 2000  # Linhas de cada arquivo CSV dos ZIPs do TSE
+    tse_ufs: tuple[str, ...] = ("BRASIL", "SP", "RJ")  # Arquivos de cada ZIP do TSE
+
+    def scaled(self, factor: int) -> "StandInDataset":
+        """
+        O mesmo conjunto de dados com factor vezes mais entidades, para testes de estresse acima do volume real.
+        As entidades do conjunto original continuam iguais, pois cada uma depende apenas da semente e do seu id.
+        """
+        if factor < 1:
+            raise ValueError(f"O fator de escala deve ser ao menos 1: {factor}")
+        return replace(
+            self, **{field: getattr(self, field) * factor for field in SCALED_FIELDS}
+        )
+
+    def rng(self, *parts) -> random.Random:
+        return random.Random(_seed(self.seed, *parts))
+
+    def nome(self, rng: random.Random) -> str:
+        return f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)} {rng.choice(SOBRENOMES)}"
+
+    def data(self, rng: random.Random, ano: int | None = None) -> date:
+        ano = ano or rng.randint(2019, 2025)
+        return date(ano, 1, 1) + timedelta(days=rng.randrange(365))
+
+    # ============= CÂMARA =============
+
+    def deputado_ids(self) -> list[int]:
+        return [204000 + i for i in range(self.deputados)]
+
+    def deputado(self, id: int) -> dict:
+        rng = self.rng("deputado", id)
+        nome = self.nome(rng)
+        return {
+            "id": id,
+            "uri": f"https://dadosabertos.camara.leg.br/api/v2/deputados/{id}",
+            "nome": nome,
+            "siglaPartido": rng.choice(PARTIDOS),
+            "siglaUf": rng.choice(UFS),
+            "idLegislatura": self.legislatura,
+            "urlFoto": f"https://www.camara.leg.br/internet/deputado/bandep/{id}.jpg",
+            "email": f"dep.{nome.split()[0].lower()}{id}@camara.leg.br",
+        }
+
+    def detalhes_deputado(self, id: int) -> dict:
+        deputado = self.deputado(id)
+        rng = self.rng("detalhes-deputado", id)
+        return {
+            "id": id,
+            "uri": deputado["uri"],
+            "nomeCivil": deputado["nome"].upper(),
+            "cpf": f"{rng.randrange(10**11):011d}",
+            "sexo": rng.choice("MF"),
+            "dataNascimento": self.data(rng, rng.randint(1950, 1995)).isoformat(),
+            "ufNascimento": rng.choice(UFS),
+            "municipioNascimento": "Brasília",
+            "escolaridade": "Superior",
+            "redeSocial": [],
+            "ultimoStatus": {
+                "id": id,
+                "nome": deputado["nome"],
+                "nomeEleitoral": deputado["nome"],
+                "siglaPartido": deputado["siglaPartido"],
+                "siglaUf": deputado["siglaUf"],
+                "idLegislatura": self.legislatura,
+                "data": "2023-02-01",
+                "situacao": "Exercício",
+                "condicaoEleitoral": rng.choice(("Titular", "Suplente")),
+                "gabinete": {"predio": "4", "sala": str(rng.randint(100, 999))},
+            },
+        }
+
+    def despesas_deputado(self, id: int, ano: int, mes: int | None = None) -> list:
+        rng = self.rng("despesas", id, ano)
+        despesas = []
+        for i in range(self.despesas_por_deputado):
+            valor = round(rng.lognormvariate(6, 1), 2)
+            documento = self.data(rng, ano)
+            despesas.append(
+                {
+                    "ano": ano,
+                    "mes": documento.month,
+                    "tipoDespesa": rng.choice(TIPOS_DESPESA),
+                    "codDocumento": id * 10000 + i,
+                    "tipoDocumento": "Nota Fiscal",
+                    "codTipoDocumento": 0,
+                    "dataDocumento": documento.isoformat(),
+                    "numDocumento": str(rng.randrange(10**6)),
+                    "valorDocumento": valor,
+                    "urlDocumento": f"https://www.camara.leg.br/cota-parlamentar/documentos/{id}/{i}.pdf",
+                    "nomeFornecedor": f"{rng.choice(SOBRENOMES).upper()} LTDA",
+                    "cnpjCpfFornecedor": f"{rng.randrange(10**14):014d}",
+                    "valorLiquido": valor,
+                    "valorGlosa": 0.0,
+                    "numRessarcimento": "",
+                    "codLote": rng.randrange(10**7),
+                    "parcela": 0,
+                }
+            )
+        if mes is not None:
+            despesas = [d for d in despesas if d["mes"] == mes]
+        return sorted(despesas, key=lambda d: d["dataDocumento"])
+
+    def discursos_deputado(self, id: int) -> list:
+        rng = self.rng("discursos-deputado", id)
+        discursos = []
+        for _ in range(self.discursos_por_deputado):
+            inicio = self.data(rng)
+            discursos.append(
+                {
+                    "dataHoraInicio": f"{inicio.isoformat()}T14:{rng.randint(10, 59)}",
+                    "dataHoraFim": f"{inicio.isoformat()}T15:{rng.randint(10, 59)}",
+                    "uriEvento": f"https://dadosabertos.camara.leg.br/api/v2/eventos/{rng.randrange(10**5)}",
+                    "faseEvento": {"titulo": "Pequeno Expediente"},
+                    "tipoDiscurso": "BREVES COMUNICAÇÕES",
+                    "urlTexto": None,
+                    "keywords": "REFORMA TRIBUTÁRIA, SAÚDE",
+                    "sumario": "Comentário sobre a pauta da semana.",
+                    "transcricao": " ".join(rng.choices(SOBRENOMES, k=200)),
+                }
+            )
+        return discursos
+
+    def frente_ids(self) -> list[int]:
+        return [54000 + i for i in range(self.frentes)]
+
+    def frente(self, id: int) -> dict:
+        return {
+            "id": id,
+            "uri": f"https://dadosabertos.camara.leg.br/api/v2/frentes/{id}",
+            "titulo": f"Frente Parlamentar {id}",
+            "idLegislatura": self.legislatura,
+        }
+
+    def membros_frente(self, id: int) -> list:
+        rng = self.rng("membros-frente", id)
+        ids = rng.sample(
+            self.deputado_ids(), min(self.membros_por_frente, self.deputados)
+        )
+        membros = []
+        for i, deputado_id in enumerate(ids):
+            deputado = self.deputado(deputado_id)
+            membros.append(
+                {
+                    **{
+                        k: deputado[k]
+                        for k in ("id", "nome", "siglaPartido", "siglaUf")
+                    },
+                    "idLegislatura": self.legislatura,
+                    "titulo": "Coordenador" if i == 0 else "Membro",
+                    "codTitulo": 1 if i == 0 else 0,
+                    "dataInicio": "2023-03-01",
+                    "dataFim": None,
+                }
+            )
+        return membros
+
+    def proposicao(self, id: int) -> dict:
+        rng = self.rng("proposicao", id)
+        return {
+            "id": id,
+            "uri": f"https://dadosabertos.camara.leg.br/api/v2/proposicoes/{id}",
+            "siglaTipo": rng.choice(SIGLAS_TIPO),
+            "codTipo": rng.randint(100, 999),
+            "numero": rng.randint(1, 5000),
+            "ano": rng.randint(2019, 2025),
+            "ementa": "Dispõe sobre " + " ".join(rng.choices(SOBRENOMES, k=12)).lower(),
+        }
+
+    def proposicoes_ids(self, data_inicio: str | None) -> list[int]:
+        rng = self.rng("proposicoes", data_inicio)
+        start = rng.randrange(2_000_000, 2_500_000)
+        return list(range(start, start + self.proposicoes))
+
+    def detalhes_proposicao(self, id: int) -> dict:
+        return {
+            **self.proposicao(id),
+            "dataApresentacao": self.data(self.rng("apresentacao", id)).isoformat(),
+            "statusProposicao": {
+                "dataHora": "2024-05-01T10:00",
+                "siglaOrgao": "PLEN",
+                "descricaoSituacao": "Aguardando Deliberação",
+            },
+        }
+
+    def autores_proposicao(self, id: int) -> list:
+        rng = self.rng("autores", id)
+        return [
+            {
+                "uri": f"https://dadosabertos.camara.leg.br/api/v2/deputados/{deputado_id}",
+                "nome": self.deputado(deputado_id)["nome"],
+                "codTipo": 10000,
+                "tipo": "Deputado(a)",
+                "ordemAssinatura": i + 1,
+                "proponente": 1,
+            }
+            for i, deputado_id in enumerate(
+                rng.sample(self.deputado_ids(), self.autores_por_proposicao)
+            )
+        ]
+
+    def votacao_ids(self, data_inicio: str | None) -> list[str]:
+        rng = self.rng("votacoes", data_inicio)
+        start = rng.randrange(2_000_000, 2_500_000)
+        return [f"{start + i}-{rng.randint(1, 300)}" for i in range(self.votacoes)]
+
+    def votacao(self, id: str) -> dict:
+        rng = self.rng("votacao", id)
+        data = self.data(rng)
+        proposicao = rng.randrange(2_000_000, 2_500_000)
+        return {
+            "id": id,
+            "uri": f"https://dadosabertos.camara.leg.br/api/v2/votacoes/{id}",
+            "data": data.isoformat(),
+            "dataHoraRegistro": f"{data.isoformat()}T18:{rng.randint(10, 59)}:00",
+            "siglaOrgao": "PLEN",
+            "uriEvento": f"https://dadosabertos.camara.leg.br/api/v2/eventos/{rng.randrange(10**5)}",
+            "proposicaoObjeto": f"PL {rng.randint(1, 5000)}/2024",
+            "uriProposicaoObjeto": f"https://dadosabertos.camara.leg.br/api/v2/proposicoes/{proposicao}",
+            "descricao": "Aprovado o Requerimento.",
+            "aprovacao": rng.choice((0, 1)),
+        }
+
+    def orientacoes_votacao(self, id: str) -> list:
+        rng = self.rng("orientacoes", id)
+        return [
+            {
+                "orientacaoVoto": rng.choice(TIPOS_VOTO[:3]),
+                "codTipoLideranca": "P",
+                "siglaPartidoBloco": partido,
+                "codPartidoBloco": 36000 + i,
+                "uriPartidoBloco": f"https://dadosabertos.camara.leg.br/api/v2/partidos/{36000 + i}",
+            }
+            for i, partido in enumerate(PARTIDOS[: self.orientacoes_por_votacao])
+        ]
+
+    def votos_votacao(self, id: str) -> list:
+        rng = self.rng("votos", id)
+        registro = self.votacao(id)["dataHoraRegistro"]
+        ids = self.deputado_ids()[: self.votos_por_votacao]
+        return [
+            {
+                "tipoVoto": rng.choice(TIPOS_VOTO),
+                "dataRegistroVoto": registro,
+                "deputado_": {
+                    k: v
+                    for k, v in self.deputado(deputado_id).items()
+                    if k in ("id", "nome", "siglaPartido", "siglaUf", "idLegislatura")
+                },
+            }
+            for deputado_id in ids
+        ]
+
+    def presenca_html(self, id: int, ano: int) -> str:
+        rng = self.rng("presenca", id, ano)
+        linhas = "\n".join(
+            f"<tr><td>{self.data(rng, ano).strftime('%d/%m/%Y')}</td><td>Presença</td></tr>"
+            for _ in range(rng.randint(20, 60))
+        )
+        return (
+            "<html><body>"
+            f'<h1 class="titulo-internal">{self.deputado(id)["nome"]}</h1>'
+            f'<a href="https://www.camara.leg.br/deputados/{id}?ano={ano}">Perfil</a>'
+            f'<table class="table table-bordered"><tbody>\n{linhas}\n</tbody></table>'
+            "</body></html>"
+        )
+
+    # ============= SENADO =============
+
+    def senador_ids(self) -> list[int]:
+        return [5000 + i for i in range(self.senadores + self.senadores_afastados)]
+
+    def identificacao_senador(self, id: int) -> dict:
+        rng = self.rng("senador", id)
+        nome = self.nome(rng)
+        return {
+            "CodigoParlamentar": str(id),
+            "CodigoPublicoNaLegAtual": str(id - 4000),
+            "NomeParlamentar": nome,
+            "NomeCompletoParlamentar": nome.upper(),
+            "SexoParlamentar": rng.choice(("Masculino", "Feminino")),
+            "FormaTratamento": "Senador ",
+            "SiglaPartidoParlamentar": rng.choice(PARTIDOS),
+            "UfParlamentar": rng.choice(UFS),
+            "EmailParlamentar": f"sen.{id}@senado.leg.br",
+        }
+
+    def senadores_em_exercicio(self) -> dict:
+        return {
+            "ListaParlamentarEmExercicio": {
+                "Metadados": {"Versao": "4", "VersaoServico": "4"},
+                "Parlamentares": {
+                    "Parlamentar": [
+                        {"IdentificacaoParlamentar": self.identificacao_senador(id)}
+                        for id in self.senador_ids()[: self.senadores]
+                    ]
+                },
+            }
+        }
+
+    def senadores_afastados_json(self) -> dict:
+        return {
+            "AfastamentoAtual": {
+                "Parlamentares": {
+                    "Parlamentar": [
+                        {"IdentificacaoParlamentar": self.identificacao_senador(id)}
+                        for id in self.senador_ids()[self.senadores :]
+                    ]
+                }
+            }
+        }
+
+    def detalhes_senador(self, id: int) -> dict:
+        rng = self.rng("detalhes-senador", id)
+        return {
+            "DetalheParlamentar": {
+                "Metadados": {"Versao": "6"},
+                "Parlamentar": {
+                    "IdentificacaoParlamentar": self.identificacao_senador(id),
+                    "DadosBasicosParlamentar": {
+                        "DataNascimento": self.data(
+                            rng, rng.randint(1945, 1985)
+                        ).isoformat(),
+                        "Naturalidade": "Brasília",
+                        "UfNaturalidade": "DF",
+                    },
+                },
+            }
+        }
+
+    def discursos_senador(self, id: int, data_inicio: str | None) -> dict:
+        rng = self.rng("discursos-senador", id, data_inicio)
+        return {
+            "DiscursosParlamentar": {
+                "Metadados": {"Versao": "5"},
+                "Parlamentar": {
+                    "IdentificacaoParlamentar": self.identificacao_senador(id),
+                    "Pronunciamentos": {
+                        "Pronunciamento": [
+                            {
+                                "CodigoPronunciamento": str(rng.randrange(10**6)),
+                                "DataPronunciamento": self.data(rng).isoformat(),
+                                "TipoUsoPalavra": {"Descricao": "Discurso"},
+                                "TextoResumo": "Pronunciamento sobre "
+                                + " ".join(rng.choices(SOBRENOMES, k=8)).lower(),
+                            }
+                            for _ in range(self.discursos_por_senador)
+                        ]
+                    },
+                },
+            }
+        }
+
+    def colegiados_json(self) -> dict:
+        rng = self.rng("colegiados")
+        return {
+            "ListaColegiados": {
+                "Colegiados": {
+                    "Colegiado": [
+                        {
+                            "CodigoColegiado": str(1000 + i),
+                            "SiglaColegiado": f"C{i:03d}",
+                            "NomeColegiado": f"Comissão {rng.choice(SOBRENOMES)} {i}",
+                            "DataInicio": self.data(rng).isoformat(),
+                        }
+                        for i in range(self.colegiados)
+                    ]
+                }
+            }
+        }
+
+    def processo(self, id: int) -> dict:
+        rng = self.rng("processo", id)
+        sigla = rng.choice(SIGLAS_TIPO)
+        numero, ano = rng.randint(1, 5000), rng.randint(2019, 2025)
+        return {
+            "id": id,
+            "codigoMateria": id + 100000,
+            "identificacao": f"{sigla} {numero}/{ano}",
+            "tipoDocumento": sigla,
+            "ementa": "Altera a Lei " + " ".join(rng.choices(SOBRENOMES, k=10)).lower(),
+            "dataApresentacao": self.data(rng, ano).isoformat(),
+            "autoria": f"Senador {self.nome(rng)}",
+        }
+
+    def processos_json(self, numdias: str | None) -> list:
+        rng = self.rng("processos", numdias)
+        start = rng.randrange(8_000_000, 9_000_000)
+        return [self.processo(start + i) for i in range(self.processos)]
+
+    def detalhes_processo(self, id: int) -> dict:
+        processo = self.processo(id)
+        return {
+            **processo,
+            "documento": {
+                "siglaTipo": processo["tipoDocumento"],
+                "resumoAutoria": processo["autoria"],
+            },
+            "autoriaIniciativa": [
+                {"autor": processo["autoria"], "ente": "Senado Federal"}
+            ],
+            "situacaoAtual": {"descricao": "Em tramitação"},
+        }
+
+    def votacoes_senado_json(self, data_inicio: str | None) -> list:
+        rng = self.rng("votacoes-senado", data_inicio)
+        ids = self.senador_ids()[: self.senadores]
+        votacoes = []
+        for i in range(self.votacoes_senado):
+            codigo = rng.randrange(10**6)
+            votacoes.append(
+                {
+                    "codigoSessao": codigo,
+                    "codigoVotacaoSve": codigo + i,
+                    "dataSessao": self.data(rng).isoformat(),
+                    "descricaoVotacao": "Votação nominal",
+                    "materia": self.processo(rng.randrange(8_000_000, 9_000_000))[
+                        "identificacao"
+                    ],
+                    "votos": [
+                        {
+                            "codigoParlamentar": id,
+                            "siglaVotoParlamentar": rng.choice(TIPOS_VOTO[:3]),
+                        }
+                        for id in ids
+                    ],
+                }
+            )
+        return votacoes
+
+    def despesas_senado(self, ano: int) -> list:
+        rng = self.rng("despesas-senado", ano)
+        ids = self.senador_ids()
+        despesas = []
+        for i in range(self.despesas_senado_por_ano):
+            id = rng.choice(ids)
+            documento = self.data(rng, ano)
+            despesas.append(
+                {
+                    "id": ano * 10**6 + i,
+                    "tipoDocumento": "Nota Fiscal",
+                    "ano": str(ano),
+                    "mes": str(documento.month),
+                    "codSenador": id,
+                    "nomeSenador": self.identificacao_senador(id)["NomeParlamentar"],
+                    "tipoDespesa": rng.choice(TIPOS_DESPESA),
+                    "cpfCnpj": f"{rng.randrange(10**14):014d}",
+                    "fornecedor": f"{rng.choice(SOBRENOMES).upper()} LTDA",
+                    "documento": str(rng.randrange(10**6)),
+                    "data": documento.isoformat(),
+                    "detalhamento": None,
+                    "valorReembolsado": round(rng.lognormvariate(6, 1), 2),
+                }
+            )
+        return despesas
+
+    # ============= TSE =============
+
+    def tse_zip(self, path: str) -> bytes | None:
+        """
+        ZIP de um recurso do TSE (ex.: 'consulta_cand/consulta_cand_2022.zip'), ou None se o recurso não existe.
+        """
+        return _tse_zip(self, path)
+
+    def tse_rows(self, columns: list[str], ano: int, uf: str) -> list[list]:
+        rng = self.rng("tse", ano, uf, len(columns))
+        rows = []
+        for i in range(self.tse_linhas):
+            values = {
+                "DT_GERACAO": "01/10/2024",
+                "ANO_ELEICAO": ano,
+                "CD_TIPO_ELEICAO": 2,
+                "NR_TURNO": 1 + (i % 10 == 0),
+                "CD_ELEICAO": 546,
+                "DS_ELEICAO": f"Eleição Geral Federal {ano}",
+                "SG_UF": rng.choice(UFS) if uf == "BRASIL" else uf,
+                "CD_CARGO": 6,
+                "DS_CARGO": "DEPUTADO FEDERAL",
+                "SQ_CANDIDATO": 250000000000 + i,
+                "NR_CANDIDATO": rng.randint(1000, 9999),
+                "SG_PARTIDO": rng.choice(PARTIDOS),
+                "NM_CANDIDATO": self.nome(rng).upper(),
+                "NM_URNA_CANDIDATO": rng.choice(SOBRENOMES).upper(),
+                "NR_CPF_CANDIDATO": f"{rng.randrange(10**11):011d}",
+                "DT_NASCIMENTO": self.data(rng, rng.randint(1950, 1995)).strftime(
+                    "%d/%m/%Y"
+                ),
+                "CD_GENERO": rng.choice((2, 4)),
+                "DS_SIT_TOT_TURNO": rng.choice(("ELEITO", "NÃO ELEITO", "SUPLENTE")),
+                "NR_ORDEM": 1,
+                "DS_URL": f"https://instagram.com/candidato{i}",
+                "CD_MUNICIPIO": rng.randint(1000, 99999),
+                "NR_ZONA": rng.randint(1, 400),
+                "QT_VOTOS_NOMINAIS": int(rng.paretovariate(1.2)),
+                "DS_ORIGEM_RECEITA": "Recursos de pessoas físicas",
+                "VR_RECEITA": f"{rng.lognormvariate(7, 1.5):.2f}".replace(".", ","),
+                "DS_ORIGEM_DESPESA": "Publicidade",
+                "VR_DESPESA_CONTRATADA": f"{rng.lognormvariate(7, 1.5):.2f}".replace(
+                    ".", ","
+                ),
+            }
+            rows.append([values[c] for c in columns])
+        return rows
+
+
+@lru_cache(maxsize=16)
+def _tse_zip(dataset: StandInDataset, path: str) -> bytes | None:
+    # Os ZIPs são gerados uma vez e mantidos em memória, pois os downloads em segmentos pedem o mesmo arquivo várias vezes
+    if not path.endswith(".zip"):
+        return None
+    stem = path.removesuffix(".zip")
+    resource, _, suffix = stem.rpartition("_")
+    uf = None
+    if not suffix.isdigit():  # Recursos por UF, ex.: rede_social_candidato_2022_SP.zip
+        uf = suffix
+        resource, _, suffix = resource.rpartition("_")
+    if resource not in TSE_ARCHIVES or not suffix.isdigit():
+        return None
+    ano = int(suffix)
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for prefix, columns in TSE_ARCHIVES[resource]:
+            for member_uf in [uf] if uf else dataset.tse_ufs:
+                text = io.StringIO()
+                writer = csv.writer(
+                    text, delimiter=";", quoting=csv.QUOTE_ALL, lineterminator="\n"
+                )
+                writer.writerow(columns)
+                writer.writerows(dataset.tse_rows(columns, ano, member_uf))
+                zf.writestr(
+                    f"{prefix}_{ano}_{member_uf}.csv",
+                    text.getvalue().encode("latin-1", errors="replace"),
+                )
+    return buffer.getvalue()
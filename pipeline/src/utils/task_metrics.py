@@ -0,0 +1,123 @@
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from prefect.context import TaskRunContext
+from prefect.logging import get_logger
+
+from database.models.base import TaskMetricsDB
+from database.repository.task_metrics import (
+    add_task_output_db,
+    insert_task_metrics_db,
+    update_task_metrics_db,
+)
+
+from .fetch_progress import FetchProgress
+
+logger = get_logger()
+
+# Task Runs deste processo que já gravaram métricas, com o Id do registro da tentativa atual. Apenas elas recebem o
+# tamanho dos arquivos gravados. As novas tentativas do Prefect mantêm o Id da Task Run e gravam um registro próprio,
+# então as atualizações vão apenas para o último registro, e não para os de todas as tentativas.
+_recorded_runs: dict[UUID, int] = {}
+
+
+def peak_rss() -> int | None:
+    """
+    Pico de memória residente do processo, em bytes. None em sistemas sem o módulo resource (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # O Linux informa o valor em KB e o macOS em bytes
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def task_run_duration(context: TaskRunContext) -> float | None:
+    """
+    Segundos desde o início da Task Run, ou None se o Prefect ainda não registrou o início.
+    """
+    start_time = context.task_run.start_time
+    if start_time is None:
+        return None
+    return (datetime.now(timezone.utc) - start_time).total_seconds()
+
+
+def record_fetch_metrics(progress: FetchProgress, lote_id: int):
+    """
+    Grava na tabela task_metrics as métricas de um download de muitas URLs, quando executado dentro de uma Task Run.
+    Falhas na gravação são apenas logadas, para não interromper a task.
+    """
+    context = TaskRunContext.get()
+    if context is None:
+        return
+
+    latencies = progress.latency_percentiles()
+    duration = task_run_duration(context)
+    if duration is None:
+        duration = time.monotonic() - progress.started
+    try:
+        metrics_id = insert_task_metrics_db(
+            TaskMetricsDB(
+                lote_id=lote_id,
+                task=progress.task,
+                task_run_id=context.task_run.id,
+                duracao=duration,
+                urls_planejadas=progress.planned,
+                urls_baixadas=progress.succeeded,
+                urls_falhas=progress.failed,
+                paginas=progress.pages,
+                registros=progress.records,
+                bytes=progress.bytes,
+                novas_tentativas=progress.retries,
+                latencia_p50=latencies["p50"],
+                latencia_p95=latencies["p95"],
+                latencia_p99=latencies["p99"],
+                pico_rss=peak_rss(),
+            )
+        )
+        _recorded_runs[context.task_run.id] = metrics_id
+    except Exception as e:
+        logger.warning(
+            f"Não foi possível gravar as métricas da task {progress.task}: {e}"
+        )
+
+
+def record_output_size(path: str | Path):
+    """
+    Soma o tamanho de um arquivo gravado às métricas da Task Run atual, se ela gravou métricas de download.
+    """
+    context = TaskRunContext.get()
+    if context is None or context.task_run.id not in _recorded_runs:
+        return
+
+    try:
+        add_task_output_db(
+            metrics_id=_recorded_runs[context.task_run.id],
+            size=Path(path).stat().st_size,
+            duration=task_run_duration(context),
+            peak_rss=peak_rss(),
+        )
+    except Exception as e:
+        logger.warning(
+            f"Não foi possível gravar o tamanho do arquivo {path} nas métricas: {e}"
+        )
+
+
+def update_task_metrics(values: dict[str, Any]):
+    """
+    Grava valores nas métricas da Task Run atual, se ela gravou métricas de download.
+    """
+    context = TaskRunContext.get()
+    if context is None or context.task_run.id not in _recorded_runs:
+        return
+
+    try:
+        update_task_metrics_db(_recorded_runs[context.task_run.id], values)
+    except Exception as e:
+        logger.warning(f"Não foi possível atualizar as métricas da task: {e}")
@@ -0,0 +1,368 @@
+import argparse
+import math
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+
+from prefect.logging import get_logger
+
+from config.loader import load_config
+from config.parameters import TasksNames
+from tasks.extract.camara import (
+    extract_camara_deputados,
+    extract_camara_detalhes_deputados,
+    extract_camara_discursos_deputados,
+    extract_camara_frentes_membros,
+    extract_camara_orientacoes_votacoes,
+    extract_camara_proposicoes,
+    extract_camara_votacoes,
+    extract_camara_votos_votacoes,
+)
+from tasks.extract.senado import (
+    extract_senado_despesas_senadores,
+    extract_senado_discursos_senadores,
+    extract_senado_senadores,
+)
+
+from .fetch_many_jsons import get_last_page
+from .fetch_progress import count_records
+from .io import save_json
+from .standin_api import StandInAPI
+from .standin_data import (
+    CAMARA_REST_PREFIX,
+    SENADO_ADM_PREFIX,
+    SENADO_REST_PREFIX,
+    StandInDataset,
+)
+from .url_utils import page_url
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+# Host das URLs resolvidas diretamente pelo servidor substituto, sem rede
+BASE_URL = "http://standin"
+
+DEFAULT_FACTORS = (1, 10, 100)
+
+# Tempo máximo estimado de uma medição. Fatores cuja estimativa passa disso não são executados
+DEFAULT_MAX_SECONDS = 60.0
+
+# Acima desse expoente de crescimento (tempo ~ entrada^expoente) a task é apontada como superlinear
+SUPERLINEAR_EXPONENT = 1.3
+
+# Tempo mínimo das medições usadas no cálculo do expoente de crescimento
+MIN_SECONDS = 0.001
+
+# Medições mais rápidas que isso são repetidas e fica o menor tempo, para reduzir o ruído
+REPEAT_BELOW_SECONDS = 1.0
+
+
+def camara(path: str) -> str:
+    return f"{BASE_URL}{CAMARA_REST_PREFIX}{path}"
+
+
+def senado(path: str) -> str:
+    return f"{BASE_URL}{SENADO_REST_PREFIX}{path}"
+
+
+def senado_adm(path: str) -> str:
+    return f"{BASE_URL}{SENADO_ADM_PREFIX}{path}"
+
+
+def camara_pages(app: StandInAPI, url: str) -> list[dict]:
+    """
+    Todas as páginas de um recurso da Câmara, na forma em que fetch_many_jsons as entrega com follow_pagination.
+    """
+    first = app.get_json(url)
+    return [first] + [
+        app.get_json(page_url(url, page)) for page in range(2, get_last_page(first) + 1)
+    ]
+
+
+def artifact(module: ModuleType) -> Callable[..., Any]:
+    """
+    Alimenta as agregações do artefato declaradas pela task com todos os documentos, como o download faria.
+    """
+
+    def run(documents: Any, *args):
+        documents = documents if isinstance(documents, list) else [documents]
+        return module.artifact_aggregates(*args).feed_many(documents).table()
+
+    return run
+
+
+@dataclass(frozen=True)
+class ScaleCase:
+    """
+    Uma função de task medida em escala:
+    - build: monta, a partir do servidor substituto, os argumentos que a task passaria para a função
+    - run: a função medida, que recebe os argumentos montados por build
+    - base: quantidades por entidade do conjunto de dados, reduzidas para que o fator 100 caiba em memória
+    """
+
+    task: str
+    build: Callable[[StandInAPI], tuple]
+    run: Callable[..., Any]
+    base: dict = field(default_factory=dict)
+
+
+SCALE_CASES = [
+    ScaleCase(
+        task=TasksNames.EXTRACT_CAMARA_DEPUTADOS,
+        build=lambda app: (app.get_json(camara("deputados")),),
+        run=artifact(extract_camara_deputados),
+    ),
+    ScaleCase(
+        task=TasksNames.EXTRACT_CAMARA_DETALHES_DEPUTADOS,
+        build=lambda app: (
+            [
+                app.get_json(camara(f"deputados/{id}"))
+                for id in app.dataset.deputado_ids()
+            ],
+        ),
+        run=artifact(extract_camara_detalhes_deputados),
+    ),
+    ScaleCase(
+        task=TasksNames.EXTRACT_CAMARA_DISCURSOS_DEPUTADOS,
+        build=lambda app: (
+            [
+                page
+                for id in app.dataset.deputado_ids()
+                for page in camara_pages(
+                    app, camara(f"deputados/{id}/discursos?itens=100")
+                )
+            ],
+        ),
+        run=artifact(extract_camara_discursos_deputados),
+        base={"discursos_por_deputado": 2},
+    ),
+    ScaleCase(
+        task=TasksNames.EXTRACT_CAMARA_FRENTES_MEMBROS,
+        build=lambda app: (
+            [
+                page
+                for id in app.dataset.frente_ids()
+                for page in camara_pages(app, camara(f"frentes/{id}/membros?itens=100"))
+            ],
+        ),
+        run=artifact(extract_camara_frentes_membros),
+        base={"membros_por_frente": 5},
+    ),
+    ScaleCase(
+        task=TasksNames.EXTRACT_CAMARA_PROPOSICOES,
+        build=lambda app: (camara_pages(app, camara("proposicoes?itens=100")),),
+        run=artifact(extract_camara_proposicoes),
+    ),
+    ScaleCase(
+        task=TasksNames.EXTRACT_CAMARA_VOTACOES,
+        build=lambda app: (camara_pages(app, camara("votacoes?itens=100")),),
+        run=artifact(extract_camara_votacoes),
+    ),
+    ScaleCase(
+        task=TasksNames.EXTRACT_CAMARA_ORIENTACOES_VOTACOES,
+        build=lambda app: (
+            [
+                app.get_json(camara(f"votacoes/{id}/orientacoes"))
+                for id in app.dataset.votacao_ids(None)
+            ],
+        ),
+        run=artifact(extract_camara_orientacoes_votacoes),
+        base={"orientacoes_por_votacao": 2},
+    ),
+    ScaleCase(
+        task=TasksNames.EXTRACT_CAMARA_VOTOS_VOTACOES,
+        build=lambda app: (
+            [
+                app.get_json(camara(f"votacoes/{id}/votos"))
+                for id in app.dataset.votacao_ids(None)
+            ],
+        ),
+        run=artifact(extract_camara_votos_votacoes),
+        base={"votos_por_votacao": 5},
+    ),
+    ScaleCase(
+        task=TasksNames.EXTRACT_SENADO_SENADORES,
+        build=lambda app: (
+            [
+                app.get_json(senado("senador/lista/atual")),
+                app.get_json(senado("senador/afastados")),
+            ],
+        ),
+        run=artifact(extract_senado_senadores),
+    ),
+    ScaleCase(
+        task=TasksNames.EXTRACT_SENADO_DISCURSOS_SENADORES,
+        build=lambda app: (
+            [
+                app.get_json(senado(f"senador/{id}/discursos?dataInicio=20240101"))
+                for id in app.dataset.senador_ids()
+            ],
+        ),
+        run=artifact(extract_senado_discursos_senadores),
+        base={"discursos_por_senador": 2},
+    ),
+    ScaleCase(
+        task=TasksNames.EXTRACT_SENADO_DESPESAS_SENADORES,
+        build=lambda app: (
+            [
+                app.get_json(senado_adm(f"senadores/despesas_ceaps/{ano}"))
+                for ano in (2024, 2025)
+            ],
+            date(2025, 2, 1),
+        ),
+        run=artifact(extract_senado_despesas_senadores),
+        base={"despesas_senado_por_ano": 2000},
+    ),
+]
+
+
+def input_size(args: tuple) -> tuple[int, int]:
+    """
+    Número de documentos JSON e de registros do primeiro argumento da função medida.
+    """
+    data = args[0]
+    documents = data if isinstance(data, list) else [data]
+    return len(documents), sum(count_records(d) for d in documents)
+
+
+def growth_exponent(a: dict, b: dict) -> float | None:
+    """
+    Expoente k de tempo ~ fator^k entre duas medições: ~1 para funções lineares, ~2 para quadráticas.
+    O volume da entrada cresce na mesma proporção que o fator de escala.
+    Medições abaixo de MIN_SECONDS são dominadas pelo ruído e não entram no cálculo.
+    """
+    if a["segundos"] is None or b["segundos"] is None:
+        return None
+    if min(a["segundos"], b["segundos"]) < MIN_SECONDS:
+        return None
+    return math.log(b["segundos"] / a["segundos"]) / math.log(b["fator"] / a["fator"])
+
+
+def measure(case: ScaleCase, factor: int) -> dict:
+    app = StandInAPI(dataset=StandInDataset(**case.base).scaled(factor))
+
+    started = time.perf_counter()
+    args = case.build(app)
+    build_seconds = time.perf_counter() - started
+    documents, records = input_size(args)
+
+    timings = []
+    while not timings or (sum(timings) < REPEAT_BELOW_SECONDS and len(timings) < 5):
+        started = time.perf_counter()
+        case.run(*args)
+        timings.append(time.perf_counter() - started)
+
+    return {
+        "fator": factor,
+        "documentos": documents,
+        "registros": records,
+        "segundos": min(timings),
+        "segundos_geracao": build_seconds,
+    }
+
+
+def scale_task(
+    case: ScaleCase,
+    factors: tuple[int, ...] = DEFAULT_FACTORS,
+    max_seconds: float = DEFAULT_MAX_SECONDS,
+) -> dict:
+    """
+    Mede a função da task em cada fator de escala. Um fator cujo tempo estimado, a partir do crescimento
+    observado nos fatores anteriores, passa de max_seconds não é executado: fica apenas a estimativa.
+    """
+    points: list[dict] = []
+    exponent = None
+    for factor in sorted(factors):
+        measured = [p for p in points if p["segundos"] is not None]
+        if measured:
+            last = measured[-1]
+            estimate = last["segundos"] * (factor / last["fator"]) ** (exponent or 1.0)
+            if estimate > max_seconds:
+                logger.warning(
+                    f"{case.task}: fator {factor} não executado, tempo estimado de {estimate:.0f}s"
+                )
+                points.append({"fator": factor, "segundos": None, "estimado": estimate})
+                continue
+
+        logger.info(f"Escala: {case.task} com fator {factor}")
+        points.append(measure(case, factor))
+        if len(measured) >= 1:
+            exponent = growth_exponent(measured[-1], points[-1]) or exponent
+
+    return {
+        "task": case.task,
+        "pontos": points,
+        "expoente": exponent,
+        "superlinear": exponent is not None and exponent > SUPERLINEAR_EXPONENT,
+    }
+
+
+def run_scaling(
+    cases: list[ScaleCase] = SCALE_CASES,
+    factors: tuple[int, ...] = DEFAULT_FACTORS,
+    max_seconds: float = DEFAULT_MAX_SECONDS,
+) -> dict:
+    return {
+        "criado_em": datetime.now().isoformat(timespec="seconds"),
+        "fatores": list(factors),
+        "tasks": [scale_task(case, factors, max_seconds) for case in cases],
+    }
+
+
+def save_results(results: dict, path: str | Path | None = None) -> str:
+    if path is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = Path(APP_SETTINGS.BENCHMARK.DIR) / f"escala_{stamp}.json"
+    return save_json(results, path)
+
+
+def format_results(results: dict) -> str:
+    def cell(point: dict) -> str:
+        if point["segundos"] is None:
+            return f"~{point['estimado']:.1f}s"
+        return f"{point['segundos']:.4f}s"
+
+    header = "".join(f"{f'x{f}':>14}" for f in results["fatores"])
+    lines = [f"{'Task':<42}{header}{'expoente':>10}"]
+    for task in results["tasks"]:
+        exponent = task["expoente"]
+        lines.append(
+            f"{task['task']:<42}"
+            + "".join(f"{cell(p):>14}" for p in task["pontos"])
+            + f"{f'{exponent:.2f}' if exponent is not None else '?':>10}"
+            + ("  SUPERLINEAR" if task["superlinear"] else "")
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Mede como as funções das tasks escalam com 10x a 100x o volume real de dados"
+    )
+    parser.add_argument(
+        "--fatores",
+        type=lambda v: tuple(int(f) for f in v.split(",")),
+        default=DEFAULT_FACTORS,
+    )
+    parser.add_argument(
+        "--tasks", type=lambda v: set(v.split(",")), help="Apenas estas tasks"
+    )
+    parser.add_argument("--limite-segundos", type=float, default=DEFAULT_MAX_SECONDS)
+    parser.add_argument("--saida", help="Arquivo JSON dos resultados")
+    args = parser.parse_args(argv)
+
+    cases = [c for c in SCALE_CASES if not args.tasks or c.task in args.tasks]
+    results = run_scaling(cases, args.fatores, args.limite_segundos)
+    path = save_results(results, args.saida)
+    print(format_results(results))
+    print(f"\nResultados salvos em {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
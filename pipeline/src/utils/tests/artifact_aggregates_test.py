@@ -0,0 +1,199 @@
+from datetime import date
+
+import pytest
+
+from src.tasks.extract.camara import extract_camara_discursos_deputados
+from src.tasks.extract.senado import (
+    extract_senado_despesas_senadores,
+    extract_senado_discursos_senadores,
+)
+from src.utils.artifact_aggregates import (
+    Aggregator,
+    ArtifactAggregates,
+    Collect,
+    Count,
+    Distinct,
+    Each,
+    GroupCount,
+    Sum,
+)
+from src.utils.fetch_many_jsons import fetch_many_jsons
+from src.utils.standin_data import CAMARA_REST_PREFIX, SENADO_REST_PREFIX
+
+# ============= AGREGADORES TESTS =============
+
+
+def test_aggregators_single_pass():
+    """Testa as agregações básicas alimentadas uma página por vez."""
+    pages = [
+        {"id": "a", "dados": [{"v": 1}, {"v": 2}]},
+        {"id": "b", "dados": []},
+        {"id": "a", "dados": [{"v": 2}]},
+    ]
+    aggregates = ArtifactAggregates(
+        table=lambda a: {name: a[name].value for name in a.aggregators},
+        paginas=Count(),
+        paginas_vazias=Count(where=lambda p: not p["dados"]),
+        registros=Sum(lambda p: len(p["dados"])),
+        valores=Each(lambda p: p["dados"], Distinct(lambda r: r["v"])),
+        por_id=GroupCount(key=lambda p: p["id"], weight=lambda p: len(p["dados"])),
+        ids=Collect(lambda p: {"id": p["id"]}),
+    )
+
+    table = aggregates.feed_many(pages).table()
+
+    assert table == {
+        "paginas": 3,
+        "paginas_vazias": 1,
+        "registros": 3,
+        "valores": 2,
+        "por_id": {"a": 3, "b": 0},
+        "ids": [{"id": "a"}, {"id": "b"}, {"id": "a"}],
+    }
+
+
+def test_group_count_keeps_first_label():
+    """Testa se o rótulo do grupo é o do primeiro item da chave."""
+    group = GroupCount(key=lambda x: x[0], label=lambda x: x[1])
+    for item in [(1, "primeiro"), (1, "segundo"), (2, "outro")]:
+        group.add(item)
+
+    assert group.value == {1: 2, 2: 1}
+    assert group.labels == {1: "primeiro", 2: "outro"}
+
+
+def test_aggregator_without_value_cannot_be_created():
+    """Testa se um agregador que não implementa value falha ao ser criado, e não ao gerar o artefato."""
+
+    class SemValor(Aggregator):
+        def add(self, item):
+            pass
+
+    with pytest.raises(TypeError):
+        SemValor()  # type: ignore
+
+
+# ============= ARTEFATOS DAS TASKS TESTS =============
+
+
+def test_discursos_deputados_artifact(standin_api):
+    """Testa se os discursos de um deputado espalhados em várias páginas somam em uma única linha."""
+    ids = standin_api.dataset.deputado_ids()[:3]
+    pages = [
+        standin_api.get_json(
+            f"http://standin{CAMARA_REST_PREFIX}deputados/{id}/discursos?itens=10&pagina={page}"
+        )
+        for id in ids
+        for page in (1, 2, 3)
+    ]
+
+    table = extract_camara_discursos_deputados.artifact_aggregates()
+    table = table.feed_many(pages).table()
+
+    assert [(row["id"], row["num_discursos"]) for row in table] == [
+        (str(id), 25) for id in ids
+    ]
+
+
+def test_discursos_senadores_artifact(standin_api):
+    """Testa se os discursos de cada senador em vários anos somam em uma única linha, com o nome do senador."""
+    id = standin_api.dataset.senador_ids()[0]
+    jsons = [
+        standin_api.get_json(
+            f"http://standin{SENADO_REST_PREFIX}senador/{id}/discursos?dataInicio={ano}0101"
+        )
+        for ano in (2023, 2024)
+    ]
+
+    table = extract_senado_discursos_senadores.artifact_aggregates()
+    table = table.feed_many(jsons).table()
+
+    assert len(table) == 1
+    assert table[0]["id"] == str(id)
+    assert table[0]["nome"]
+    assert table[0]["num_discursos"] == 2 * standin_api.dataset.discursos_por_senador
+
+
+@pytest.mark.parametrize(
+    "start_date, expected",
+    [
+        # Período dentro do mesmo ano: os meses a partir de abril
+        (date(2024, 7, 1), 3),
+        # Período que atravessa o ano: todo o ano atual e os meses a partir de novembro
+        (date(2025, 2, 1), 3),
+    ],
+)
+def test_despesas_senadores_artifact(start_date, expected):
+    """Testa o filtro de período das despesas, com meses como texto, número ou com zero à esquerda."""
+    despesas = [
+        {"ano": "2024", "mes": "4"},
+        {"ano": "2024", "mes": "07"},
+        {"ano": 2024, "mes": 12},
+        {"ano": "2025", "mes": "1"},
+        {"ano": "2025", "mes": "02"},
+        {"ano": "2024", "mes": "2"},
+    ]
+
+    table = extract_senado_despesas_senadores.artifact_aggregates(start_date)
+    table = table.feed_many([despesas]).table()
+
+    assert table == [{"total_despesas": expected}]
+
+
+# ============= DOWNLOAD TESTS =============
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_jsons_feeds_aggregates(standin_api, standin_url):
+    """Testa se fetch_many_jsons alimenta as agregações com cada página baixada."""
+    urls = [
+        f"{standin_url}{CAMARA_REST_PREFIX}deputados/{id}/discursos?itens=10"
+        for id in standin_api.dataset.deputado_ids()
+    ]
+    aggregates = extract_camara_discursos_deputados.artifact_aggregates()
+
+    results = await fetch_many_jsons(
+        urls=urls,
+        not_downloaded_urls=[],
+        task="teste",
+        lote_id=1,
+        follow_pagination=True,
+        aggregates=aggregates,
+    )
+
+    table = aggregates.table()
+    assert len(results) == 3 * len(urls)
+    assert len(table) == len(urls)
+    assert all(row["num_discursos"] == 25 for row in table)
+
+
+@pytest.mark.asyncio
+async def test_retry_does_not_feed_page_twice(standin_api, standin_url, monkeypatch):
+    """Testa se uma página que falha depois de lida é contada uma única vez quando a tentativa é repetida."""
+    import src.utils.fetch_many_jsons as fetch_many_jsons_module
+
+    get_last_page = fetch_many_jsons_module.get_last_page
+    calls = []
+
+    def fails_once(data):
+        calls.append(data)
+        if len(calls) == 1:
+            raise RuntimeError("falha depois da leitura da página")
+        return get_last_page(data)
+
+    monkeypatch.setattr(fetch_many_jsons_module, "get_last_page", fails_once)
+
+    id = standin_api.dataset.deputado_ids()[0]
+    aggregates = extract_camara_discursos_deputados.artifact_aggregates()
+    results = await fetch_many_jsons(
+        urls=[f"{standin_url}{CAMARA_REST_PREFIX}deputados/{id}/discursos?itens=10"],
+        not_downloaded_urls=[],
+        task="teste",
+        lote_id=1,
+        follow_pagination=True,
+        aggregates=aggregates,
+    )
+
+    assert len(calls) == 2
+    assert len(results) == 3
+    assert aggregates.table()[0]["num_discursos"] == 25
@@ -1,8 +1,13 @@
+import json
 from datetime import date
 
 import pytest
 
-from src.utils.camara import get_legislatura_data
+from src.utils.camara import (
+    get_legislatura_data,
+    iter_page_records,
+    save_camara_pages,
+)
 
 
 @pytest.fixture
@@ -164,3 +169,67 @@ def test_id_as_string_number_converts():
     result = get_legislatura_data(data, "id")
     assert result == 57
     assert isinstance(result, int)
+
+
+# ============= PAGE RECORDS TESTS =============
+
+
+@pytest.fixture
+def frentes_pages():
+    """
+    Duas páginas do endpoint de frentes, como retornadas pela API.
+    """
+    base = "https://dadosabertos.camara.leg.br/api/v2/frentes?idLegislatura=57"
+    return [
+        {
+            "dados": [
+                {"id": 1, "uri": "u1", "titulo": "Frente A", "idLegislatura": 57},
+                {"id": 2, "uri": "u2", "titulo": "Frente B", "idLegislatura": 57},
+            ],
+            "links": [{"rel": "self", "href": base}],
+        },
+        {
+            "dados": [{"id": 3, "uri": "u3", "titulo": "Frente C"}],
+            "links": [{"rel": "self", "href": base + "&pagina=2"}],
+        },
+    ]
+
+
+def test_iter_page_records_adds_provenance(frentes_pages):
+    """Testa se cada registro recebe a URL, a página e o lote de origem."""
+    records = list(iter_page_records(frentes_pages, lote_id=7))
+
+    assert [r["id"] for r in records] == [1, 2, 3]
+    assert [r["_pagina"] for r in records] == [1, 1, 2]
+    assert all(r["_lote_id"] == 7 for r in records)
+    assert records[2]["_url"].endswith("pagina=2")
+
+
+def test_iter_page_records_projects_fields(frentes_pages):
+    """Testa se apenas os campos listados são mantidos."""
+    records = list(iter_page_records(frentes_pages, 1, fields=("id", "idLegislatura")))
+
+    assert records[0] == {
+        "id": 1,
+        "idLegislatura": 57,
+        "_url": "https://dadosabertos.camara.leg.br/api/v2/frentes?idLegislatura=57",
+        "_pagina": 1,
+        "_lote_id": 1,
+    }
+    # Campos ausentes no registro não são criados
+    assert "idLegislatura" not in records[2]
+
+
+def test_save_camara_pages_modes(frentes_pages, tmp_path):
+    """Testa se o NDJson tem um registro por linha ou uma página por linha."""
+    records_path = save_camara_pages(
+        frentes_pages, tmp_path / "registros.ndjson", 1, records=True
+    )
+    pages_path = save_camara_pages(
+        frentes_pages, tmp_path / "paginas.ndjson", 1, records=False
+    )
+
+    with open(records_path, encoding="utf-8") as f:
+        assert [json.loads(line)["id"] for line in f] == [1, 2, 3]
+    with open(pages_path, encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == frentes_pages
@@ -0,0 +1,212 @@
+import time
+
+import httpx
+import pytest
+
+import src.utils.http_client as http_client_module
+from src.utils.cassette import (
+    CHUNK_SIZE,
+    AsyncRecordingTransport,
+    Cassette,
+    RecordingTransport,
+    ReplayTransport,
+)
+from src.utils.fetch_many_jsons import fetch_many_jsons
+from src.utils.standin_api import FaultProfile, LatencyProfile, StandInAPI
+from src.utils.standin_data import CAMARA_REST_PREFIX, TSE_PREFIX, StandInDataset
+
+BASE_URL = "http://standin"
+ARCHIVE = "consulta_cand/consulta_cand_2022.zip"
+
+
+def recording_client(cassette: Cassette, app: StandInAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=AsyncRecordingTransport(cassette, httpx.ASGITransport(app=app)),
+        base_url=BASE_URL,
+    )
+
+
+@pytest.fixture
+def cassette_mode(monkeypatch, tmp_path):
+    """
+    Ativa o modo cassete de http_client com um cassete em um diretório temporário.
+    """
+    settings = http_client_module.APP_SETTINGS.CASSETTE
+
+    def set_mode(mode: str, time_scale: float = 0.0):
+        monkeypatch.setattr(settings, "MODE", mode)
+        monkeypatch.setattr(settings, "DIR", str(tmp_path / "cassete"))
+        monkeypatch.setattr(settings, "TIME_SCALE", time_scale)
+        http_client_module.current_cassette.cache_clear()
+
+    yield set_mode
+    http_client_module.current_cassette.cache_clear()
+
+
+# ============= CASSETE TESTS =============
+
+
+@pytest.mark.asyncio
+async def test_replay_returns_recorded_responses(tmp_path, standin_api):
+    """Testa se as respostas reproduzidas são iguais às gravadas, sem acessar o servidor."""
+    url = f"{CAMARA_REST_PREFIX}deputados/204000/discursos?itens=10"
+    async with recording_client(Cassette(tmp_path), standin_api) as c:
+        recorded = await c.get(url)
+
+    replay = ReplayTransport(Cassette(tmp_path), time_scale=0)
+    async with httpx.AsyncClient(transport=replay, base_url=BASE_URL) as c:
+        # A URL é comparada na forma canônica
+        replayed = await c.get(
+            f"{CAMARA_REST_PREFIX}deputados/204000/discursos?itens=10&pagina=1"
+        )
+        missing = await c.get(f"{CAMARA_REST_PREFIX}deputados/204001")
+
+    assert replayed.status_code == 200
+    assert replayed.json() == recorded.json()
+    assert replayed.headers["x-total-count"] == "25"
+    assert missing.status_code == 404
+    assert standin_api.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_replay_keeps_response_order(tmp_path):
+    """Testa se as respostas da mesma URL são reproduzidas na ordem gravada, repetindo a última."""
+    app = StandInAPI(
+        dataset=StandInDataset(deputados=1), faults=FaultProfile(fail_first=1)
+    )
+    url = f"{CAMARA_REST_PREFIX}deputados/204000"
+    async with recording_client(Cassette(tmp_path), app) as c:
+        recorded = [(await c.get(url)).status_code for _ in range(2)]
+
+    cassette = Cassette(tmp_path)
+    with httpx.Client(
+        transport=ReplayTransport(cassette, time_scale=0), base_url=BASE_URL
+    ) as c:
+        replayed = [c.get(url).status_code for _ in range(3)]
+
+    assert recorded == [503, 200]
+    assert replayed == [503, 200, 200]
+    assert cassette.summary()["respostas"] == 2
+
+
+@pytest.mark.asyncio
+async def test_replay_timing(tmp_path):
+    """Testa se a latência gravada é reproduzida e comprimida por time_scale."""
+    app = StandInAPI(
+        dataset=StandInDataset(deputados=1),
+        latency=LatencyProfile(distribution="constante", mean=0.2),
+    )
+    url = f"{CAMARA_REST_PREFIX}deputados/204000"
+    async with recording_client(Cassette(tmp_path), app) as c:
+        await c.get(url)
+
+    elapsed = {}
+    for time_scale in (1.0, 0.1):
+        transport = ReplayTransport(Cassette(tmp_path), time_scale=time_scale)
+        async with httpx.AsyncClient(transport=transport, base_url=BASE_URL) as c:
+            started = time.monotonic()
+            await c.get(url)
+            elapsed[time_scale] = time.monotonic() - started
+
+    assert elapsed[1.0] >= 0.2
+    assert elapsed[0.1] < 0.1
+
+
+def test_identical_bodies_are_stored_once(tmp_path):
+    """Testa se corpos iguais são gravados uma única vez."""
+    transport = RecordingTransport(
+        Cassette(tmp_path),
+        httpx.MockTransport(lambda r: httpx.Response(200, text="{}")),
+    )
+    with httpx.Client(transport=transport) as c:
+        c.get("http://standin/a")
+        c.get("http://standin/b")
+
+    assert len(list((tmp_path / "corpos").iterdir())) == 1
+    assert Cassette(tmp_path).summary()["urls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_jsons_replays_recorded_lote(
+    cassette_mode, standin_api, standin_url
+):
+    """Testa se o download de muitas URLs reproduz, sem o servidor, exatamente o que foi gravado."""
+    urls = [
+        f"{standin_url}{CAMARA_REST_PREFIX}deputados/{id}/discursos?itens=10"
+        for id in standin_api.dataset.deputado_ids()
+    ]
+
+    cassette_mode("record")
+    recorded = await fetch_many_jsons(
+        urls=urls,
+        not_downloaded_urls=[],
+        task="teste",
+        lote_id=1,
+        follow_pagination=True,
+    )
+    requests = standin_api.requests
+
+    cassette_mode("replay")
+    replayed = await fetch_many_jsons(
+        urls=urls,
+        not_downloaded_urls=[],
+        task="teste",
+        lote_id=1,
+        follow_pagination=True,
+    )
+
+    def key(page):
+        return page["links"][0]["href"]
+
+    assert sorted(replayed, key=key) == sorted(recorded, key=key)  # type: ignore
+    assert standin_api.requests == requests
+
+
+def test_recording_streams_body_to_disk(tmp_path, standin_api, standin_url):
+    """Testa se o corpo é gravado enquanto o chamador lê o stream, e a resposta só entra no índice quando ele é fechado."""
+    body = standin_api.dataset.tse_zip(ARCHIVE)
+    assert body is not None
+    url = f"{standin_url}{TSE_PREFIX}{ARCHIVE}"
+
+    with httpx.Client(transport=RecordingTransport(Cassette(tmp_path))) as c:
+        with c.stream("GET", url) as r:
+            assert not (tmp_path / "index.ndjson").exists()
+            received = b"".join(r.iter_bytes(16 * 1024))
+        with c.stream("GET", url, headers={"Range": "bytes=0-99"}) as r:
+            pass
+
+    assert received == body
+    cassette = Cassette(tmp_path)
+    [complete] = cassette.entries()[Cassette.key("GET", url)]
+    [abandoned] = cassette.entries()[Cassette.key("GET", url, "bytes=0-99")]
+    assert (complete["tamanho"], complete["completo"]) == (len(body), True)
+    assert (abandoned["tamanho"], abandoned["completo"]) == (0, False)
+    assert not list((tmp_path / "corpos").glob("*.tmp"))
+
+
+@pytest.mark.asyncio
+async def test_replay_streams_recorded_archive(tmp_path):
+    """Testa se o ZIP gravado é reproduzido em pedaços, com os mesmos bytes, intervalos e headers do HEAD."""
+    # ZIP com alguns pedaços de CHUNK_SIZE
+    app = StandInAPI(dataset=StandInDataset(tse_linhas=3000))
+    body = app.dataset.tse_zip(ARCHIVE)
+    assert body is not None and len(body) > 2 * CHUNK_SIZE
+    url = f"{TSE_PREFIX}{ARCHIVE}"
+    async with recording_client(Cassette(tmp_path), app) as c:
+        await c.head(url)
+        await c.get(url)
+        await c.get(url, headers={"Range": "bytes=100-199"})
+
+    replay = ReplayTransport(Cassette(tmp_path), time_scale=0)
+    async with httpx.AsyncClient(transport=replay, base_url=BASE_URL) as c:
+        head = await c.head(url)
+        async with c.stream("GET", url) as r:
+            chunks = [chunk async for chunk in r.aiter_raw()]
+        partial = await c.get(url, headers={"Range": "bytes=100-199"})
+
+    assert head.headers["content-length"] == str(len(body))
+    assert head.headers["etag"]
+    assert b"".join(chunks) == body
+    assert len(chunks) == -(-len(body) // CHUNK_SIZE)
+    assert partial.status_code == 206
+    assert partial.content == body[100:200]
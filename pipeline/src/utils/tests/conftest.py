@@ -0,0 +1,31 @@
+import pytest
+
+from src.utils.standin_api import StandInAPI, serve_in_thread
+from src.utils.standin_data import StandInDataset
+
+
+@pytest.fixture
+def standin_api() -> StandInAPI:
+    """
+    Servidor substituto das APIs com poucos dados, para testes rápidos.
+    """
+    return StandInAPI(
+        dataset=StandInDataset(
+            deputados=20,
+            discursos_por_deputado=25,
+            despesas_por_deputado=30,
+            senadores=10,
+            senadores_afastados=2,
+            processos=50,
+            tse_linhas=100,
+        )
+    )
+
+
+@pytest.fixture
+def standin_url(standin_api):
+    """
+    URL do servidor substituto executando em uma porta local livre.
+    """
+    with serve_in_thread(standin_api) as url:
+        yield url
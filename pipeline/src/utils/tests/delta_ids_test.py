@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+
+from src.utils.delta_ids import select_delta_ids
+
+NOW = datetime(2026, 10, 19, 6, 0, tzinfo=timezone.utc)
+
+
+def registry(ids: list, last_lote: datetime, spread: timedelta) -> dict[str, datetime]:
+    """
+    Registro de IDs baixados em lotes anteriores: o primeiro ID é o mais antigo e o último foi baixado em last_lote.
+    """
+    return {
+        str(id): last_lote - spread * (len(ids) - 1 - i) / max(len(ids) - 1, 1)
+        for i, id in enumerate(ids)
+    }
+
+
+# ============= SELEÇÃO DE IDS TESTS =============
+
+
+def test_first_lote_fetches_every_id():
+    """Testa se, sem registro, todos os IDs são novos."""
+    delta = select_delta_ids([1, 2, 3], {}, refresh_days=10, now=NOW)
+
+    assert delta.novos == [1, 2, 3]
+    assert delta.atualizar == []
+
+
+def test_daily_lote_fetches_new_ids_and_oldest_slice():
+    """Testa se um lote diário baixa os IDs novos e a fração mais antiga dos conhecidos."""
+    known = list(range(100))
+    registered = registry(known, NOW - timedelta(days=1), timedelta(days=9))
+
+    delta = select_delta_ids(known + [500, 501], registered, refresh_days=10, now=NOW)
+
+    assert delta.novos == [500, 501]
+    assert delta.atualizar == list(range(10))
+    assert delta.total == 102
+
+
+def test_refresh_period_does_not_depend_on_lote_frequency():
+    """Testa se a fatia diminui com lotes mais frequentes, mantendo o período de atualização."""
+    known = [str(i) for i in range(240)]
+    registered = registry(known, NOW - timedelta(hours=1), timedelta(days=9))
+
+    delta = select_delta_ids(known, registered, refresh_days=10, now=NOW)
+
+    assert delta.atualizar == ["0"]
+
+
+def test_overdue_ids_are_always_fetched():
+    """Testa se todos os IDs vencidos são baixados, mesmo que passem da fatia do lote."""
+    known = list(range(100))
+    registered = registry(known, NOW - timedelta(days=1), timedelta(days=30))
+
+    delta = select_delta_ids(known, registered, refresh_days=10, now=NOW)
+
+    overdue = [id for id in known if registered[str(id)] <= NOW - timedelta(days=10)]
+    assert len(overdue) > 10
+    assert delta.atualizar == overdue
+
+
+def test_every_id_refreshed_within_period():
+    """Testa se, com um lote por dia, todos os IDs são baixados de novo dentro do período."""
+    ids = list(range(95))
+    registered: dict[str, datetime] = {}
+    fetched_per_lote = []
+
+    for day in range(25):
+        now = NOW + timedelta(days=day)
+        delta = select_delta_ids(ids, registered, refresh_days=10, now=now)
+        registered.update({str(id): now for id in delta.ids})
+        fetched_per_lote.append(len(delta.ids))
+
+    assert fetched_per_lote[0] == 95
+    assert max(fetched_per_lote[1:]) <= 10
+    assert all(
+        NOW + timedelta(days=24) - t <= timedelta(days=10) for t in registered.values()
+    )
+
+
+def test_zero_refresh_days_fetches_everything():
+    """Testa se refresh_days = 0 baixa todos os IDs, sem repetir IDs duplicados."""
+    registered = {"1": NOW, "2": NOW}
+
+    delta = select_delta_ids([1, 2, 2, 3], registered, refresh_days=0, now=NOW)
+
+    assert delta.ids == [1, 2, 3]
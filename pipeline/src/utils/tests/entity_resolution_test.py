@@ -0,0 +1,132 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.utils.entity_resolution import (
+    CandidatosIndex,
+    Parlamentar,
+    normalize_name,
+    resolve_parlamentares,
+)
+from src.utils.tse_parquet import success_marker_path
+
+CANDIDATOS = pd.DataFrame(
+    [
+        # SQ_CANDIDATO, NM_CANDIDATO, NM_URNA_CANDIDATO, NR_CPF_CANDIDATO, DT_NASCIMENTO, SG_UF
+        (1, "JOSÉ DA SILVA", "ZÉ DA SILVA", "01234567890", date(1970, 2, 1), "SP"),
+        (2, "JOSÉ DA SILVA", "JOSÉ SILVA", "11111111111", date(1981, 5, 3), "SP"),
+        (3, "MARIA DE SOUZA PEREIRA", "MARIA PEREIRA", None, date(1965, 7, 9), "MG"),
+        (4, "ANTÔNIO CARLOS LIMA", "TONINHO", None, date(1960, 12, 15), "BA"),
+    ],
+    columns=[
+        "SQ_CANDIDATO",
+        "NM_CANDIDATO",
+        "NM_URNA_CANDIDATO",
+        "NR_CPF_CANDIDATO",
+        "DT_NASCIMENTO",
+        "SG_UF",
+    ],
+)
+
+
+def parlamentar(**kwargs) -> Parlamentar:
+    values = {
+        "casa": "camara",
+        "id": "100",
+        "nome_civil": None,
+        "nome_parlamentar": None,
+        "data_nascimento": None,
+        "uf": None,
+        "cpf": None,
+    }
+    values.update(kwargs)
+    return Parlamentar(**values)
+
+
+@pytest.fixture
+def index():
+    return CandidatosIndex(CANDIDATOS)
+
+
+@pytest.fixture
+def transform_dir(tmp_path):
+    """
+    Candidatos de 2022 no layout dos arquivos Parquet do TSE, já convertidos.
+    """
+    for uf, uf_df in CANDIDATOS.groupby("SG_UF"):
+        partition_dir = (
+            tmp_path / "candidatos" / "consulta_cand" / "ano=2022" / f"SG_UF={uf}"
+        )
+        partition_dir.mkdir(parents=True)
+        uf_df.drop(columns="SG_UF").astype({"NR_CPF_CANDIDATO": "string"}).to_parquet(
+            partition_dir / "part-0.parquet"
+        )
+    success_marker_path(tmp_path, "candidatos", 2022, "BRASIL").touch()
+    return tmp_path
+
+
+# ============= TESTS =============
+
+
+def test_normalize_name():
+    """Testa a remoção de acentos, pontuação e espaços repetidos."""
+    assert normalize_name("  José  D'Ávila ") == "JOSE D AVILA"
+    assert normalize_name("") is None
+
+
+def test_match_by_cpf(index):
+    """Testa a correspondência pelo CPF, mesmo com homônimos."""
+    assert index.match(parlamentar(cpf="01234567890", nome_civil="José da Silva")) == (
+        1,
+        "cpf",
+    )
+
+
+def test_match_by_name_and_birth_date(index):
+    """Testa a correspondência por nome e data de nascimento entre homônimos."""
+    p = parlamentar(nome_civil="José da Silva", data_nascimento=date(1981, 5, 3))
+    assert index.match(p) == (2, "nome_nascimento")
+
+
+def test_match_by_name_and_uf(index):
+    """Testa a correspondência pelo nome de urna e UF."""
+    p = parlamentar(casa="senado", nome_parlamentar="Toninho", uf="BA")
+    assert index.match(p) == (4, "nome_uf")
+
+
+def test_match_by_similarity(index):
+    """Testa a correspondência por nome parecido entre candidatos da mesma UF e data de nascimento."""
+    p = parlamentar(
+        nome_civil="Maria Souza Pereira", data_nascimento=date(1965, 7, 9), uf="MG"
+    )
+    assert index.match(p) == (3, "nascimento_uf_similaridade")
+
+
+def test_ambiguous_match_is_rejected(index):
+    """Testa se homônimos sem outro critério não geram correspondência."""
+    assert index.match(parlamentar(nome_civil="José da Silva", uf="SP")) is None
+
+
+def test_resolve_is_incremental(transform_dir):
+    """Testa se apenas os parlamentares novos ou alterados são comparados novamente."""
+    deputado = parlamentar(cpf="01234567890")
+    senador = parlamentar(casa="senado", id="5", nome_parlamentar="Toninho", uf="BA")
+
+    rows = resolve_parlamentares([deputado, senador], [2022], {}, transform_dir)
+    assert [(r.casa, r.sq_candidato, r.criterio) for r in rows] == [
+        ("camara", 1, "cpf"),
+        ("senado", 4, "nome_uf"),
+    ]
+
+    signatures = {(r.casa, r.parlamentar_id, r.ano_eleicao): r.assinatura for r in rows}
+    senador_alterado = parlamentar(casa="senado", id="5", nome_parlamentar="Antônio")
+    rows = resolve_parlamentares(
+        [deputado, senador_alterado], [2022], signatures, transform_dir
+    )
+    assert [(r.parlamentar_id, r.sq_candidato) for r in rows] == [("5", None)]
+
+
+def test_resolve_skips_years_without_candidatos(transform_dir):
+    """Testa se os anos sem arquivos de candidatos convertidos são ignorados."""
+    assert resolve_parlamentares([parlamentar()], [2018], {}, transform_dir) == []
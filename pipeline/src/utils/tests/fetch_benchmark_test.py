@@ -0,0 +1,100 @@
+import pytest
+
+import src.utils.fetch_many_jsons as fetch_many_jsons_module
+import src.utils.io as io_module
+from src.utils.fetch_benchmark import (
+    BenchmarkMatrix,
+    compare,
+    load_results,
+    run_benchmark,
+    save_results,
+    without_error_persistence,
+)
+
+# ============= MATRIZ TESTS =============
+
+
+def test_matrix_scenarios():
+    """Testa se a matriz gera todas as combinações, sem variar os itens no motor html."""
+    matrix = BenchmarkMatrix(
+        limites=(5, 10),
+        paginas=(1, 4),
+        itens=(15, 100),
+        latencias=("constante",),
+        taxas_erro=(0.0, 0.02),
+    )
+    scenarios = matrix.scenarios()
+
+    assert len([s for s in scenarios if s.motor == "json"]) == 2 * 2 * 2 * 2
+    assert len([s for s in scenarios if s.motor == "html"]) == 2 * 2 * 2
+    assert len({s.id for s in scenarios}) == len(scenarios)
+
+    with pytest.raises(ValueError):
+        BenchmarkMatrix(motores=("xml",)).scenarios()
+
+
+# ============= EXECUÇÃO TESTS =============
+
+
+def test_run_benchmark_measures_each_scenario(tmp_path):
+    """Testa se cada cenário é executado contra o servidor substituto e tem as suas métricas salvas."""
+    matrix = BenchmarkMatrix(
+        limites=(2,),
+        recursos=3,
+        paginas=(2,),
+        itens=(5,),
+        latencias=("constante",),
+        latencia_media=0.01,
+        taxas_erro=(0.0,),
+    )
+    results = run_benchmark(matrix.scenarios())
+    saved = load_results(save_results(results, tmp_path / "resultado.json"))
+
+    assert [s["motor"] for s in saved["cenarios"]] == ["json", "html"]
+    for scenario in saved["cenarios"]:
+        assert scenario["erro"] is None
+        assert scenario["requisicoes"] == scenario["urls_baixadas"] == 3 * 2
+        assert scenario["latencia_p50"] >= 0.01
+        assert scenario["latencia_p99"] >= scenario["latencia_p50"]
+        assert scenario["requisicoes_por_s"] > 0
+        assert scenario["cpu_por_requisicao_ms"] > 0
+
+
+def test_benchmark_does_not_persist_errors():
+    """Testa se as falhas permanentes dos cenários ficam em memória, sem gravar na tabela erros_extract."""
+    original = io_module.insert_extract_error_db
+
+    with without_error_persistence() as errors:
+        for module in (fetch_many_jsons_module, io_module):
+            module.insert_extract_error_db(
+                lote_id=0, task="benchmark", status_code=500, message="", url="u"
+            )
+
+    assert len(errors) == 2
+    assert io_module.insert_extract_error_db is original
+
+
+# ============= COMPARAÇÃO TESTS =============
+
+
+def test_compare_flags_regressions():
+    """Testa se a comparação aponta apenas as métricas que pioraram além do limite."""
+    base = {
+        "cenarios": [
+            {"cenario": "a", "requisicoes_por_s": 100.0, "latencia_p95": 0.1},
+            {"cenario": "b", "requisicoes_por_s": 100.0, "latencia_p95": 0.1},
+        ]
+    }
+    current = {
+        "cenarios": [
+            {"cenario": "a", "requisicoes_por_s": 80.0, "latencia_p95": 0.09},
+            {"cenario": "b", "requisicoes_por_s": 105.0, "latencia_p95": 0.105},
+            {"cenario": "novo", "requisicoes_por_s": 1.0, "latencia_p95": 1.0},
+        ]
+    }
+    rows = compare(base, current, threshold=0.1)
+
+    assert [row["cenario"] for row in rows] == ["a", "b"]
+    assert rows[0]["regressoes"] == ["requisicoes_por_s"]
+    assert rows[0]["variacoes"]["requisicoes_por_s"] == pytest.approx(-0.2)
+    assert rows[1]["regressoes"] == []
@@ -0,0 +1,84 @@
+import pytest
+
+from src.utils.fetch_many_jsons import fetch_many_jsons
+from src.utils.standin_api import FaultProfile, StandInAPI, serve_in_thread
+from src.utils.standin_data import CAMARA_REST_PREFIX, StandInDataset
+
+
+def detalhes_urls(url: str, dataset: StandInDataset) -> list[str]:
+    return [f"{url}{CAMARA_REST_PREFIX}deputados/{id}" for id in dataset.deputado_ids()]
+
+
+def discursos_urls(url: str, dataset: StandInDataset) -> list[str]:
+    return [
+        f"{url}{CAMARA_REST_PREFIX}deputados/{id}/discursos?itens=10"
+        for id in dataset.deputado_ids()
+    ]
+
+
+# ============= TESTS =============
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_jsons_non_paginated(standin_api, standin_url):
+    """
+    Teste da função fetch_many_jsons para lista de URLs não paginadas.
+    """
+    urls = detalhes_urls(standin_url, standin_api.dataset)
+
+    results = await fetch_many_jsons(
+        urls=urls,
+        not_downloaded_urls=[],
+        task="teste",
+        lote_id=1,
+        follow_pagination=False,
+        validate_results=True,
+    )
+
+    assert len(results) == len(urls)
+    assert {r["dados"]["id"] for r in results} == set(
+        standin_api.dataset.deputado_ids()
+    )  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_jsons_paginated(standin_api, standin_url):
+    """
+    Teste da função fetch_many_jsons para lista de URLs paginadas: 25 discursos por deputado em páginas de 10.
+    """
+    dataset = standin_api.dataset
+    urls = discursos_urls(standin_url, dataset)
+
+    results = await fetch_many_jsons(
+        urls=urls,
+        not_downloaded_urls=[],
+        task="teste",
+        lote_id=1,
+        follow_pagination=True,
+        validate_results=True,
+        limit=5,
+    )
+
+    items_downloaded = sum(len(r.get("dados", [])) for r in results)  # type: ignore
+    assert len(results) == 3 * len(urls)
+    assert items_downloaded == dataset.deputados * dataset.discursos_por_deputado
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_jsons_retries_server_errors():
+    """
+    Teste das novas tentativas: cada URL falha uma vez com 503 antes de ser baixada.
+    """
+    dataset = StandInDataset(deputados=5)
+    app = StandInAPI(dataset=dataset, faults=FaultProfile(fail_first=1))
+    with serve_in_thread(app) as url:
+        results = await fetch_many_jsons(
+            urls=detalhes_urls(url, dataset),
+            not_downloaded_urls=[],
+            task="teste",
+            lote_id=1,
+            max_retries=3,
+        )
+
+    assert len(results) == 5
+    assert app.statuses == {503: 5, 200: 5}
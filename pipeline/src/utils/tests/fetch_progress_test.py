@@ -0,0 +1,197 @@
+import asyncio
+import logging
+
+import pytest
+
+import src.utils.fetch_progress as fetch_progress_module
+from src.utils.fetch_progress import (
+    MB,
+    FetchProgress,
+    artifact_key,
+    percentile,
+    progress_markdown,
+)
+
+
+@pytest.fixture
+def progress_logger() -> logging.Logger:
+    logger = logging.getLogger("fetch_progress_test")
+    logger.setLevel(logging.DEBUG)
+    return logger
+
+
+# ============= CONTADORES TESTS =============
+
+
+def test_snapshot_counts_rates_and_eta(progress_logger):
+    """Testa se o resumo agrega contagens, bytes, taxas e estima o tempo restante."""
+    progress = FetchProgress("teste", planned=4, logger=progress_logger)
+    progress.started -= 10  # Simula 10 segundos de execução
+
+    started = progress.request_started("https://exemplo/1")
+    progress.success("https://exemplo/1", nbytes=MB, records=3)
+    progress.request_finished("https://exemplo/1", started)
+    progress.retry_started()
+    progress.failure()
+    progress.add_planned(2)
+
+    s = progress.snapshot()
+    assert (s["planned"], s["done"], s["succeeded"], s["failed"]) == (6, 2, 1, 1)
+    assert (s["pages"], s["records"], s["bytes"]) == (1, 3, MB)
+    assert (s["retries"], s["retrying"]) == (1, 1)
+    assert (s["in_flight"], s["hosts"]) == (0, {})
+    assert s["urls_per_s"] == pytest.approx(0.2, rel=0.01)
+    assert s["mb_per_s"] == pytest.approx(0.1, rel=0.01)
+    assert s["eta"] == pytest.approx(20, rel=0.01)
+
+
+def test_percentile_nearest_rank():
+    """Testa o cálculo dos percentis de latência pelo posto mais próximo."""
+    values = [float(i) for i in range(1, 101)]
+    assert [percentile(values, q) for q in (50, 95, 99)] == [50.0, 95.0, 99.0]
+    assert percentile([0.3], 99) == 0.3
+    assert percentile([], 50) is None
+
+
+def test_latency_percentiles(progress_logger):
+    """Testa se a latência de cada requisição é registrada entre request_started e request_finished."""
+    progress = FetchProgress("teste", planned=2, logger=progress_logger)
+    for url in ("https://a.gov.br/1", "https://a.gov.br/2"):
+        progress.request_finished(url, progress.request_started(url) - 1)
+
+    percentiles = progress.latency_percentiles()
+    assert percentiles["p50"] == pytest.approx(1, abs=0.1)
+    assert percentiles["p99"] == pytest.approx(1, abs=0.1)
+
+
+def test_snapshot_without_progress_has_no_eta(progress_logger):
+    """Testa se o ETA é desconhecido enquanto nenhuma URL foi concluída."""
+    progress = FetchProgress("teste", planned=10, logger=progress_logger)
+    assert progress.snapshot()["eta"] is None
+    assert "ETA: ?" in progress.message()
+
+
+def test_success_logs_only_sampled_urls(progress_logger, caplog):
+    """Testa se apenas uma a cada sample_every URLs baixadas é logada."""
+    progress = FetchProgress(
+        "teste", planned=10, sample_every=5, logger=progress_logger
+    )
+    with caplog.at_level(logging.DEBUG, logger=progress_logger.name):
+        for i in range(10):
+            progress.success(f"https://exemplo/{i}", nbytes=1)
+
+    assert [r.getMessage() for r in caplog.records] == [
+        "teste: URL 5 baixada: https://exemplo/4",
+        "teste: URL 10 baixada: https://exemplo/9",
+    ]
+
+
+# ============= REPORT TESTS =============
+
+
+@pytest.mark.asyncio
+async def test_report_logs_at_interval_and_at_exit(progress_logger, caplog):
+    """Testa se o progresso é logado periodicamente durante o bloco e uma última vez ao sair."""
+    progress = FetchProgress(
+        "teste", planned=2, interval=0.05, sample_every=0, logger=progress_logger
+    )
+    with caplog.at_level(logging.INFO, logger=progress_logger.name):
+        async with progress.report():
+            progress.success("https://exemplo/1", nbytes=10)
+            await asyncio.sleep(0.12)
+            progress.success("https://exemplo/2", nbytes=10)
+
+    assert len(caplog.records) >= 3
+    final = caplog.records[-1]
+    assert final.getMessage().startswith("teste: 2/2 URLs")
+    assert final.progress["bytes"] == 20
+
+
+# ============= ARTEFATOS TESTS =============
+
+
+def test_in_flight_per_host(progress_logger):
+    """Testa se as requisições em andamento são contadas por host."""
+    progress = FetchProgress("teste", planned=3, limit=5, logger=progress_logger)
+    progress.request_started("https://a.gov.br/x")
+    progress.request_started("https://a.gov.br/y")
+    started = progress.request_started("https://b.gov.br/z")
+    progress.request_finished("https://b.gov.br/z", started)
+
+    s = progress.snapshot()
+    assert (s["in_flight"], s["hosts"], s["limit"]) == (2, {"a.gov.br": 2}, 5)
+
+
+def test_progress_markdown_table(progress_logger):
+    """Testa se a tabela em markdown mostra URLs concluídas, fila de novas tentativas, janela e hosts."""
+    progress = FetchProgress("teste", planned=4, limit=10, logger=progress_logger)
+    progress.success("https://a.gov.br/1", nbytes=1)
+    progress.request_started("https://a.gov.br/2")
+    progress.retry_started()
+
+    markdown = progress_markdown(progress.snapshot())
+    assert "| URLs concluídas | 1/4 (25.0%) |" in markdown
+    assert "| Fila de novas tentativas | 1 (total: 1) |" in markdown
+    assert "| Janela de concorrência | 1/10 |" in markdown
+    assert "| a.gov.br | 1 |" in markdown
+
+
+def test_artifact_key():
+    """Testa se a chave do artefato contém apenas letras minúsculas, números e hífens."""
+    assert (
+        artifact_key("extract_camara_Frentes membros")
+        == "progresso-extract-camara-frentes-membros"
+    )
+
+
+@pytest.mark.asyncio
+async def test_publish_creates_then_updates_progress(progress_logger, monkeypatch):
+    """Testa se o artefato de progresso é criado uma vez e depois apenas atualizado, junto da tabela em markdown."""
+    calls = []
+
+    async def create_progress(progress, key, description):
+        calls.append(("create", progress, key))
+        return "artifact-id"
+
+    async def update_progress(artifact_id, progress):
+        calls.append(("update", progress, artifact_id))
+
+    async def create_markdown(markdown, key, description):
+        calls.append(("markdown", key))
+
+    monkeypatch.setattr(
+        fetch_progress_module, "acreate_progress_artifact", create_progress
+    )
+    monkeypatch.setattr(
+        fetch_progress_module, "aupdate_progress_artifact", update_progress
+    )
+    monkeypatch.setattr(
+        fetch_progress_module, "acreate_markdown_artifact", create_markdown
+    )
+
+    progress = FetchProgress("teste", planned=2, logger=progress_logger)
+    artifact_id = await progress.publish(progress.snapshot(), None)
+    progress.success("https://a.gov.br/1", nbytes=1)
+    await progress.publish(progress.snapshot(), artifact_id)
+
+    assert calls == [
+        ("create", 0.0, "progresso-teste"),
+        ("markdown", "progresso-teste-tabela"),
+        ("update", 50.0, "artifact-id"),
+        ("markdown", "progresso-teste-tabela"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_publish_failure_does_not_raise(progress_logger, monkeypatch, caplog):
+    """Testa se uma falha ao publicar o artefato é apenas logada."""
+
+    async def fail(**kwargs):
+        raise RuntimeError("API indisponível")
+
+    monkeypatch.setattr(fetch_progress_module, "acreate_progress_artifact", fail)
+
+    progress = FetchProgress("teste", planned=1, logger=progress_logger)
+    with caplog.at_level(logging.WARNING, logger=progress_logger.name):
+        assert await progress.publish(progress.snapshot(), None) is None
+    assert "API indisponível" in caplog.records[-1].getMessage()
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+import src.utils.instrumentation as instrumentation_module
+from src.utils.instrumentation import Instrument, instrumented
+from src.utils.profiling import TaskProfiler, functions_markdown
+
+
+class RecordingInstrument(Instrument):
+    """
+    Instrumento que apenas registra as chamadas recebidas.
+    """
+
+    title = "Teste"
+    calls: list = []
+
+    def start(self):
+        RecordingInstrument.calls.append(("start", self.task_name, self.lote_id))
+
+    def stop(self):
+        RecordingInstrument.calls.append(("stop", self.task_name, self.lote_id))
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    """
+    Ativa o RecordingInstrument para a task 'ativa'.
+    """
+    RecordingInstrument.calls = []
+    monkeypatch.setattr(
+        instrumentation_module,
+        "task_instruments",
+        lambda task_name: [RecordingInstrument] if task_name == "ativa" else [],
+    )
+    return RecordingInstrument.calls
+
+
+# ============= DECORADOR TESTS =============
+
+
+def test_disabled_returns_function_unchanged(enabled):
+    """Testa se, sem instrumentos ativos, a própria função é retornada."""
+
+    def task_fn(lote_id: int):
+        return lote_id
+
+    assert instrumented("inativa")(task_fn) is task_fn
+
+
+def test_sync_task_is_instrumented(enabled):
+    """Testa se os instrumentos recebem o lote_id da task e são encerrados mesmo com erro."""
+
+    @instrumented("ativa")
+    def task_fn(x: int, lote_id: int):
+        raise RuntimeError("falhou")
+
+    with pytest.raises(RuntimeError):
+        task_fn(1, lote_id=5)
+
+    assert enabled == [("start", "ativa", 5), ("stop", "ativa", 5)]
+
+
+def test_async_task_is_instrumented(enabled):
+    """Testa se tasks assíncronas são instrumentadas e mantêm o retorno."""
+
+    @instrumented("ativa")
+    async def task_fn(lote_id: int):
+        await asyncio.sleep(0)
+        return "ok"
+
+    assert asyncio.iscoroutinefunction(task_fn)
+    assert asyncio.run(task_fn(3)) == "ok"
+    assert enabled == [("start", "ativa", 3), ("stop", "ativa", 3)]
+
+
+# ============= PROFILE TESTS =============
+
+
+def test_profiler_writes_profile_and_top_functions(monkeypatch, tmp_path):
+    """Testa se o profile e a lista das funções mais custosas são gravados no diretório do lote."""
+    monkeypatch.setattr(
+        instrumentation_module.APP_SETTINGS.INSTRUMENTATION, "OUTPUT_DIR", str(tmp_path)
+    )
+
+    def custosa():
+        return sum(i * i for i in range(20000))
+
+    profiler = TaskProfiler("teste", lote_id=8)
+    profiler.start()
+    custosa()
+    profiler.stop()
+
+    assert (tmp_path / "lote_8" / "teste.prof").exists()
+    assert (tmp_path / "lote_8" / "teste_top.txt").exists()
+    assert any(row["funcao"] == "custosa" for row in profiler.rows)
+    assert "`custosa`" in profiler.markdown()
+
+
+def test_functions_markdown():
+    """Testa a tabela em markdown das funções mais custosas."""
+    markdown = functions_markdown(
+        [
+            {
+                "funcao": "parse",
+                "local": "io.py:10",
+                "chamadas": 3,
+                "tempo_proprio": 0.5,
+                "tempo_acumulado": 1.25,
+            }
+        ]
+    )
+    assert markdown.splitlines()[-1] == "| `parse` | io.py:10 | 3 | 0.500 | 1.250 |"
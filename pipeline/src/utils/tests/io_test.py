@@ -1,28 +1,39 @@
 import pytest
-import requests
 
-from src.utils.io import fetch_html_many_async
+import src.utils.io as io_module
+from src.utils.fetch_progress import FetchProgress
+from src.utils.io import fetch_html_many_async, fetch_json
+from src.utils.standin_api import FaultProfile, StandInAPI, serve_in_thread
+from src.utils.standin_data import (
+    CAMARA_PORTAL_PREFIX,
+    CAMARA_REST_PREFIX,
+    StandInDataset,
+)
 
 
 @pytest.fixture
-def urls_paginas_html_deputados() -> list[str]:
+def urls_paginas_html_deputados(standin_api, standin_url) -> list[str]:
     """
-    Série de URLs das páginas HTML de deputados.
+    Série de URLs das páginas HTML de presença dos deputados no servidor substituto.
     """
-
-    deputados_url = "https://dadosabertos.camara.leg.br/api/v2/deputados?idLegislatura=57&ordem=ASC&ordenarPor=nome"
-
-    response = requests.get(deputados_url)
-    response.raise_for_status()
-    data = response.json()
-
-    ids_deputados = {deputado.get("id", 0) for deputado in data.get("dados", [])}
-
-    paginas_deputados_urls = [
-        f"https://www.camara.leg.br/deputados/{id}" for id in ids_deputados
+    return [
+        f"{standin_url}{CAMARA_PORTAL_PREFIX}deputados/{id}/presenca-plenario/2024"
+        for id in standin_api.dataset.deputado_ids()
     ]
 
-    return paginas_deputados_urls
+
+@pytest.fixture
+def recorded_metrics(monkeypatch) -> list:
+    """
+    Substitui a gravação das métricas na tabela task_metrics por uma lista com os FetchProgress gravados.
+    """
+    recorded = []
+    monkeypatch.setattr(
+        io_module,
+        "record_fetch_metrics",
+        lambda progress, lote_id: recorded.append(progress),
+    )
+    return recorded
 
 
 # ============= TESTS =============
@@ -37,7 +48,9 @@ async def test_fetch_html_many_async(urls_paginas_html_deputados):
     urls = urls_paginas_html_deputados
     expected_count = len(urls_paginas_html_deputados)
 
-    results = await fetch_html_many_async(urls=urls, lote_id=9999, task="teste")
+    results = await fetch_html_many_async(
+        urls=urls, not_downloaded_urls=[], lote_id=9999, task="teste"
+    )
 
     items_downloaded = len(results)
 
@@ -45,3 +58,54 @@ async def test_fetch_html_many_async(urls_paginas_html_deputados):
     assert items_downloaded == expected_count, (
         f"Esperava por {expected_count} resultados baixados, mas retornaram {items_downloaded}"
     )
+    assert all('class="titulo-internal"' in html for html in results)  # type: ignore
+
+
+def test_fetch_json_records_metrics(recorded_metrics):
+    """Testa se fetch_json grava as métricas do download, com a nova tentativa e os registros da resposta."""
+    app = StandInAPI(
+        dataset=StandInDataset(deputados=3), faults=FaultProfile(fail_first=1)
+    )
+    with serve_in_thread(app) as url:
+        data = fetch_json(
+            f"{url}{CAMARA_REST_PREFIX}deputados", lote_id=1, task="teste"
+        )
+
+    [progress] = recorded_metrics
+    assert progress.task == "teste"
+    assert (progress.planned, progress.succeeded, progress.failed) == (1, 1, 0)
+    assert progress.retries == 1
+    assert progress.records == len(data["dados"])  # type: ignore
+    assert len(progress.latencies) == 2 and progress.bytes > 0
+
+
+def test_fetch_json_records_metrics_on_failure(recorded_metrics):
+    """Testa se as métricas são gravadas também quando o download falha em todas as tentativas."""
+    app = StandInAPI(dataset=StandInDataset(deputados=1))
+    with serve_in_thread(app) as url:
+        with pytest.raises(Exception, match="após 1 tentativas"):
+            fetch_json(
+                f"{url}{CAMARA_REST_PREFIX}inexistente",
+                lote_id=1,
+                task="teste",
+                max_retries=1,
+            )
+
+    [progress] = recorded_metrics
+    assert (progress.succeeded, progress.failed) == (0, 1)
+
+
+def test_fetch_json_shared_progress_is_recorded_by_caller(recorded_metrics):
+    """Testa se, com um progress compartilhado entre vários JSONs, fetch_json não grava as métricas."""
+    progress = FetchProgress(task="teste", planned=2)
+    with serve_in_thread(StandInAPI(dataset=StandInDataset(deputados=1))) as url:
+        for _ in range(2):
+            fetch_json(
+                f"{url}{CAMARA_REST_PREFIX}deputados",
+                lote_id=1,
+                task="teste",
+                progress=progress,
+            )
+
+    assert recorded_metrics == []
+    assert progress.succeeded == 2
@@ -0,0 +1,192 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from src.database.repository.load import CsvRowsReader
+from src.utils.load_records import (
+    deputados_rows,
+    despesas_rows,
+    processos_rows,
+    votos_rows,
+)
+
+CAMARA_URL = "https://dadosabertos.camara.leg.br/api/v2/"
+
+
+def write_ndjson(path, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+    return path
+
+
+@pytest.fixture
+def despesa():
+    """
+    Despesa de um deputado, como retornada pela API da Câmara.
+    """
+    return {
+        "ano": 2025,
+        "mes": 3,
+        "tipoDespesa": "COMBUSTÍVEIS E LUBRIFICANTES.",
+        "codDocumento": 7890123,
+        "tipoDocumento": "Nota Fiscal",
+        "dataDocumento": "2025-03-10T00:00:00",
+        "numDocumento": "1234",
+        "valorDocumento": 250.5,
+        "valorLiquido": 250.5,
+        "valorGlosa": 0,
+        "nomeFornecedor": "POSTO",
+        "cnpjCpfFornecedor": "12345678000199",
+        "parcela": 0,
+    }
+
+
+# ============= RECORDS TESTS =============
+
+
+def test_despesas_rows_from_records_and_pages(despesa, tmp_path):
+    """Testa se o NDJson com um registro por linha e o com uma página por linha geram as mesmas linhas."""
+    url = CAMARA_URL + "deputados/204554/despesas?itens=100"
+    records = write_ndjson(tmp_path / "registros.ndjson", [{**despesa, "_url": url}])
+    pages = write_ndjson(
+        tmp_path / "paginas.ndjson",
+        [{"dados": [despesa], "links": [{"rel": "self", "href": url}]}],
+    )
+
+    rows = list(despesas_rows(records))
+    assert rows == list(despesas_rows(pages))
+
+    row = rows[0]
+    assert row["deputado_id"] == 204554
+    assert row["data_competencia"] == date(2025, 3, 1)
+    assert row["data_documento"] == date(2025, 3, 10)
+    assert row["valor_documento"] == Decimal("250.5")
+    assert len(row["chave"]) == 32
+
+
+def test_votos_rows_take_votacao_from_url(tmp_path):
+    """Testa se o id da votação vem da URL da página de votos."""
+    path = write_ndjson(
+        tmp_path / "votos.ndjson",
+        [
+            {
+                "dados": [
+                    {
+                        "tipoVoto": "Sim",
+                        "dataRegistroVoto": "2025-03-11T18:02:12",
+                        "deputado_": {"id": 204554, "siglaUf": "SP"},
+                    }
+                ],
+                "links": [
+                    {"rel": "self", "href": CAMARA_URL + "votacoes/2438580-86/votos"}
+                ],
+            }
+        ],
+    )
+
+    assert list(votos_rows(path)) == [
+        {
+            "votacao_id": "2438580-86",
+            "deputado_id": 204554,
+            "data": date(2025, 3, 11),
+            "tipo_voto": "Sim",
+            "data_registro_voto": datetime(2025, 3, 11, 18, 2, 12),
+            "sigla_partido": None,
+            "sigla_uf": "SP",
+        }
+    ]
+
+
+def test_votos_without_registro_use_votacao_date(tmp_path):
+    """Testa se votos sem data de registro usam a data da votação como partição, e se são descartados sem nenhuma das datas."""
+    write_ndjson(
+        tmp_path / "votacoes.ndjson",
+        [{"dados": {"id": "2438580-86", "data": "2025-03-11"}}],
+    )
+    path = write_ndjson(
+        tmp_path / "votos.ndjson",
+        [
+            {
+                "dados": [
+                    {"tipoVoto": "Sim", "deputado_": {"id": 1}},
+                    {
+                        "tipoVoto": "Não",
+                        "dataRegistroVoto": "invalida",
+                        "deputado_": {"id": 2},
+                    },
+                ],
+                "links": [
+                    {"rel": "self", "href": CAMARA_URL + "votacoes/2438580-86/votos"}
+                ],
+            },
+            {
+                "dados": [{"tipoVoto": "Sim", "deputado_": {"id": 1}}],
+                "links": [{"rel": "self", "href": CAMARA_URL + "votacoes/999-1/votos"}],
+            },
+        ],
+    )
+
+    rows = list(votos_rows(path))
+
+    assert [(row["deputado_id"], row["data"]) for row in rows] == [
+        (1, date(2025, 3, 11)),
+        (2, date(2025, 3, 11)),
+    ]
+    assert all(row["data_registro_voto"] is None for row in rows)
+
+
+def test_rows_skip_records_without_key(tmp_path):
+    """Testa se registros sem identificador são descartados e valores inválidos viram None."""
+    path = write_ndjson(
+        tmp_path / "detalhes_deputados.ndjson",
+        [
+            {"dados": {"id": 1, "dataNascimento": "invalida", "ultimoStatus": {}}},
+            {"dados": {"nomeCivil": "Sem id"}},
+        ],
+    )
+
+    rows = list(deputados_rows(path))
+    assert [r["id"] for r in rows] == [1]
+    assert rows[0]["data_nascimento"] is None
+
+
+def test_processos_rows(tmp_path):
+    """Testa a leitura da lista de respostas do endpoint de processos do Senado."""
+    path = tmp_path / "processos.json"
+    path.write_text(
+        json.dumps([[{"id": 10, "identificacao": "PL 1/2025"}, {"id": None}]]),
+        encoding="utf-8",
+    )
+
+    rows = list(processos_rows(path))
+    assert [(r["id"], r["identificacao"]) for r in rows] == [(10, "PL 1/2025")]
+
+
+# ============= COPY CSV TESTS =============
+
+
+def test_csv_rows_reader_streams_in_chunks():
+    """Testa se o CSV é gerado sob demanda e se None e texto vazio são diferenciados."""
+    rows = ({"id": i, "nome": "" if i == 2 else None} for i in range(1, 4))
+    reader = CsvRowsReader(rows, ["_linha", "id", "nome"])
+
+    chunks = []
+    while chunk := reader.read(5):
+        assert len(chunk) <= 5
+        chunks.append(chunk)
+
+    assert "".join(chunks) == '"1","1",\n"2","2",""\n"3","3",\n'
+    assert reader.rows == 3
+
+
+def test_csv_rows_reader_serializes_json():
+    """Testa se listas e dicionários são gravados como JSON em um único campo."""
+    reader = CsvRowsReader([{"dados": {"a": [1, "ç"]}}], ["_linha", "dados"])
+
+    row = next(csv.reader(io.StringIO(reader.read())))
+    assert row == ["1", '{"a": [1, "ç"]}']
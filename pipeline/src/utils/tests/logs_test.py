@@ -0,0 +1,84 @@
+import logging
+
+import pytest
+
+import src.utils.logs as logs_module
+from src.utils.logs import DatabaseLogHandler
+
+
+@pytest.fixture
+def inserted(monkeypatch):
+    """
+    Substitui a gravação no banco de dados por uma lista com os lotes de logs gravados.
+    """
+    batches = []
+    monkeypatch.setattr(logs_module, "insert_log_db", lambda logs: batches.append(logs))
+    return batches
+
+
+def make_record(message: str, level: int = logging.WARNING, **extra):
+    record = logging.LogRecord(
+        "prefect.task_runs", level, __file__, 1, message, None, None
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+# ============= HANDLER TESTS =============
+
+
+def test_handler_writes_batches_with_run_names(inserted):
+    """Testa se os logs são gravados em lotes com os nomes da Flow Run e da Task Run do registro."""
+    handler = DatabaseLogHandler(lote_id=3, batch_size=2, flush_interval=60)
+    for i in range(3):
+        handler.handle(
+            make_record(
+                f"msg {i}", flow_run_name="camara_flow", task_run_name="extract"
+            )
+        )
+    handler.close()
+
+    assert [len(batch) for batch in inserted] == [2, 1]
+    log = inserted[0][0]
+    assert (log.lote_id, log.flow_run_name, log.task_run_name) == (
+        3,
+        "camara_flow",
+        "extract",
+    )
+    assert log.level == "WARNING"
+    assert log.message == "msg 0"
+
+
+def test_handler_filters_level_and_logs_outside_runs(inserted):
+    """Testa se logs abaixo do nível configurado ou fora de uma Flow Run são descartados."""
+    handler = DatabaseLogHandler(lote_id=1, level=logging.WARNING)
+    logger = logging.getLogger("logs_test")
+    logger.propagate = False
+    logger.addHandler(handler)
+
+    logger.handle(make_record("info", level=logging.INFO, flow_run_name="pipeline"))
+    logger.handle(make_record("sem flow"))
+    logger.handle(make_record("erro", level=logging.ERROR, flow_run_name="pipeline"))
+    logger.removeHandler(handler)
+    handler.close()
+
+    assert [log.message for batch in inserted for log in batch] == ["erro"]
+
+
+def test_handler_keeps_running_after_database_error(monkeypatch):
+    """Testa se uma falha na gravação não derruba a thread do handler."""
+    batches = []
+
+    def insert(logs):
+        if not batches:
+            batches.append(None)
+            raise RuntimeError("banco indisponível")
+        batches.append(logs)
+
+    monkeypatch.setattr(logs_module, "insert_log_db", insert)
+    handler = DatabaseLogHandler(lote_id=1, batch_size=1)
+    handler.handle(make_record("primeiro", flow_run_name="pipeline"))
+    handler.handle(make_record("segundo", flow_run_name="pipeline"))
+    handler.close()
+
+    assert [log.message for log in batches[1]] == ["segundo"]
@@ -0,0 +1,90 @@
+import asyncio
+import time
+import traceback
+
+import pytest
+
+import src.utils.loop_lag as loop_lag_module
+from src.utils.loop_lag import LoopLagMonitor, blocking_site
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    """
+    Monitor com intervalos curtos e sem gravação de métricas.
+    """
+    settings = loop_lag_module.APP_SETTINGS.INSTRUMENTATION
+    monkeypatch.setattr(settings, "LOOP_LAG_INTERVAL", 0.01)
+    monkeypatch.setattr(settings, "LOOP_LAG_THRESHOLD", 0.05)
+    updates = []
+    monkeypatch.setattr(loop_lag_module, "update_task_metrics", updates.append)
+    instrument = LoopLagMonitor("teste", lote_id=1)
+    instrument.updates = updates
+    return instrument
+
+
+def bloqueia_o_loop():
+    time.sleep(0.3)
+
+
+# ============= LAG TESTS =============
+
+
+def test_monitor_captures_blocking_code(monitor):
+    """Testa se o código síncrono que bloqueia o loop é identificado e medido."""
+
+    async def task_fn():
+        monitor.start()
+        await asyncio.sleep(0.05)
+        bloqueia_o_loop()
+        await asyncio.sleep(0.05)
+        monitor.stop()
+
+    asyncio.run(task_fn())
+
+    [offender] = monitor.worst_offenders()
+    assert "(bloqueia_o_loop)" in offender["local"]
+    assert offender["ocorrencias"] == 1
+    assert 0.15 < offender["total"] < 0.5
+    assert "time.sleep(0.3)" in offender["pilha"]
+
+    summary = monitor.summary()
+    assert summary["lag_loop_max"] > 0.15
+    [update] = monitor.updates
+    assert update["bloqueios_loop"][0]["local"] == offender["local"]
+    assert "pilha" not in update["bloqueios_loop"][0]
+    assert "`" + offender["local"] + "`" in monitor.markdown()
+
+
+def test_monitor_without_blocking(monitor):
+    """Testa se um loop que não é bloqueado não gera registros de bloqueio."""
+
+    async def task_fn():
+        monitor.start()
+        await asyncio.sleep(0.1)
+        monitor.stop()
+
+    asyncio.run(task_fn())
+
+    assert monitor.worst_offenders() == []
+    assert monitor.summary()["bloqueio_loop_total"] == 0
+    assert len(monitor.lags) > 0
+
+
+def test_monitor_in_sync_task(monitor):
+    """Testa se o monitor não faz nada fora de um event loop."""
+    monitor.start()
+    monitor.stop()
+    assert monitor.updates == []
+    assert "síncrona" in monitor.markdown()
+
+
+def test_blocking_site_prefers_project_frames():
+    """Testa se o bloqueio é atribuído ao frame mais interno do código do projeto."""
+    stack = traceback.StackSummary.from_list(
+        [
+            (str(loop_lag_module.PROJECT_DIR / "utils" / "io.py"), 10, "save", None),
+            ("/usr/lib/python3/json/encoder.py", 200, "encode", None),
+        ]
+    )
+    assert blocking_site(stack).name == "save"
@@ -0,0 +1,86 @@
+import logging
+
+import pytest
+
+import src.utils.memory as memory_module
+from src.utils.fetch_progress import MB
+from src.utils.memory import MemoryMonitor, current_rss, task_memory_budget
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    """
+    Configuração do monitor de memória com medições frequentes e sem limites.
+    """
+    settings = memory_module.APP_SETTINGS.INSTRUMENTATION
+    monkeypatch.setattr(settings, "MEMORY_INTERVAL", 0.01)
+    monkeypatch.setattr(settings, "MEMORY_BUDGET", 0)
+    monkeypatch.setattr(settings, "MEMORY_BUDGETS", {})
+    return settings
+
+
+@pytest.fixture
+def updates(monkeypatch):
+    """
+    Valores que o monitor gravaria nas métricas da task.
+    """
+    updates = []
+    monkeypatch.setattr(memory_module, "update_task_metrics", updates.append)
+    return updates
+
+
+def aloca_listas():
+    return [[i] * 10 for i in range(50000)]
+
+
+# ============= MEMÓRIA TESTS =============
+
+
+def test_monitor_reports_top_allocations(settings, updates):
+    """Testa se os locais que mais alocaram memória durante a task são listados e gravados nas métricas."""
+    monitor = MemoryMonitor("teste", lote_id=1)
+    monitor.start()
+    dados = aloca_listas()
+    monitor.stop()
+
+    assert len(dados) == 50000
+    assert len(monitor.samples) >= 2
+    assert monitor.allocations[0]["local"].startswith("memory_test.py:")
+    assert monitor.allocations[0]["diferenca"] > MB
+    assert monitor.traced_peak > MB
+
+    [update] = updates
+    assert update["alocacoes"][0]["local"] == monitor.allocations[0]["local"]
+    assert update["orcamento_memoria_excedido"] is False
+    assert "`" + monitor.allocations[0]["local"] + "`" in monitor.markdown()
+
+
+def test_monitor_warns_when_budget_exceeded(settings, updates, caplog):
+    """Testa se um aviso é logado quando o RSS passa do limite de memória da task."""
+    settings.MEMORY_BUDGETS = {"teste": 1}  # 1 MB, sempre excedido
+
+    monitor = MemoryMonitor("teste", lote_id=1)
+    with caplog.at_level(logging.WARNING, logger=memory_module.logger.name):
+        monitor.start()
+        monitor.stop()
+
+    assert monitor.budget_exceeded
+    assert "limite de memória" in caplog.records[0].getMessage()
+    assert updates[0]["orcamento_memoria_excedido"] is True
+
+
+def test_task_memory_budget(settings):
+    """Testa se o limite por task tem prioridade sobre o limite geral."""
+    settings.MEMORY_BUDGET = 100
+    settings.MEMORY_BUDGETS = {"despesas": 300}
+    assert task_memory_budget("despesas") == 300 * MB
+    assert task_memory_budget("outra") == 100 * MB
+
+    settings.MEMORY_BUDGET = 0
+    assert task_memory_budget("outra") is None
+
+
+def test_current_rss():
+    """Testa a leitura do RSS atual do processo."""
+    rss = current_rss()
+    assert rss is None or rss > MB
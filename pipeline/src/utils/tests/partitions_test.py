@@ -0,0 +1,108 @@
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+
+import src.database.repository.partitions as partitions_module
+from src.database.models.base import Deputados, Despesas, Discursos
+from src.database.repository.partitions import (
+    ensure_partitions_db,
+    partition_bounds,
+    partition_column,
+    partition_interval,
+    partition_start,
+    retention_start,
+)
+
+# ============= PARTITION SCHEME TESTS =============
+
+
+def test_partition_column_of_fact_tables():
+    """Testa se a coluna de partição é lida da definição da tabela."""
+    assert partition_column(Despesas.__table__).name == "data_competencia"  # type: ignore
+    assert partition_column(Discursos.__table__).name == "data_hora_inicio"  # type: ignore
+    assert partition_column(Deputados.__table__) is None  # type: ignore
+    assert partition_interval(Despesas.__table__) == "year"  # type: ignore
+
+
+# ============= PARTITION BOUNDS TESTS =============
+
+
+@pytest.mark.parametrize(
+    "value, interval, expected",
+    [
+        (
+            date(2025, 3, 10),
+            "year",
+            ("despesas_2025", date(2025, 1, 1), date(2026, 1, 1)),
+        ),
+        (
+            datetime(2025, 12, 31, 23, 59),
+            "month",
+            ("despesas_2025_12", date(2025, 12, 1), date(2026, 1, 1)),
+        ),
+        (
+            date(2024, 2, 29),
+            "month",
+            ("despesas_2024_02", date(2024, 2, 1), date(2024, 3, 1)),
+        ),
+    ],
+)
+def test_partition_bounds(value, interval, expected):
+    """Testa o nome e os limites da partição que contém a data."""
+    assert partition_bounds("despesas", value, interval) == expected
+
+
+def test_partition_start_from_name():
+    """Testa se o início da partição é recuperado do nome gerado por partition_bounds."""
+    assert partition_start("despesas", "despesas_2025") == date(2025, 1, 1)
+    assert partition_start("despesas", "despesas_2025_07") == date(2025, 7, 1)
+    assert partition_start("despesas", "despesas_antiga") is None
+
+
+def test_retention_start():
+    """Testa o primeiro dia mantido pela retenção, contando o ano atual."""
+    assert retention_start(0, date(2026, 10, 19)) is None
+    assert retention_start(1, date(2026, 10, 19)) == date(2026, 1, 1)
+    assert retention_start(10, date(2026, 10, 19)) == date(2017, 1, 1)
+
+
+# ============= PARTITION DDL TESTS =============
+
+
+class RecordingConnection:
+    """
+    Conexão que grava os comandos executados e responde à busca das datas da staging com starts.
+    """
+
+    def __init__(self, starts: list[datetime]):
+        self.starts = starts
+        self.statements: list[str] = []
+
+    def execute(self, stmt, params=None):
+        self.statements.append(str(stmt))
+        return SimpleNamespace(scalars=lambda: iter(self.starts))
+
+
+def test_ensure_partitions_reattaches_detached_table(monkeypatch):
+    """Testa se uma partição desanexada e mantida como tabela comum é anexada de novo, em vez de ignorada pelo CREATE TABLE IF NOT EXISTS."""
+    monkeypatch.setattr(
+        partitions_module, "list_partitions_db", lambda conn, table: ["despesas_2025"]
+    )
+    monkeypatch.setattr(
+        partitions_module,
+        "table_exists_db",
+        lambda conn, name: name == "despesas_2015",
+    )
+    conn = RecordingConnection(
+        [datetime(2015, 1, 1), datetime(2024, 1, 1), datetime(2025, 1, 1)]
+    )
+
+    created = ensure_partitions_db(conn, Despesas.__table__)  # type: ignore
+
+    assert created == ["despesas_2015", "despesas_2024"]
+    ddl = conn.statements[1:]
+    assert ddl[0].startswith('ALTER TABLE "despesas" ATTACH PARTITION "despesas_2015"')
+    assert "FROM ('2015-01-01') TO ('2016-01-01')" in ddl[0]
+    assert ddl[1].startswith('CREATE TABLE IF NOT EXISTS "despesas_2024" PARTITION OF')
+    assert len(ddl) == 2
@@ -0,0 +1,146 @@
+import httpx
+import pytest
+
+from src.utils.segmented_download import (
+    RemoteFileChangedError,
+    check_partial_response,
+    check_size,
+    join_parts,
+    part_path,
+    prepare_parts_dir,
+    resume_headers,
+    split_segments,
+)
+from src.utils.standin_data import TSE_PREFIX
+
+ARCHIVE = "consulta_cand/consulta_cand_2022.zip"
+
+# ============= TESTS =============
+
+
+def test_split_segments_covers_whole_file():
+    """Testa se os segmentos cobrem todos os bytes do arquivo, sem sobreposição."""
+    segments = split_segments(total_size=10, segment_size=4)
+    assert segments == [(0, 3), (4, 7), (8, 9)]
+    assert sum(end - start + 1 for start, end in segments) == 10
+
+
+def test_split_segments_exact_multiple():
+    """Testa a divisão quando o tamanho é múltiplo do tamanho do segmento."""
+    assert split_segments(total_size=8, segment_size=4) == [(0, 3), (4, 7)]
+
+
+def test_split_segments_smaller_than_segment():
+    """Testa a divisão de um arquivo menor que um segmento."""
+    assert split_segments(total_size=3, segment_size=4) == [(0, 2)]
+
+
+# ============= PARTES TESTS =============
+
+
+def test_parts_of_another_version_are_discarded(tmp_path):
+    """Testa se as partes gravadas com outro validador são apagadas e as do mesmo validador são mantidas."""
+    parts = tmp_path / "a.zip.parts"
+    prepare_parts_dir(parts, '"v1"')
+    part_path(parts, 0).write_bytes(b"abc")
+
+    prepare_parts_dir(parts, '"v1"')
+    assert part_path(parts, 0).read_bytes() == b"abc"
+
+    prepare_parts_dir(parts, '"v2"')
+    assert not part_path(parts, 0).exists()
+    assert (parts / "validator").read_text(encoding="utf-8") == '"v2"'
+
+
+def test_parts_without_validator_file_are_discarded(tmp_path):
+    """Testa se partes sem o arquivo do validador (ex.: de uma versão antiga do pipeline) não são reaproveitadas."""
+    parts = tmp_path / "a.zip.parts"
+    parts.mkdir()
+    part_path(parts, 0).write_bytes(b"abc")
+
+    prepare_parts_dir(parts, None)
+
+    assert not part_path(parts, 0).exists()
+
+
+def test_resume_headers(tmp_path):
+    """Testa o intervalo pedido para uma parte vazia, parcial, completa e maior que o segmento."""
+    path = tmp_path / "00000.part"
+
+    assert resume_headers(path, 100, 199, '"v1"') == {
+        "Range": "bytes=100-199",
+        "If-Range": '"v1"',
+    }
+
+    path.write_bytes(b"x" * 40)
+    assert resume_headers(path, 100, 199, None) == {"Range": "bytes=140-199"}
+
+    path.write_bytes(b"x" * 100)
+    assert resume_headers(path, 100, 199, None) is None
+
+    path.write_bytes(b"x" * 101)
+    assert resume_headers(path, 100, 199, None) == {"Range": "bytes=100-199"}
+    assert not path.exists()
+
+
+def test_join_parts_and_check_size(tmp_path):
+    """Testa a junção das partes na ordem e a conferência com o Content-Length."""
+    parts = tmp_path / "a.zip.parts"
+    parts.mkdir()
+    for i, content in enumerate([b"aa", b"bb", b"c"]):
+        part_path(parts, i).write_bytes(content)
+    out = tmp_path / "a.zip.tmp"
+
+    join_parts(parts, 3, out)
+
+    assert out.read_bytes() == b"aabbc"
+    check_size(out, 5)
+    check_size(out, None)
+    with pytest.raises(Exception, match="diferente do informado"):
+        check_size(out, 6)
+
+
+# ============= DOWNLOAD TESTS =============
+
+
+def test_partial_download_resumes_from_part(standin_api, standin_url, tmp_path):
+    """Testa se uma parte interrompida é completada com um Range a partir do que já está em disco."""
+    body = standin_api.dataset.tse_zip(ARCHIVE)
+    url = f"{standin_url}{TSE_PREFIX}{ARCHIVE}"
+    start, end = 100, 1099
+    path = tmp_path / "00000.part"
+    path.write_bytes(body[start : start + 300])
+
+    with httpx.Client() as client:
+        etag = client.head(url).headers["etag"]
+        headers = resume_headers(path, start, end, etag)
+        with client.stream("GET", url, headers=headers) as r:
+            check_partial_response(r, url)
+            with open(path, "ab") as f:
+                for chunk in r.iter_bytes():
+                    f.write(chunk)
+
+    assert r.headers["content-range"] == f"bytes {start + 300}-{end}/{len(body)}"
+    assert path.read_bytes() == body[start : end + 1]
+
+
+def test_changed_file_answers_whole_body(standin_url):
+    """Testa se, com um validador que não é mais o do arquivo, o If-Range faz o servidor responder 200 e o corpo não é aceito."""
+    url = f"{standin_url}{TSE_PREFIX}{ARCHIVE}"
+
+    with httpx.Client() as client:
+        headers = {"Range": "bytes=0-99", "If-Range": '"versao-anterior"'}
+        with client.stream("GET", url, headers=headers) as r:
+            assert r.status_code == 200
+            with pytest.raises(RemoteFileChangedError):
+                check_partial_response(r, url)
+
+
+def test_server_error_is_not_treated_as_changed_file(standin_url):
+    """Testa se um erro HTTP é propagado como erro HTTP, e não como arquivo alterado."""
+    url = f"{standin_url}{TSE_PREFIX}inexistente/inexistente.zip"
+
+    with httpx.Client() as client:
+        with client.stream("GET", url, headers={"Range": "bytes=0-9"}) as r:
+            with pytest.raises(httpx.HTTPStatusError):
+                check_partial_response(r, url)
@@ -0,0 +1,182 @@
+import io
+import random
+import statistics
+import time
+import zipfile
+
+import httpx
+import pytest
+
+from src.config.loader import load_config, use_standin
+from src.utils.standin_api import FaultProfile, LatencyProfile, StandInAPI
+from src.utils.standin_data import (
+    CAMARA_REST_PREFIX,
+    SENADO_ADM_PREFIX,
+    SENADO_REST_PREFIX,
+    TSE_PREFIX,
+    StandInDataset,
+)
+from src.utils.tse_archives import tse_member_pattern
+
+
+def client(app: StandInAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://standin"
+    )
+
+
+# ============= CÂMARA TESTS =============
+
+
+@pytest.mark.asyncio
+async def test_camara_pagination(standin_api):
+    """Testa se as páginas da Câmara têm os links, o total de itens e o recorte corretos."""
+    async with client(standin_api) as c:
+        url = f"{CAMARA_REST_PREFIX}deputados/204000/discursos?itens=10"
+        first = await c.get(url)
+        last = await c.get(url + "&pagina=3")
+
+    assert first.headers["x-total-count"] == "25"
+    links = {link["rel"]: link["href"] for link in first.json()["links"]}
+    assert links["last"].endswith("itens=10&pagina=3")
+    assert links["next"].endswith("itens=10&pagina=2")
+    assert len(first.json()["dados"]) == 10
+    assert len(last.json()["dados"]) == 5
+    assert "next" not in {link["rel"] for link in last.json()["links"]}
+
+
+@pytest.mark.asyncio
+async def test_camara_details_are_deterministic(standin_api):
+    """Testa se um recurso tem sempre o mesmo conteúdo e se ids desconhecidos retornam 404."""
+    async with client(standin_api) as c:
+        first = await c.get(f"{CAMARA_REST_PREFIX}deputados/204001")
+        second = await c.get(f"{CAMARA_REST_PREFIX}deputados/204001")
+        missing = await c.get(f"{CAMARA_REST_PREFIX}inexistente")
+
+    assert first.json() == second.json()
+    assert first.json()["dados"]["ultimoStatus"]["situacao"] == "Exercício"
+    assert missing.status_code == 404
+
+
+# ============= SENADO TESTS =============
+
+
+@pytest.mark.asyncio
+async def test_senado_envelopes(standin_api):
+    """Testa os envelopes aninhados das respostas do Senado."""
+    async with client(standin_api) as c:
+        atual = (await c.get(f"{SENADO_REST_PREFIX}senador/lista/atual?v=4")).json()
+        detalhe = (await c.get(f"{SENADO_REST_PREFIX}senador/5000?v=6")).json()
+        despesas = (
+            await c.get(f"{SENADO_ADM_PREFIX}senadores/despesas_ceaps/2024")
+        ).json()
+
+    parlamentares = atual["ListaParlamentarEmExercicio"]["Parlamentares"]["Parlamentar"]
+    assert len(parlamentares) == 10
+    assert (
+        detalhe["DetalheParlamentar"]["Parlamentar"]["IdentificacaoParlamentar"][
+            "CodigoParlamentar"
+        ]
+        == "5000"
+    )
+    assert isinstance(despesas, list) and despesas[0]["ano"] == "2024"
+
+
+# ============= TSE TESTS =============
+
+
+@pytest.mark.asyncio
+async def test_tse_archive_supports_ranges(standin_api):
+    """Testa o HEAD e o download por intervalos de bytes dos ZIPs do TSE."""
+    url = f"{TSE_PREFIX}consulta_cand/consulta_cand_2022.zip"
+    async with client(standin_api) as c:
+        head = await c.head(url)
+        full = await c.get(url)
+        size = int(head.headers["content-length"])
+        part = await c.get(url, headers={"Range": f"bytes=0-{size // 2 - 1}"})
+        rest = await c.get(
+            url,
+            headers={"Range": f"bytes={size // 2}-", "If-Range": head.headers["etag"]},
+        )
+        changed = await c.get(
+            url, headers={"Range": "bytes=0-9", "If-Range": '"outro"'}
+        )
+
+    assert head.headers["accept-ranges"] == "bytes"
+    assert head.content == b""
+    assert part.status_code == rest.status_code == 206
+    assert part.content + rest.content == full.content
+    assert changed.status_code == 200
+
+    with zipfile.ZipFile(io.BytesIO(full.content)) as zf:
+        names = zf.namelist()
+        header = zf.read(names[0]).decode("latin-1").splitlines()[0]
+    assert any(tse_member_pattern("BRASIL").search(name) for name in names)
+    assert '"SQ_CANDIDATO"' in header
+
+
+# ============= FALHAS TESTS =============
+
+
+@pytest.mark.asyncio
+async def test_throttling_sends_retry_after():
+    """Testa as respostas 429 com Retry-After, injetadas e pelo limite de requisições por segundo."""
+    injected = StandInAPI(
+        dataset=StandInDataset(deputados=1),
+        faults=FaultProfile(throttle_rate=1.0, retry_after=2),
+    )
+    limited = StandInAPI(
+        dataset=StandInDataset(deputados=1),
+        faults=FaultProfile(max_requests_per_second=2),
+    )
+    url = f"{CAMARA_REST_PREFIX}legislaturas"
+    async with client(injected) as c:
+        throttled = await c.get(url)
+    async with client(limited) as c:
+        statuses = [(await c.get(url)).status_code for _ in range(4)]
+
+    assert throttled.status_code == 429
+    assert throttled.headers["retry-after"] == "2"
+    assert statuses == [200, 200, 429, 429]
+
+
+@pytest.mark.asyncio
+async def test_bandwidth_limit():
+    """Testa se a banda limitada atrasa as respostas proporcionalmente ao tamanho."""
+    app = StandInAPI(
+        dataset=StandInDataset(tse_linhas=200, tse_ufs=("BRASIL",)),
+        faults=FaultProfile(bandwidth=0.5),
+    )
+    async with client(app) as c:
+        started = time.monotonic()
+        response = await c.get(f"{TSE_PREFIX}consulta_cand/consulta_cand_2022.zip")
+        elapsed = time.monotonic() - started
+
+    assert elapsed >= len(response.content) / (0.5 * 1024 * 1024) * 0.9
+
+
+def test_latency_profiles():
+    """Testa se as distribuições de latência respeitam a média configurada."""
+    rng = random.Random(0)
+    for distribution in ("constante", "uniforme", "exponencial"):
+        profile = LatencyProfile(distribution=distribution, mean=0.1)
+        mean = statistics.fmean(profile.sample(rng) for _ in range(5000))
+        assert mean == pytest.approx(0.1, rel=0.1)
+
+    lognormal = LatencyProfile(distribution="lognormal", mean=0.1, sigma=0.8)
+    samples = [lognormal.sample(rng) for _ in range(5000)]
+    assert statistics.median(samples) == pytest.approx(0.1, rel=0.1)
+
+    with pytest.raises(ValueError):
+        LatencyProfile(distribution="normal")
+
+
+def test_use_standin_points_base_urls_to_server():
+    """Testa se o modo STANDIN aponta todas as URLs base para o servidor substituto."""
+    config = load_config()
+    config.STANDIN.URL = "http://127.0.0.1:9999/"
+    use_standin(config)
+
+    assert config.CAMARA.REST_BASE_URL == "http://127.0.0.1:9999" + CAMARA_REST_PREFIX
+    assert config.SENADO.ADM_BASE_URL == "http://127.0.0.1:9999" + SENADO_ADM_PREFIX
+    assert config.TSE.BASE_URL == "http://127.0.0.1:9999" + TSE_PREFIX
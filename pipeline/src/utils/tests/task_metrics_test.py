@@ -0,0 +1,129 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+import src.utils.task_metrics as task_metrics_module
+from src.utils.fetch_progress import FetchProgress, count_records
+from src.utils.task_metrics import (
+    record_fetch_metrics,
+    record_output_size,
+    update_task_metrics,
+)
+
+
+@pytest.fixture
+def task_run(monkeypatch):
+    """
+    Simula a execução dentro de uma Task Run, com o id da execução e sem horário de início.
+    """
+    run = SimpleNamespace(id=uuid4(), start_time=None)
+    context = SimpleNamespace(task_run=run)
+    monkeypatch.setattr(
+        task_metrics_module, "TaskRunContext", SimpleNamespace(get=lambda: context)
+    )
+    return run
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """
+    Substitui as gravações no banco de dados por listas com os valores gravados.
+    A inserção retorna o Id do registro, na ordem das inserções a partir de 1.
+    """
+    calls = {"insert": [], "output": [], "update": []}
+
+    def insert(metrics):
+        calls["insert"].append(metrics)
+        return len(calls["insert"])
+
+    monkeypatch.setattr(task_metrics_module, "insert_task_metrics_db", insert)
+    monkeypatch.setattr(
+        task_metrics_module,
+        "add_task_output_db",
+        lambda **kwargs: calls["output"].append(kwargs),
+    )
+    monkeypatch.setattr(
+        task_metrics_module,
+        "update_task_metrics_db",
+        lambda metrics_id, values: calls["update"].append((metrics_id, values)),
+    )
+    monkeypatch.setattr(task_metrics_module, "_recorded_runs", {})
+    return calls
+
+
+# ============= MÉTRICAS TESTS =============
+
+
+def test_record_fetch_metrics(task_run, db):
+    """Testa se as contagens, bytes, latências e o pico de memória do download são gravados para a Task Run."""
+    progress = FetchProgress("teste", planned=3)
+    for i in range(2):
+        url = f"https://a.gov.br/{i}"
+        progress.request_finished(url, progress.request_started(url))
+        progress.success(url, nbytes=100, records=5)
+    progress.failure()
+    progress.retry_started()
+
+    record_fetch_metrics(progress, lote_id=7)
+
+    [metrics] = db["insert"]
+    assert (metrics.lote_id, metrics.task, metrics.task_run_id) == (
+        7,
+        "teste",
+        task_run.id,
+    )
+    assert (metrics.urls_planejadas, metrics.urls_baixadas, metrics.urls_falhas) == (
+        3,
+        2,
+        1,
+    )
+    assert (metrics.paginas, metrics.registros, metrics.bytes) == (2, 10, 200)
+    assert metrics.novas_tentativas == 1
+    assert metrics.latencia_p50 is not None and metrics.duracao >= 0
+    assert metrics.pico_rss and metrics.pico_rss > 0
+
+
+def test_record_output_size_only_for_recorded_runs(task_run, db, tmp_path):
+    """Testa se o tamanho do arquivo é somado apenas às Task Runs que gravaram métricas de download."""
+    path = tmp_path / "saida.ndjson"
+    path.write_text("x" * 42)
+
+    record_output_size(path)
+    assert db["output"] == []
+
+    record_fetch_metrics(FetchProgress("teste", planned=0), lote_id=1)
+    record_output_size(path)
+    assert db["output"][0]["metrics_id"] == 1
+    assert db["output"][0]["size"] == 42
+
+
+def test_retry_updates_only_its_own_record(task_run, db, tmp_path):
+    """Testa se, na nova tentativa de uma Task Run, o tamanho do arquivo e os instrumentos vão apenas para o registro da nova tentativa."""
+    path = tmp_path / "saida.ndjson"
+    path.write_text("x" * 10)
+
+    # Primeira tentativa, que falha depois de gravar as métricas do download
+    record_fetch_metrics(FetchProgress("teste", planned=0), lote_id=1)
+    # Nova tentativa da mesma Task Run
+    record_fetch_metrics(FetchProgress("teste", planned=0), lote_id=1)
+    record_output_size(path)
+    update_task_metrics({"rss_max": 1})
+
+    assert [metrics.task_run_id for metrics in db["insert"]] == [task_run.id] * 2
+    assert [call["metrics_id"] for call in db["output"]] == [2]
+    assert db["update"] == [(2, {"rss_max": 1})]
+
+
+def test_record_fetch_metrics_outside_task_run(db):
+    """Testa se nada é gravado fora de uma Task Run."""
+    record_fetch_metrics(FetchProgress("teste", planned=1), lote_id=1)
+    assert db["insert"] == []
+
+
+def test_count_records():
+    """Testa a contagem de registros de páginas da Câmara, listas e objetos."""
+    assert count_records({"dados": [1, 2, 3], "links": []}) == 3
+    assert count_records({"dados": {"id": 1}}) == 1
+    assert count_records([{"id": 1}, {"id": 2}]) == 2
+    assert count_records({"DetalheParlamentar": {}}) == 1
@@ -0,0 +1,92 @@
+import pytest
+
+from src.config.parameters import TasksNames
+from src.utils.standin_api import StandInAPI
+from src.utils.standin_data import CAMARA_REST_PREFIX, StandInDataset
+from src.utils.task_scaling import (
+    SCALE_CASES,
+    ScaleCase,
+    camara_pages,
+    run_scaling,
+    scale_task,
+)
+
+
+def documents(app: StandInAPI) -> tuple:
+    return ([{"dados": [1]} for _ in range(app.dataset.deputados)],)
+
+
+def quadratic(docs: list):
+    return sum(1 for a in docs for b in docs if a is b)
+
+
+def linear(docs: list):
+    return sum(len(d["dados"]) for d in docs)
+
+
+# ============= DADOS EM ESCALA TESTS =============
+
+
+def test_scaled_dataset_keeps_original_entities():
+    """Testa se a escala multiplica as entidades sem alterar as existentes nem as quantidades por entidade."""
+    dataset = StandInDataset(deputados=3)
+    scaled = dataset.scaled(10)
+
+    assert scaled.deputados == 30
+    assert scaled.discursos_por_deputado == dataset.discursos_por_deputado
+    assert scaled.deputado(204001) == dataset.deputado(204001)
+    with pytest.raises(ValueError):
+        dataset.scaled(0)
+
+
+def test_camara_pages_without_server():
+    """Testa se as páginas de uma listagem da Câmara são geradas direto pelas rotas, sem servidor."""
+    app = StandInAPI(dataset=StandInDataset(proposicoes=250))
+    pages = camara_pages(
+        app, f"http://standin{CAMARA_REST_PREFIX}proposicoes?itens=100"
+    )
+
+    assert [len(page["dados"]) for page in pages] == [100, 100, 50]
+    assert len({p["id"] for page in pages for p in page["dados"]}) == 250
+
+
+# ============= CRESCIMENTO TESTS =============
+
+
+def test_growth_exponent_separates_linear_and_quadratic():
+    """Testa se o expoente de crescimento distingue funções lineares de quadráticas."""
+    slow = scale_task(
+        ScaleCase("quadratica", documents, quadratic, {"deputados": 300}), (1, 4)
+    )
+    fast = scale_task(
+        ScaleCase("linear", documents, linear, {"deputados": 100000}), (1, 4)
+    )
+
+    assert [p["registros"] for p in slow["pontos"]] == [300, 1200]
+    assert slow["expoente"] > 1.5 and slow["superlinear"]
+    assert fast["expoente"] < 1.5
+
+
+def test_factor_over_budget_is_estimated():
+    """Testa se um fator com tempo estimado acima do limite não é executado."""
+    result = scale_task(
+        ScaleCase("quadratica", documents, quadratic, {"deputados": 300}),
+        (1, 2, 100),
+        max_seconds=0.5,
+    )
+
+    last = result["pontos"][-1]
+    assert last["segundos"] is None
+    assert last["estimado"] > 0.5
+
+
+def test_scaling_real_task():
+    """Testa a medição de uma função de task com dados gerados pelo servidor substituto."""
+    cases = [
+        c for c in SCALE_CASES if c.task == TasksNames.EXTRACT_CAMARA_DETALHES_DEPUTADOS
+    ]
+    results = run_scaling(cases, (1, 2))
+
+    points = results["tasks"][0]["pontos"]
+    assert [p["documentos"] for p in points] == [513, 1026]
+    assert all(p["segundos"] > 0 for p in points)
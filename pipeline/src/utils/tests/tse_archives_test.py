@@ -0,0 +1,119 @@
+import zipfile
+
+import pytest
+
+from src.database.models.base import TSEArchive
+from src.utils.tse_archives import (
+    archive_changed,
+    iter_archive_members,
+    tse_member_pattern,
+)
+
+URL = "https://cdn.tse.jus.br/estatistica/sead/odsele/consulta_cand/consulta_cand_2022.zip"
+
+
+@pytest.fixture
+def stored_archive():
+    """
+    Versão de um arquivo gravada no registro de arquivos do TSE.
+    """
+    return TSEArchive(
+        url=URL,
+        etag='"63a1f2-5f1e"',
+        last_modified="Mon, 10 Oct 2022 12:00:00 GMT",
+        content_length=1024,
+        path="output/extract/tse/candidatos/2022",
+    )
+
+
+# ============= TESTS =============
+
+
+def test_same_etag_is_not_changed(stored_archive):
+    """Testa se o arquivo com o mesmo ETag é considerado igual."""
+    remote = TSEArchive(
+        url=URL,
+        etag=stored_archive.etag,
+        last_modified="Tue, 11 Oct 2022 12:00:00 GMT",
+        content_length=1024,
+    )
+    assert not archive_changed(stored_archive, remote)
+
+
+def test_different_etag_is_changed(stored_archive):
+    """Testa se o arquivo com ETag diferente é considerado alterado."""
+    remote = TSEArchive(url=URL, etag='"ffff"', last_modified=None, content_length=1024)
+    assert archive_changed(stored_archive, remote)
+
+
+def test_different_content_length_is_changed(stored_archive):
+    """Testa se o arquivo com tamanho diferente é considerado alterado, mesmo com o mesmo ETag."""
+    remote = TSEArchive(
+        url=URL, etag=stored_archive.etag, last_modified=None, content_length=2048
+    )
+    assert archive_changed(stored_archive, remote)
+
+
+def test_last_modified_used_without_etag(stored_archive):
+    """Testa a comparação por Last-Modified quando o servidor não envia ETag."""
+    remote = TSEArchive(
+        url=URL,
+        etag=None,
+        last_modified=stored_archive.last_modified,
+        content_length=None,
+    )
+    assert not archive_changed(stored_archive, remote)
+
+
+def test_without_validators_is_changed(stored_archive):
+    """Testa se, sem ETag e Last-Modified, o arquivo é considerado alterado."""
+    remote = TSEArchive(url=URL, etag=None, last_modified=None, content_length=1024)
+    assert archive_changed(stored_archive, remote)
+
+
+# ============= ARCHIVE MEMBERS TESTS =============
+
+
+@pytest.fixture
+def candidatos_zip(tmp_path):
+    """
+    ZIP com a mesma estrutura do arquivo de candidatos do TSE.
+    """
+    zip_path = tmp_path / "2022.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("leiame.pdf", b"%PDF")
+        zf.writestr(
+            "consulta_cand_2022_BRASIL.csv",
+            "SG_UF;NM_CANDIDATO\nSP;JOSÉ\n".encode("latin-1"),
+        )
+        zf.writestr(
+            "consulta_cand_2022_SP.csv",
+            "SG_UF;NM_CANDIDATO\nSP;JOSÉ\n".encode("latin-1"),
+        )
+    return zip_path
+
+
+def test_iter_archive_members_filters_by_pattern(candidatos_zip):
+    """Testa se apenas os membros que correspondem ao padrão são lidos."""
+    members = [
+        (name, stream.read())
+        for name, stream in iter_archive_members(candidatos_zip, tse_member_pattern())
+    ]
+    assert [name for name, _ in members] == ["consulta_cand_2022_BRASIL.csv"]
+    assert members[0][1].decode("latin-1").endswith("SP;JOSÉ\n")
+
+
+def test_iter_archive_members_by_uf(candidatos_zip):
+    """Testa a seleção do membro de uma UF específica."""
+    names = [
+        name
+        for name, _ in iter_archive_members(candidatos_zip, tse_member_pattern("SP"))
+    ]
+    assert names == ["consulta_cand_2022_SP.csv"]
+
+
+def test_iter_archive_members_does_not_extract(candidatos_zip):
+    """Testa se nenhum arquivo é extraído para o disco."""
+    for _ in iter_archive_members(candidatos_zip):
+        pass
+    assert [p.name for p in candidatos_zip.parent.iterdir()] == ["2022.zip"]
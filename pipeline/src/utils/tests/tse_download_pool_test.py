@@ -0,0 +1,272 @@
+from pathlib import Path
+
+import httpx
+import pytest
+
+import src.utils.tse_download_pool as pool_module
+from src.database.models.base import TSEArchive
+from src.utils.segmented_download import RemoteFileChangedError, prepare_parts_dir
+from src.utils.standin_data import TSE_PREFIX
+from src.utils.tse_download_pool import (
+    BandwidthLimiter,
+    TSEArchiveJob,
+    download_item,
+    download_tse_archives,
+    finish_job,
+    register_failure,
+    schedule_work,
+)
+from src.utils.tse_store import store_archive
+
+BASE_URL = "https://cdn.tse.jus.br/estatistica/sead/odsele/"
+
+
+def job(name: str, size: int | None, accept_ranges: bool = True) -> TSEArchiveJob:
+    url = BASE_URL + name
+    return TSEArchiveJob(
+        url=url,
+        dest_path=Path("output") / name,
+        task=name,
+        remote=TSEArchive(url=url, etag=None, last_modified=None, content_length=size),
+        accept_ranges=accept_ranges,
+    )
+
+
+def job_at(tmp_path, size: int) -> TSEArchiveJob:
+    url = BASE_URL + "a.zip"
+    return TSEArchiveJob(
+        url=url,
+        dest_path=tmp_path / "a.zip",
+        task="a.zip",
+        remote=TSEArchive(url=url, etag=None, last_modified=None, content_length=size),
+        accept_ranges=True,
+    )
+
+
+# ============= TESTS =============
+
+
+def test_schedule_largest_first():
+    """Testa se os maiores arquivos entram primeiro na fila."""
+    jobs = [job("pequeno.zip", 10), job("grande.zip", 90), job("medio.zip", 50)]
+    work = schedule_work(jobs, segment_size=100)
+    assert [j.task for j, _ in work] == ["grande.zip", "medio.zip", "pequeno.zip"]
+    assert all(index is None for _, index in work)
+
+
+def test_schedule_splits_large_archives_in_segments():
+    """Testa se arquivos maiores que um segmento são divididos quando o servidor aceita Range."""
+    grande = job("grande.zip", 250)
+    sem_range = job("sem_range.zip", 200, accept_ranges=False)
+    work = schedule_work([sem_range, grande], segment_size=100)
+
+    assert [(j.task, index) for j, index in work] == [
+        ("grande.zip", 0),
+        ("grande.zip", 1),
+        ("grande.zip", 2),
+        ("sem_range.zip", None),
+    ]
+    assert grande.segments == [(0, 99), (100, 199), (200, 249)]
+    assert grande.pending == 3
+    assert sem_range.pending == 1
+
+
+def test_schedule_unknown_size_last():
+    """Testa se arquivos sem Content-Length ficam no fim da fila."""
+    work = schedule_work([job("sem_tamanho.zip", None), job("a.zip", 1)], 100)
+    assert [j.task for j, _ in work] == ["a.zip", "sem_tamanho.zip"]
+
+
+# ============= DOWNLOAD TESTS =============
+
+ARCHIVE = "consulta_cand/consulta_cand_2022.zip"
+SEGMENT = 1024
+
+
+@pytest.fixture
+def pool_db(monkeypatch, tmp_path):
+    """
+    Substitui o registro de arquivos e a tabela erros_extract por listas e usa um armazenamento por SHA-256 temporário.
+    - stored: versões registradas por URL, devolvidas por get_tse_archives_db
+    - metrics: FetchProgress gravados na tabela task_metrics
+    """
+    calls = {"stored": {}, "upsert": [], "errors": [], "verified": [], "metrics": []}
+    monkeypatch.setattr(
+        pool_module,
+        "get_tse_archives_db",
+        lambda urls: {
+            url: calls["stored"][url] for url in urls if url in calls["stored"]
+        },
+    )
+    monkeypatch.setattr(
+        pool_module,
+        "upsert_tse_archive_db",
+        lambda archive, lote_id: calls["upsert"].append(archive),
+    )
+    monkeypatch.setattr(
+        pool_module,
+        "update_tse_archives_verified_db",
+        lambda urls: calls["verified"].extend(urls),
+    )
+    monkeypatch.setattr(
+        pool_module,
+        "insert_extract_error_db",
+        lambda **kwargs: calls["errors"].append(kwargs),
+    )
+    monkeypatch.setattr(
+        pool_module,
+        "store_archive",
+        lambda source, dest, url: store_archive(source, dest, url, tmp_path / "store"),
+    )
+    monkeypatch.setattr(pool_module, "apply_retention", lambda: None)
+    monkeypatch.setattr(
+        pool_module,
+        "record_fetch_metrics",
+        lambda progress, lote_id: calls["metrics"].append(progress),
+    )
+    monkeypatch.setattr(pool_module, "check_disk_space", lambda *args: None)
+    return calls
+
+
+def standin_job(standin_url: str, tmp_path) -> TSEArchiveJob:
+    return TSEArchiveJob(
+        url=f"{standin_url}{TSE_PREFIX}{ARCHIVE}",
+        dest_path=tmp_path / "candidatos" / "2022.zip",
+        task="extract_tse_candidatos",
+    )
+
+
+@pytest.mark.asyncio
+async def test_pool_resumes_interrupted_segments(
+    standin_api, standin_url, tmp_path, pool_db
+):
+    """Testa se as partes de um download interrompido são completadas e apenas os bytes que faltam são baixados."""
+    body = standin_api.dataset.tse_zip(ARCHIVE)
+    job = standin_job(standin_url, tmp_path)
+    etag = httpx.head(job.url).headers["etag"]
+
+    # Download anterior interrompido: primeiro segmento completo e metade do segundo
+    prepare_parts_dir(job.parts_dir, etag)
+    job.part_path(0).write_bytes(body[:SEGMENT])
+    job.part_path(1).write_bytes(body[SEGMENT : SEGMENT + SEGMENT // 2])
+
+    results = await download_tse_archives([job], lote_id=1, segment_size=SEGMENT)
+
+    assert Path(results[job.url]).read_bytes() == body
+    assert job.downloaded_bytes == len(body) - SEGMENT - SEGMENT // 2
+    assert not job.parts_dir.exists()
+    [archive] = pool_db["upsert"]
+    assert (
+        archive.etag == etag and archive.sha256 and archive.content_length == len(body)
+    )
+    # Uma URL planejada e baixada, com uma requisição por segmento que faltava
+    [progress] = pool_db["metrics"]
+    assert (progress.planned, progress.succeeded, progress.failed) == (1, 1, 0)
+    assert progress.bytes == job.downloaded_bytes
+    assert progress.pages == len(job.segments)
+    assert len(progress.latencies) == len(job.segments) - 1
+
+
+@pytest.mark.asyncio
+async def test_pool_discards_parts_of_previous_version(
+    standin_api, standin_url, tmp_path, pool_db
+):
+    """Testa se partes gravadas para outra versão do arquivo não são reaproveitadas."""
+    body = standin_api.dataset.tse_zip(ARCHIVE)
+    job = standin_job(standin_url, tmp_path)
+    prepare_parts_dir(job.parts_dir, '"versao-anterior"')
+    job.part_path(0).write_bytes(b"x" * SEGMENT)
+
+    results = await download_tse_archives([job], lote_id=1, segment_size=SEGMENT)
+
+    assert Path(results[job.url]).read_bytes() == body
+    assert job.downloaded_bytes == len(body)
+
+
+@pytest.mark.asyncio
+async def test_pool_single_stream_for_small_archives(
+    standin_api, standin_url, tmp_path, pool_db
+):
+    """Testa o download em um único stream de arquivos menores que um segmento."""
+    body = standin_api.dataset.tse_zip(ARCHIVE)
+    job = standin_job(standin_url, tmp_path)
+
+    results = await download_tse_archives([job], lote_id=1, segment_size=len(body))
+
+    assert job.segments == []
+    assert Path(results[job.url]).read_bytes() == body
+    assert standin_api.statuses[206] == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_skips_unchanged_archive(standin_url, tmp_path, pool_db):
+    """Testa se um arquivo com a mesma versão registrada não é baixado de novo."""
+    job = standin_job(standin_url, tmp_path)
+    remote = httpx.head(job.url).headers
+    stored_path = tmp_path / "registrado.zip"
+    stored_path.write_bytes(b"zip")
+    pool_db["stored"][job.url] = TSEArchive(
+        url=job.url,
+        etag=remote["etag"],
+        last_modified=remote["last-modified"],
+        content_length=int(remote["content-length"]),
+        path=str(stored_path),
+    )
+
+    results = await download_tse_archives([job], lote_id=1, segment_size=SEGMENT)
+
+    assert results[job.url] == str(stored_path)
+    assert job.downloaded_bytes == 0
+    assert pool_db["verified"] == [job.url]
+
+
+@pytest.mark.asyncio
+async def test_changed_archive_fails_without_keeping_parts(
+    standin_url, tmp_path, pool_db
+):
+    """Testa se um segmento respondido com 200 (If-Range recusado) falha e descarta as partes da versão anterior."""
+    job = standin_job(standin_url, tmp_path)
+    job.remote = TSEArchive(
+        url=job.url, etag='"versao-anterior"', last_modified=None, content_length=4096
+    )
+    job.accept_ranges = True
+    schedule_work([job], SEGMENT)
+    prepare_parts_dir(job.parts_dir, job.validator)
+
+    async with httpx.AsyncClient() as client:
+        with pytest.raises(RemoteFileChangedError) as error:
+            await download_item(client, BandwidthLimiter(0), job, 1)
+
+    register_failure(job, lote_id=1, error=error.value)
+
+    assert job.failed
+    assert not job.parts_dir.exists()
+    assert pool_db["errors"][0]["url"] == job.url
+
+
+def test_failure_registered_once_per_archive(tmp_path, pool_db):
+    """Testa se a falha de vários segmentos do mesmo arquivo gera um único registro em erros_extract."""
+    job = job_at(tmp_path, size=10)
+    schedule_work([job], segment_size=4)
+
+    for _ in job.segments:
+        register_failure(job, lote_id=1, error=Exception("Conexão perdida"))
+
+    assert len(pool_db["errors"]) == 1
+
+
+def test_finish_job_rejects_size_mismatch(tmp_path, pool_db):
+    """Testa se um arquivo com tamanho diferente do Content-Length não é registrado e não deixa partes para trás."""
+    job = job_at(tmp_path, size=10)
+    schedule_work([job], segment_size=4)
+    prepare_parts_dir(job.parts_dir, None)
+    for i, content in enumerate([b"aaaa", b"bbbb", b"c"]):
+        job.part_path(i).write_bytes(content)
+
+    with pytest.raises(Exception, match="diferente do informado"):
+        finish_job(job, lote_id=1)
+
+    assert pool_db["upsert"] == []
+    assert not job.parts_dir.exists()
+    assert not job.dest_path.with_name(job.dest_path.name + ".tmp").exists()
+    assert not job.dest_path.exists()
@@ -0,0 +1,115 @@
+import zipfile
+
+import pandas as pd
+import pytest
+
+from src.utils.tse_parquet import (
+    TSE_SCHEMAS,
+    convert_tse_archive,
+    member_table_name,
+    parquet_up_to_date,
+)
+
+CANDIDATOS_CSV = (
+    '"ANO_ELEICAO";"SG_UF";"DS_CARGO";"SQ_CANDIDATO";"NM_CANDIDATO";"NR_CPF_CANDIDATO";"SG_PARTIDO";"DT_NASCIMENTO";"VR_DESPESA_MAX_CAMPANHA"\n'
+    '"2022";"SP";"DEPUTADO FEDERAL";"250001600000";"JOSÉ DA SILVA";"01234567890";"PT";"01/02/1970";"3176572,53"\n'
+    '"2022";"MG";"DEPUTADO FEDERAL";"130001600001";"MARIA JOÃO";"#NULO#";"PL";"#NULO#";"-1"\n'
+    '"2022";"SP";"SENADOR";"250001600002";"ANTÔNIO";"09876543210";"PSD";"15/12/1960";"5000000"\n'
+)
+
+
+@pytest.fixture
+def candidatos_zip(tmp_path):
+    """
+    ZIP de candidatos com o arquivo BRASIL e o de uma UF, que não deve ser lido.
+    """
+    zip_path = tmp_path / "2022.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("consulta_cand_2022_BRASIL.csv", CANDIDATOS_CSV.encode("latin-1"))
+        zf.writestr("consulta_cand_2022_SP.csv", CANDIDATOS_CSV.encode("latin-1"))
+    return zip_path
+
+
+# ============= TESTS =============
+
+
+def test_member_table_name():
+    """Testa a remoção do ano e da UF do nome do membro."""
+    assert member_table_name("receitas_candidatos_2022_BRASIL.csv") == (
+        "receitas_candidatos"
+    )
+    assert member_table_name("rede_social_candidato_2018_SP.csv") == (
+        "rede_social_candidato"
+    )
+
+
+def test_convert_partitions_by_uf(candidatos_zip, tmp_path):
+    """Testa se cada UF é gravada na sua partição, lendo o CSV em vários chunks."""
+    out_dir = tmp_path / "transform"
+    paths = convert_tse_archive(
+        candidatos_zip, "candidatos", 2022, out_dir=out_dir, chunk_size=1
+    )
+
+    table_dir = out_dir / "candidatos" / "consulta_cand" / "ano=2022"
+    assert sorted(paths) == sorted(
+        str(table_dir / f"SG_UF={uf}" / "part-0.parquet") for uf in ("MG", "SP")
+    )
+    assert len(pd.read_parquet(table_dir / "SG_UF=SP" / "part-0.parquet")) == 2
+
+
+def test_convert_applies_schema(candidatos_zip, tmp_path):
+    """Testa se os tipos declarados são aplicados e o texto latin-1 é preservado."""
+    out_dir = tmp_path / "transform"
+    convert_tse_archive(candidatos_zip, "candidatos", 2022, out_dir=out_dir)
+
+    df = pd.read_parquet(out_dir / "candidatos" / "consulta_cand").set_index(
+        "SQ_CANDIDATO"
+    )
+    assert str(df.index.dtype) == "int64"
+    assert isinstance(df["DS_CARGO"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["SG_UF"].dtype, pd.CategoricalDtype)
+    # O CPF continua como texto para não perder os zeros à esquerda
+    assert df.loc[250001600000, "NR_CPF_CANDIDATO"] == "01234567890"
+    assert df.loc[250001600000, "NM_CANDIDATO"] == "JOSÉ DA SILVA"
+    assert df.loc[130001600001, "NM_CANDIDATO"] == "MARIA JOÃO"
+    assert df.loc[250001600000, "VR_DESPESA_MAX_CAMPANHA"] == pytest.approx(3176572.53)
+    assert pd.isna(df.loc[130001600001, "DT_NASCIMENTO"])
+    assert str(df.loc[250001600002, "DT_NASCIMENTO"]) == "1960-12-15"
+
+
+def test_convert_without_uf_column(tmp_path):
+    """Testa a partição pela UF informada nos ZIPs sem a coluna SG_UF."""
+    zip_path = tmp_path / "SP-2022.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr(
+            "rede_social_candidato_2022_SP.csv",
+            '"SQ_CANDIDATO";"NR_ORDEM_REDE_SOCIAL";"DS_URL"\n"250001600000";"1";"https://x.com/a"\n',
+        )
+
+    out_dir = tmp_path / "transform"
+    paths = convert_tse_archive(
+        zip_path, "redes_sociais", 2022, out_dir=out_dir, uf="SP"
+    )
+
+    assert paths == [
+        str(
+            out_dir
+            / "redes_sociais"
+            / "rede_social_candidato"
+            / "ano=2022"
+            / "SG_UF=SP"
+            / "part-0.parquet"
+        )
+    ]
+    assert parquet_up_to_date(zip_path, out_dir, "redes_sociais", 2022, "SP")
+    assert not parquet_up_to_date(zip_path, out_dir, "redes_sociais", 2022, "RJ")
+
+
+def test_schemas_declared_for_all_datasets():
+    """Testa se existe schema para todos os datasets extraídos do TSE."""
+    assert set(TSE_SCHEMAS) == {
+        "candidatos",
+        "prestacao_contas",
+        "redes_sociais",
+        "votacao",
+    }
@@ -0,0 +1,80 @@
+import zipfile
+
+import pytest
+
+from src.utils.tse_store import (
+    InsufficientDiskSpaceError,
+    apply_retention,
+    check_disk_space,
+    read_manifest,
+    store_archive,
+    store_object_path,
+)
+
+URL = "https://cdn.tse.jus.br/estatistica/sead/odsele/consulta_cand/consulta_cand_2022.zip"
+
+
+def make_zip(path, content: str):
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("consulta_cand_2022_BRASIL.csv", content)
+    return path
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    return tmp_path / "store"
+
+
+# ============= TESTS =============
+
+
+def test_store_archive_links_destination(tmp_path, store_dir):
+    """Testa se o ZIP vai para o armazenamento e o destino é um link para ele."""
+    dest = tmp_path / "candidatos" / "2022" / "2022.zip"
+    downloaded = make_zip(tmp_path / "2022.zip.tmp", "SG_UF;NM\nSP;A\n")
+
+    digest = store_archive(downloaded, dest, URL, store_dir)
+
+    object_path = store_object_path(digest, store_dir)
+    assert not downloaded.exists()
+    assert dest.read_bytes() == object_path.read_bytes()
+    assert dest.stat().st_ino == object_path.stat().st_ino
+
+    manifest = read_manifest(digest, store_dir)
+    assert [m["nome"] for m in manifest["membros"]] == ["consulta_cand_2022_BRASIL.csv"]
+    assert [o["url"] for o in manifest["origens"]] == [URL]
+
+
+def test_store_archive_deduplicates_same_content(tmp_path, store_dir):
+    """Testa se o mesmo conteúdo baixado novamente não gera uma nova cópia."""
+    dest = tmp_path / "2022.zip"
+    first = store_archive(make_zip(tmp_path / "a.tmp", "x"), dest, URL, store_dir)
+    # O mesmo arquivo gerado de novo tem o mesmo conteúdo byte a byte
+    (tmp_path / "b.tmp").write_bytes(store_object_path(first, store_dir).read_bytes())
+    second = store_archive(tmp_path / "b.tmp", dest, URL, store_dir)
+
+    assert first == second
+    assert len(list(store_dir.glob("*/*.zip"))) == 1
+    assert len(read_manifest(first, store_dir)["origens"]) == 2
+
+
+def test_retention_keeps_latest_versions(tmp_path, store_dir):
+    """Testa se apenas as versões mais recentes de cada URL são mantidas."""
+    dest = tmp_path / "2022.zip"
+    digests = [
+        store_archive(make_zip(tmp_path / f"{i}.tmp", str(i)), dest, URL, store_dir)
+        for i in range(3)
+    ]
+
+    removed = apply_retention(store_dir, keep_versions=2)
+
+    assert removed == [digests[0]]
+    assert not store_object_path(digests[0], store_dir).exists()
+    assert dest.read_bytes() == store_object_path(digests[2], store_dir).read_bytes()
+
+
+def test_check_disk_space_fails_fast(tmp_path):
+    """Testa se a verificação de espaço falha informando a estimativa."""
+    with pytest.raises(InsufficientDiskSpaceError, match="são necessários"):
+        check_disk_space(tmp_path / "nao_existe", 10**18, "baixar os arquivos")
+    check_disk_space(tmp_path, 1, "baixar os arquivos", margin_bytes=0)
@@ -0,0 +1,82 @@
+import pandas as pd
+import pytest
+
+from src.utils.tse_votacao import VotacaoAgregada, build_votacao_agregada
+
+
+@pytest.fixture
+def transform_dir(tmp_path):
+    """
+    Arquivos Parquet de votação por município e zona, no layout gerado pela conversão do TSE.
+    """
+    rows = {
+        "SP": [
+            # SQ_CANDIDATO, NR_TURNO, CD_MUNICIPIO, NR_ZONA, QT_VOTOS_NOMINAIS
+            (250001, 1, 71072, 1, 100),
+            (250001, 1, 71072, 2, 50),
+            (250001, 1, 62910, 5, 10),
+            (250002, 1, 71072, 1, 7),
+        ],
+        "MG": [
+            (250001, 1, 41238, 3, 20),
+            (250001, 2, 41238, 3, 30),
+        ],
+    }
+    for uf, uf_rows in rows.items():
+        partition_dir = (
+            tmp_path
+            / "votacao"
+            / "votacao_candidato_munzona"
+            / "ano=2022"
+            / f"SG_UF={uf}"
+        )
+        partition_dir.mkdir(parents=True)
+        pd.DataFrame(
+            uf_rows,
+            columns=[
+                "SQ_CANDIDATO",
+                "NR_TURNO",
+                "CD_MUNICIPIO",
+                "NR_ZONA",
+                "QT_VOTOS_NOMINAIS",
+            ],
+        ).to_parquet(partition_dir / "part-0.parquet")
+    return tmp_path
+
+
+# ============= TESTS =============
+
+
+def test_votos_por_municipio(transform_dir):
+    """Testa se as zonas de um mesmo município são somadas."""
+    votacao = VotacaoAgregada(build_votacao_agregada(2022, transform_dir))
+    df = votacao.votos(250001, "municipio")
+    assert df[
+        ["NR_TURNO", "SG_UF", "CD_MUNICIPIO", "QT_VOTOS_NOMINAIS"]
+    ].values.tolist() == [
+        [1, "MG", 41238, 20],
+        [1, "SP", 62910, 10],
+        [1, "SP", 71072, 150],
+        [2, "MG", 41238, 30],
+    ]
+
+
+def test_votos_por_uf_e_total(transform_dir):
+    """Testa os níveis UF e total e a separação por turno."""
+    votacao = VotacaoAgregada(build_votacao_agregada(2022, transform_dir))
+    uf_df = votacao.votos(250001, "uf")
+    assert uf_df[["NR_TURNO", "SG_UF", "QT_VOTOS_NOMINAIS"]].values.tolist() == [
+        [1, "MG", 20],
+        [1, "SP", 160],
+        [2, "MG", 30],
+    ]
+    assert votacao.total(250001) == 180
+    assert votacao.total(250001, turno=2) == 30
+    assert votacao.total(250002) == 7
+
+
+def test_candidato_sem_votos(transform_dir):
+    """Testa a consulta de um candidato que não está nos arquivos."""
+    votacao = VotacaoAgregada(build_votacao_agregada(2022, transform_dir))
+    assert votacao.votos(999, "municipio").empty
+    assert votacao.total(999) == 0
@@ -0,0 +1,128 @@
+from datetime import date
+
+import pytest
+
+from src.utils.url_utils import (
+    EndpointTemplate,
+    canonical_url,
+    get_page_number,
+    page_url,
+    split_dates_by_year,
+    split_page_url,
+)
+
+BASE_URL = "https://dadosabertos.camara.leg.br/api/v2/"
+
+
+@pytest.fixture
+def despesas_template():
+    """
+    Template do endpoint de despesas de deputados.
+    """
+    return EndpointTemplate(
+        BASE_URL,
+        "deputados/{id}/despesas",
+        {"ordem": "ASC", "ordenarPor": "dataDocumento", "itens": 100},
+    )
+
+
+# ============= CANONICAL URL TESTS =============
+
+
+def test_canonical_url_removes_double_slash_and_sorts_params():
+    """Testa se a mesma URL escrita de formas diferentes gera a mesma chave."""
+    url_1 = "https://dadosabertos.camara.leg.br/api/v2//deputados?idLegislatura=57&ordem=ASC"
+    url_2 = (
+        "HTTPS://dadosabertos.camara.leg.br/api/v2/deputados?ordem=ASC&idLegislatura=57"
+    )
+    assert canonical_url(url_1) == canonical_url(url_2)
+
+
+def test_canonical_url_page_param_last_and_first_page_omitted():
+    """Testa se 'pagina' fica por último e se 'pagina=1' é removida."""
+    url = f"{BASE_URL}votacoes?pagina=3&itens=100&dataInicio=2024-01-01"
+    assert canonical_url(url) == (
+        f"{BASE_URL}votacoes?dataInicio=2024-01-01&itens=100&pagina=3"
+    )
+    assert canonical_url(f"{BASE_URL}votacoes?pagina=1&itens=100") == (
+        f"{BASE_URL}votacoes?itens=100"
+    )
+
+
+def test_canonical_url_is_idempotent():
+    """Testa se aplicar a forma canônica duas vezes não altera a URL."""
+    url = canonical_url(f"{BASE_URL}votacoes?itens=100&pagina=2")
+    assert canonical_url(url) == url
+
+
+# ============= ENDPOINT TEMPLATE TESTS =============
+
+
+def test_template_generates_canonical_url(despesas_template):
+    """Testa se a URL gerada pelo template já está na forma canônica."""
+    url = despesas_template.url(id=204535, ano=2024, mes=3)
+    assert url == (
+        f"{BASE_URL}deputados/204535/despesas"
+        "?ano=2024&itens=100&mes=3&ordem=ASC&ordenarPor=dataDocumento"
+    )
+    assert canonical_url(url) == url
+
+
+def test_template_ignores_none_params(despesas_template):
+    """Testa se parâmetros None não entram na query."""
+    assert despesas_template.url(id=1, ano=2024, mes=None) == despesas_template.url(
+        id=1, ano=2024
+    )
+
+
+def test_template_missing_path_value_raises_error(despesas_template):
+    """Testa se levanta erro quando falta um valor do caminho."""
+    with pytest.raises(ValueError, match="Faltam os valores"):
+        despesas_template.url(ano=2024)
+
+
+def test_template_without_params():
+    """Testa um template sem parâmetros de query e com barras sobrando."""
+    template = EndpointTemplate(BASE_URL, "/deputados/{id}/")
+    assert template.url(id=10) == f"{BASE_URL}deputados/10"
+
+
+# ============= PAGINATION TESTS =============
+
+
+def test_page_url_matches_canonical_url(despesas_template):
+    """Testa se a URL de página gerada sem interpretar a URL é canônica."""
+    url = despesas_template.url(id=1, ano=2024)
+    assert page_url(url, 1) == url
+    assert canonical_url(page_url(url, 5)) == page_url(url, 5)
+    assert get_page_number(page_url(url, 5)) == 5
+
+
+def test_split_page_url(despesas_template):
+    """Testa a separação entre a URL da primeira página e o número da página."""
+    url = despesas_template.url(id=1, ano=2024)
+    assert split_page_url(page_url(url, 4)) == (url, 4)
+    assert split_page_url(url) == (url, 1)
+
+
+def test_get_page_number_default():
+    """Testa o valor padrão quando não existe o parâmetro de paginação."""
+    assert get_page_number(f"{BASE_URL}votacoes?itens=100") == 1
+
+
+# ============= DATE RANGES TESTS =============
+
+
+def test_split_dates_by_year():
+    """Testa a divisão de datas em intervalos contidos em um único ano."""
+    assert split_dates_by_year(date(2023, 11, 10), date(2025, 2, 1)) == [
+        (date(2023, 11, 10), date(2023, 12, 31)),
+        (date(2024, 1, 1), date(2024, 12, 31)),
+        (date(2025, 1, 1), date(2025, 2, 1)),
+    ]
+
+
+def test_split_dates_by_year_invalid_range():
+    """Testa se levanta erro quando a data de início é maior que a de fim."""
+    with pytest.raises(ValueError, match="não pode ser maior"):
+        split_dates_by_year(date(2025, 1, 2), date(2025, 1, 1))
@@ -0,0 +1,71 @@
+import re
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO
+
+import httpx
+from prefect.logging import get_logger
+
+from database.models.base import TSEArchive
+
+logger = get_logger()
+
+
+def archive_from_headers(url: str, response_headers: httpx.Headers) -> TSEArchive:
+    content_length = response_headers.get("content-length")
+    return TSEArchive(
+        url=url,
+        etag=response_headers.get("etag"),
+        last_modified=response_headers.get("last-modified"),
+        content_length=int(content_length) if content_length else None,
+    )
+
+
+def archive_changed(stored: TSEArchive, remote: TSEArchive) -> bool:
+    """
+    Compara a versão gravada no registro com a versão do servidor.
+    Sem ETag ou Last-Modified não é possível garantir que o arquivo é o mesmo, então ele é considerado alterado.
+    """
+    if (
+        stored.content_length is not None
+        and remote.content_length is not None
+        and stored.content_length != remote.content_length
+    ):
+        return True
+
+    if stored.etag and remote.etag:
+        return stored.etag != remote.etag
+
+    if stored.last_modified and remote.last_modified:
+        return stored.last_modified != remote.last_modified
+
+    return True
+
+
+def tse_member_pattern(uf: str = "BRASIL", extension: str = "csv") -> re.Pattern:
+    """
+    Padrão dos nomes dos membros dos ZIPs do TSE, que terminam com a UF ou BRASIL.
+    Ex.: consulta_cand_2022_BRASIL.csv, votacao_candidato_munzona_2022_SP.csv
+    """
+    return re.compile(rf"_{re.escape(uf)}\.{re.escape(extension)}$", re.IGNORECASE)
+
+
+def iter_archive_members(
+    zip_path: str | Path, pattern: str | re.Pattern | None = None
+) -> Iterator[tuple[str, IO[bytes]]]:
+    """
+    Percorre os membros de um ZIP cujo nome corresponde ao padrão, entregando cada um como um stream de bytes descomprimido.
+    Nada é extraído para o disco: o consumidor lê o stream diretamente (ex.: pandas.read_csv com encoding latin-1 e sep ';').
+    O stream só é válido até a próxima iteração.
+    """
+    regex = re.compile(pattern) if isinstance(pattern, str) else pattern
+
+    with zipfile.ZipFile(zip_path) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            if regex is not None and not regex.search(info.filename):
+                continue
+            with zf.open(info) as member:
+                yield info.filename, member
@@ -0,0 +1,454 @@
+import asyncio
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+from prefect.logging import get_logger
+
+from config.loader import load_config
+from config.parameters import TasksNames
+from config.request_headers import headers
+from database.models.base import TSEArchive
+from database.repository.arquivos_tse import (
+    get_tse_archives_db,
+    update_tse_archives_verified_db,
+    upsert_tse_archive_db,
+)
+from database.repository.erros_extract import insert_extract_error_db
+
+from .fetch_progress import FetchProgress
+from .http_client import async_http_client
+from .io import ensure_dir
+from .segmented_download import (
+    MB,
+    RemoteFileChangedError,
+    check_partial_response,
+    check_size,
+    join_parts,
+    part_path,
+    parts_dir,
+    prepare_parts_dir,
+    resume_headers,
+    split_segments,
+)
+from .task_metrics import record_fetch_metrics
+from .tse_archives import archive_changed, archive_from_headers
+from .tse_store import apply_retention, check_disk_space, store_archive
+from .url_utils import canonical_url
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+
+@dataclass
+class TSEArchiveJob:
+    """
+    Arquivo do TSE a ser baixado pelo pool de downloads.
+    - task é o nome gravado na tabela erros_extract em caso de falha
+    - started é o instante em que o primeiro item do arquivo saiu da fila, para medir a vazão de cada arquivo
+    """
+
+    url: str
+    dest_path: Path
+    task: str
+    remote: TSEArchive | None = None
+    accept_ranges: bool = False
+    segments: list[tuple[int, int]] = field(default_factory=list)
+    pending: int = 0
+    downloaded_bytes: int = 0
+    started: float | None = None
+    failed: bool = False
+
+    @property
+    def size(self) -> int:
+        if self.remote is None or self.remote.content_length is None:
+            return 0
+        return self.remote.content_length
+
+    @property
+    def validator(self) -> str | None:
+        if self.remote is None:
+            return None
+        return self.remote.etag or self.remote.last_modified
+
+    @property
+    def parts_dir(self) -> Path:
+        return parts_dir(self.dest_path)
+
+    def part_path(self, index: int) -> Path:
+        return part_path(self.parts_dir, index)
+
+
+class BandwidthLimiter:
+    """
+    Token bucket compartilhado entre todos os downloads do pool.
+    Com bytes_per_second igual a 0 a banda não é limitada.
+    """
+
+    def __init__(self, bytes_per_second: float):
+        self.rate = bytes_per_second
+        self._allowance = bytes_per_second
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def consume(self, n_bytes: int):
+        if not self.rate:
+            return
+
+        async with self._lock:
+            now = time.monotonic()
+            self._allowance = min(
+                self.rate, self._allowance + (now - self._last) * self.rate
+            )
+            self._last = now
+            self._allowance -= n_bytes
+
+            # Quem está dentro do lock espera a banda ser reposta, segurando os outros downloads
+            if self._allowance < 0:
+                await asyncio.sleep(-self._allowance / self.rate)
+
+
+def schedule_work(
+    jobs: list[TSEArchiveJob], segment_size: int
+) -> list[tuple[TSEArchiveJob, int | None]]:
+    """
+    Gera a fila de trabalho do pool. Os arquivos são ordenados do maior para o menor (longest-processing-time first),
+    assim os arquivos pequenos preenchem os intervalos enquanto os grandes terminam.
+    Arquivos maiores que um segmento e com suporte a Range são divididos em segmentos, que entram na fila como itens independentes.
+    Cada item é (job, índice do segmento) ou (job, None) para o download em um único stream.
+    """
+    work = []
+    for job in sorted(jobs, key=lambda j: j.size, reverse=True):
+        if job.accept_ranges and job.size > segment_size:
+            job.segments = split_segments(job.size, segment_size)
+            work.extend((job, i) for i in range(len(job.segments)))
+        else:
+            job.segments = []
+            work.append((job, None))
+        job.pending = len(job.segments) or 1
+    return work
+
+
+async def probe_job(
+    client: httpx.AsyncClient,
+    job: TSEArchiveJob,
+    stored: TSEArchive | None,
+    semaphore: asyncio.Semaphore,
+):
+    """
+    Busca os metadados (ETag, Last-Modified, Content-Length e suporte a Range) do arquivo no servidor sem baixá-lo.
+    Utiliza HEAD e, caso o servidor não aceite, um GET condicional que é fechado antes da leitura do corpo.
+    Falhas na verificação não impedem o download.
+    """
+    async with semaphore:
+        try:
+            r = await client.head(job.url)
+
+            if r.status_code in (405, 501):
+                conditional_headers = {}
+                if stored is not None and stored.etag:
+                    conditional_headers["If-None-Match"] = stored.etag
+                if stored is not None and stored.last_modified:
+                    conditional_headers["If-Modified-Since"] = stored.last_modified
+
+                async with client.stream(
+                    "GET", job.url, headers=conditional_headers
+                ) as r:
+                    # 304: o arquivo não mudou desde a versão gravada
+                    if r.status_code == 304 and stored is not None:
+                        job.remote = TSEArchive(
+                            url=job.url,
+                            etag=stored.etag,
+                            last_modified=stored.last_modified,
+                            content_length=stored.content_length,
+                        )
+                        return
+                    r.raise_for_status()
+
+            r.raise_for_status()
+            job.remote = archive_from_headers(job.url, r.headers)
+            job.accept_ranges = r.headers.get("accept-ranges", "").lower() == "bytes"
+        except Exception as e:
+            logger.warning(
+                f"Não foi possível verificar o arquivo {job.url} no servidor: {e}"
+            )
+
+
+async def download_item(
+    client: httpx.AsyncClient,
+    limiter: BandwidthLimiter,
+    job: TSEArchiveJob,
+    index: int | None,
+    progress: FetchProgress | None = None,
+):
+    """
+    Baixa um segmento para o seu arquivo de parte, continuando de onde parou, ou o arquivo inteiro em um único stream.
+    A latência registrada em progress é a de cada requisição, com a leitura do corpo.
+    """
+    if index is None:
+        path = job.dest_path.with_name(job.dest_path.name + ".tmp")
+        request_headers = {}
+        mode = "wb"
+    else:
+        start, end = job.segments[index]
+        path = job.part_path(index)
+        request_headers = resume_headers(path, start, end, job.validator)
+        if request_headers is None:
+            return
+        mode = "ab"
+
+    started = progress.request_started(job.url) if progress is not None else None
+    try:
+        async with client.stream("GET", job.url, headers=request_headers) as r:
+            if index is None:
+                r.raise_for_status()
+            else:
+                check_partial_response(r, job.url)
+            with open(path, mode) as f:
+                async for chunk in r.aiter_bytes(MB):
+                    await limiter.consume(len(chunk))
+                    f.write(chunk)
+                    job.downloaded_bytes += len(chunk)
+    finally:
+        if progress is not None and started is not None:
+            progress.request_finished(job.url, started)
+
+
+def required_disk_space(jobs: list[TSEArchiveJob]) -> int:
+    """
+    Estimativa do espaço em disco necessário para os downloads, descontando as partes já baixadas.
+    """
+    required = 0
+    for job in jobs:
+        if not job.segments:
+            required += job.size
+            continue
+
+        done = sum(
+            job.part_path(i).stat().st_size
+            for i in range(len(job.segments))
+            if job.part_path(i).exists()
+        )
+        required += 2 * job.size - done
+    return required
+
+
+def finish_job(job: TSEArchiveJob, lote_id: int) -> str:
+    """
+    Junta as partes (se houver), confere o tamanho com o Content-Length, guarda o ZIP no armazenamento
+    endereçado por SHA-256 e registra a versão baixada.
+    """
+    tmp_path = job.dest_path.with_name(job.dest_path.name + ".tmp")
+
+    if job.segments:
+        join_parts(job.parts_dir, len(job.segments), tmp_path)
+
+    try:
+        check_size(tmp_path, job.size)
+        digest = store_archive(tmp_path, job.dest_path, job.url)
+    finally:
+        # Um arquivo que não passou na verificação não pode ser reaproveitado na próxima tentativa
+        tmp_path.unlink(missing_ok=True)
+        shutil.rmtree(job.parts_dir, ignore_errors=True)
+
+    if job.remote is not None:
+        job.remote.path = str(job.dest_path)
+        job.remote.sha256 = digest
+        upsert_tse_archive_db(job.remote, lote_id)
+
+    elapsed = time.perf_counter() - (job.started or time.perf_counter())
+    mode = f"{len(job.segments)} segmentos" if job.segments else "stream único"
+    logger.info(
+        f"Download de {job.url} concluído ({mode}): {job.downloaded_bytes / MB:.1f} MB em {elapsed:.1f}s "
+        f"({job.downloaded_bytes / MB / max(elapsed, 1e-6):.1f} MB/s)"
+    )
+
+    return str(job.dest_path)
+
+
+def register_failure(
+    job: TSEArchiveJob,
+    lote_id: int,
+    error: Exception,
+    progress: FetchProgress | None = None,
+):
+    # Os outros segmentos em andamento do mesmo arquivo também falham, mas o arquivo é registrado uma única vez
+    if job.failed:
+        return
+    job.failed = True
+    if progress is not None:
+        progress.failure()
+    # As partes de uma versão que mudou no servidor não servem para a próxima tentativa
+    if isinstance(error, RemoteFileChangedError):
+        shutil.rmtree(job.parts_dir, ignore_errors=True)
+    status_code = (
+        error.response.status_code if isinstance(error, httpx.HTTPStatusError) else None
+    )
+    logger.error(f"Falha permanente ao baixar o arquivo {job.url}: {error}")
+
+    try:
+        insert_extract_error_db(
+            lote_id=lote_id,
+            task=job.task,
+            status_code=status_code,
+            message=str(error),
+            url=job.url,
+        )
+    except Exception as e:
+        logger.critical(
+            f"Erro ao tentar inserir o erro da URL {job.url} no banco de dados: {e}"
+        )
+
+
+async def download_tse_archives(
+    jobs: list[TSEArchiveJob],
+    lote_id: int,
+    force: bool = False,
+    pool_size: int = APP_SETTINGS.TSE.DOWNLOAD_POOL_SIZE,
+    max_bandwidth: float = APP_SETTINGS.TSE.DOWNLOAD_MAX_BANDWIDTH,
+    segment_size: int = APP_SETTINGS.TSE.DOWNLOAD_SEGMENT_SIZE * MB,
+    timeout: float = 60.0,
+    max_retries: int = APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
+    task: str = TasksNames.EXTRACT_TSE_ARCHIVES,
+) -> dict[str, str | None]:
+    """
+    Baixa todos os arquivos do TSE em um único pool assíncrono com número limitado de conexões.
+    - Arquivos que não mudaram desde a última versão registrada não são baixados (exceto com force=True)
+    - Os maiores arquivos são agendados primeiro, divididos em segmentos quando o servidor aceita Range
+    - max_bandwidth (MB/s) limita a banda somada de todos os downloads. 0 = sem limite
+    - As métricas dos arquivos baixados (um arquivo por URL, um segmento por página) são gravadas na tabela task_metrics
+    Retorna um dicionário URL -> caminho do ZIP, com None para os arquivos que não puderam ser baixados.
+    """
+    for job in jobs:
+        job.url = canonical_url(job.url)
+        job.dest_path = Path(job.dest_path)
+        ensure_dir(job.dest_path.parent)
+
+    results: dict[str, str | None] = {}
+    semaphore = asyncio.Semaphore(pool_size)
+    limiter = BandwidthLimiter(max_bandwidth * MB)
+    started = time.perf_counter()
+
+    async with async_http_client(
+        timeout=timeout, follow_redirects=True, headers=headers
+    ) as client:
+        # Uma única consulta, fora do event loop
+        stored_archives = await asyncio.to_thread(
+            get_tse_archives_db, [job.url for job in jobs]
+        )
+        await asyncio.gather(
+            *(
+                probe_job(client, job, stored_archives.get(job.url), semaphore)
+                for job in jobs
+            )
+        )
+
+        to_download = []
+        unchanged = []
+        for job in jobs:
+            stored = stored_archives.get(job.url)
+            if (
+                not force
+                and stored is not None
+                and job.remote is not None
+                and stored.path is not None
+                and Path(stored.path).exists()
+                and not archive_changed(stored, job.remote)
+            ):
+                logger.info(f"O arquivo {job.url} não mudou desde o último download.")
+                unchanged.append(job.url)
+                results[job.url] = stored.path
+            else:
+                to_download.append(job)
+        await asyncio.to_thread(update_tse_archives_verified_db, unchanged)
+
+        work = schedule_work(to_download, segment_size)
+        for job in to_download:
+            if job.segments:
+                prepare_parts_dir(job.parts_dir, job.validator)
+
+        # Arquivos em segmentos ocupam o dobro do tamanho enquanto as partes são juntadas
+        check_disk_space(
+            APP_SETTINGS.TSE.OUTPUT_EXTRACT_DIR,
+            required_disk_space(to_download),
+            f"baixar {len(to_download)} arquivos do TSE",
+        )
+
+        logger.info(
+            f"Baixando {len(to_download)} de {len(jobs)} arquivos do TSE "
+            f"({sum(job.size for job in to_download) / MB:.1f} MB em {len(work)} itens, {pool_size} conexões)"
+        )
+
+        queue = asyncio.Queue()
+        for item in work:
+            queue.put_nowait(item)
+
+        progress = FetchProgress(task=task, planned=len(to_download), limit=pool_size)
+
+        async def worker():
+            while True:
+                job, index = await queue.get()
+                try:
+                    if job.failed:
+                        continue
+                    if job.started is None:
+                        job.started = time.perf_counter()
+
+                    for attempt in range(max_retries):
+                        try:
+                            await download_item(client, limiter, job, index, progress)
+                            break
+                        except Exception as e:
+                            # Um arquivo que mudou no servidor não se resolve com novas tentativas
+                            if attempt < max_retries - 1 and not isinstance(
+                                e, RemoteFileChangedError
+                            ):
+                                logger.warning(
+                                    f"Erro ao baixar {job.url}: {e}. TENTANDO NOVAMENTE. Tentativa: {attempt}"
+                                )
+                                progress.retry_started()
+                                try:
+                                    await asyncio.sleep(2**attempt)
+                                finally:
+                                    progress.retry_finished()
+                            else:
+                                raise
+
+                    job.pending -= 1
+                    if job.pending == 0:
+                        results[job.url] = await asyncio.to_thread(
+                            finish_job, job, lote_id
+                        )
+                        progress.success(
+                            job.url,
+                            job.downloaded_bytes,
+                            pages=len(job.segments) or 1,
+                        )
+                except Exception as e:
+                    register_failure(job, lote_id, e, progress)
+                    results[job.url] = None
+                finally:
+                    queue.task_done()
+
+        async with progress.report():
+            workers = [asyncio.create_task(worker()) for _ in range(pool_size)]
+            await queue.join()
+
+    for w in workers:
+        w.cancel()
+
+    await asyncio.to_thread(apply_retention)
+    record_fetch_metrics(progress, lote_id)
+
+    elapsed = time.perf_counter() - started
+    downloaded_bytes = sum(job.downloaded_bytes for job in to_download)
+    logger.info(
+        f"Downloads do TSE concluídos: {downloaded_bytes / MB:.1f} MB em {elapsed:.1f}s "
+        f"({downloaded_bytes / MB / max(elapsed, 1e-6):.1f} MB/s), "
+        f"{sum(1 for job in to_download if job.failed)} falhas"
+    )
+
+    return results
@@ -0,0 +1,364 @@
+import os
+import re
+import time
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from prefect.logging import get_logger
+
+from config.loader import load_config
+
+from .io import ensure_dir
+from .tse_archives import iter_archive_members, tse_member_pattern
+from .tse_store import check_disk_space
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+TSE_CSV_ENCODING = "latin-1"
+TSE_CSV_SEPARATOR = ";"
+TSE_DATE_FORMAT = "%d/%m/%Y"
+# Marcadores utilizados pelo TSE para valores nulos ou não divulgados nas colunas de texto
+TSE_NULL_VALUES = ["#NULO#", "#NE#", "#NULO", "#NE"]
+
+# Coluna utilizada para particionar os arquivos Parquet por UF
+PARTITION_COLUMN = "SG_UF"
+
+# Sufixo dos membros dos ZIPs do TSE, ex.: consulta_cand_2022_BRASIL.csv -> consulta_cand
+_MEMBER_SUFFIX = re.compile(r"_\d{4}_[A-Za-z]+\.csv$", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class TSESchema:
+    """
+    Tipos declarados das colunas dos CSVs do TSE. Colunas não declaradas são mantidas como texto,
+    e colunas declaradas que não existem no arquivo de um determinado ano são ignoradas.
+    """
+
+    ints: frozenset[str] = field(default_factory=frozenset)
+    floats: frozenset[str] = field(default_factory=frozenset)
+    dates: frozenset[str] = field(default_factory=frozenset)
+    categories: frozenset[str] = field(default_factory=frozenset)
+
+    def arrow_type(self, column: str) -> pa.DataType:
+        if column in self.ints:
+            return pa.int64()
+        if column in self.floats:
+            return pa.float64()
+        if column in self.dates:
+            return pa.date32()
+        if column in self.categories:
+            return pa.dictionary(pa.int32(), pa.string())
+        return pa.string()
+
+    def arrow_schema(self, columns: list[str]) -> pa.Schema:
+        return pa.schema([(column, self.arrow_type(column)) for column in columns])
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Converte as colunas de um chunk lido como texto para os tipos declarados.
+        """
+        for column in df.columns:
+            if column in self.ints:
+                df[column] = pd.to_numeric(df[column], errors="coerce").astype("Int64")
+            elif column in self.floats:
+                # Os valores monetários do TSE utilizam vírgula como separador decimal
+                df[column] = pd.to_numeric(
+                    df[column].str.replace(",", ".", regex=False), errors="coerce"
+                )
+            elif column in self.dates:
+                df[column] = pd.to_datetime(
+                    df[column], format=TSE_DATE_FORMAT, errors="coerce"
+                ).dt.date
+            elif column in self.categories:
+                df[column] = df[column].astype("category")
+        return df
+
+
+# Colunas presentes em todos os arquivos de eleições do TSE
+_ELEICAO_INTS = frozenset(
+    {
+        "ANO_ELEICAO",
+        "AA_ELEICAO",
+        "CD_TIPO_ELEICAO",
+        "NR_TURNO",
+        "CD_ELEICAO",
+        "CD_CARGO",
+        "SQ_CANDIDATO",
+        "NR_CANDIDATO",
+        "NR_PARTIDO",
+    }
+)
+_ELEICAO_DATES = frozenset({"DT_GERACAO", "DT_ELEICAO"})
+_ELEICAO_CATEGORIES = frozenset(
+    {
+        "NM_TIPO_ELEICAO",
+        "DS_ELEICAO",
+        "TP_ABRANGENCIA",
+        "SG_UF",
+        "SG_UE",
+        "NM_UE",
+        "DS_CARGO",
+        "SG_PARTIDO",
+        "NM_PARTIDO",
+        "TP_AGREMIACAO",
+        "DS_SIT_TOT_TURNO",
+    }
+)
+
+TSE_SCHEMAS: dict[str, TSESchema] = {
+    "candidatos": TSESchema(
+        ints=_ELEICAO_INTS
+        | {
+            "SQ_COLIGACAO",
+            "CD_SITUACAO_CANDIDATURA",
+            "CD_DETALHE_SITUACAO_CAND",
+            "CD_NACIONALIDADE",
+            "CD_MUNICIPIO_NASCIMENTO",
+            "NR_IDADE_DATA_POSSE",
+            "CD_GENERO",
+            "CD_GRAU_INSTRUCAO",
+            "CD_ESTADO_CIVIL",
+            "CD_COR_RACA",
+            "CD_OCUPACAO",
+            "CD_SIT_TOT_TURNO",
+            "NR_PROTOCOLO_CANDIDATURA",
+            "NR_PROCESSO",
+        },
+        floats=frozenset({"VR_DESPESA_MAX_CAMPANHA"}),
+        dates=_ELEICAO_DATES | {"DT_NASCIMENTO"},
+        categories=_ELEICAO_CATEGORIES
+        | {
+            "DS_SITUACAO_CANDIDATURA",
+            "DS_DETALHE_SITUACAO_CAND",
+            "DS_NACIONALIDADE",
+            "SG_UF_NASCIMENTO",
+            "DS_GENERO",
+            "DS_GRAU_INSTRUCAO",
+            "DS_ESTADO_CIVIL",
+            "DS_COR_RACA",
+            "DS_OCUPACAO",
+            "ST_REELEICAO",
+            "ST_DECLARAR_BENS",
+        },
+    ),
+    "prestacao_contas": TSESchema(
+        ints=_ELEICAO_INTS
+        | {
+            "SQ_PRESTADOR_CONTAS",
+            "CD_FONTE_RECEITA",
+            "CD_ORIGEM_RECEITA",
+            "CD_NATUREZA_RECEITA",
+            "CD_ESPECIE_RECEITA",
+            "CD_ORIGEM_DESPESA",
+            "CD_ESPECIE_DOCUMENTO",
+            "SQ_RECEITA",
+            "SQ_DESPESA",
+            "SQ_PARCELAMENTO_DESPESA",
+        },
+        floats=frozenset({"VR_RECEITA", "VR_DESPESA_CONTRATADA", "VR_PAGTO_DESPESA"}),
+        dates=_ELEICAO_DATES
+        | {"DT_PRESTACAO_CONTAS", "DT_RECEITA", "DT_DESPESA", "DT_PAGTO_DESPESA"},
+        categories=_ELEICAO_CATEGORIES
+        | {
+            "TP_PRESTACAO_CONTAS",
+            "DS_FONTE_RECEITA",
+            "DS_ORIGEM_RECEITA",
+            "DS_NATUREZA_RECEITA",
+            "DS_ESPECIE_RECEITA",
+            "DS_ORIGEM_DESPESA",
+            "DS_ESPECIE_DOCUMENTO",
+        },
+    ),
+    "redes_sociais": TSESchema(
+        ints=_ELEICAO_INTS | {"NR_ORDEM_REDE_SOCIAL"},
+        dates=_ELEICAO_DATES,
+        categories=_ELEICAO_CATEGORIES,
+    ),
+    "votacao": TSESchema(
+        ints=_ELEICAO_INTS
+        | {
+            "CD_MUNICIPIO",
+            "NR_ZONA",
+            "SQ_COLIGACAO",
+            "CD_SITUACAO_CANDIDATURA",
+            "CD_DETALHE_SITUACAO_CAND",
+            "CD_SIT_TOT_TURNO",
+            "QT_VOTOS_NOMINAIS",
+            "QT_VOTOS_NOMINAIS_VALIDOS",
+        },
+        dates=_ELEICAO_DATES,
+        categories=_ELEICAO_CATEGORIES
+        | {
+            "NM_MUNICIPIO",
+            "DS_SITUACAO_CANDIDATURA",
+            "DS_DETALHE_SITUACAO_CAND",
+            "ST_VOTO_EM_TRANSITO",
+            "NM_TIPO_DESTINACAO_VOTOS",
+        },
+    ),
+}
+
+
+def member_table_name(filename: str) -> str:
+    """
+    Nome da tabela de um membro do ZIP, sem o ano e a UF.
+    Ex.: receitas_candidatos_2022_BRASIL.csv -> receitas_candidatos
+    """
+    return _MEMBER_SUFFIX.sub("", Path(filename).name)
+
+
+def success_marker_path(out_dir: str | Path, dataset: str, year: int, uf: str) -> Path:
+    """
+    Arquivo que indica que a conversão de um ZIP terminou. Arquivos iniciados com '_' são ignorados pelos leitores de Parquet.
+    """
+    return Path(out_dir) / dataset / f"_SUCCESS_{year}_{uf}"
+
+
+def parquet_up_to_date(
+    zip_path: str | Path, out_dir: str | Path, dataset: str, year: int, uf: str
+) -> bool:
+    """
+    Verifica se a conversão do ZIP já foi feita depois da última vez que ele foi baixado.
+    """
+    marker = success_marker_path(out_dir, dataset, year, uf)
+    return marker.exists() and marker.stat().st_mtime >= Path(zip_path).stat().st_mtime
+
+
+class _PartitionWriters:
+    """
+    Mantém um ParquetWriter aberto por UF enquanto os chunks de um membro são lidos,
+    gerando um único arquivo por partição. Os arquivos só substituem os anteriores quando todos foram escritos.
+    """
+
+    def __init__(self, table_dir: Path, year: int, schema: pa.Schema):
+        self.table_dir = table_dir
+        self.year = year
+        self.schema = schema
+        self.writers: dict[str, tuple[pq.ParquetWriter, Path, Path]] = {}
+
+    def write(self, uf: str, df: pd.DataFrame):
+        if uf not in self.writers:
+            partition_dir = (
+                self.table_dir / f"ano={self.year}" / f"{PARTITION_COLUMN}={uf}"
+            )
+            ensure_dir(partition_dir)
+            final_path = partition_dir / "part-0.parquet"
+            tmp_path = partition_dir / ".part-0.parquet.tmp"
+            self.writers[uf] = (
+                pq.ParquetWriter(tmp_path, self.schema, compression="zstd"),
+                tmp_path,
+                final_path,
+            )
+
+        writer = self.writers[uf][0]
+        writer.write_table(
+            pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        )
+
+    def commit(self) -> list[str]:
+        paths = []
+        for writer, tmp_path, final_path in self.writers.values():
+            writer.close()
+            os.replace(tmp_path, final_path)
+            paths.append(str(final_path))
+        return paths
+
+    def abort(self):
+        for writer, tmp_path, _ in self.writers.values():
+            writer.close()
+            tmp_path.unlink(missing_ok=True)
+
+
+def convert_tse_archive(
+    zip_path: str | Path,
+    dataset: str,
+    year: int,
+    out_dir: str | Path = APP_SETTINGS.TSE.OUTPUT_TRANSFORM_DIR,
+    uf: str = "BRASIL",
+    chunk_size: int = APP_SETTINGS.TSE.PARQUET_CHUNK_SIZE,
+) -> list[str]:
+    """
+    Converte os CSVs de um ZIP do TSE em arquivos Parquet particionados por ano e UF, sem extrair o ZIP.
+    - Os CSVs (latin-1, separados por ';') são lidos em chunks de tamanho limitado
+    - Os tipos das colunas seguem o schema declarado do dataset em TSE_SCHEMAS
+    - Cada tabela do ZIP é gravada em <out_dir>/<dataset>/<tabela>/ano=<ano>/SG_UF=<uf>/part-0.parquet
+    Os ZIPs trazem um arquivo BRASIL com todas as UFs, que é o único lido. Nos ZIPs que são de uma única UF
+    e não possuem a coluna SG_UF (ex.: redes sociais), a partição é a UF informada.
+    Retorna os caminhos dos arquivos Parquet gravados.
+    """
+    schema = TSE_SCHEMAS[dataset]
+    dataset_dir = Path(out_dir) / dataset
+    started = time.perf_counter()
+
+    # Os arquivos Parquet com zstd ficam com tamanho próximo ao dos membros comprimidos no ZIP
+    member_regex = tse_member_pattern(uf)
+    with zipfile.ZipFile(zip_path) as zf:
+        estimated_size = sum(
+            info.compress_size
+            for info in zf.infolist()
+            if member_regex.search(info.filename)
+        )
+    check_disk_space(out_dir, estimated_size, f"converter {zip_path} para Parquet")
+
+    paths = []
+    rows = 0
+    for filename, stream in iter_archive_members(zip_path, member_regex):
+        table_dir = dataset_dir / member_table_name(filename)
+
+        chunks = pd.read_csv(
+            stream,
+            sep=TSE_CSV_SEPARATOR,
+            encoding=TSE_CSV_ENCODING,
+            dtype=str,
+            keep_default_na=False,
+            na_values=TSE_NULL_VALUES,
+            chunksize=chunk_size,
+        )
+
+        writers = None
+        try:
+            for chunk in chunks:
+                chunk = schema.apply(chunk)
+                rows += len(chunk)
+
+                if writers is None:
+                    columns = [c for c in chunk.columns if c != PARTITION_COLUMN]
+                    writers = _PartitionWriters(
+                        table_dir, year, schema.arrow_schema(columns)
+                    )
+
+                if PARTITION_COLUMN not in chunk.columns:
+                    writers.write(uf, chunk)
+                    continue
+
+                # A UF fica no caminho da partição, não dentro do arquivo
+                for partition_uf, partition_df in chunk.groupby(
+                    PARTITION_COLUMN, observed=True, sort=False
+                ):
+                    writers.write(
+                        str(partition_uf), partition_df.drop(columns=PARTITION_COLUMN)
+                    )
+        except Exception:
+            if writers is not None:
+                writers.abort()
+            raise
+
+        if writers is not None:
+            paths.extend(writers.commit())
+
+    marker = success_marker_path(out_dir, dataset, year, uf)
+    ensure_dir(marker.parent)
+    marker.touch()
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Conversão de {zip_path} para Parquet concluída: {rows} linhas em {len(paths)} arquivos em {elapsed:.1f}s"
+    )
+
+    return paths
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import shutil
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from prefect.logging import get_logger
+
+from config.loader import load_config
+
+from .io import ensure_dir
+from .segmented_download import MB
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+# Os ZIPs verificados ficam em <OUTPUT_EXTRACT_DIR>/store/<2 primeiros caracteres>/<sha256>.zip,
+# acompanhados do manifesto <sha256>.json. Os caminhos por dataset/ano são hard links para esses objetos.
+STORE_DIR = Path(APP_SETTINGS.TSE.OUTPUT_EXTRACT_DIR) / "store"
+
+
+class InsufficientDiskSpaceError(Exception):
+    """Não há espaço livre em disco suficiente para a operação."""
+
+
+def check_disk_space(
+    path: str | Path,
+    required_bytes: int,
+    operation: str,
+    margin_bytes: int = APP_SETTINGS.TSE.DISK_SPACE_MARGIN * MB,
+):
+    """
+    Falha antes de começar uma operação que não caberia no disco, informando a estimativa de espaço necessário.
+    """
+    path = Path(path)
+    # O diretório pode ainda não existir, então o espaço é verificado no ancestral mais próximo
+    while not path.exists() and path != path.parent:
+        path = path.parent
+
+    free = shutil.disk_usage(path).free
+    if free < required_bytes + margin_bytes:
+        raise InsufficientDiskSpaceError(
+            f"Espaço em disco insuficiente para {operation}: são necessários aproximadamente "
+            f"{required_bytes / MB:.1f} MB (+ {margin_bytes / MB:.0f} MB de margem) em {path}, "
+            f"mas há apenas {free / MB:.1f} MB livres."
+        )
+
+
+def sha256_file(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(MB):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def store_object_path(digest: str, store_dir: str | Path = STORE_DIR) -> Path:
+    return Path(store_dir) / digest[:2] / f"{digest}.zip"
+
+
+def manifest_path(digest: str, store_dir: str | Path = STORE_DIR) -> Path:
+    return store_object_path(digest, store_dir).with_suffix(".json")
+
+
+def archive_members(zip_path: str | Path) -> list[dict]:
+    """
+    Lista os membros do ZIP. Abrir o diretório central também confere que o arquivo baixado é um ZIP válido.
+    """
+    with zipfile.ZipFile(zip_path) as zf:
+        return [
+            {
+                "nome": info.filename,
+                "tamanho": info.file_size,
+                "tamanho_comprimido": info.compress_size,
+                "crc32": f"{info.CRC:08x}",
+            }
+            for info in zf.infolist()
+            if not info.is_dir()
+        ]
+
+
+def read_manifest(digest: str, store_dir: str | Path = STORE_DIR) -> dict:
+    with open(manifest_path(digest, store_dir), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(manifest: dict, store_dir: str | Path = STORE_DIR):
+    path = manifest_path(manifest["sha256"], store_dir)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def link_or_copy(source: Path, dest: Path):
+    """
+    Substitui dest por um hard link para source. Se o sistema de arquivos não aceitar hard links, copia o arquivo.
+    """
+    ensure_dir(dest.parent)
+    tmp_path = dest.with_name(dest.name + ".link")
+    tmp_path.unlink(missing_ok=True)
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, dest)
+
+
+def store_archive(
+    downloaded_path: str | Path,
+    dest_path: str | Path,
+    url: str,
+    store_dir: str | Path = STORE_DIR,
+) -> str:
+    """
+    Move um ZIP recém-baixado para o armazenamento endereçado por SHA-256 e aponta dest_path para ele.
+    - Se o conteúdo já existe no armazenamento (ex.: o TSE publicou o mesmo arquivo com outro ETag), o download é descartado
+    - O manifesto registra os membros do ZIP e as URLs/datas em que o conteúdo foi baixado
+    Retorna o SHA-256 do arquivo.
+    """
+    downloaded_path = Path(downloaded_path)
+    dest_path = Path(dest_path)
+
+    digest = sha256_file(downloaded_path)
+    object_path = store_object_path(digest, store_dir)
+
+    if object_path.exists():
+        logger.info(
+            f"O conteúdo de {url} já está armazenado ({digest}), reaproveitando."
+        )
+        downloaded_path.unlink()
+        manifest = read_manifest(digest, store_dir)
+    else:
+        members = archive_members(downloaded_path)
+        ensure_dir(object_path.parent)
+        os.replace(downloaded_path, object_path)
+        manifest = {
+            "sha256": digest,
+            "tamanho": object_path.stat().st_size,
+            "membros": members,
+            "origens": [],
+        }
+
+    manifest["origens"].append(
+        {"url": url, "data_hora": datetime.now(timezone.utc).isoformat()}
+    )
+    write_manifest(manifest, store_dir)
+
+    link_or_copy(object_path, dest_path)
+
+    return digest
+
+
+def apply_retention(
+    store_dir: str | Path = STORE_DIR,
+    keep_versions: int = APP_SETTINGS.TSE.STORE_RETENTION,
+) -> list[str]:
+    """
+    Remove do armazenamento as versões antigas dos arquivos, mantendo as keep_versions mais recentes de cada URL.
+    Um objeto só é removido quando nenhuma URL o mantém. Retorna os SHA-256 removidos.
+    """
+    # A versão atual de cada URL nunca é removida
+    keep_versions = max(keep_versions, 1)
+
+    store_dir = Path(store_dir)
+    if not store_dir.exists():
+        return []
+
+    # URL -> lista de (data do download mais recente, sha256)
+    versions_by_url: dict[str, list[tuple[str, str]]] = {}
+    digests = set()
+    for path in store_dir.glob("*/*.json"):
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+        digest = manifest["sha256"]
+        digests.add(digest)
+
+        last_by_url: dict[str, str] = {}
+        for origem in manifest["origens"]:
+            last_by_url[origem["url"]] = max(
+                origem["data_hora"], last_by_url.get(origem["url"], "")
+            )
+        for url, last_download in last_by_url.items():
+            versions_by_url.setdefault(url, []).append((last_download, digest))
+
+    retained = set()
+    for versions in versions_by_url.values():
+        versions.sort(reverse=True)
+        retained.update(digest for _, digest in versions[:keep_versions])
+
+    removed = []
+    for digest in digests - retained:
+        store_object_path(digest, store_dir).unlink(missing_ok=True)
+        manifest_path(digest, store_dir).unlink(missing_ok=True)
+        removed.append(digest)
+
+    if removed:
+        logger.info(
+            f"{len(removed)} versões antigas de arquivos do TSE removidas do armazenamento."
+        )
+
+    return removed
@@ -0,0 +1,183 @@
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from prefect.logging import get_logger
+
+from config.loader import load_config
+
+from .io import ensure_dir
+from .tse_parquet import PARTITION_COLUMN
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+VOTES_COLUMN = "QT_VOTOS_NOMINAIS"
+CANDIDATE_COLUMN = "SQ_CANDIDATO"
+
+# Colunas de cada nível de agregação, na ordem em que os arrays são ordenados.
+# Todos começam pelo número sequencial do candidato, que é a chave das consultas.
+AGGREGATION_LEVELS = {
+    "municipio": [CANDIDATE_COLUMN, "NR_TURNO", PARTITION_COLUMN, "CD_MUNICIPIO"],
+    "uf": [CANDIDATE_COLUMN, "NR_TURNO", PARTITION_COLUMN],
+    "total": [CANDIDATE_COLUMN, "NR_TURNO"],
+}
+
+# Tipos compactos dos arrays gravados em disco
+ARRAY_DTYPES = {
+    CANDIDATE_COLUMN: np.int64,
+    "NR_TURNO": np.int8,
+    PARTITION_COLUMN: "S2",
+    "CD_MUNICIPIO": np.int32,
+    VOTES_COLUMN: np.int64,
+}
+
+
+def votacao_parquet_dir(
+    year: int, transform_dir: str | Path = APP_SETTINGS.TSE.OUTPUT_TRANSFORM_DIR
+) -> Path:
+    return Path(transform_dir) / "votacao" / "votacao_candidato_munzona" / f"ano={year}"
+
+
+def votacao_agregada_dir(
+    year: int, transform_dir: str | Path = APP_SETTINGS.TSE.OUTPUT_TRANSFORM_DIR
+) -> Path:
+    return Path(transform_dir) / "votacao_agregada" / f"ano={year}"
+
+
+def aggregate_votacao_municipio(
+    parquet_dir: str | Path,
+    batch_size: int = APP_SETTINGS.TSE.PARQUET_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Soma os votos de cada candidato por turno e município a partir dos arquivos Parquet de votação por município e zona.
+    Os arquivos de cada UF são lidos em lotes, apenas com as colunas necessárias. Cada lote é agregado com groupby
+    e as somas parciais da UF são agregadas novamente ao final do arquivo, já que uma UF não compartilha municípios com outra.
+    """
+    keys = [CANDIDATE_COLUMN, "NR_TURNO", "CD_MUNICIPIO"]
+    columns = keys + [VOTES_COLUMN]
+
+    aggregated = []
+    for path in sorted(Path(parquet_dir).glob(f"{PARTITION_COLUMN}=*/*.parquet")):
+        uf = path.parent.name.split("=", 1)[1]
+
+        partials = [
+            batch.to_pandas()
+            .groupby(keys, sort=False, observed=True)[VOTES_COLUMN]
+            .sum()
+            for batch in pq.ParquetFile(path).iter_batches(
+                batch_size=batch_size, columns=columns
+            )
+        ]
+        if not partials:
+            continue
+
+        uf_df = pd.concat(partials).groupby(level=keys, sort=False).sum().reset_index()
+        uf_df[PARTITION_COLUMN] = uf
+        aggregated.append(uf_df)
+
+    if not aggregated:
+        return pd.DataFrame(columns=AGGREGATION_LEVELS["municipio"] + [VOTES_COLUMN])
+
+    return pd.concat(aggregated, ignore_index=True)[
+        AGGREGATION_LEVELS["municipio"] + [VOTES_COLUMN]
+    ]
+
+
+def aggregate_levels(municipio_df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """
+    Gera os níveis UF e total a partir da soma por município, ordenando todos pela chave do candidato.
+    """
+    levels = {}
+    for level, keys in AGGREGATION_LEVELS.items():
+        if level == "municipio":
+            df = municipio_df
+        else:
+            df = (
+                municipio_df.groupby(keys, sort=False)[VOTES_COLUMN].sum().reset_index()
+            )
+        levels[level] = df.sort_values(keys, kind="stable", ignore_index=True)
+    return levels
+
+
+def save_votacao_agregada(levels: dict[str, pd.DataFrame], dest_dir: str | Path):
+    """
+    Grava cada coluna de cada nível como um array .npy, que pode ser aberto com mmap sem ler o arquivo inteiro.
+    O diretório anterior só é substituído quando todos os arrays foram gravados.
+    """
+    dest_dir = Path(dest_dir)
+    tmp_dir = dest_dir.with_name(dest_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    for level, df in levels.items():
+        level_dir = ensure_dir(tmp_dir / level)
+        for column in AGGREGATION_LEVELS[level] + [VOTES_COLUMN]:
+            np.save(
+                level_dir / f"{column}.npy",
+                df[column].to_numpy().astype(ARRAY_DTYPES[column]),
+            )
+
+    shutil.rmtree(dest_dir, ignore_errors=True)
+    tmp_dir.rename(dest_dir)
+
+
+def build_votacao_agregada(
+    year: int, transform_dir: str | Path = APP_SETTINGS.TSE.OUTPUT_TRANSFORM_DIR
+) -> str:
+    """
+    Pré-calcula os votos de cada candidato por município, por UF e no total da eleição de um ano.
+    Retorna o diretório dos arrays gravados.
+    """
+    started = time.perf_counter()
+
+    municipio_df = aggregate_votacao_municipio(votacao_parquet_dir(year, transform_dir))
+    levels = aggregate_levels(municipio_df)
+    dest_dir = votacao_agregada_dir(year, transform_dir)
+    save_votacao_agregada(levels, dest_dir)
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Votação agregada de {year} gravada em {dest_dir}: "
+        + ", ".join(f"{len(df)} linhas por {level}" for level, df in levels.items())
+        + f" em {elapsed:.1f}s"
+    )
+
+    return str(dest_dir)
+
+
+class VotacaoAgregada:
+    """
+    Consulta os votos pré-calculados de uma eleição. Os arrays são abertos com mmap e, como estão ordenados
+    pelo número sequencial do candidato, cada consulta é uma busca binária, sem percorrer os dados.
+    """
+
+    def __init__(self, path: str | Path):
+        path = Path(path)
+        self.arrays = {
+            level: {
+                column: np.load(path / level / f"{column}.npy", mmap_mode="r")
+                for column in AGGREGATION_LEVELS[level] + [VOTES_COLUMN]
+            }
+            for level in AGGREGATION_LEVELS
+        }
+
+    def votos(self, sq_candidato: int, level: str = "total") -> pd.DataFrame:
+        arrays = self.arrays[level]
+        candidates = arrays[CANDIDATE_COLUMN]
+        start = np.searchsorted(candidates, sq_candidato, side="left")
+        end = np.searchsorted(candidates, sq_candidato, side="right")
+
+        df = pd.DataFrame(
+            {column: np.asarray(array[start:end]) for column, array in arrays.items()}
+        )
+        if PARTITION_COLUMN in df.columns:
+            df[PARTITION_COLUMN] = df[PARTITION_COLUMN].str.decode("ascii")
+        return df
+
+    def total(self, sq_candidato: int, turno: int = 1) -> int:
+        df = self.votos(sq_candidato, "total")
+        return int(df.loc[df["NR_TURNO"] == turno, VOTES_COLUMN].sum())
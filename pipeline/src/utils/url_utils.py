@@ -1,30 +1,130 @@
+import re
 from datetime import date
+from string import Formatter
 from typing import Any
-from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+from urllib.parse import parse_qsl, quote, urlparse, urlsplit, urlunsplit
 
+# Parâmetro de paginação da API da Câmara. Na forma canônica ele é sempre o último parâmetro
+# da query e é omitido na primeira página.
+PAGE_PARAM = "pagina"
 
-def get_query_param_value(url: str, param_name: str, default_value: str | int) -> Any:
+_MULTIPLE_SLASHES = re.compile(r"/{2,}")
+_PAGE_PARAM_VALUE = re.compile(rf"[?&]{PAGE_PARAM}=(\d+)")
+_TRAILING_PAGE_PARAM = re.compile(rf"[?&]{PAGE_PARAM}=(\d+)$")
+
+
+def _encode_query(params: list[tuple[str, Any]]) -> str:
+    return "&".join(
+        f"{quote(str(k), safe='')}={quote(str(v), safe='')}" for k, v in params
+    )
+
+
+def canonical_url(url: str) -> str:
+    """
+    Retorna a forma canônica de uma URL, utilizada como chave sempre que URLs são comparadas, cacheadas ou gravadas no banco de dados.
+    - Esquema e domínio em minúsculo, barras duplicadas do caminho removidas
+    - Parâmetros em ordem alfabética, com o parâmetro de paginação sempre por último
+    - Parâmetros vazios e 'pagina=1' são removidos
+    """
+    parsed = urlsplit(url.strip())
+    path = _MULTIPLE_SLASHES.sub("/", parsed.path)
+
+    page = None
+    params = []
+    for key, value in parse_qsl(parsed.query):
+        if key == PAGE_PARAM:
+            page = value
+        else:
+            params.append((key, value))
+
+    params.sort()
+    if page not in (None, "1"):
+        params.append((PAGE_PARAM, page))
+
+    return urlunsplit(
+        (
+            parsed.scheme.lower(),
+            parsed.netloc.lower(),
+            path,
+            _encode_query(params),
+            "",
+        )
+    )
+
+
+def page_url(url: str, page: int) -> str:
+    """
+    Retorna a URL de uma página específica a partir da URL canônica da primeira página.
+    Como o parâmetro de paginação é sempre o último da forma canônica, não é necessário interpretar a URL.
+    """
+    if page <= 1:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{PAGE_PARAM}={page}"
+
+
+def split_page_url(url: str) -> tuple[str, int]:
     """
-    Busca o valor de um parâmetro específico de uma URL. Se o parâmetro não estiver presente, retorna o valor padrão.
+    Separa uma URL canônica entre a URL da primeira página e o número da página.
     """
-    parsed_url = urlparse(url)
-    params = parse_qs(parsed_url.query)
-    param_value = params.get(param_name, [default_value])[0]
-    return param_value
+    match = _TRAILING_PAGE_PARAM.search(url)
+    if match is None:
+        return url, 1
+    return url[: match.start()], int(match.group(1))
 
 
-def alter_query_param_value(base_url: str, param_name: str, new_value) -> str:
+def get_page_number(url: str, default_value: int = 1) -> int:
     """
-    Substitui o valor de um parâmetro específico de uma URL, retornando uma nova URL com o novo valor.
-    Se o parâmetro não existir, ele é criado.
+    Busca o número da página de uma URL sem interpretar a query inteira.
     """
-    parsed_base_url = urlparse(base_url)
-    base_params = parse_qs(parsed_base_url.query)
-    base_params[param_name] = [str(new_value)]
+    match = _PAGE_PARAM_VALUE.search(url)
+    return int(match.group(1)) if match else default_value
 
-    new_query = urlencode(base_params, doseq=True)
-    new_url = urlunparse(parsed_base_url._replace(query=new_query))
-    return new_url
+
+class EndpointTemplate:
+    """
+    Template pré-compilado de um endpoint. Gera URLs já na forma canônica, com os parâmetros em ordem estável.
+    - path aceita campos no formato str.format, ex.: 'deputados/{id}/despesas'
+    - fixed_params são os parâmetros enviados em todas as requisições do endpoint
+    """
+
+    __slots__ = ("_prefix", "_path", "_path_fields", "_fixed_params")
+
+    def __init__(
+        self, base_url: str, path: str, fixed_params: dict[str, Any] | None = None
+    ):
+        self._prefix = base_url.rstrip("/") + "/"
+        self._path = _MULTIPLE_SLASHES.sub("/", path.strip("/"))
+        self._path_fields = frozenset(
+            field for _, field, _, _ in Formatter().parse(self._path) if field
+        )
+        self._fixed_params = {
+            k: v for k, v in (fixed_params or {}).items() if v is not None
+        }
+
+    def url(self, **params: Any) -> str:
+        """
+        Gera a URL canônica do endpoint. Os argumentos que correspondem a campos do caminho são substituídos nele,
+        os demais viram parâmetros da query. Parâmetros None são ignorados.
+        """
+        path_values = {}
+        query = dict(self._fixed_params)
+        for key, value in params.items():
+            if key in self._path_fields:
+                path_values[key] = quote(str(value), safe="")
+            elif value is not None:
+                query[key] = value
+
+        missing = self._path_fields - path_values.keys()
+        if missing:
+            raise ValueError(
+                f"Faltam os valores {sorted(missing)} para o caminho '{self._path}'"
+            )
+
+        page = query.pop(PAGE_PARAM, None)
+        url = self._prefix + self._path.format(**path_values)
+        if query:
+            url += "?" + _encode_query(sorted(query.items()))
+        return page_url(url, int(page)) if page is not None else url
 
 
 def get_path_parameter_value(url: str, param_name: str) -> Any:
@@ -35,56 +135,19 @@ def get_path_parameter_value(url: str, param_name: str) -> Any:
     return path_parts[param_index + 1]
 
 
-def is_first_page(url: str) -> bool:
-    """ADICIONAR ESSA FUNÇÃO AQUI NO UTITLS DE URL"""
-    parsed = urlparse(url)
-    params = parse_qs(parsed.query)
-    # Se não tem 'pagina' OU é '1', é primeira página
-    pagina = params.get("pagina", ["1"])[0]
-    return str(pagina) in ["1", ""]
-
-
-def generate_date_urls_senado(
-    url: str, start_date: date, end_date: date
-) -> list[str] | None:
+def split_dates_by_year(start_date: date, end_date: date) -> list[tuple[date, date]]:
     """
-    Calcula e retorna as URLs necessárias para baixar os dados do Senado de acordo com as datas de início e fim selecionadas. A maioria dos endpoints do Senado aceitam apenas a diferença de um ano entre esses argumentos.
+    Divide o intervalo entre as datas de início e fim em intervalos contidos em um único ano. A maioria dos endpoints do Senado aceitam apenas a diferença de um ano entre esses argumentos.
     """
-    if "%STARTDATE%" not in url or "%ENDDATE%" not in url:
-        raise ValueError(
-            f"A URL não possui as strings corretas de '%STARTDATE%' ou '%ENDDATE' para realizara a substituição: {url}"
-        )
-
     if end_date < start_date:
         raise ValueError(
             f"A data de início ({start_date}) não pode ser maior que a data de fim ({end_date})"
         )
 
-    if start_date.year == end_date.year:
-        url_ret = url.replace("%STARTDATE%", start_date.isoformat()).replace(
-            "%ENDDATE%", end_date.isoformat()
-        )
-        return [url_ret]
-
-    if start_date.year != end_date.year:
-        urls_ret = []
-        for year in range(start_date.year, (end_date.year + 1)):
-            if year == start_date.year:
-                url_ret = url.replace("%STARTDATE%", start_date.isoformat()).replace(
-                    "%ENDDATE%", f"{year}-12-31"
-                )
-                urls_ret.append(url_ret)
-
-            if year != start_date.year and year != end_date.year:
-                url_ret = url.replace("%STARTDATE%", f"{year}-01-01").replace(
-                    "%ENDDATE%", f"{year}-12-31"
-                )
-                urls_ret.append(url_ret)
-
-            if year == end_date.year:
-                url_ret = url.replace("%STARTDATE%", f"{year}-01-01").replace(
-                    "%ENDDATE%", end_date.isoformat()
-                )
-                urls_ret.append(url_ret)
-
-        return urls_ret
+    ranges = []
+    for year in range(start_date.year, end_date.year + 1):
+        range_start = start_date if year == start_date.year else date(year, 1, 1)
+        range_end = end_date if year == end_date.year else date(year, 12, 31)
+        ranges.append((range_start, range_end))
+
+    return ranges